@@ -0,0 +1,272 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Load generator / benchmark for the geth test network.
+#
+#    Scenarios:
+#       rpc  - raw eth_blockNumber calls, as many per second as possible.
+#       set  - SimpleStorage.set(x) transactions, throughput and time until
+#              each transaction is mined (time-to-inclusion).
+#       read - mix of SimpleStorage.get() eth_calls and eth_getStorageAt reads.
+#
+#    Reports p50/p95/p99 latency, calls or transactions per second and the
+#    error rate, as a table and optionally as json. --mock runs against an
+#    in-process mock geth server (mockGethServer.py) instead of real clients.
+#
+#    ./benchmarkNetwork.py --scenario rpc,read --node 127.0.0.1:9000 --node 127.0.0.1:11000
+#    ./benchmarkNetwork.py --mock --scenario rpc,set,read --duration 5 --json results.json
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import argparse
+import itertools
+import json
+import sys
+import threading
+import time
+from networkGethClients import rpcCommand, deployContract
+from rpcConnectionPool import configureDefaultPool
+from rpcMetrics import getDefaultMetrics, serveMetrics
+from receiptWaiter import waitForReceipt
+from transactionSubmitter import TransactionSubmitter
+from testProject import SimpleStorageContract, SimpleStorageGetHash, SimpleStorageSet
+
+
+def percentile(sortedValues,fraction):
+    if not sortedValues:
+        return None
+    index = min(len(sortedValues) - 1, max(0, int(round(fraction * (len(sortedValues) - 1)))))
+    return sortedValues[index]
+
+def isError(results):
+    return isinstance(results, dict) and 'error' in results
+
+
+class LatencyRecorder(object):
+    """ Thread safe collection of call latencies (seconds) and error counts. """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = 0
+        self.started = time.time()
+        self.finished = None
+
+    def record(self,latency,error=False):
+        with self.lock:
+            if error:
+                self.errors += 1
+            else:
+                self.latencies.append(latency)
+
+    def finish(self):
+        self.finished = time.time()
+
+    def summary(self,unit='calls'):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            errors = self.errors
+        elapsed = (self.finished or time.time()) - self.started
+        total = len(latencies) + errors
+        toMs = lambda value: None if value == None else round(value * 1000.0, 3)
+        return {'count': len(latencies), 'errors': errors,
+                'errorRate': round(errors / float(total), 6) if total else 0.0,
+                'seconds': round(elapsed, 3),
+                unit + 'PerSecond': round(len(latencies) / elapsed, 2) if elapsed > 0 else None,
+                'p50ms': toMs(percentile(latencies, 0.50)), 'p95ms': toMs(percentile(latencies, 0.95)),
+                'p99ms': toMs(percentile(latencies, 0.99)), 'maxms': toMs(latencies[-1] if latencies else None),
+                'meanms': toMs(sum(latencies) / len(latencies) if latencies else None)}
+
+
+def runWorkers(nodes,duration,concurrency,work):
+    """ Run work(ip, port, recorder, workerIndex, callIndex) in a loop on concurrency threads for duration seconds. """
+    recorder = LatencyRecorder()
+    deadline = time.time() + duration
+
+    def worker(workerIndex):
+        ip, port = nodes[workerIndex % len(nodes)]
+        for callIndex in itertools.count():
+            if time.time() >= deadline:
+                break
+            work(ip, port, recorder, workerIndex, callIndex)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    recorder.finish()
+    return recorder
+
+
+##############################################################################
+# Scenarios
+##############################################################################
+
+def runRpcScenario(nodes,duration=10,concurrency=8,method="eth_blockNumber"):
+    """ Raw rpc calls per second. """
+    def work(ip, port, recorder, workerIndex, callIndex):
+        started = time.perf_counter()
+        results = rpcCommand(ip=ip,port=port,method=method,params=[])
+        recorder.record(time.perf_counter() - started, isError(results))
+    return runWorkers(nodes, duration, concurrency, work).summary('calls')
+
+def runReadScenario(nodes,contractAddress,duration=10,concurrency=8,callFraction=0.5):
+    """ Mix of get() eth_calls (callFraction of the reads) and eth_getStorageAt reads of slot 0. """
+    everyNth = max(1, int(round(1.0 / callFraction))) if callFraction > 0 else None
+
+    def work(ip, port, recorder, workerIndex, callIndex):
+        started = time.perf_counter()
+        if everyNth != None and callIndex % everyNth == 0:
+            results = rpcCommand(ip=ip,port=port,method="eth_call",params=[{'to':contractAddress,'data':SimpleStorageGetHash},"latest"])
+        else:
+            results = rpcCommand(ip=ip,port=port,method="eth_getStorageAt",params=[contractAddress,"0x0","latest"])
+        recorder.record(time.perf_counter() - started, isError(results))
+    return runWorkers(nodes, duration, concurrency, work).summary('calls')
+
+def runSetScenario(nodes,contractAddress,duration=10,concurrency=8,settle=60,gas=None):
+    """ SimpleStorage.set(x) transactions sent from every account of every client.
+        Measures send latency, transactions mined per second and time-to-inclusion.
+    """
+    # inclusion is seen by the submitter's checks, how often they run bounds its resolution
+    submitter = TransactionSubmitter(nodes, workers=concurrency, gas=gas, checkInterval=0.25)
+    sendRecorder = LatencyRecorder()
+    inclusionRecorder = LatencyRecorder()
+    unsent = [0]
+    lock = threading.Lock()
+
+    def track(started):
+        sent = []
+
+        def onSent(transactionHash):
+            sent.append(transactionHash)
+            sendRecorder.record(time.perf_counter() - started)
+            with lock:
+                unsent[0] -= 1
+
+        def onMined(future):
+            # the future gives the hash that was mined, also when the transaction was resent
+            if future.exception() == None:
+                inclusionRecorder.record(time.perf_counter() - started)
+            elif not sent:
+                sendRecorder.record(0, True)
+                with lock:
+                    unsent[0] -= 1
+        return onSent, onMined
+
+    deadline = time.time() + duration
+    value = 0
+    while time.time() < deadline:
+        if unsent[0] >= concurrency * 4:
+            time.sleep(0.001)
+            continue
+        value += 1
+        with lock:
+            unsent[0] += 1
+        onSent, onMined = track(time.perf_counter())
+        future = submitter.submit({'to': contractAddress, 'data': SimpleStorageSet.encode(value)}, onSent=onSent)
+        future.add_done_callback(onMined)
+    sendRecorder.finish()
+    submitter.waitUntilMined(timeout=settle)
+    inclusionRecorder.finish()
+    submitter.close()
+    send = sendRecorder.summary('transactions')
+    inclusion = inclusionRecorder.summary('transactions')
+    return {'send': send, 'inclusion': inclusion,
+            'transactionsPerSecond': inclusion['transactionsPerSecond'],
+            'notMined': send['count'] - inclusion['count']}
+
+def deploySimpleStorage(ip,port,timeout=300):
+    """ Deploy the SimpleStorage contract, returns its address. """
+    transactionHash = deployContract(ip, port, contractBytecode=SimpleStorageContract)
+    if isError(transactionHash):
+        raise Exception('rpc_communication_error', transactionHash)
+    receipt = waitForReceipt(ip, port, transactionHash, timeout=timeout)
+    if receipt == None:
+        raise Exception('SimpleStorage deployment was not mined within ' + str(timeout) + ' seconds')
+    return receipt['contractAddress']
+
+
+##############################################################################
+# Reporting
+##############################################################################
+
+def formatTable(results):
+    """ Human readable table of the scenario summaries. """
+    columns = ['count', 'errors', 'errorRate', 'p50ms', 'p95ms', 'p99ms', 'maxms']
+    rows = []
+    for scenario, summary in results.items():
+        if 'send' in summary:
+            rows.append((scenario + ' send', summary['send'], summary['send'].get('transactionsPerSecond')))
+            rows.append((scenario + ' inclusion', summary['inclusion'], summary['transactionsPerSecond']))
+        else:
+            rows.append((scenario, summary, summary.get('callsPerSecond')))
+    lines = [("%-16s" % 'scenario') + ("%10s" % 'per sec') + "".join("%10s" % column for column in columns)]
+    for name, summary, perSecond in rows:
+        lines.append(("%-16s" % name) + ("%10s" % perSecond) + "".join("%10s" % summary.get(column) for column in columns))
+    return "\n".join(lines)
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmark the geth test network.')
+    parser.add_argument('--scenario', default='rpc', help='comma separated list of: rpc, set, read')
+    parser.add_argument('--node', action='append', default=[], help='<ip>:<rpcPort>, repeatable (default 127.0.0.1:9000)')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per scenario')
+    parser.add_argument('--concurrency', type=int, default=8, help='threads (or transactions in flight x4 for set)')
+    parser.add_argument('--read-call-fraction', type=float, default=0.5, help='share of eth_call in the read scenario')
+    parser.add_argument('--contract', default=None, help='existing SimpleStorage address, deployed if not given')
+    parser.add_argument('--mock', action='store_true', help='benchmark against an in-process mock geth server')
+    parser.add_argument('--mock-block-time', type=float, default=1.0)
+    parser.add_argument('--mock-latency', type=float, default=0.0, help='seconds the mock adds to every request')
+    parser.add_argument('--mock-error-rate', type=float, default=0.0, help='fraction of calls the mock fails')
+    parser.add_argument('--json', default=None, help='also write the results to this json file ("-" for stdout)')
+    parser.add_argument('--metrics-port', type=int, default=None, help='serve per client/method rpc metrics on http://0.0.0.0:<port>/metrics')
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenario.split(',') if name.strip()]
+    configureDefaultPool(maxHandlesPerNode=max(8, args.concurrency))
+    if args.metrics_port != None:
+        serveMetrics(args.metrics_port)
+
+    server = None
+    if args.mock:
+        from mockGethServer import MockGethServer
+        server = MockGethServer(blockTime=args.mock_block_time, latency=args.mock_latency, errorRate=args.mock_error_rate).start()
+        nodes = [server.address()]
+    else:
+        nodes = [tuple(text.rsplit(':', 1)) for text in args.node] or [('127.0.0.1', '9000')]
+
+    contractAddress = args.contract
+    if contractAddress == None and ('set' in scenarios or 'read' in scenarios):
+        contractAddress = deploySimpleStorage(nodes[0][0], nodes[0][1])
+
+    results = {}
+    for scenario in scenarios:
+        if scenario == 'rpc':
+            results[scenario] = runRpcScenario(nodes, args.duration, args.concurrency)
+        elif scenario == 'read':
+            results[scenario] = runReadScenario(nodes, contractAddress, args.duration, args.concurrency, args.read_call_fraction)
+        elif scenario == 'set':
+            results[scenario] = runSetScenario(nodes, contractAddress, args.duration, args.concurrency)
+        else:
+            parser.error('unknown scenario: ' + scenario)
+
+    if server != None:
+        server.stop()
+
+    print (formatTable(results))
+    results['rpcMetrics'] = getDefaultMetrics().snapshot()
+    if args.json == '-':
+        print (json.dumps(results, indent=2, sort_keys=True))
+    elif args.json:
+        with open(args.json, 'w') as jsonFile:
+            json.dump(results, jsonFile, indent=2, sort_keys=True)
@@ -15,59 +15,49 @@ import pprint
 import pycurl
 import json
 import sys
-from io import BytesIO
 import time
+import threading
+from rpcTransport import post, TransportError
+from rpcJson import loads
+from rpcMetrics import getDefaultMetrics
+from receiptWaiter import waitForReceipt
+from abiCodec import AbiContract, encodeArguments
+from contractStorage import readContractStorage
+from networkGethClients import estimateGas, trackSent, observeReceipt
 
 def rpcCommand(method,params=[],ip='localhost',port='9012',id=1,jsonrpc="2.0",verbose=False,exceptions=False):
     """ Method to abstract away 'curl' usage to interact with RPC of geth clients.
         Will throw error if attempting to connect to a client that doesn't exist.
     """
-    # the <ip:port> to connect to
-    ipPort = str(ip) + ":" + str(port)
-    # buffer to capture output
-    buffer = BytesIO()
-    # start building curl command to process
+    # build the json rpc request
+    data2 = {"jsonrpc":str(jsonrpc),"method": str(method),"params":params,"id":str(id)}
+    data = json.dumps(data2)
+    # HTTP POST over a pooled, keep-alive, pycurl handle (or the client's IPC/WebSocket transport, see rpcTransport.py)
     try:
-        c = pycurl.Curl()
-        c.setopt(pycurl.URL, ipPort)
-        c.setopt(pycurl.HTTPHEADER, ['Accept:application/json'])
-        c.setopt(pycurl.WRITEFUNCTION, buffer.write)
-        data2 = {"jsonrpc":str(jsonrpc),"method": str(method),"params":params,"id":str(id)}
-        data = json.dumps(data2)
-        c.setopt(pycurl.POST, 1)
-        c.setopt(pycurl.POSTFIELDS, data)
-        if verbose:
-            c.setopt(pycurl.VERBOSE, 1)
-        #perform pycurl
-        c.perform()
-
-        # check response code (HTTP codes)
-        if (c.getinfo(pycurl.RESPONSE_CODE) != 200):
-            if exceptions:
-                raise Exception('rpc_communication_error', 'return_code_not_200')
-            return {'error':'rpc_comm_error','desc':'return_code_not_200','error_num':None}
-        #close pycurl object
-        c.close()
-    except pycurl.error as e:
-        c.close()
+        responseCode, body = post(ip, port, data, verbose=verbose, method=method)
+    except (pycurl.error, TransportError) as e:
         errno, message = e.args
         if exceptions:
-            raise Exception('rpc_communication_error', 'Error No: ' + errno + ", message: " + message)
+            raise Exception('rpc_communication_error', 'Error No: ' + str(errno) + ", message: " + message)
         return {'error':'rpc_comm_error','desc':message,'error_num':errno}
 
+    # check response code (HTTP codes)
+    if (responseCode != 200):
+        if exceptions:
+            raise Exception('rpc_communication_error', 'return_code_not_200')
+        return {'error':'rpc_comm_error','desc':'return_code_not_200','error_num':None}
 
-    # decode result
-    results = str(buffer.getvalue().decode('iso-8859-1'))
     if verbose:
-        print (results)
+        print (body.decode('iso-8859-1'))
 
-    # convert result to json object for parsing
-    data = json.loads(results)
+    # convert result to json object for parsing, straight from the received bytes
+    data = loads(body)
     # return appropriate result
     if 'result' in data.keys():
         return data["result"]
     else:
         if 'error' in data.keys():
+            getDefaultMetrics().recordError(ip, port, method)
             if exceptions:
                 raise Exception('rpc_communication_error', data)
             return data
@@ -95,6 +85,22 @@ def getAccounts(ip,port,verbose=False):
         print ("Accounts: " + result)
     return results
 
+# (ip, port) -> account list, the accounts of a client only change when one is created
+accountCache = {}
+accountCacheLock = threading.Lock()
+
+def getCachedAccounts(ip,port,refresh=False):
+    """ Get list of accounts on target geth client, only asking the client the first time. """
+    key = (str(ip), str(port))
+    with accountCacheLock:
+        accounts = accountCache.get(key)
+    if accounts == None or refresh:
+        accounts = getAccounts(ip,port)
+        if isinstance(accounts, list):
+            with accountCacheLock:
+                accountCache[key] = accounts
+    return accounts
+
 def getBalance(ip,port,account=None,blockParameter="latest", verbose=False):
     """ Get balance of an account. Defaults to first account in client.
           blockParameter defaults to "latest", valid options are:
@@ -107,7 +113,7 @@ def getBalance(ip,port,account=None,blockParameter="latest", verbose=False):
     if account == None:
         if verbose == 'True':
             print ("No account given, querying first account on cliennt.")
-        account = rpcCommand(ip=ip,port=port,method='eth_accounts')[0]
+        account = getCachedAccounts(ip,port)[0]
         if verbose == 'True':
             print ("   Account Number: " + account)
     results = rpcCommand(ip=ip,port=port,method="eth_getBalance",params=[account,blockParameter])
@@ -129,16 +135,22 @@ def getEnodeInfo(ip,port,verbose=False):
         print ("Enode: " + results['enode'])
     return results['enode']
 
-def deployContract(ip,port,gas = "0x200000", contractBytecode="", account=None,verbose=False):
+def deployContract(ip,port,gas = None, contractBytecode="", account=None,verbose=False):
     if account == None:
-        account = getAccounts(ip,port)[0]
+        account = getCachedAccounts(ip,port)[0]
         if verbose == 'True':
             print ("No acocunt provided, first acocunt on this client will be used: " + account)
+    if gas == None:
+        gas = estimateGas(ip, port, {'from':account, 'data': contractBytecode})
+        if not isinstance(gas, str):
+            return gas
     # Could add future check to see if account balance is suffient enough.
     # balance = getBalance(ip,port,results1[0])
     # balanceNeeded = .... calculation of contract size + gas offering, etc.
     # print ( "balance is not enough, ohly has: " + balance + " needs: " + balanceNeeded)
-    results = rpcCommand(ip=ip,port=port,method="eth_sendTransaction",params=[{'from':account, 'data': contractBytecode,'gas': gas}])
+    transaction = {'from':account, 'data': contractBytecode,'gas': gas}
+    results = rpcCommand(ip=ip,port=port,method="eth_sendTransaction",params=[transaction])
+    trackSent(results, transaction)
     if verbose == 'True':
         print ("Transaction results:" + results)
     # return receipt.
@@ -147,21 +159,26 @@ def deployContract(ip,port,gas = "0x200000", contractBytecode="", account=None,v
 
 def getAddressOfTransaction(ip,port,transactionReceipt,account=None,verbose='False'):
     if account == None:
-        account = getAccounts(ip,port)[0]
+        account = getCachedAccounts(ip,port)[0]
         if verbose == 'True':
             print ("No acocunt provided, first acocunt on this client will be used: " + account)
     results = rpcCommand("eth_getTransactionReceipt", params=[transactionReceipt], ip=ip, port=port)
+    observeReceipt(results)
     if verbose == 'True':
         print ("TransactionReceipt:")
         pprint.pprint(results)
     return results
 
 
-def callContractMethod(ip,port,toAddress,dataString,gas="0x200000",account=None,verbose=False):
+def callContractMethod(ip,port,toAddress,dataString,gas=None,account=None,verbose=False):
     if account == None:
-        account = getAccounts(ip,port)[0]
+        account = getCachedAccounts(ip,port)[0]
         if verbose == 'True':
             print ("No acocunt provided, first acocunt on this client will be used: " + account)
+    if gas == None:
+        gas = estimateGas(ip, port, {'from':account, 'to':toAddress, 'data': dataString})
+        if not isinstance(gas, str):
+            return gas
     # Could add future check to see if account balance is suffient enough.
     # balance = getBalance(ip,port,results1[0])
     # balanceNeeded = .... calculation of contract size + gas offering, etc.
@@ -171,6 +188,7 @@ def callContractMethod(ip,port,toAddress,dataString,gas="0x200000",account=None,
         print ("Call Contract Method Transaction Parameters:")
         pprint.pprint(params)
     results = rpcCommand(ip=ip,port=port,method="eth_sendTransaction",params=params)
+    trackSent(results, params[0])
     if verbose == 'True':
         if isinstance(results,dict):
             print ("Transaction results:")
@@ -209,17 +227,23 @@ def makeNewFilter(ip,port,fromBlock="0x1",verbose='False'):
         print ("Transaction by hash:" + newFilterID)
     return newFilterID
 
-def ethCall(ip,port,toAddress,dataString,gas="0x200000",account=None,verbose=False):
-    """ Executes a new message call immediately without creating a transaction on the block chain. """
+def ethCall(ip,port,toAddress,dataString,gas=None,account=None,tag="latest",verbose=False):
+    """ Executes a new message call immediately without creating a transaction on the block chain,
+        against the state at block tag ("latest" or a hex block number). Without gas the client
+        allows the call as much gas as it needs.
+    """
     if account == None:
-        account = getAccounts(ip,port)[0]
+        account = getCachedAccounts(ip,port)[0]
         if verbose == 'True':
             print ("No acocunt provided, first acocunt on this client will be used: " + account)
     # Could add future check to see if account balance is suffient enough.
     # balance = getBalance(ip,port,results1[0])
     # balanceNeeded = .... calculation of contract size + gas offering, etc.
     # print ( "balance is not enough, ohly has: " + balance + " needs: " + balanceNeeded)
-    params=[{'from':account, 'to':toAddress, 'data': dataString, 'gas': gas}, "latest"]
+    call = {'from':account, 'to':toAddress, 'data': dataString}
+    if gas != None:
+        call['gas'] = gas
+    params=[call, tag]
     if verbose == 'True':
         print ("Call Contract Method Transaction Parameters:")
         pprint.pprint(params)
@@ -233,26 +257,8 @@ def ethCall(ip,port,toAddress,dataString,gas="0x200000",account=None,verbose=Fal
     return results
 
 def getSimpleStorageAt(ip,port,dataAddress,position,tag="latest",verbose='False'):
-    # get value at specified storage.
-
-    params=[{ 'fromBlock':fromBlock, 'data':dataAddress, 'quantity':position }]
-
-    if verbose == 'True':
-        print ("eth_getstorageAt Params:")
-        pprint.pprint(params)
-
-    results = rpcCommand("eth_getStorageAt", params=params, ip=ip, port=port)
-
-    if verbose == 'True':
-        if isinstance(results,dict):
-            print ("getSimpleStorageAt results:")
-            pprint.pprint(results)
-        else:
-            print ("getSimpleStorageAt results:" + results)
-    return results
-
-def getSimpleStorageAt(ip,port,dataAddress,position,tag="latest",verbose='False'):
-    # get value at specified storage.
+    # get value at specified storage slot, see contractStorage.readContractStorage to read many
+    # variables (including mappings, arrays and struct members) at once.
     params=[ dataAddress, position, tag ]
 
     if verbose == 'True':
@@ -279,7 +285,7 @@ def getSimpleStorageAt(ip,port,dataAddress,position,tag="latest",verbose='False'
 def callMethodLocally(ip,port):
     address = listAccounts(ip,port)
     print (address)
-    zeroInt32= "1".rjust(64,'0')
+    zeroInt32= encodeArguments(['uint256'], [1])[2:]
     print (zeroInt32)
     paramValues = {'to':address[0], 'gas':'0x20000', 'data':"0xcfae3217"+zeroInt32}
 #    paramValues = {'to':address[0], 'gas':'0x20000', 'data':"0x23b87507" +zeroInt32+zeroInt32+zeroInt32+zeroInt32}
@@ -309,6 +315,40 @@ def getHash(ip,port):
     print (results)
 
 
+##############################################################################
+# SimpleStorage contract (see the comments in 'main' for its source and ABI)
+##############################################################################
+
+#################################################
+# Contract & RuntimeBytecode
+#################################################
+SimpleStorageContract = "0x6060604052341561000f57600080fd5b60d38061001d6000396000f3006060604052600436106049576000357c0100000000000000000000000000000000000000000000000000000000900463ffffffff16806360fe47b114604e5780636d4ce63c14606e575b600080fd5b3415605857600080fd5b606c60048080359060200190919050506094565b005b3415607857600080fd5b607e609e565b6040518082815260200191505060405180910390f35b8060008190555050565b600080549050905600a165627a7a723058206569c46c09feaa724076844fe37ec8fd0c9086ae2e72f1c0e93ed5852bad29390029"
+SimpleStorageRuntimeBytecode = "0x6060604052600436106049576000357c0100000000000000000000000000000000000000000000000000000000900463ffffffff16806360fe47b114604e5780636d4ce63c14606e575b600080fd5b3415605857600080fd5b606c60048080359060200190919050506094565b005b3415607857600080fd5b607e609e565b6040518082815260200191505060405180910390f35b8060008190555050565b600080549050905600a165627a7a723058206569c46c09feaa724076844fe37ec8fd0c9086ae2e72f1c0e93ed5852bad29390029"
+
+#################################################
+# Interface ABI, encoders/decoders for each function are built from it once.
+#################################################
+SimpleStorageAbi = '[{"constant":false,"inputs":[{"name":"x","type":"uint256"}],"name":"set","outputs":[],"payable":false,"stateMutability":"nonpayable","type":"function"},{"constant":true,"inputs":[],"name":"get","outputs":[{"name":"retVal","type":"uint256"}],"payable":false,"stateMutability":"view","type":"function"}]'
+SimpleStorage = AbiContract(SimpleStorageAbi)
+SimpleStorageGet = SimpleStorage.function("get")
+SimpleStorageSet = SimpleStorage.function("set")
+
+#################################################
+# SimpleStorage Function Hashses
+#################################################
+# "6d4ce63c": "get()",
+# "60fe47b1": "set(uint256)"
+#################################################
+SimpleStorageGetHash = SimpleStorageGet.selectorHex
+SimpleStorageSetHash = SimpleStorageSet.selectorHex
+
+# input to set value to '2'
+SimpleStorageSet2 = SimpleStorageSet.encode(2)
+
+# Storage layout of its state variables, for contractStorage.readContractStorage
+SimpleStorageLayout = {'storedData': {'slot': 0, 'type': 'uint256'}}
+
+
 ##############################################################################
 # 'main' entrypoint of script
 ##############################################################################
@@ -364,24 +404,6 @@ if __name__ == '__main__':
     #    }
     # )
 
-    #################################################
-    # Contract & RuntimeBytecode
-    #################################################
-    SimpleStorageContract = "0x6060604052341561000f57600080fd5b60d38061001d6000396000f3006060604052600436106049576000357c0100000000000000000000000000000000000000000000000000000000900463ffffffff16806360fe47b114604e5780636d4ce63c14606e575b600080fd5b3415605857600080fd5b606c60048080359060200190919050506094565b005b3415607857600080fd5b607e609e565b6040518082815260200191505060405180910390f35b8060008190555050565b600080549050905600a165627a7a723058206569c46c09feaa724076844fe37ec8fd0c9086ae2e72f1c0e93ed5852bad29390029"
-    SimpleStorageRuntimeBytecode = "0x6060604052600436106049576000357c0100000000000000000000000000000000000000000000000000000000900463ffffffff16806360fe47b114604e5780636d4ce63c14606e575b600080fd5b3415605857600080fd5b606c60048080359060200190919050506094565b005b3415607857600080fd5b607e609e565b6040518082815260200191505060405180910390f35b8060008190555050565b600080549050905600a165627a7a723058206569c46c09feaa724076844fe37ec8fd0c9086ae2e72f1c0e93ed5852bad29390029"
-
-    #################################################
-    # SimpleStorage Function Hashses
-    #################################################
-    # "6d4ce63c": "get()",
-    # "60fe47b1": "set(uint256)"
-    #################################################
-    SimpleStorageGetHash = "0x6d4ce63c"
-    SimpleStorageSetHash = "0x60fe47b1"
-
-    # input to set value to '2'
-    SimpleStorageSet2 = "0x60fe47b10000000000000000000000000000000000000000000000000000000000000002"
-
     #################################################
     # Logic to submit/operate/filter a contract
     #################################################
@@ -393,11 +415,12 @@ if __name__ == '__main__':
     ipAddr = "127.0.0.1"
     portAddr = "9000"
 
-    # Time to sleep after submitting a transaction to allow the block to be mined (public test network is 5~7+ minutes)
-    sleepTime = 60 # seconds
+    # Most time to wait for a submitted transaction to be mined (public test network is 5~7+ minutes)
+    receiptTimeout = 600 # seconds
 
     # Make a new filter (locally). Note: Filter doesn't yet have any info about contract so similar to "*" search.
     # Filter doesn't work, feel free to try to get it to work if you want.
+    # chainIngest.streamChain(...) streams every block, transaction and log instead of polling a filter.
     # newFilterID = makeNewFilter(ip=ipAddr,port=portAddr,fromBlock="0x1",verbose='False')
     # print ("New Filter ID: " + str(newFilterID))
 
@@ -412,9 +435,9 @@ if __name__ == '__main__':
     print ("Smart Contract Submission TransactionReceipt: ")
     pprint.pprint(contractTransactionReceipt)
 
-    # Sleep for some time to allow mining of transaction's block to finish.
-    print ("Sleeping for " + str(sleepTime) + " seconds to allow for mining of transaction." + "\n")
-    time.sleep(sleepTime)
+    # Wait for the transaction's block to be mined, returns as soon as its receipt is available.
+    print ("Waiting (up to " + str(receiptTimeout) + " seconds) for mining of transaction." + "\n")
+    waitForReceipt(ipAddr, portAddr, contractTransactionReceipt, timeout=receiptTimeout)
 
     # get the address of the contract, after its transaction has been mined into a complete block.
     contractAddress = getAddressOfTransaction (
@@ -433,13 +456,15 @@ if __name__ == '__main__':
                                              port = portAddr,
                                              toAddress = contractAddress,
                                              dataString = SimpleStorageGetHash,
-                                             gas = "0x200000",
+                                             gas = None,
                                              account = None,
                                              verbose = 'False'
                                            )
 
     print ("Method Local Call Results: ")
     pprint.pprint(methodLocalCallResuls)
+    if isinstance(methodLocalCallResuls, str):
+        print ("Decoded get() value: " + str(SimpleStorageGet.decodeOutput(methodLocalCallResuls)))
 
 
     # Call 'get()' in the smart contract on the blockchian, no direct results returned, have to check manually later.
@@ -448,18 +473,17 @@ if __name__ == '__main__':
                                               port = portAddr,
                                               toAddress = contractAddress,
                                               dataString = SimpleStorageSet2,
-                                              gas = "0x200000",
+                                              gas = None,
                                               account = None,
                                               verbose = 'False'
                                             )
 
-    # Sleep for some time to allow mining of transaction's block to finish.
-    print ("Sleeping for " + str(sleepTime) + " seconds to allow for mining of transaction." + "\n")
-    time.sleep(sleepTime)
+    # Wait for the transaction's block to be mined, returns as soon as its receipt is available.
+    print ("Waiting (up to " + str(receiptTimeout) + " seconds) for mining of transaction." + "\n")
+    waitForReceipt(ipAddr, portAddr, MethodCallTransactionReceipt, timeout=receiptTimeout)
 
     # get the block number, after its transaction has been mined into a complete block.
-    # NOTE: this isn't the ideal way to check this in a production system, since this call would error
-    # if transaction has not yet been mined, (let alone many other possible scenarios)
+    # NOTE: this call would still error if the transaction was not mined within receiptTimeout.
     methodCallTransaction = getAddressOfTransaction (
                                                  ip = ipAddr,
                                                  port = portAddr,
@@ -470,21 +494,13 @@ if __name__ == '__main__':
 
     print ("MethodCall Transaction BlockNumber: " + methodCallBlockNumber + "\n")
 
-    # Read the geth client's local blockchain for the value of a contract's storage
-    # NOTE: This works for scalar variables, variables inside data structs are more complext to access.
-    dataValue = getSimpleStorageAt (
-                                   ip = ipAddr,
-                                   port = portAddr,
-                                   dataAddress = contractAddress,
-                                   position = '0x0',
-                                   tag = 'latest',
-                                   verbose = 'True'
-                                 )
-
-    blockNumber = getBlockNumber(ipAddr,portAddr)
+    # Read the geth client's local blockchain for the values of a contract's storage variables.
+    # NOTE: the layout can also describe mappings (with the keys to read), arrays, strings and structs,
+    #       their slots are computed locally and all of them are read at the same block.
+    dataValues, blockNumber = readContractStorage(ipAddr, portAddr, contractAddress, SimpleStorageLayout)
 
     # Print out the value of the data.
-    print ("At Block Number: " + blockNumber + ", value of contract's first variable: " + dataValue )
+    print ("At Block Number: " + blockNumber + ", value of contract's first variable: " + str(dataValues['storedData']) )
 
     # Check the Filter for any changes.
     # changeResults = getFilterChanges(ip=ipAddr,port=portAddr,filterID=newFilterID,verbose="True")
@@ -0,0 +1,504 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Multi-node SimpleStorage workload: N simulated prosumers at once.
+#
+#    Deploys one SimpleStorage contract (or one per node) and runs prosumers
+#    that interleave set(x) transactions and get() calls over every node,
+#    each at a rate following a schedule (constant, poisson or burst). The
+#    prosumers run as threads, or split over several processes.
+#
+#    Every mined set(x) is checked for read-your-writes: get() (ethCall)
+#    and the contract's storage slot (getSimpleStorageAt) at the block it
+#    was mined in, on the node it was sent to, against the last successful
+#    set(x) of that block (by transaction index). An observer samples the head
+#    and contract values of every node, from which come the staleness of
+#    each write (time until every other node had its block) and the
+#    divergence between nodes.
+#
+#    ./workloadSimulator.py --node 127.0.0.1:9000 --node 127.0.0.1:11000 --prosumers 20 --schedule poisson
+#    ./workloadSimulator.py --mock --mock-nodes 3 --prosumers 50 --rate 2 --duration 10 --processes 2
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from networkGethClients import rpcBatchCommand
+from rpcConnectionPool import configureDefaultPool
+from receiptWaiter import waitForReceipts
+from benchmarkNetwork import percentile, isError, deploySimpleStorage
+from testProject import (callContractMethod, ethCall, getSimpleStorageAt, getCachedAccounts,
+                         SimpleStorageGetHash, SimpleStorageSet)
+
+# set(x) values carry their writer: prosumer index in the high bits, its write sequence in the low ones
+SEQUENCE_BITS = 32
+
+def makeValue(prosumer,sequence):
+    return (prosumer << SEQUENCE_BITS) | sequence
+
+def decodeWord(results):
+    """ int value of a 32 byte rpc result, None for an error or an empty result. """
+    if not isinstance(results, str) or results in ("0x", ""):
+        return None
+    return int(results, 16)
+
+
+##############################################################################
+# Rate schedules, generators of operation times (seconds after the start)
+##############################################################################
+
+def constantSchedule(rate,randomGenerator,burstSize=None):
+    """ Evenly spaced operations, rate per second. """
+    phase = randomGenerator.uniform(0, 1.0 / rate)
+    for index in itertools.count():
+        yield phase + index / float(rate)
+
+def poissonSchedule(rate,randomGenerator,burstSize=None):
+    """ A Poisson process: exponentially distributed gaps with a mean of 1 / rate. """
+    offset = 0.0
+    while True:
+        offset += randomGenerator.expovariate(rate)
+        yield offset
+
+def burstSchedule(rate,randomGenerator,burstSize=10):
+    """ burstSize operations at once every burstSize / rate seconds, the same mean rate. """
+    period = burstSize / float(rate)
+    phase = randomGenerator.uniform(0, period)
+    for burst in itertools.count():
+        for index in range(burstSize):
+            yield phase + burst * period
+
+SCHEDULES = {'constant': constantSchedule, 'poisson': poissonSchedule, 'burst': burstSchedule}
+
+
+##############################################################################
+# Prosumers
+##############################################################################
+
+class ProsumerGroup(object):
+    """ The prosumers run by one process: a thread per prosumer, plus a thread that waits for
+        the receipts of their set(x) transactions and checks read-your-writes on them.
+          nodes     - list of (ip, port), operations go round robin over all of them.
+          contracts - SimpleStorage addresses, prosumer i uses contracts[i % len(contracts)].
+          prosumers - indexes of the prosumers to run.
+          config    - dict with started (time.time() to start at), duration, rate, schedule,
+                      burstSize, setFraction, settle (seconds to wait for receipts) and seed.
+    """
+
+    def __init__(self,nodes,contracts,prosumers,config):
+        self.nodes = [(str(ip), str(port)) for ip, port in nodes]
+        self.contracts = contracts
+        self.prosumers = prosumers
+        self.config = config
+        self.accounts = [getCachedAccounts(ip, port) for ip, port in self.nodes]
+        self.lock = threading.Lock()
+        # node index -> transaction hash -> write, sent but not seen mined yet
+        self.pending = dict((index, {}) for index in range(len(self.nodes)))
+        self.writes = []
+        self.reads = []
+        self.late = 0
+        self.sending = True
+        # (node index, block number) -> contract -> [(transactionIndex, transactionHash, value)] of its successful set(x)
+        self.blockWrites = OrderedDict()
+
+    def run(self):
+        threads = [threading.Thread(target=self.runProsumer, args=(prosumer,)) for prosumer in self.prosumers]
+        checker = threading.Thread(target=self.checkLoop)
+        for thread in threads + [checker]:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.sending = False
+        checker.join()
+        with self.lock:
+            for pending in self.pending.values():
+                self.writes.extend(pending.values())
+                pending.clear()
+        return {'writes': self.writes, 'reads': self.reads, 'late': self.late}
+
+    def runProsumer(self,prosumer):
+        config = self.config
+        seed = config.get('seed')
+        randomGenerator = random.Random(None if seed == None else seed * 1000003 + prosumer)
+        schedule = SCHEDULES[config['schedule']](config['rate'], randomGenerator, config['burstSize'])
+        contract = self.contracts[prosumer % len(self.contracts)]
+        deadline = config['started'] + config['duration']
+        sequence = 0
+        for operation, offset in enumerate(schedule):
+            at = config['started'] + offset
+            if at >= deadline:
+                break
+            delay = at - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -0.1:
+                with self.lock:
+                    self.late += 1
+            nodeIndex = (prosumer + operation) % len(self.nodes)
+            if randomGenerator.random() < config['setFraction']:
+                sequence += 1
+                self.set(prosumer, sequence, nodeIndex, contract)
+            else:
+                self.get(nodeIndex, contract)
+
+    def set(self,prosumer,sequence,nodeIndex,contract):
+        ip, port = self.nodes[nodeIndex]
+        accounts = self.accounts[nodeIndex]
+        write = {'prosumer': prosumer, 'sequence': sequence, 'node': nodeIndex, 'contract': contract,
+                 'sentAt': time.time(), 'acceptedAt': None, 'minedAt': None, 'blockNumber': None,
+                 'outcome': None, 'error': None}
+        started = time.perf_counter()
+        transactionHash = callContractMethod(ip, port, contract, SimpleStorageSet.encode(makeValue(prosumer, sequence)),
+                                             account=accounts[prosumer % len(accounts)])
+        write['sendSeconds'] = time.perf_counter() - started
+        with self.lock:
+            if isinstance(transactionHash, str):
+                write['acceptedAt'] = time.time()
+                self.pending[nodeIndex][transactionHash] = write
+            else:
+                write['error'] = str(transactionHash)
+                self.writes.append(write)
+
+    def get(self,nodeIndex,contract):
+        ip, port = self.nodes[nodeIndex]
+        started = time.perf_counter()
+        results = ethCall(ip, port, contract, SimpleStorageGetHash)
+        with self.lock:
+            self.reads.append((time.perf_counter() - started, decodeWord(results) == None))
+
+    ##########################################################################
+    # receipts and read-your-writes
+    ##########################################################################
+
+    def checkLoop(self):
+        settleUntil = None
+        while True:
+            with self.lock:
+                waiting = [(nodeIndex, list(pending)) for nodeIndex, pending in self.pending.items() if pending]
+            if not self.sending:
+                settleUntil = settleUntil or time.time() + self.config['settle']
+                if not waiting or time.time() >= settleUntil:
+                    return
+            if not waiting:
+                time.sleep(0.05)
+                continue
+            for nodeIndex, hashes in waiting:
+                ip, port = self.nodes[nodeIndex]
+                waitForReceipts(ip, port, hashes, timeout=0.25, onReceipt=self.onReceipt(nodeIndex))
+
+    def onReceipt(self,nodeIndex):
+        def mined(transactionHash, receipt):
+            with self.lock:
+                write = self.pending[nodeIndex].pop(transactionHash, None)
+            if write == None:
+                return
+            write['minedAt'] = time.time()
+            write['blockNumber'] = int(receipt['blockNumber'], 16)
+            write['transactionHash'] = transactionHash
+            write['outcome'] = self.readYourWrite(write) if receipt.get('status') != "0x0" else 'failed'
+            with self.lock:
+                self.writes.append(write)
+        return mined
+
+    def writesInBlock(self,nodeIndex,blockNumber,contract):
+        """ [(transactionIndex, transactionHash, value)] of the successful set(x) calls to contract in a block,
+            in block order. Many writes share a block, so the block and its receipts are fetched once.
+        """
+        key = (nodeIndex, blockNumber)
+        if key not in self.blockWrites:
+            ip, port = self.nodes[nodeIndex]
+            block = rpcBatchCommand([("eth_getBlockByNumber", [hex(blockNumber), True])], ip=ip, port=port)[0]
+            if not isinstance(block, dict) or 'error' in block:
+                return None
+            calls = [transaction for transaction in block.get('transactions', [])
+                     if transaction.get('to') and (transaction.get('input') or "").startswith(SimpleStorageSet.selectorHex)]
+            receipts = rpcBatchCommand([("eth_getTransactionReceipt", [transaction['hash']]) for transaction in calls],
+                                       ip=ip, port=port) if calls else []
+            byContract = {}
+            for transaction, receipt in zip(calls, receipts):
+                if not isinstance(receipt, dict) or 'error' in receipt:
+                    return None
+                if receipt.get('status') != "0x0":
+                    byContract.setdefault(transaction['to'].lower(), []).append(
+                        (int(transaction['transactionIndex'], 16), transaction['hash'], int(transaction['input'][10:74], 16)))
+            self.blockWrites[key] = dict((address, sorted(writes)) for address, writes in byContract.items())
+            while len(self.blockWrites) > 256:
+                self.blockWrites.popitem(last=False)
+        return self.blockWrites[key].get(contract.lower(), [])
+
+    def readYourWrite(self,write):
+        """ Read the value back at the write's block on its node, through both get() and the storage slot,
+            and compare it with the last successful set(x) to the contract in that block (by transaction
+            index, whoever sent it):
+              consistent  - both give the value written, this write came last in its block.
+              overwritten - both give the value of a set(x) after this one in the same block.
+              stale       - both give any other value (an older write, of any prosumer): a read-your-writes
+                            violation, the state at the block does not include the writes in it.
+              mismatch    - get() and the storage slot disagree.
+              error       - either read failed.
+            ('failed' is given to writes whose transaction failed, see onReceipt.)
+        """
+        ip, port = self.nodes[write['node']]
+        tag = hex(write['blockNumber'])
+        called = decodeWord(ethCall(ip, port, write['contract'], SimpleStorageGetHash, tag=tag))
+        stored = decodeWord(getSimpleStorageAt(ip, port, write['contract'], "0x0", tag))
+        writes = self.writesInBlock(write['node'], write['blockNumber'], write['contract'])
+        if called == None or stored == None or not writes:
+            return 'error'
+        if called != stored:
+            return 'mismatch'
+        transactionIndex, transactionHash, value = writes[-1]
+        if called != value:
+            return 'stale'
+        return 'consistent' if transactionHash == write['transactionHash'] else 'overwritten'
+
+def runProsumerGroup(nodes,contracts,prosumers,config):
+    """ Run a ProsumerGroup to the end, the entry point of each worker process. """
+    configureDefaultPool(maxHandlesPerNode=max(8, len(prosumers)))
+    return ProsumerGroup(nodes, contracts, prosumers, config).run()
+
+
+##############################################################################
+# Observing every node
+##############################################################################
+
+class NetworkObserver(object):
+    """ Samples the head and the contract values of every node every interval seconds.
+        Records when each node first had each block (for staleness), how far apart the heads
+        are, how often nodes show different contract values at their latest block, and whether
+        they differ at the same block: a different block hash (a fork) or different state.
+    """
+
+    def __init__(self,nodes,contracts,interval=0.5):
+        self.nodes = [(str(ip), str(port)) for ip, port in nodes]
+        self.contracts = contracts
+        self.interval = interval
+        self.executor = ThreadPoolExecutor(max_workers=len(self.nodes))
+        # node index -> block number -> time the node was first seen at or past it
+        self.firstSeen = [{} for node in self.nodes]
+        self.heads = [None] * len(self.nodes)
+        self.samples = 0
+        self.sampleErrors = 0
+        self.headSpreads = []
+        self.latestDisagreements = 0
+        self.forkedSamples = 0
+        self.divergentSamples = 0
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def batch(self,calls):
+        return list(self.executor.map(lambda node: rpcBatchCommand(calls, ip=node[0], port=node[1]), self.nodes))
+
+    def sample(self):
+        latest = self.batch([("eth_blockNumber", [])] + [("eth_getStorageAt", [contract, "0x0", "latest"]) for contract in self.contracts])
+        now = time.time()
+        if any(isError(results[0]) or not isinstance(results[0], str) for results in latest):
+            self.sampleErrors += 1
+            return
+        for nodeIndex, results in enumerate(latest):
+            head = int(results[0], 16)
+            previous = self.heads[nodeIndex]
+            for number in range(head if previous == None else previous + 1, head + 1):
+                self.firstSeen[nodeIndex].setdefault(number, now)
+            self.heads[nodeIndex] = max(head, previous or 0)
+        heads = [int(results[0], 16) for results in latest]
+        self.samples += 1
+        self.headSpreads.append(max(heads) - min(heads))
+        if len(set(tuple(results[1:]) for results in latest)) > 1:
+            self.latestDisagreements += 1
+        common = hex(min(heads))
+        atCommon = self.batch([("eth_getBlockByNumber", [common, False])] +
+                              [("eth_getStorageAt", [contract, "0x0", common]) for contract in self.contracts])
+        hashes = set(results[0].get('hash') if isinstance(results[0], dict) else None for results in atCommon)
+        if len(hashes) > 1:
+            self.forkedSamples += 1
+        elif len(set(tuple(results[1:]) for results in atCommon)) > 1:
+            self.divergentSamples += 1
+
+    def loop(self):
+        while not self.stopped.is_set():
+            started = time.time()
+            self.sample()
+            self.stopped.wait(max(0.0, self.interval - (time.time() - started)))
+
+    def start(self):
+        self.thread = threading.Thread(target=self.loop, name='networkObserver')
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def waitForBlock(self,number,timeout=30):
+        """ Keep sampling until every node has had block number, or timeout seconds passed. """
+        deadline = time.time() + timeout
+        while time.time() < deadline and not all(head != None and head >= number for head in self.heads):
+            time.sleep(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread != None:
+            self.thread.join()
+        self.executor.shutdown()
+
+    def staleness(self,write):
+        """ Seconds from a write's block being on its node until every other node had it too (to within
+            the sample interval), None if some node never got it while observed.
+        """
+        number = write['blockNumber']
+        others = [self.firstSeen[index].get(number) for index in range(len(self.nodes)) if index != write['node']]
+        if None in others:
+            return None
+        mined = self.firstSeen[write['node']].get(number, write['minedAt'])
+        return max([0.0] + [seen - mined for seen in others])
+
+    def summary(self):
+        return {'samples': self.samples, 'sampleErrors': self.sampleErrors,
+                'headSpreadMax': max(self.headSpreads) if self.headSpreads else None,
+                'headSpreadMean': round(sum(self.headSpreads) / float(len(self.headSpreads)), 3) if self.headSpreads else None,
+                'latestDisagreementRate': round(self.latestDisagreements / float(self.samples), 4) if self.samples else None,
+                'forkedSamples': self.forkedSamples, 'divergentSamples': self.divergentSamples}
+
+
+##############################################################################
+# Simulation
+##############################################################################
+
+def deployContracts(nodes,perNode=False,timeout=300):
+    """ One SimpleStorage contract deployed from the first node, or one deployed from each node. """
+    targets = nodes if perNode else nodes[:1]
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        return list(executor.map(lambda node: deploySimpleStorage(node[0], node[1], timeout=timeout), targets))
+
+def latencySummary(seconds):
+    values = sorted(seconds)
+    toMs = lambda value: None if value == None else round(value * 1000.0, 3)
+    return {'count': len(values), 'p50ms': toMs(percentile(values, 0.50)), 'p95ms': toMs(percentile(values, 0.95)),
+            'p99ms': toMs(percentile(values, 0.99)), 'maxms': toMs(values[-1] if values else None)}
+
+def simulate(nodes,prosumers=10,rate=1.0,schedule='poisson',setFraction=0.5,duration=30,contracts=None,perNodeContracts=False,
+             processes=1,settle=60,sampleInterval=0.5,burstSize=10,seed=None):
+    """ Run the workload, returns the report (see summarize). Deploys the contracts unless given. """
+    if schedule not in SCHEDULES:
+        raise ValueError('unknown schedule: ' + str(schedule))
+    nodes = [(str(ip), str(port)) for ip, port in nodes]
+    contracts = contracts or deployContracts(nodes, perNodeContracts)
+    processes = max(1, min(processes, prosumers))
+    # worker processes need a moment to start, the prosumers of every process start together
+    config = {'started': time.time() + (2.0 if processes > 1 else 0.1), 'duration': duration, 'rate': rate,
+              'schedule': schedule, 'burstSize': burstSize, 'setFraction': setFraction, 'settle': settle, 'seed': seed}
+    groups = [list(range(index, prosumers, processes)) for index in range(processes)]
+    observer = NetworkObserver(nodes, contracts, sampleInterval).start()
+    if processes == 1:
+        results = [ProsumerGroup(nodes, contracts, groups[0], config).run()]
+    else:
+        with multiprocessing.get_context('spawn').Pool(processes) as pool:
+            results = pool.starmap(runProsumerGroup, [(nodes, contracts, group, config) for group in groups])
+    lastBlock = max([write['blockNumber'] for group in results for write in group['writes'] if write['blockNumber'] != None] or [0])
+    observer.waitForBlock(lastBlock, timeout=min(settle, 30))
+    observer.stop()
+    return summarize(results, observer, config, prosumers, processes, contracts)
+
+def summarize(results,observer,config,prosumers,processes,contracts):
+    writes = [write for group in results for write in group['writes']]
+    reads = [read for group in results for read in group['reads']]
+    accepted = [write for write in writes if write['acceptedAt'] != None]
+    mined = [write for write in accepted if write['minedAt'] != None]
+    outcomes = dict((outcome, 0) for outcome in ('consistent', 'overwritten', 'stale', 'mismatch', 'error', 'failed'))
+    for write in mined:
+        outcomes[write['outcome']] += 1
+    staleness = [observer.staleness(write) for write in mined]
+    duration = float(config['duration'])
+    return {'prosumers': prosumers, 'processes': processes, 'schedule': config['schedule'], 'rate': config['rate'],
+            'nodes': len(observer.nodes), 'contracts': contracts, 'seconds': duration,
+            'throughput': {'setsPerSecond': round(len(accepted) / duration, 2),
+                           'minedPerSecond': round(len(mined) / duration, 2),
+                           'getsPerSecond': round(len(reads) / duration, 2)},
+            'errors': {'sets': len(writes) - len(accepted), 'gets': sum(1 for latency, error in reads if error),
+                       'notMined': len(accepted) - len(mined)},
+            'late': sum(group['late'] for group in results),
+            'send': latencySummary([write['sendSeconds'] for write in writes]),
+            'get': latencySummary([latency for latency, error in reads if not error]),
+            'inclusion': latencySummary([write['minedAt'] - write['acceptedAt'] for write in mined]),
+            'readYourWrites': dict(outcomes, violations=outcomes['stale'] + outcomes['mismatch']),
+            'staleness': dict(latencySummary([value for value in staleness if value != None]),
+                              notPropagated=sum(1 for value in staleness if value == None)),
+            'divergence': observer.summary()}
+
+def formatReport(report):
+    """ Human readable summary of a report. """
+    throughput = report['throughput']
+    lines = [str(report['prosumers']) + " prosumers (" + report['schedule'] + ", " + str(report['rate']) + "/s each) over " +
+             str(report['nodes']) + " nodes, " + str(len(report['contracts'])) + " contract(s), " + str(report['seconds']) + " seconds",
+             "throughput   sets/s " + str(throughput['setsPerSecond']) + "   mined/s " + str(throughput['minedPerSecond']) +
+             "   gets/s " + str(throughput['getsPerSecond']),
+             "errors       " + " ".join(name + " " + str(value) for name, value in sorted(report['errors'].items())) +
+             "   late operations " + str(report['late'])]
+    lines.append(("%-12s" % 'latency') + "".join("%10s" % column for column in ['count', 'p50ms', 'p95ms', 'p99ms', 'maxms']))
+    for name in ('send', 'get', 'inclusion', 'staleness'):
+        lines.append(("%-12s" % name) + "".join("%10s" % report[name].get(column) for column in ['count', 'p50ms', 'p95ms', 'p99ms', 'maxms']))
+    lines.append("not propagated " + str(report['staleness']['notPropagated']))
+    lines.append("read-your-writes " + " ".join(name + " " + str(value) for name, value in sorted(report['readYourWrites'].items())))
+    lines.append("divergence   " + " ".join(name + " " + str(value) for name, value in sorted(report['divergence'].items())))
+    return "\n".join(lines)
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Simulate prosumers driving SimpleStorage on every node of the network.')
+    parser.add_argument('--node', action='append', default=[], help='<ip>:<rpcPort>, repeatable (default 127.0.0.1:9000 and 127.0.0.1:11000)')
+    parser.add_argument('--prosumers', type=int, default=10)
+    parser.add_argument('--rate', type=float, default=1.0, help='operations per second of each prosumer')
+    parser.add_argument('--schedule', default='poisson', choices=sorted(SCHEDULES))
+    parser.add_argument('--burst-size', type=int, default=10, help='operations per burst of the burst schedule')
+    parser.add_argument('--set-fraction', type=float, default=0.5, help='share of set(x) transactions, the rest are get() calls')
+    parser.add_argument('--duration', type=float, default=30, help='seconds of load')
+    parser.add_argument('--contracts', default='one', choices=['one', 'per-node'], help='one shared contract, or one per node')
+    parser.add_argument('--contract', action='append', default=[], help='existing SimpleStorage address(es) to use instead')
+    parser.add_argument('--processes', type=int, default=1, help='split the prosumers over this many processes')
+    parser.add_argument('--settle', type=float, default=60, help='most seconds to wait for the last transactions to be mined')
+    parser.add_argument('--sample-interval', type=float, default=0.5, help='seconds between samples of every node')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the schedules and operation mix')
+    parser.add_argument('--mock', action='store_true', help='run against in-process mock geth servers sharing one chain')
+    parser.add_argument('--mock-nodes', type=int, default=2)
+    parser.add_argument('--mock-block-time', type=float, default=1.0)
+    parser.add_argument('--json', default=None, help='also write the report to this json file ("-" for stdout)')
+    args = parser.parse_args()
+
+    configureDefaultPool(maxHandlesPerNode=max(8, args.prosumers))
+    servers = []
+    if args.mock:
+        from mockGethServer import MockChain, MockGethServer
+        chain = MockChain(accounts=max(3, args.prosumers), blockTime=args.mock_block_time)
+        servers = [MockGethServer(chain=chain, mine=(index == 0)).start() for index in range(args.mock_nodes)]
+        nodes = [server.address() for server in servers]
+    else:
+        nodes = [tuple(text.rsplit(':', 1)) for text in args.node] or [('127.0.0.1', '9000'), ('127.0.0.1', '11000')]
+
+    report = simulate(nodes, prosumers=args.prosumers, rate=args.rate, schedule=args.schedule, setFraction=args.set_fraction,
+                      duration=args.duration, contracts=args.contract or None, perNodeContracts=(args.contracts == 'per-node'),
+                      processes=args.processes, settle=args.settle, sampleInterval=args.sample_interval,
+                      burstSize=args.burst_size, seed=args.seed)
+    for server in servers:
+        server.stop()
+
+    print (formatReport(report))
+    if args.json == '-':
+        print (json.dumps(report, indent=2, sort_keys=True))
+    elif args.json:
+        with open(args.json, 'w') as jsonFile:
+            json.dump(report, jsonFile, indent=2, sort_keys=True)
@@ -0,0 +1,326 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Contract ABI encoder/decoder for eth_call / eth_sendTransaction data.
+#
+#    Loads a contract's ABI json and builds an encoder and a decoder per
+#    function once, with its selector cached, instead of gluing hex strings
+#    together by hand. Whole batches of calls are encoded into one buffer
+#    and hex formatted in a single pass.
+#
+#    Supports uint<N>, int<N>, address, bool, bytes<N>, bytes, string and
+#    dynamic arrays (T[]) of the static types.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import binascii
+import functools
+import json
+import re
+from keccak import keccak256
+
+WORD = 32
+ZERO_WORD = bytes(WORD)
+
+
+@functools.lru_cache(maxsize=None)
+def functionSelector(signature):
+    """ First 4 bytes of keccak256 of a signature like 'set(uint256)'. """
+    return keccak256(signature.encode('utf-8'))[:4]
+
+def hexToBytes(hexString):
+    if hexString.startswith('0x') or hexString.startswith('0X'):
+        hexString = hexString[2:]
+    if len(hexString) % 2:
+        hexString = '0' + hexString
+    return binascii.unhexlify(hexString)
+
+
+##############################################################################
+# Per type word encoders / decoders, each encoder writes one 32 byte word
+# into a memoryview at an offset, each decoder reads one.
+##############################################################################
+
+def uintEncoder(bits):
+    limit = 1 << bits
+    def encode(view, offset, value):
+        value = int(value)
+        if value < 0 or value >= limit:
+            raise ValueError('value out of range for uint' + str(bits) + ': ' + str(value))
+        view[offset:offset + WORD] = value.to_bytes(WORD, 'big')
+    return encode
+
+def intEncoder(bits):
+    low, high = -(1 << (bits - 1)), 1 << (bits - 1)
+    def encode(view, offset, value):
+        value = int(value)
+        if value < low or value >= high:
+            raise ValueError('value out of range for int' + str(bits) + ': ' + str(value))
+        view[offset:offset + WORD] = (value % (1 << 256)).to_bytes(WORD, 'big')
+    return encode
+
+def encodeAddress(view,offset,value):
+    raw = hexToBytes(value) if isinstance(value, str) else bytes(value)
+    if len(raw) != 20:
+        raise ValueError('address must be 20 bytes: ' + str(value))
+    view[offset:offset + 12] = ZERO_WORD[:12]
+    view[offset + 12:offset + WORD] = raw
+
+def encodeBool(view,offset,value):
+    view[offset:offset + WORD] = (1 if value else 0).to_bytes(WORD, 'big')
+
+def fixedBytesEncoder(size):
+    def encode(view, offset, value):
+        raw = hexToBytes(value) if isinstance(value, str) else bytes(value)
+        if len(raw) > size:
+            raise ValueError('too many bytes for bytes' + str(size))
+        view[offset:offset + len(raw)] = raw
+        view[offset + len(raw):offset + WORD] = ZERO_WORD[len(raw):]
+    return encode
+
+def uintDecoder(view,offset):
+    return int.from_bytes(view[offset:offset + WORD], 'big')
+
+def intDecoder(bits):
+    def decode(view, offset):
+        value = int.from_bytes(view[offset:offset + WORD], 'big')
+        return value - (1 << 256) if value >= (1 << 255) else value
+    return decode
+
+def decodeAddress(view,offset):
+    return "0x" + binascii.hexlify(view[offset + 12:offset + WORD]).decode('ascii')
+
+def decodeBool(view,offset):
+    return int.from_bytes(view[offset:offset + WORD], 'big') != 0
+
+def fixedBytesDecoder(size):
+    def decode(view, offset):
+        return bytes(view[offset:offset + size])
+    return decode
+
+def staticCodec(abiType):
+    """ (encoder, decoder) for a static (one word) type, None if the type is not static. """
+    match = re.match(r'^(u?int)(\d*)$', abiType)
+    if match:
+        bits = int(match.group(2) or 256)
+        if match.group(1) == 'uint':
+            return uintEncoder(bits), uintDecoder
+        return intEncoder(bits), intDecoder(bits)
+    if abiType == 'address':
+        return encodeAddress, decodeAddress
+    if abiType == 'bool':
+        return encodeBool, decodeBool
+    match = re.match(r'^bytes(\d+)$', abiType)
+    if match:
+        return fixedBytesEncoder(int(match.group(1))), fixedBytesDecoder(int(match.group(1)))
+    return None
+
+
+##############################################################################
+# Whole argument lists
+##############################################################################
+
+def canonicalType(abiType):
+    """ Solidity aliases (uint, int) are hashed under their full names. """
+    return re.sub(r'^(u?int)(?=$|\[)', r'\g<1>256', abiType)
+
+def isDynamic(abiType):
+    return abiType in ('bytes', 'string') or abiType.endswith('[]')
+
+def paddedLength(length):
+    return (length + WORD - 1) // WORD * WORD
+
+def dynamicPayload(abiType,value):
+    """ bytes for the tail of a dynamic value: its length word and padded contents. """
+    if abiType in ('bytes', 'string'):
+        raw = value.encode('utf-8') if abiType == 'string' else (hexToBytes(value) if isinstance(value, str) else bytes(value))
+        buffer = bytearray(WORD + paddedLength(len(raw)))
+        buffer[0:WORD] = len(raw).to_bytes(WORD, 'big')
+        buffer[WORD:WORD + len(raw)] = raw
+        return buffer
+    itemType = abiType[:-2]
+    codec = staticCodec(itemType)
+    if codec == None:
+        raise ValueError('unsupported array item type: ' + itemType)
+    values = list(value)
+    buffer = bytearray(WORD * (len(values) + 1))
+    view = memoryview(buffer)
+    view[0:WORD] = len(values).to_bytes(WORD, 'big')
+    for index, item in enumerate(values):
+        codec[0](view, WORD * (index + 1), item)
+    return buffer
+
+def dynamicDecoder(abiType):
+    if abiType in ('bytes', 'string'):
+        def decode(view, offset, base):
+            start = base + int.from_bytes(view[offset:offset + WORD], 'big')
+            length = int.from_bytes(view[start:start + WORD], 'big')
+            raw = bytes(view[start + WORD:start + WORD + length])
+            return raw.decode('utf-8') if abiType == 'string' else raw
+        return decode
+    itemDecoder = staticCodec(abiType[:-2])[1]
+    def decode(view, offset, base):
+        start = base + int.from_bytes(view[offset:offset + WORD], 'big')
+        length = int.from_bytes(view[start:start + WORD], 'big')
+        return [itemDecoder(view, start + WORD * (index + 1)) for index in range(length)]
+    return decode
+
+
+class ArgumentCodec(object):
+    """ Encoder/decoder for one list of types, built once and reused for every call. """
+
+    def __init__(self,types):
+        self.types = [canonicalType(abiType) for abiType in types]
+        self.static = not any(isDynamic(abiType) for abiType in self.types)
+        self.encoders = []
+        self.decoders = []
+        for abiType in self.types:
+            if isDynamic(abiType):
+                self.encoders.append(None)
+                self.decoders.append(dynamicDecoder(abiType))
+            else:
+                codec = staticCodec(abiType)
+                if codec == None:
+                    raise ValueError('unsupported abi type: ' + abiType)
+                encoder, decoder = codec
+                self.encoders.append(encoder)
+                self.decoders.append(lambda view, offset, base, decoder=decoder: decoder(view, offset))
+        self.headSize = WORD * len(self.types)
+
+    def checkCount(self,values):
+        if len(values) != len(self.types):
+            raise ValueError('expected ' + str(len(self.types)) + ' arguments (' + ','.join(self.types) + '), got ' + str(len(values)))
+
+    def encodeInto(self,view,offset,values):
+        """ Encode static values into view at offset (the caller sized it to headSize). """
+        for index, encoder in enumerate(self.encoders):
+            encoder(view, offset + WORD * index, values[index])
+
+    def encode(self,values,prefix=b''):
+        """ bytes of prefix followed by the encoded values. """
+        values = list(values)
+        self.checkCount(values)
+        if self.static:
+            buffer = bytearray(len(prefix) + self.headSize)
+            view = memoryview(buffer)
+            view[0:len(prefix)] = prefix
+            self.encodeInto(view, len(prefix), values)
+            return bytes(buffer)
+        tails = []
+        tailOffset = self.headSize
+        head = bytearray(self.headSize)
+        view = memoryview(head)
+        for index, abiType in enumerate(self.types):
+            if self.encoders[index] == None:
+                payload = dynamicPayload(abiType, values[index])
+                view[WORD * index:WORD * (index + 1)] = tailOffset.to_bytes(WORD, 'big')
+                tails.append(payload)
+                tailOffset += len(payload)
+            else:
+                self.encoders[index](view, WORD * index, values[index])
+        return b''.join([prefix, bytes(head)] + [bytes(tail) for tail in tails])
+
+    def decode(self,data):
+        """ Decode bytes (or a hex string) into a list of values. """
+        if isinstance(data, str):
+            data = hexToBytes(data)
+        view = memoryview(data)
+        if len(view) < self.headSize:
+            raise ValueError('not enough data to decode (' + ','.join(self.types) + '): ' + str(len(view)) + ' bytes')
+        return [decoder(view, WORD * index, 0) for index, decoder in enumerate(self.decoders)]
+
+
+##############################################################################
+# Functions and contracts
+##############################################################################
+
+class AbiFunction(object):
+    """ One contract function: cached selector, input encoder and output decoder. """
+
+    def __init__(self,entry):
+        self.name = entry['name']
+        self.inputTypes = [canonicalType(item['type']) for item in entry.get('inputs', [])]
+        self.outputTypes = [canonicalType(item['type']) for item in entry.get('outputs', [])]
+        self.constant = entry.get('constant', False) or entry.get('stateMutability') in ('view', 'pure')
+        self.signature = self.name + "(" + ",".join(self.inputTypes) + ")"
+        self.selector = functionSelector(self.signature)
+        self.selectorHex = "0x" + binascii.hexlify(self.selector).decode('ascii')
+        self.inputs = ArgumentCodec(self.inputTypes)
+        self.outputs = ArgumentCodec(self.outputTypes)
+
+    def encodeBytes(self,*args):
+        return self.inputs.encode(args, self.selector)
+
+    def encode(self,*args):
+        """ '0x' hex call data for this function called with args. """
+        return "0x" + binascii.hexlify(self.encodeBytes(*args)).decode('ascii')
+
+    def encodeMany(self,argumentLists):
+        """ Hex call data for many calls. Static argument lists are all written into one
+            buffer and hex formatted at once.
+        """
+        argumentLists = list(argumentLists)
+        if not self.inputs.static:
+            return [self.encode(*args) for args in argumentLists]
+        size = len(self.selector) + self.inputs.headSize
+        buffer = bytearray(size * len(argumentLists))
+        view = memoryview(buffer)
+        for index, args in enumerate(argumentLists):
+            self.inputs.checkCount(args)
+            offset = index * size
+            view[offset:offset + 4] = self.selector
+            self.inputs.encodeInto(view, offset + 4, args)
+        allHex = binascii.hexlify(buffer).decode('ascii')
+        return ["0x" + allHex[2 * size * index:2 * size * (index + 1)] for index in range(len(argumentLists))]
+
+    def decodeOutput(self,data):
+        """ Decode an eth_call result. A single output is returned as is, several as a list. """
+        values = self.outputs.decode(data)
+        return values[0] if len(values) == 1 else values
+
+    def decodeOutputs(self,results):
+        return [self.decodeOutput(data) for data in results]
+
+    def decodeInput(self,data):
+        """ Decode call data (with its selector) back into the argument list. """
+        raw = hexToBytes(data) if isinstance(data, str) else bytes(data)
+        if raw[:4] != self.selector:
+            raise ValueError('call data is not for ' + self.signature)
+        return self.inputs.decode(raw[4:])
+
+
+class AbiContract(object):
+    """ Every function of a contract ABI (list or json string), by name, signature and selector. """
+
+    def __init__(self,abi):
+        if isinstance(abi, str):
+            abi = json.loads(abi)
+        self.functions = [AbiFunction(entry) for entry in abi if entry.get('type', 'function') == 'function']
+        self.byName = {}
+        self.bySignature = {}
+        self.bySelector = {}
+        for function in self.functions:
+            self.byName.setdefault(function.name, function)
+            self.bySignature[function.signature] = function
+            self.bySelector[function.selector] = function
+
+    def function(self,nameOrSignature):
+        function = self.bySignature.get(nameOrSignature) or self.byName.get(nameOrSignature)
+        if function == None:
+            raise KeyError('no function ' + nameOrSignature + ' in abi')
+        return function
+
+    def functionForCallData(self,data):
+        raw = hexToBytes(data[:10]) if isinstance(data, str) else bytes(data[:4])
+        return self.bySelector.get(raw)
+
+def encodeArguments(types,values):
+    """ '0x' hex of values encoded as the given types (no selector). """
+    return "0x" + binascii.hexlify(ArgumentCodec(types).encode(values)).decode('ascii')
+
+def decodeArguments(types,data):
+    return ArgumentCodec(types).decode(data)
@@ -0,0 +1,355 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# asyncio version of the ethereum RPC "2.0" helpers in networkGethClients.py
+#
+#    Speaks HTTP/1.1 over keep-alive asyncio streams, so one event loop can
+#    query every geth client of a network at the same time.
+#
+#    ./asyncGethClients.py 127.0.0.1:9000 127.0.0.1:11000
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import asyncio
+import itertools
+import json
+import pprint
+import sys
+import time
+import warnings
+from rpcJson import loads
+from rpcMetrics import getDefaultMetrics, batchLabel
+
+
+class AsyncRpcConnection(object):
+    """ One keep-alive HTTP/1.1 connection to a geth client. """
+
+    def __init__(self,ip,port):
+        self.ip = str(ip)
+        self.port = str(port)
+        self.reader = None
+        self.writer = None
+        self.reused = False
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.ip, int(self.port))
+
+    def close(self):
+        if self.writer != None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def post(self,data):
+        """ HTTP POST data (bytes), returns (responseCode, responseBytes, keepAlive). """
+        if self.writer == None:
+            await self.open()
+        request = ("POST / HTTP/1.1\r\n"
+                   "Host: " + self.ip + ":" + self.port + "\r\n"
+                   "Accept: application/json\r\n"
+                   "Content-Type: application/json\r\n"
+                   "Content-Length: " + str(len(data)) + "\r\n"
+                   "Connection: keep-alive\r\n\r\n")
+        self.writer.write(request.encode('ascii') + data)
+        await self.writer.drain()
+
+        statusLine = await self.reader.readline()
+        if not statusLine:
+            raise ConnectionResetError('connection closed by client')
+        responseCode = int(statusLine.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('iso-8859-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append((await self.reader.readexactly(size)))
+                await self.reader.readline()
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await self.reader.readexactly(int(headers['content-length']))
+        else:
+            body = await self.reader.read()
+            headers['connection'] = 'close'
+        keepAlive = headers.get('connection', '').lower() != 'close'
+        return responseCode, body, keepAlive
+
+
+class AsyncRpcClient(object):
+    """ Sends rpc calls to any number of geth clients concurrently.
+          maxInFlightPerNode - most calls outstanding to one client at once (one connection each).
+          timeout            - default seconds allowed for one call.
+    """
+
+    def __init__(self,maxInFlightPerNode=4,timeout=10.0):
+        self.maxInFlightPerNode = maxInFlightPerNode
+        self.timeout = timeout
+        self.semaphores = {}
+        self.idleConnections = {}
+        self.ids = itertools.count(1)
+
+    def semaphore(self,key):
+        if key not in self.semaphores:
+            self.semaphores[key] = asyncio.Semaphore(self.maxInFlightPerNode)
+        return self.semaphores[key]
+
+    async def post(self,ip,port,data,timeout=None,method='unknown'):
+        """ HTTP POST data to <ip:port>, at most maxInFlightPerNode at once per client.
+            method names the call in rpcMetrics.
+            Returns (responseCode, responseBytes). Raises OSError/asyncio.TimeoutError on failures.
+        """
+        key = (str(ip), str(port))
+        if timeout == None:
+            timeout = self.timeout
+        async with self.semaphore(key):
+            idle = self.idleConnections.setdefault(key, [])
+            connection = idle.pop() if idle else AsyncRpcConnection(ip, port)
+            started = time.perf_counter()
+            try:
+                try:
+                    responseCode, body, keepAlive = await asyncio.wait_for(connection.post(data), timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if not connection.reused:
+                        raise
+                    # the client closed an idle keep-alive connection, retry once on a fresh one
+                    connection.close()
+                    connection = AsyncRpcConnection(ip, port)
+                    responseCode, body, keepAlive = await asyncio.wait_for(connection.post(data), timeout)
+            except:
+                getDefaultMetrics().record(ip, port, method, time.perf_counter() - started, len(data), 0, connection.reused, True)
+                connection.close()
+                raise
+            getDefaultMetrics().record(ip, port, method, time.perf_counter() - started, len(data), len(body),
+                                       connection.reused, responseCode != 200)
+            if keepAlive:
+                connection.reused = True
+                idle.append(connection)
+            else:
+                connection.close()
+            return responseCode, body
+
+    async def rpcCommand(self,method,params=[],ip='localhost',port='9012',id=None,jsonrpc="2.0",timeout=None,exceptions=False):
+        """ async counterpart of networkGethClients.rpcCommand, same return values and errors. """
+        if id == None:
+            id = next(self.ids)
+        data = json.dumps({"jsonrpc":str(jsonrpc),"method": str(method),"params":params,"id":str(id)}).encode('utf-8')
+        try:
+            responseCode, body = await self.post(ip, port, data, timeout=timeout, method=str(method))
+        except asyncio.TimeoutError:
+            if exceptions:
+                raise Exception('rpc_communication_error', 'timeout')
+            return {'error':'rpc_comm_error','desc':'timeout','error_num':None}
+        except OSError as e:
+            if exceptions:
+                raise Exception('rpc_communication_error', 'Error No: ' + str(e.errno) + ", message: " + str(e))
+            return {'error':'rpc_comm_error','desc':str(e),'error_num':e.errno}
+
+        if (responseCode != 200):
+            if exceptions:
+                raise Exception('rpc_communication_error', 'return_code_not_200')
+            return {'error':'rpc_comm_error','desc':'return_code_not_200','error_num':None}
+
+        data = loads(body)
+        if 'result' in data.keys():
+            return data["result"]
+        if 'error' in data.keys():
+            getDefaultMetrics().recordError(ip, port, str(method))
+            if exceptions:
+                raise Exception('rpc_communication_error', data)
+            return data
+        if exceptions:
+            raise Exception('rpc_communication_error', "Unknown Error: possible method/parameter(s) were wrong and/or networking issue.")
+        return {"error":"Unknown Error: possible method/parameter(s) were wrong and/or networking issue."}
+
+    async def rpcBatchCommand(self,calls,ip='localhost',port='9012',jsonrpc="2.0",timeout=None,exceptions=False):
+        """ async counterpart of networkGethClients.rpcBatchCommand (without chunking).
+            Returns a list of results in the same order as calls.
+        """
+        calls = list(calls)
+        ids = [next(self.ids) for call in calls]
+        data = json.dumps([{"jsonrpc":str(jsonrpc),"method":str(method),"params":params,"id":callId}
+                           for callId, (method, params) in zip(ids, calls)]).encode('utf-8')
+        try:
+            responseCode, body = await self.post(ip, port, data, timeout=timeout, method=batchLabel(calls))
+            error = None
+            if (responseCode != 200):
+                error = {'error':'rpc_comm_error','desc':'return_code_not_200','error_num':None}
+        except asyncio.TimeoutError:
+            error = {'error':'rpc_comm_error','desc':'timeout','error_num':None}
+        except OSError as e:
+            error = {'error':'rpc_comm_error','desc':str(e),'error_num':e.errno}
+        if error != None:
+            if exceptions:
+                raise Exception('rpc_communication_error', error['desc'])
+            return [error for call in calls]
+        responses = loads(body)
+        if isinstance(responses, dict):
+            getDefaultMetrics().recordError(ip, port, batchLabel(calls))
+            if exceptions:
+                raise Exception('rpc_communication_error', responses)
+            return [responses for call in calls]
+        byId = dict((response.get('id'), response) for response in responses)
+        results = []
+        for callId in ids:
+            response = byId.get(callId, {"error":"Unknown Error: no response for batched call."})
+            if 'result' in response:
+                results.append(response['result'])
+            else:
+                getDefaultMetrics().recordError(ip, port, batchLabel(calls))
+                if exceptions:
+                    raise Exception('rpc_communication_error', response)
+                results.append(response)
+        return results
+
+    def close(self):
+        """ Close every idle connection. """
+        for connections in self.idleConnections.values():
+            for connection in connections:
+                connection.close()
+        self.idleConnections = {}
+
+
+##############################################################################
+# Shared client, one per event loop.
+##############################################################################
+
+defaultClients = {}
+
+def getDefaultClient():
+    """ Get the client shared by the helper methods on the current event loop. """
+    loop = asyncio.get_event_loop()
+    for oldLoop in [oldLoop for oldLoop in defaultClients if oldLoop.is_closed()]:
+        del defaultClients[oldLoop]
+    if loop not in defaultClients:
+        defaultClients[loop] = AsyncRpcClient()
+    return defaultClients[loop]
+
+
+##############################################################################
+# Helper methods to simplify blockchain interactions (async).
+##############################################################################
+
+async def rpcCommand(method,params=[],ip='localhost',port='9012',timeout=None,exceptions=False,client=None):
+    """ Send one rpc call through the shared (or given) client. """
+    client = client or getDefaultClient()
+    return (await client.rpcCommand(method, params=params, ip=ip, port=port, timeout=timeout, exceptions=exceptions))
+
+async def getPeerCount(ip,port,timeout=None,client=None):
+    """ Get number of peers connected to target client. """
+    return (await rpcCommand("net_peerCount", [], ip, port, timeout, client=client))
+
+async def getAccounts(ip,port,timeout=None,client=None):
+    """ Get list of accounts on target geth client """
+    return (await rpcCommand("eth_accounts", [], ip, port, timeout, client=client))
+
+async def getBalance(ip,port,account=None,blockParameter="latest",timeout=None,client=None):
+    """ Get balance of an account. Defaults to first account in client. """
+    if account == None:
+        accounts = await getAccounts(ip, port, timeout, client)
+        if not isinstance(accounts, list):
+            return accounts
+        account = accounts[0]
+    return (await rpcCommand("eth_getBalance", [account, blockParameter], ip, port, timeout, client=client))
+
+async def addPeer(ip,port,enode,timeout=None,client=None):
+    """ Add a peer to this client."""
+    return (await rpcCommand("admin_addPeer", [enode], ip, port, timeout, client=client))
+
+async def getEnodeInfo(ip,port,timeout=None,client=None):
+    """ Get the enode of this client, or the error dict if the call failed. """
+    results = await rpcCommand("admin_nodeInfo", [], ip, port, timeout, client=client)
+    if isinstance(results, dict) and 'enode' in results:
+        return results['enode']
+    return results
+
+async def getBlockNumber(ip,port,timeout=None,client=None):
+    """ Get current block number. """
+    return (await rpcCommand("eth_blockNumber", [], ip, port, timeout, client=client))
+
+async def getTransactionByHash(ip,port,hash,timeout=None,client=None):
+    """ Returns the information about a transaction requested by transaction hash. """
+    return (await rpcCommand("eth_getTransactionByHash", [hash], ip, port, timeout, client=client))
+
+async def getAddressOfTransaction(ip,port,transactionReceipt,timeout=None,client=None):
+    """ Returns the receipt of a transaction, None until it has been mined. """
+    return (await rpcCommand("eth_getTransactionReceipt", [transactionReceipt], ip, port, timeout, client=client))
+
+
+##############################################################################
+# Fan out helpers, run one helper against many clients at once.
+##############################################################################
+
+async def fanOut(nodes,helper,*args,**kwargs):
+    """ Run helper(ip, port, *args, **kwargs) against every (ip, port) in nodes concurrently.
+        Returns the results in the same order as nodes.
+    """
+    return (await asyncio.gather(*[helper(ip, port, *args, **kwargs) for ip, port in nodes]))
+
+def currentEventLoop():
+    """ The event loop set for this thread, None if there is none. """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            return asyncio.get_event_loop_policy().get_event_loop()
+    except RuntimeError:
+        return None
+
+def runSync(coroutine):
+    """ Run a coroutine to completion from synchronous code (any thread), on a new event loop that is
+        the thread's current one while it runs. Before python 3.5.3 get_event_loop() (and so Semaphore,
+        open_connection and getDefaultClient) only finds the loop that way, not the running one.
+    """
+    previous = currentEventLoop()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        client = defaultClients.pop(loop, None)
+        if client != None:
+            client.close()
+        loop.close()
+        asyncio.set_event_loop(previous if previous != None and not previous.is_closed() else None)
+
+def runFanOut(nodes,helper,*args,**kwargs):
+    """ Blocking version of fanOut for synchronous scripts. """
+    return runSync(fanOut(nodes, helper, *args, **kwargs))
+
+async def probeNode(ip,port,timeout=None,client=None):
+    """ Get block number and peer count of one client. """
+    blockNumber, peerCount = await asyncio.gather(getBlockNumber(ip, port, timeout, client),
+                                                       getPeerCount(ip, port, timeout, client))
+    return {'blockNumber': blockNumber, 'peerCount': peerCount}
+
+def parseNode(text):
+    """ Turn '<ip>:<port>' into (ip, port). """
+    ip, _, port = text.rpartition(':')
+    return (ip or '127.0.0.1', port)
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    # Must give <this-script> <ip:port> [<ip:port> ...]
+    nodes = [parseNode(arg) for arg in sys.argv[1:]] or [('127.0.0.1', '9000'), ('127.0.0.1', '11000')]
+
+    # query every client at once, total time is that of the slowest client.
+    results = runFanOut(nodes, probeNode)
+    for (ip, port), result in zip(nodes, results):
+        print (ip + ":" + port + " -> ")
+        pprint.pprint(result)
@@ -0,0 +1,248 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Snapshot of the balances of every account of every client, and diffs of
+# two snapshots.
+#
+#    The accounts of all clients are gathered at once and deduplicated, the
+#    block is pinned (the lowest head of the clients, so every client has
+#    it), and all balances at that block are fetched in batched requests
+#    spread over the clients concurrently.
+#
+#    Snapshots are stored column wise: csv ("# block <n>" then account,wei
+#    rows) or, with numpy installed, .npz with an account column and the
+#    wei values split into high/low uint64 columns so diffs are vectorized.
+#
+#    ./balanceSnapshot.py snapshot --node 127.0.0.1:9000 --node 127.0.0.1:11000 --output before.csv
+#    ./balanceSnapshot.py diff before.csv after.csv
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import argparse
+import asyncio
+import csv
+import sys
+from asyncGethClients import AsyncRpcClient, parseNode, runSync
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LOW_MASK = (1 << 64) - 1
+
+
+class BalanceSnapshot(object):
+    """ Balances (wei) of accounts at one block, accounts sorted and lower case. """
+
+    def __init__(self,block,accounts,balances):
+        self.block = block
+        rows = sorted(zip((account.lower() for account in accounts), balances))
+        self.accounts = [account for account, balance in rows]
+        self.balances = [balance for account, balance in rows]
+        self.cachedColumns = None
+
+    def total(self):
+        return sum(self.balances)
+
+    def asDict(self):
+        return dict(zip(self.accounts, self.balances))
+
+    def columns(self):
+        """ numpy columns: accounts ('<U42'), high and low 64 bits of each balance (uint64).
+            Balances of 2**128 wei or more do not fit and raise ValueError.
+        """
+        if self.cachedColumns == None:
+            if any(balance >> 128 for balance in self.balances):
+                raise ValueError('balance too large for the high/low uint64 columns')
+            high = numpy.fromiter((balance >> 64 for balance in self.balances), dtype=numpy.uint64, count=len(self.balances))
+            low = numpy.fromiter((balance & LOW_MASK for balance in self.balances), dtype=numpy.uint64, count=len(self.balances))
+            self.cachedColumns = (numpy.array(self.accounts, dtype='<U42'), high, low)
+        return self.cachedColumns
+
+    def save(self,path):
+        if path.endswith('.npz'):
+            if numpy == None:
+                raise Exception('numpy is needed for .npz snapshots')
+            accounts, high, low = self.columns()
+            numpy.savez_compressed(path, block=numpy.array([self.block]), accounts=accounts, high=high, low=low)
+            return
+        with open(path, 'w', newline='') as snapshotFile:
+            self.writeCsv(snapshotFile)
+
+    def writeCsv(self,snapshotFile):
+        """ The csv form ("# block <n>", the account,wei header, then the rows) to an open file. """
+        snapshotFile.write("# block " + str(self.block) + "\n")
+        writer = csv.writer(snapshotFile)
+        writer.writerow(['account', 'wei'])
+        writer.writerows(zip(self.accounts, self.balances))
+
+    @staticmethod
+    def load(path):
+        if path.endswith('.npz'):
+            if numpy == None:
+                raise Exception('numpy is needed for .npz snapshots')
+            data = numpy.load(path)
+            accounts, high, low = data['accounts'], data['high'], data['low']
+            snapshot = BalanceSnapshot(int(data['block'][0]), accounts.tolist(),
+                                       [(high << 64) | low for high, low in zip(high.tolist(), low.tolist())])
+            # stored sorted, the columns can be used as they are
+            snapshot.cachedColumns = (accounts, high, low)
+            return snapshot
+        with open(path, newline='') as snapshotFile:
+            block = int(snapshotFile.readline().split()[-1])
+            reader = csv.reader(snapshotFile)
+            next(reader)
+            accounts = []
+            balances = []
+            for account, wei in reader:
+                accounts.append(account)
+                balances.append(int(wei))
+        return BalanceSnapshot(block, accounts, balances)
+
+
+##############################################################################
+# Taking a snapshot
+##############################################################################
+
+async def gatherAccounts(nodes,client):
+    """ Accounts of every client at once. Returns (sorted unique accounts, dict of (ip, port) -> accounts). """
+    results = await asyncio.gather(*[client.rpcCommand("eth_accounts", [], ip, port) for ip, port in nodes])
+    byNode = {}
+    for node, accounts in zip(nodes, results):
+        if isinstance(accounts, list):
+            byNode[node] = [account.lower() for account in accounts]
+    return sorted(set(account for accounts in byNode.values() for account in accounts)), byNode
+
+async def pinBlock(nodes,client):
+    """ The lowest head block of the clients that answer, every one of them has its state. """
+    results = await asyncio.gather(*[client.rpcCommand("eth_blockNumber", [], ip, port) for ip, port in nodes])
+    heads = [int(result, 16) for result in results if isinstance(result, str)]
+    if not heads:
+        raise Exception('rpc_communication_error', 'no client answered eth_blockNumber')
+    return min(heads)
+
+async def fetchBalances(nodes,accounts,block,client,chunkSize=500):
+    """ Balances of accounts at block, in batches spread round robin over the clients.
+        A batch that fails on one client is retried on the others.
+    """
+    chunks = [accounts[start:start + chunkSize] for start in range(0, len(accounts), chunkSize)]
+
+    async def fetch(index, chunk):
+        calls = [("eth_getBalance", [account, hex(block)]) for account in chunk]
+        for attempt in range(len(nodes)):
+            ip, port = nodes[(index + attempt) % len(nodes)]
+            results = await client.rpcBatchCommand(calls, ip, port)
+            if all(isinstance(result, str) for result in results):
+                return [int(result, 16) for result in results]
+        raise Exception('rpc_communication_error', 'no client returned the balances', results[0])
+
+    results = await asyncio.gather(*[fetch(index, chunk) for index, chunk in enumerate(chunks)])
+    return [balance for chunkBalances in results for balance in chunkBalances]
+
+async def takeSnapshotAsync(nodes,accounts=None,block=None,chunkSize=500,maxInFlightPerNode=4,timeout=60.0):
+    client = AsyncRpcClient(maxInFlightPerNode=maxInFlightPerNode, timeout=timeout)
+    try:
+        gathered, byNode = await gatherAccounts(nodes, client)
+        accounts = sorted(set(gathered) | set(account.lower() for account in (accounts or [])))
+        if block == None:
+            block = await pinBlock(nodes, client)
+        balances = await fetchBalances(nodes, accounts, block, client, chunkSize)
+        return BalanceSnapshot(block, accounts, balances)
+    finally:
+        client.close()
+
+def takeSnapshot(nodes,accounts=None,block=None,chunkSize=500,maxInFlightPerNode=4,timeout=60.0):
+    """ Balances of every account of every client (plus accounts) at block (default: the lowest
+        head of the clients), nodes being a list of (ip, port). Returns a BalanceSnapshot.
+    """
+    return runSync(takeSnapshotAsync(nodes, accounts, block, chunkSize, maxInFlightPerNode, timeout))
+
+
+##############################################################################
+# Diffs
+##############################################################################
+
+def diffSnapshots(before,after):
+    """ Accounts that appeared, disappeared or whose balance changed between two snapshots.
+        Returns {'added': [(account, wei)], 'removed': [(account, wei)], 'changed': [(account, before, after, delta)]}.
+    """
+    if numpy != None:
+        try:
+            return diffColumns(before, after)
+        except ValueError:
+            # balances beyond 128 bits, compared one by one below
+            pass
+    beforeBalances = before.asDict()
+    afterBalances = after.asDict()
+    return {'added': [(account, afterBalances[account]) for account in after.accounts if account not in beforeBalances],
+            'removed': [(account, beforeBalances[account]) for account in before.accounts if account not in afterBalances],
+            'changed': [(account, beforeBalances[account], balance, balance - beforeBalances[account])
+                        for account, balance in zip(after.accounts, after.balances)
+                        if account in beforeBalances and beforeBalances[account] != balance]}
+
+def diffColumns(before,after):
+    """ diffSnapshots with numpy: the (sorted) account columns are matched with one searchsorted,
+        balances compared as high/low uint64 columns, only changed rows become python ints again.
+    """
+    accountsBefore, highBefore, lowBefore = before.columns()
+    accountsAfter, highAfter, lowAfter = after.columns()
+    # position of every account of after in before, and whether it is there
+    positions = numpy.searchsorted(accountsBefore, accountsAfter)
+    positions[positions == len(accountsBefore)] = 0
+    found = accountsBefore[positions] == accountsAfter if len(accountsBefore) else numpy.zeros(len(accountsAfter), dtype=bool)
+    indexAfter = numpy.nonzero(found)[0]
+    indexBefore = positions[found]
+    changed = (highBefore[indexBefore] != highAfter[indexAfter]) | (lowBefore[indexBefore] != lowAfter[indexAfter])
+    kept = numpy.zeros(len(accountsBefore), dtype=bool)
+    kept[indexBefore] = True
+    return {'added': [(after.accounts[index], after.balances[index]) for index in numpy.nonzero(~found)[0]],
+            'removed': [(before.accounts[index], before.balances[index]) for index in numpy.nonzero(~kept)[0]],
+            'changed': [(before.accounts[old], before.balances[old], after.balances[new], after.balances[new] - before.balances[old])
+                        for old, new in zip(indexBefore[changed].tolist(), indexAfter[changed].tolist())]}
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Snapshot and diff the balances of every account of the network.')
+    commands = parser.add_subparsers(dest='command')
+    snapshotParser = commands.add_parser('snapshot', help='take a snapshot')
+    snapshotParser.add_argument('--node', action='append', default=[], help='<ip>:<rpcPort>, repeatable (default 127.0.0.1:9000)')
+    snapshotParser.add_argument('--account', action='append', default=[], help='extra account to include, repeatable')
+    snapshotParser.add_argument('--block', type=int, default=None, help='block number (default: lowest head of the clients)')
+    snapshotParser.add_argument('--chunk-size', type=int, default=500, help='eth_getBalance calls per batched request')
+    snapshotParser.add_argument('--output', default='-', help='.csv or .npz file, "-" prints the csv')
+    diffParser = commands.add_parser('diff', help='compare two snapshots')
+    diffParser.add_argument('before')
+    diffParser.add_argument('after')
+    args = parser.parse_args()
+
+    if args.command == 'snapshot':
+        nodes = [parseNode(text) for text in args.node] or [('127.0.0.1', '9000')]
+        snapshot = takeSnapshot(nodes, args.account, args.block, args.chunk_size)
+        if args.output == '-':
+            snapshot.writeCsv(sys.stdout)
+        else:
+            snapshot.save(args.output)
+            print ("Saved " + str(len(snapshot.accounts)) + " balances at block " + str(snapshot.block) + " to " + args.output)
+    elif args.command == 'diff':
+        before = BalanceSnapshot.load(args.before)
+        after = BalanceSnapshot.load(args.after)
+        diff = diffSnapshots(before, after)
+        print ("blocks " + str(before.block) + " -> " + str(after.block))
+        for account, balance in diff['added']:
+            print ("+ " + account + " " + str(balance))
+        for account, balance in diff['removed']:
+            print ("- " + account + " " + str(balance))
+        for account, old, new, delta in diff['changed']:
+            print ("~ " + account + " " + str(old) + " -> " + str(new) + " (" + ("+" if delta > 0 else "") + str(delta) + ")")
+    else:
+        parser.print_help()
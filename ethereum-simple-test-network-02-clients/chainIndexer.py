@@ -0,0 +1,365 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Index a geth client's chain into a local SQLite database.
+#
+#    Follows the chain with chainIngest.streamChain, fetches the receipts of
+#    every transaction in batched requests, and writes blocks, transactions,
+#    receipts and logs into SQLite in bulk transactions (one commit per many
+#    blocks). Addresses and topics are indexed, so questions such as "which
+#    transactions touched contract X" are answered from local disk. The
+#    database is its own checkpoint: a restart resumes after the last block
+#    that was committed. When the chain is reorganized (found on resume or
+#    while following the head) the rows of the orphaned blocks are dropped
+#    and the new chain is indexed from the fork point.
+#
+#    ./chainIndexer.py index 127.0.0.1 9000 chain.db
+#    ./chainIndexer.py query chain.db --address <contractAddress>
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import argparse
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from chainIngest import streamChain
+from networkGethClients import rpcBatchCommand
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    number INTEGER PRIMARY KEY, hash TEXT NOT NULL, parentHash TEXT, timestamp INTEGER,
+    miner TEXT, gasUsed INTEGER, gasLimit INTEGER, transactionCount INTEGER);
+CREATE TABLE IF NOT EXISTS transactions (
+    hash TEXT PRIMARY KEY, blockNumber INTEGER NOT NULL, transactionIndex INTEGER,
+    fromAddress TEXT, toAddress TEXT, value TEXT, gas INTEGER, gasPrice TEXT, nonce INTEGER, input TEXT);
+CREATE TABLE IF NOT EXISTS receipts (
+    transactionHash TEXT PRIMARY KEY, blockNumber INTEGER NOT NULL, fromAddress TEXT, toAddress TEXT,
+    contractAddress TEXT, gasUsed INTEGER, cumulativeGasUsed INTEGER, status INTEGER);
+CREATE TABLE IF NOT EXISTS logs (
+    blockNumber INTEGER NOT NULL, logIndex INTEGER NOT NULL, transactionHash TEXT, address TEXT,
+    topic0 TEXT, topic1 TEXT, topic2 TEXT, topic3 TEXT, data TEXT, PRIMARY KEY (blockNumber, logIndex));
+CREATE INDEX IF NOT EXISTS blocksHash ON blocks (hash);
+CREATE INDEX IF NOT EXISTS transactionsBlock ON transactions (blockNumber);
+CREATE INDEX IF NOT EXISTS transactionsFrom ON transactions (fromAddress, blockNumber);
+CREATE INDEX IF NOT EXISTS transactionsTo ON transactions (toAddress, blockNumber);
+CREATE INDEX IF NOT EXISTS receiptsBlock ON receipts (blockNumber);
+CREATE INDEX IF NOT EXISTS receiptsFrom ON receipts (fromAddress, blockNumber);
+CREATE INDEX IF NOT EXISTS receiptsContract ON receipts (contractAddress);
+CREATE INDEX IF NOT EXISTS logsAddress ON logs (address, blockNumber);
+CREATE INDEX IF NOT EXISTS logsTopic0 ON logs (topic0, blockNumber);
+CREATE INDEX IF NOT EXISTS logsTopic1 ON logs (topic1);
+CREATE INDEX IF NOT EXISTS logsTopic2 ON logs (topic2);
+CREATE INDEX IF NOT EXISTS logsTopic3 ON logs (topic3);
+"""
+
+def quantity(value):
+    """ '0x..' quantity -> int, None stays None. """
+    return None if value == None else int(value, 16)
+
+def wei(value):
+    """ '0x..' wei -> decimal text, wei does not fit SQLite's 64 bit integers. """
+    return None if value == None else str(int(value, 16))
+
+def address(value):
+    return None if value == None else value.lower()
+
+
+class ChainIndex(object):
+    """ SQLite store of blocks, transactions, receipts and logs, with the query API.
+        Rows are returned as dicts; addresses are lower case, wei values decimal strings.
+    """
+
+    def __init__(self,path):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        # WAL lets queries run while the indexer writes, NORMAL syncs once per checkpoint instead of per commit
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    ##########################################################################
+    # writing
+    ##########################################################################
+
+    def lastBlock(self):
+        """ (number, hash) of the highest indexed block, or None for an empty index. """
+        row = self.connection.execute("SELECT number, hash FROM blocks ORDER BY number DESC LIMIT 1").fetchone()
+        return None if row == None else (row['number'], row['hash'])
+
+    def write(self,blocks,transactions,receipts,logs):
+        """ Insert rows of every table in one transaction, re-indexed rows are replaced. """
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO blocks VALUES (?,?,?,?,?,?,?,?)", [
+                (quantity(block['number']), block['hash'], block['parentHash'], quantity(block.get('timestamp')),
+                 address(block.get('miner')), quantity(block.get('gasUsed')), quantity(block.get('gasLimit')),
+                 len(block.get('transactions', []))) for block in blocks])
+            self.connection.executemany("INSERT OR REPLACE INTO transactions VALUES (?,?,?,?,?,?,?,?,?,?)", [
+                (transaction['hash'], quantity(transaction['blockNumber']), quantity(transaction.get('transactionIndex')),
+                 address(transaction.get('from')), address(transaction.get('to')), wei(transaction.get('value')),
+                 quantity(transaction.get('gas')), wei(transaction.get('gasPrice')), quantity(transaction.get('nonce')),
+                 transaction.get('input')) for transaction in transactions])
+            self.connection.executemany("INSERT OR REPLACE INTO receipts VALUES (?,?,?,?,?,?,?,?)", [
+                (receipt['transactionHash'], quantity(receipt['blockNumber']), address(receipt.get('from')),
+                 address(receipt.get('to')), address(receipt.get('contractAddress')), quantity(receipt.get('gasUsed')),
+                 quantity(receipt.get('cumulativeGasUsed')), quantity(receipt.get('status'))) for receipt in receipts])
+            self.connection.executemany("INSERT OR REPLACE INTO logs VALUES (?,?,?,?,?,?,?,?,?)", [
+                (quantity(log['blockNumber']), quantity(log['logIndex']), log.get('transactionHash'), address(log.get('address')))
+                + tuple((log.get('topics', []) + [None] * 4)[:4]) + (log.get('data'),) for log in logs])
+
+    def recentHashes(self,count):
+        """ Block number -> hash of the count highest indexed blocks. """
+        return dict((row['number'], row['hash']) for row in
+                    self.connection.execute("SELECT number, hash FROM blocks ORDER BY number DESC LIMIT ?", (count,)))
+
+    def removeFrom(self,number):
+        """ Drop every row of block number and above (a reorganized chain is indexed again from there). """
+        with self.connection:
+            for table in ('logs', 'receipts', 'transactions'):
+                self.connection.execute("DELETE FROM " + table + " WHERE blockNumber >= ?", (number,))
+            self.connection.execute("DELETE FROM blocks WHERE number >= ?", (number,))
+
+    ##########################################################################
+    # queries
+    ##########################################################################
+
+    def query(self,sql,parameters=()):
+        """ Run any SELECT against the index, rows as dicts. """
+        return [dict(row) for row in self.connection.execute(sql, parameters)]
+
+    def block(self,number):
+        rows = self.query("SELECT * FROM blocks WHERE number = ?", (number,))
+        return rows[0] if rows else None
+
+    def transaction(self,transactionHash):
+        rows = self.query("SELECT * FROM transactions WHERE hash = ?", (transactionHash,))
+        return rows[0] if rows else None
+
+    def receipt(self,transactionHash):
+        rows = self.query("SELECT * FROM receipts WHERE transactionHash = ?", (transactionHash,))
+        return rows[0] if rows else None
+
+    def transactionsFrom(self,account,fromBlock=0,toBlock=None):
+        return self.query("SELECT * FROM transactions WHERE fromAddress = ? AND blockNumber BETWEEN ? AND ?"
+                          " ORDER BY blockNumber, transactionIndex", (account.lower(), fromBlock, self.upTo(toBlock)))
+
+    def transactionsTo(self,account,fromBlock=0,toBlock=None):
+        return self.query("SELECT * FROM transactions WHERE toAddress = ? AND blockNumber BETWEEN ? AND ?"
+                          " ORDER BY blockNumber, transactionIndex", (account.lower(), fromBlock, self.upTo(toBlock)))
+
+    def transactionsTouching(self,contract,fromBlock=0,toBlock=None):
+        """ Transactions sent to, from, or creating contract, or emitting a log of it. """
+        contract = contract.lower()
+        toBlock = self.upTo(toBlock)
+        return self.query(
+            "SELECT * FROM transactions WHERE hash IN ("
+            " SELECT hash FROM transactions WHERE toAddress = ?1 AND blockNumber BETWEEN ?2 AND ?3"
+            " UNION SELECT hash FROM transactions WHERE fromAddress = ?1 AND blockNumber BETWEEN ?2 AND ?3"
+            " UNION SELECT transactionHash FROM receipts WHERE contractAddress = ?1 AND blockNumber BETWEEN ?2 AND ?3"
+            " UNION SELECT transactionHash FROM logs WHERE address = ?1 AND blockNumber BETWEEN ?2 AND ?3)"
+            " ORDER BY blockNumber, transactionIndex", (contract, fromBlock, toBlock))
+
+    def receiptsFrom(self,account,fromBlock=0,toBlock=None):
+        return self.query("SELECT * FROM receipts WHERE fromAddress = ? AND blockNumber BETWEEN ? AND ?"
+                          " ORDER BY blockNumber", (account.lower(), fromBlock, self.upTo(toBlock)))
+
+    def contractCreatedBy(self,contract):
+        """ Receipt of the transaction that created contract, None if it is not indexed. """
+        rows = self.query("SELECT * FROM receipts WHERE contractAddress = ?", (contract.lower(),))
+        return rows[0] if rows else None
+
+    def logs(self,address=None,topics=(),fromBlock=0,toBlock=None,limit=None):
+        """ Logs like eth_getLogs: optional emitting address and topics (None matches any topic). """
+        sql = "SELECT * FROM logs WHERE blockNumber BETWEEN ? AND ?"
+        parameters = [fromBlock, self.upTo(toBlock)]
+        if address != None:
+            sql += " AND address = ?"
+            parameters.append(address.lower())
+        for position, topic in enumerate(topics):
+            if topic != None:
+                sql += " AND topic" + str(position) + " = ?"
+                parameters.append(topic.lower())
+        sql += " ORDER BY blockNumber, logIndex"
+        if limit != None:
+            sql += " LIMIT " + str(int(limit))
+        return self.query(sql, parameters)
+
+    def upTo(self,toBlock):
+        return (1 << 63) - 1 if toBlock == None else toBlock
+
+    def counts(self):
+        """ Rows of every table. """
+        return dict((table, self.connection.execute("SELECT COUNT(*) FROM " + table).fetchone()[0])
+                    for table in ('blocks', 'transactions', 'receipts', 'logs'))
+
+
+##############################################################################
+# Indexing
+##############################################################################
+
+def fetchReceipts(ip,port,transactionHashes,chunkSize=100,workers=4):
+    """ Receipts of the transactions, in concurrent batched requests, in the same order. """
+    chunks = [transactionHashes[start:start + chunkSize] for start in range(0, len(transactionHashes), chunkSize)]
+    if not chunks:
+        return []
+
+    def fetch(chunk):
+        return rpcBatchCommand([("eth_getTransactionReceipt", [transactionHash]) for transactionHash in chunk],
+                               ip=ip, port=port, chunkSize=len(chunk), exceptions=True)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as executor:
+        return [receipt for receipts in executor.map(fetch, chunks) for receipt in receipts]
+
+
+class ChainIndexer(object):
+    """ Follows a client's chain into a ChainIndex.
+          commitBlocks  - blocks written per SQLite transaction while catching up.
+          commitSeconds - once rows were held this long, commit at the next block (following the head).
+        The other arguments are passed on to chainIngest.streamChain.
+    """
+
+    def __init__(self,index,ip,port,rangeSize=50,workers=4,confirmations=0,commitBlocks=500,commitSeconds=2.0,
+                 receiptChunkSize=100,reorgDepth=128):
+        self.index = index
+        self.ip = ip
+        self.port = port
+        self.rangeSize = rangeSize
+        self.workers = workers
+        self.confirmations = confirmations
+        self.commitBlocks = commitBlocks
+        self.commitSeconds = commitSeconds
+        self.receiptChunkSize = receiptChunkSize
+        self.reorgDepth = reorgDepth
+        self.reorgs = 0
+        self.clear()
+
+    def clear(self):
+        self.blocks = []
+        self.transactions = []
+        self.logs = []
+        self.lastFlush = time.time()
+
+    def flush(self):
+        """ Fetch the receipts of the held transactions and write everything held in one transaction. """
+        if not self.blocks:
+            return
+        receipts = fetchReceipts(self.ip, self.port, [transaction['hash'] for transaction in self.transactions],
+                                 self.receiptChunkSize, self.workers)
+        self.index.write(self.blocks, self.transactions, [receipt for receipt in receipts if receipt != None], self.logs)
+        self.clear()
+
+    def startBlock(self,fromBlock):
+        """ Resume after the last indexed block. """
+        last = self.index.lastBlock()
+        return fromBlock if last == None else last[0] + 1
+
+    def reorganized(self,fromBlock):
+        """ Drop the rows of block fromBlock and above, held or already committed. """
+        self.blocks = [block for block in self.blocks if quantity(block['number']) < fromBlock]
+        self.transactions = [transaction for transaction in self.transactions if quantity(transaction['blockNumber']) < fromBlock]
+        self.logs = [log for log in self.logs if quantity(log['blockNumber']) < fromBlock]
+        self.index.removeFrom(fromBlock)
+        self.reorgs += 1
+
+    def run(self,fromBlock=0,toBlock=None,progress=None):
+        """ Index blocks fromBlock..toBlock (None to keep following the head).
+            progress(blockNumber) is called after every commit.
+        """
+        # the indexed hashes are checked against the client by streamChain, before and while following
+        for kind, item in streamChain(self.ip, self.port, self.startBlock(fromBlock), toBlock, self.rangeSize, self.workers,
+                                      confirmations=self.confirmations, reorgDepth=self.reorgDepth,
+                                      knownHashes=self.index.recentHashes(self.reorgDepth)):
+            if kind == 'reorg':
+                self.reorganized(item['fromBlock'])
+            elif kind == 'block':
+                # a block is complete when the next one arrives, commit on block boundaries only
+                if len(self.blocks) >= self.commitBlocks or (self.blocks and time.time() - self.lastFlush > self.commitSeconds):
+                    self.flushed(progress)
+                self.blocks.append(item)
+            elif kind == 'transaction':
+                self.transactions.append(item)
+            elif kind == 'log':
+                self.logs.append(item)
+        self.flushed(progress)
+
+    def flushed(self,progress):
+        number = quantity(self.blocks[-1]['number']) if self.blocks else None
+        self.flush()
+        if progress != None and number != None:
+            progress(number)
+
+
+def indexChain(ip,port,path,fromBlock=0,toBlock=None,**kwargs):
+    """ Index the chain of the client at ip:port into the SQLite file at path, see ChainIndexer. """
+    index = ChainIndex(path)
+    try:
+        ChainIndexer(index, ip, port, **kwargs).run(fromBlock, toBlock)
+    finally:
+        index.close()
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Index blocks, transactions, receipts and logs into SQLite, and query them.')
+    commands = parser.add_subparsers(dest='command')
+    indexParser = commands.add_parser('index', help='follow a client and index its chain')
+    indexParser.add_argument('ip')
+    indexParser.add_argument('port')
+    indexParser.add_argument('database')
+    indexParser.add_argument('--from', dest='fromBlock', type=int, default=0)
+    indexParser.add_argument('--to', dest='toBlock', type=int, default=None)
+    indexParser.add_argument('--range-size', type=int, default=50)
+    indexParser.add_argument('--workers', type=int, default=4)
+    indexParser.add_argument('--confirmations', type=int, default=0)
+    indexParser.add_argument('--commit-blocks', type=int, default=500)
+    queryParser = commands.add_parser('query', help='query an index')
+    queryParser.add_argument('database')
+    queryParser.add_argument('--address', help='transactions touching this account or contract')
+    queryParser.add_argument('--from-account', help='receipts of transactions sent by this account')
+    queryParser.add_argument('--logs', help='logs emitted by this contract')
+    queryParser.add_argument('--topic', action='append', default=[], help='log topic (topic0 first), repeatable')
+    queryParser.add_argument('--sql', help='any SELECT statement')
+    args = parser.parse_args()
+
+    if args.command == 'index':
+        index = ChainIndex(args.database)
+        indexer = ChainIndexer(index, args.ip, args.port, rangeSize=args.range_size, workers=args.workers,
+                               confirmations=args.confirmations, commitBlocks=args.commit_blocks)
+        started = time.time()
+        try:
+            indexer.run(args.fromBlock, args.toBlock,
+                        progress=lambda number: print ("Indexed up to block " + str(number) + " " + str(index.counts())))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            index.close()
+        print ("Took " + str(round(time.time() - started, 2)) + " seconds")
+    elif args.command == 'query':
+        index = ChainIndex(args.database)
+        if args.address:
+            rows = index.transactionsTouching(args.address)
+        elif args.from_account:
+            rows = index.receiptsFrom(args.from_account)
+        elif args.logs or args.topic:
+            rows = index.logs(args.logs, args.topic)
+        elif args.sql:
+            rows = index.query(args.sql)
+        else:
+            rows = [index.counts()]
+        for row in rows:
+            print (json.dumps(row))
+        index.close()
+    else:
+        parser.print_help()
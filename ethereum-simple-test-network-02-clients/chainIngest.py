@@ -0,0 +1,222 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Stream the blocks, transactions and logs of a geth client's chain.
+#
+#    Walks forward from a block number, fetching ranges of blocks in
+#    parallel (one batched eth_getBlockByNumber request and one eth_getLogs
+#    request per range), then follows the head once it has caught up.
+#    Progress can be saved to a checkpoint file so a restart resumes where
+#    it left off instead of rescanning from genesis. Every block's
+#    parentHash is checked against the block emitted before it (and the
+#    checkpoint's hashes against the client on resume), when the chain was
+#    reorganized a ('reorg', ...) item tells the consumer to drop what it
+#    got from the fork point on, and the new chain is streamed from there.
+#
+#    ./chainIngest.py 127.0.0.1 9000 --checkpoint ingest.checkpoint
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from networkGethClients import rpcCommand, rpcBatchCommand, rpcStreamCommand
+
+
+class ChainCheckpoint(object):
+    """ Next block number to ingest and the hashes of the blocks just before it, stored in a small
+        json file (written atomically).
+    """
+
+    def __init__(self,path):
+        self.path = path
+
+    def load(self):
+        """ Returns the saved {'nextBlock','blockHash','recentHashes'} dict (recentHashes maps block
+            numbers to hashes), or None if nothing was saved yet.
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as checkpointFile:
+            saved = json.load(checkpointFile)
+        recentHashes = dict((int(number), blockHash) for number, blockHash in (saved.get('recentHashes') or {}).items())
+        if saved.get('blockHash') and saved['nextBlock'] > 0:
+            recentHashes.setdefault(saved['nextBlock'] - 1, saved['blockHash'])
+        saved['recentHashes'] = recentHashes
+        return saved
+
+    def save(self,nextBlock,blockHash=None,recentHashes=None):
+        temporaryPath = self.path + '.tmp'
+        with open(temporaryPath, 'w') as checkpointFile:
+            json.dump({'nextBlock': nextBlock, 'blockHash': blockHash, 'savedAt': time.time(),
+                       'recentHashes': dict((str(number), value) for number, value in (recentHashes or {}).items())},
+                      checkpointFile)
+        os.replace(temporaryPath, self.path)
+
+
+def fetchRange(ip,port,start,end,fullTransactions=True,includeLogs=True):
+    """ Fetch blocks start..end (inclusive) in one batched request, plus their logs.
+        Returns a list of (block, logs) in block order.
+    """
+    blocks = rpcBatchCommand([("eth_getBlockByNumber", [hex(number), fullTransactions]) for number in range(start, end + 1)],
+                             ip=ip, port=port, chunkSize=end - start + 1, exceptions=True)
+    logsByBlock = {}
+    if includeLogs:
+        # logs are sorted into their blocks as they are parsed, the raw response is never held whole
+        rpcStreamCommand(ip=ip,port=port,method="eth_getLogs",params=[{'fromBlock':hex(start),'toBlock':hex(end)}],
+                         onItem=lambda log: logsByBlock.setdefault(log['blockHash'], []).append(log),exceptions=True)
+    results = []
+    for block in blocks:
+        if block == None:
+            break
+        logs = logsByBlock.get(block['hash'], [])
+        logs.sort(key=lambda log: int(log['logIndex'], 16))
+        results.append((block, logs))
+    return results
+
+def getHeadNumber(ip,port):
+    return int(rpcCommand(ip=ip,port=port,method="eth_blockNumber",params=[],exceptions=True), 16)
+
+def findForkPoint(ip,port,recentHashes):
+    """ First block number whose remembered hash the client no longer has, None if it has them all.
+          recentHashes - block number -> hash of the blocks emitted (one batched request checks them all).
+        When none of them are still canonical the reorg is deeper than what is remembered, the lowest
+        remembered number is returned.
+    """
+    numbers = sorted(recentHashes)
+    blocks = rpcBatchCommand([("eth_getBlockByNumber", [hex(number), False]) for number in numbers],
+                             ip=ip, port=port, chunkSize=max(1, len(numbers)), exceptions=True) if numbers else []
+    forkPoint = None
+    for number, block in reversed(list(zip(numbers, blocks))):
+        if block != None and block['hash'] == recentHashes[number]:
+            break
+        forkPoint = number
+    return forkPoint
+
+def rewind(recentHashes,forkPoint):
+    """ Forget the remembered hashes from forkPoint on, returns the 'reorg' item. """
+    orphaned = [recentHashes.pop(number) for number in sorted(recentHashes) if number >= forkPoint]
+    return {'fromBlock': forkPoint, 'orphaned': orphaned}
+
+def streamChain(ip,port,fromBlock=0,toBlock=None,rangeSize=50,workers=4,fullTransactions=True,includeLogs=True,
+                checkpoint=None,confirmations=0,pollInterval=0.5,reorgDepth=128,knownHashes=None):
+    """ Generator of ('block', block), ('transaction', transaction) and ('log', log) tuples in chain order.
+        When the chain was reorganized under what was emitted (or under the checkpoint), a
+        ('reorg', {'fromBlock': n, 'orphaned': [block hashes]}) tuple comes first: everything from block n
+        on is no longer canonical, and the new chain is streamed again from block n.
+          fromBlock     - first block number, ignored when checkpoint has a saved position.
+          toBlock       - last block number, None to keep following the head forever.
+          rangeSize     - blocks fetched per batched request.
+          workers       - ranges fetched in parallel, at most 2*workers ranges are held in memory.
+          checkpoint    - optional ChainCheckpoint (or path), saved after every range has been consumed.
+          confirmations - stay this many blocks behind the head.
+          pollInterval  - seconds between head polls once caught up.
+          reorgDepth    - hashes of this many recent blocks are remembered, the deepest reorg that is
+                          rewound exactly (a deeper one rewinds to the oldest block remembered).
+          knownHashes   - block number -> hash of blocks the consumer already has (up to fromBlock - 1),
+                          checked on start like a checkpoint's, ignored when checkpoint has a saved position.
+    """
+    if isinstance(checkpoint, str):
+        checkpoint = ChainCheckpoint(checkpoint)
+    saved = checkpoint.load() if checkpoint != None else None
+    if saved != None:
+        fromBlock = saved['nextBlock']
+        knownHashes = saved['recentHashes']
+    # block number -> hash of the recently emitted blocks, oldest first
+    recentHashes = OrderedDict()
+    for number in sorted(knownHashes or {})[-reorgDepth:]:
+        recentHashes[number] = knownHashes[number]
+    if recentHashes:
+        # the chain may have been reorganized while nothing was running
+        forkPoint = findForkPoint(ip, port, recentHashes)
+        if forkPoint != None:
+            yield ('reorg', rewind(recentHashes, forkPoint))
+            fromBlock = min(fromBlock, forkPoint)
+            if checkpoint != None:
+                checkpoint.save(fromBlock, next(reversed(recentHashes.values()), None), recentHashes)
+
+    nextBlock = fromBlock
+    pending = []
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while toBlock == None or nextBlock <= toBlock:
+            head = getHeadNumber(ip, port) - confirmations
+            if toBlock != None:
+                head = min(head, toBlock)
+            # queue up ranges, bounded so memory use does not grow with the chain's length
+            scheduled = pending[-1][1] + 1 if pending else nextBlock
+            while scheduled <= head and len(pending) < 2 * workers:
+                end = min(scheduled + rangeSize - 1, head)
+                pending.append((scheduled, end, executor.submit(fetchRange, ip, port, scheduled, end, fullTransactions, includeLogs)))
+                scheduled = end + 1
+            if not pending:
+                # caught up, follow the head
+                time.sleep(pollInterval)
+                continue
+
+            start, end, future = pending.pop(0)
+            lastHash = None
+            forkPoint = None
+            for block, logs in future.result():
+                number = int(block['number'], 16)
+                if recentHashes.get(number - 1, block['parentHash']) != block['parentHash']:
+                    # not built on the block emitted before it, find how far back the chains agree. If they
+                    # still agree everywhere, the fetched block was itself replaced since, it is fetched again.
+                    forkPoint = findForkPoint(ip, port, recentHashes)
+                    break
+                yield ('block', block)
+                if fullTransactions:
+                    for transaction in block['transactions']:
+                        yield ('transaction', transaction)
+                for log in logs:
+                    yield ('log', log)
+                nextBlock = number + 1
+                lastHash = block['hash']
+                recentHashes[number] = lastHash
+                while len(recentHashes) > reorgDepth:
+                    recentHashes.popitem(last=False)
+            if forkPoint != None:
+                yield ('reorg', rewind(recentHashes, forkPoint))
+                nextBlock = forkPoint
+                lastHash = next(reversed(recentHashes.values()), None)
+            if nextBlock <= end:
+                # the client did not have every block of the range yet (or reorganized it), drop what was queued after it
+                for queued in pending:
+                    queued[2].cancel()
+                pending = []
+            if checkpoint != None and (lastHash != None or forkPoint != None):
+                checkpoint.save(nextBlock, lastHash, recentHashes)
+    finally:
+        for queued in pending:
+            queued[2].cancel()
+        executor.shutdown(wait=False)
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Stream blocks, transactions and logs as json lines.')
+    parser.add_argument('ip')
+    parser.add_argument('port')
+    parser.add_argument('--from', dest='fromBlock', type=int, default=0)
+    parser.add_argument('--to', dest='toBlock', type=int, default=None)
+    parser.add_argument('--range-size', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--confirmations', type=int, default=0)
+    parser.add_argument('--checkpoint', default=None, help='file to save/resume progress')
+    args = parser.parse_args()
+
+    for kind, item in streamChain(args.ip, args.port, args.fromBlock, args.toBlock, args.range_size, args.workers,
+                                  checkpoint=args.checkpoint, confirmations=args.confirmations):
+        sys.stdout.write(json.dumps({'type': kind, 'data': item}) + "\n")
@@ -0,0 +1,263 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Bulk reader of a contract's storage variables.
+#
+#    Given a layout of the contract's state variables (scalar slots, packed
+#    variables, structs, mappings with the keys to read, fixed and dynamic
+#    arrays, strings/bytes), every storage slot is computed locally with
+#    solidity's rules (keccak256 for mapping entries and dynamic data) and
+#    all of them are fetched with concurrent batched eth_getStorageAt
+#    requests at one pinned block. Reading dynamic array lengths and long
+#    strings takes one extra round trip each level.
+#
+#    ./contractStorage.py 127.0.0.1 9000 <contractAddress> layout.json
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import json
+import pprint
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from abiCodec import WORD, staticCodec, hexToBytes
+from keccak import keccak256
+from networkGethClients import rpcCommand, rpcBatchCommand
+
+
+def slotBytes(slot):
+    return slot.to_bytes(WORD, 'big')
+
+def mappingSlot(keyType,key,slot):
+    """ Slot of mapping[key] for a mapping stored at slot: keccak256(key . slot). """
+    if keyType == 'string':
+        raw = key.encode('utf-8')
+    elif keyType == 'bytes':
+        raw = hexToBytes(key) if isinstance(key, str) else bytes(key)
+    else:
+        raw = bytearray(WORD)
+        staticCodec(keyType)[0](memoryview(raw), 0, key)
+    return int.from_bytes(keccak256(bytes(raw) + slotBytes(slot)), 'big')
+
+def dataSlot(slot):
+    """ First slot of the data of a dynamic array or long string stored at slot. """
+    return int.from_bytes(keccak256(slotBytes(slot)), 'big')
+
+def typeSize(spec):
+    """ Bytes a value takes in storage, values smaller than a slot are packed together. """
+    abiType = spec['type']
+    match = re.match(r'^u?int(\d*)$', abiType)
+    if match:
+        return int(match.group(1) or 256) // 8
+    if abiType == 'address':
+        return 20
+    if abiType == 'bool':
+        return 1
+    match = re.match(r'^bytes(\d+)$', abiType)
+    if match:
+        return int(match.group(1))
+    return WORD * slotCount(spec)
+
+def slotCount(spec):
+    """ Slots a value takes up: structs and fixed size arrays span several. """
+    if spec['type'] == 'struct':
+        if 'slots' in spec:
+            return spec['slots']
+        return max(field.get('slot', 0) + 1 for field in normalizeFields(spec['fields']).values())
+    if spec['type'] == 'array' and 'size' in spec:
+        value = normalizeSpec(spec['value'])
+        perSlot = WORD // typeSize(value) if typeSize(value) < WORD else 0
+        if perSlot:
+            return (spec['size'] + perSlot - 1) // perSlot
+        return spec['size'] * slotCount(value)
+    return 1
+
+def normalizeSpec(spec):
+    """ 'uint256' is short for {'type': 'uint256'}. """
+    return {'type': spec} if isinstance(spec, str) else spec
+
+def normalizeFields(fields):
+    return dict((name, normalizeSpec(spec)) for name, spec in fields.items())
+
+def decodeValue(abiType,word,offset,size):
+    """ Decode a value type from a 32 byte slot, packed values sit offset bytes from the slot's right end. """
+    raw = word[WORD - offset - size:WORD - offset]
+    if abiType.startswith('bytes'):
+        padded = raw.ljust(WORD, b'\0')
+    elif abiType.startswith('int'):
+        padded = int.from_bytes(raw, 'big', signed=True).to_bytes(WORD, 'big', signed=True)
+    else:
+        padded = raw.rjust(WORD, b'\0')
+    value = staticCodec(abiType)[1](memoryview(padded), 0)
+    return "0x" + value.hex() if isinstance(value, bytes) else value
+
+
+class ArrayElements(dict):
+    """ index -> element of an array while it is being read, see finishArrays(). """
+
+    def __init__(self,asList=True):
+        dict.__init__(self)
+        self.asList = asList
+
+def finishArrays(value):
+    """ Turn the ArrayElements of whole arrays into lists (arrays read at some 'indexes' stay dicts). """
+    if isinstance(value, dict):
+        finished = dict((key, finishArrays(item)) for key, item in value.items())
+        if isinstance(value, ArrayElements) and value.asList:
+            return [finished[index] for index in sorted(finished)]
+        return finished
+    return value
+
+
+class StorageReader(object):
+    """ Reads contract storage variables laid out by a layout spec, all at one block.
+          batchSize - eth_getStorageAt calls per HTTP request.
+          workers   - batched requests in flight at once.
+
+        A layout is a dict of variable name -> spec:
+          {'slot': 0, 'type': 'uint256'}                    value types: uint<N>, int<N>, address, bool, bytes<N>
+          {'slot': 0, 'offset': 20, 'type': 'bool'}         packed into slot 0, 20 bytes from its right end
+          {'slot': 1, 'type': 'mapping', 'key': 'address', 'value': 'uint256', 'keys': [...]}
+          {'slot': 2, 'type': 'array', 'value': 'uint64'}   dynamic array, optionally 'indexes': [...] or 'limit'
+          {'slot': 3, 'type': 'array', 'value': 'uint64', 'size': 4}   fixed size array
+          {'slot': 5, 'type': 'string'}                     (or 'bytes')
+          {'slot': 6, 'type': 'struct', 'fields': {'id': {'slot': 0, 'type': 'uint64'}, ...}}
+        'value' and struct fields may be any spec themselves (field slots are relative to the struct).
+    """
+
+    def __init__(self,ip,port,batchSize=200,workers=4):
+        self.ip = ip
+        self.port = port
+        self.batchSize = batchSize
+        self.workers = workers
+
+    def blockParameter(self,block):
+        """ Pin 'latest' (or None) to the current block number so every read sees the same state. """
+        if block == None or block == 'latest':
+            return rpcCommand(ip=self.ip,port=self.port,method="eth_blockNumber",params=[],exceptions=True)
+        return hex(block) if isinstance(block, int) else block
+
+    def fetchSlots(self,address,slots,block):
+        """ slot -> 32 byte word for every slot, in concurrent batched requests. """
+        slots = sorted(set(slots))
+        chunks = [slots[start:start + self.batchSize] for start in range(0, len(slots), self.batchSize)]
+
+        def fetch(chunk):
+            return rpcBatchCommand([("eth_getStorageAt", [address, hex(slot), block]) for slot in chunk],
+                                   ip=self.ip, port=self.port, chunkSize=len(chunk), exceptions=True)
+
+        words = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(chunks)))) as executor:
+            for chunk, results in zip(chunks, executor.map(fetch, chunks)):
+                for slot, result in zip(chunk, results):
+                    words[slot] = hexToBytes(result).rjust(WORD, b'\0')[-WORD:]
+        return words
+
+    def read(self,address,layout,block=None):
+        """ Read every variable of layout from the contract at address.
+            Returns (values, blockNumber): values mirrors layout (mappings become dicts of
+            key -> value, arrays lists, structs dicts), blockNumber the '0x' block they were read at.
+        """
+        block = self.blockParameter(block)
+        values = {}
+        # (slot, callback(word)) for the next round trip
+        self.reads = []
+        for name, spec in layout.items():
+            spec = normalizeSpec(spec)
+            self.plan(values, name, spec, spec.get('slot', 0), spec.get('offset', 0))
+        while self.reads:
+            reads, self.reads = self.reads, []
+            words = self.fetchSlots(address, [slot for slot, callback in reads], block)
+            for slot, callback in reads:
+                callback(words[slot])
+        return finishArrays(values), block
+
+    def plan(self,container,key,spec,slot,offset=0):
+        """ Queue the reads that fill container[key] with the value described by spec at slot. """
+        abiType = spec['type']
+        if abiType == 'struct':
+            container[key] = {}
+            for name, field in normalizeFields(spec['fields']).items():
+                self.plan(container[key], name, field, slot + field.get('slot', 0), field.get('offset', 0))
+        elif abiType == 'mapping':
+            container[key] = {}
+            value = normalizeSpec(spec['value'])
+            for mapKey in spec.get('keys', []):
+                self.plan(container[key], mapKey, value, mappingSlot(spec['key'], mapKey, slot))
+        elif abiType == 'array' and 'size' in spec:
+            self.planElements(container, key, spec, slot, range(spec['size']))
+        elif abiType == 'array':
+            def withLength(word):
+                length = int.from_bytes(word, 'big')
+                indexes = spec.get('indexes')
+                if indexes == None:
+                    indexes = range(min(length, spec.get('limit', length)))
+                self.planElements(container, key, spec, dataSlot(slot), [index for index in indexes if index < length])
+            self.reads.append((slot, withLength))
+        elif abiType in ('string', 'bytes'):
+            self.reads.append((slot, lambda word: self.planBytes(container, key, abiType, slot, word)))
+        else:
+            size = typeSize(spec)
+            self.reads.append((slot, lambda word: container.__setitem__(key, decodeValue(abiType, word, offset, size))))
+
+    def planElements(self,container,key,spec,firstSlot,indexes):
+        value = normalizeSpec(spec['value'])
+        size = typeSize(value)
+        elements = container[key] = ArrayElements(asList='indexes' not in spec)
+        for index in indexes:
+            if size < WORD:
+                perSlot = WORD // size
+                self.plan(elements, index, value, firstSlot + index // perSlot, (index % perSlot) * size)
+            else:
+                self.plan(elements, index, value, firstSlot + index * slotCount(value))
+
+    def planBytes(self,container,key,abiType,slot,word):
+        """ Short values (< 32 bytes) live in the slot itself, long ones in the slots at keccak256(slot). """
+        if word[-1] & 1 == 0:
+            length = word[-1] // 2
+            container[key] = self.decodeBytes(abiType, word[:length])
+            return
+        length = (int.from_bytes(word, 'big') - 1) // 2
+        first = dataSlot(slot)
+        count = (length + WORD - 1) // WORD
+        parts = {}
+
+        def collect(index):
+            def callback(word):
+                parts[index] = word
+                if len(parts) == count:
+                    container[key] = self.decodeBytes(abiType, b''.join(parts[part] for part in range(count))[:length])
+            return callback
+        for index in range(count):
+            self.reads.append((first + index, collect(index)))
+
+    def decodeBytes(self,abiType,raw):
+        return raw.decode('utf-8', 'replace') if abiType == 'string' else "0x" + raw.hex()
+
+
+def readContractStorage(ip,port,address,layout,block=None,batchSize=200,workers=4):
+    """ Read every variable of layout (see StorageReader) at block (default: the current head).
+        Returns (values, blockNumber).
+    """
+    return StorageReader(ip, port, batchSize=batchSize, workers=workers).read(address, layout, block)
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    if len(sys.argv) < 5:
+        print ("usage: ./contractStorage.py <ip> <port> <contractAddress> <layout.json> [block]")
+        sys.exit(1)
+    with open(sys.argv[4]) as layoutFile:
+        layout = json.load(layoutFile)
+    values, blockNumber = readContractStorage(sys.argv[1], sys.argv[2], sys.argv[3], layout,
+                                              block=sys.argv[5] if len(sys.argv) > 5 else None)
+    print ("At Block Number: " + blockNumber)
+    pprint.pprint(values)
@@ -0,0 +1,352 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Ethereum keys without geth: secp256k1 public keys, account addresses,
+# node (enode) ids and version 3 keystore files that geth can unlock.
+#
+#    Keystores are encrypted with AES-128-CTR under a key from scrypt when
+#    hashlib has it (python 3.6+ with OpenSSL 1.1), otherwise from
+#    PBKDF2-HMAC-SHA256 (hashlib's, in C on every python 3), which geth
+#    reads just as well. Existing scrypt keystores are still decrypted
+#    without hashlib.scrypt, by a pure python scrypt (about half a minute
+#    per key with the light parameters).
+#    AES comes from pycryptodome when it is installed, otherwise a pure
+#    python AES (only two blocks are encrypted per key, so it costs nothing
+#    noticeable).
+#
+#    ./ethKeys.py <privateKeyHex>
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+import uuid
+from keccak import keccak256
+
+##############################################################################
+# secp256k1
+##############################################################################
+
+FIELD = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+GENERATOR = (0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+             0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8)
+
+def jacobianDouble(point):
+    x, y, z = point
+    if y == 0:
+        return (0, 0, 0)
+    ySquared = y * y % FIELD
+    s = 4 * x * ySquared % FIELD
+    m = 3 * x * x % FIELD
+    newX = (m * m - 2 * s) % FIELD
+    return (newX, (m * (s - newX) - 8 * ySquared * ySquared) % FIELD, 2 * y * z % FIELD)
+
+def jacobianAdd(point,other):
+    """ point + other, other in affine coordinates (z = 1). """
+    x1, y1, z1 = point
+    if z1 == 0:
+        return (other[0], other[1], 1)
+    x2, y2 = other
+    zSquared = z1 * z1 % FIELD
+    u2 = x2 * zSquared % FIELD
+    s2 = y2 * zSquared * z1 % FIELD
+    if u2 == x1:
+        return jacobianDouble(point) if s2 == y1 else (0, 0, 0)
+    h = (u2 - x1) % FIELD
+    r = (s2 - y1) % FIELD
+    hSquared = h * h % FIELD
+    hCubed = hSquared * h % FIELD
+    x1hSquared = x1 * hSquared % FIELD
+    newX = (r * r - hCubed - 2 * x1hSquared) % FIELD
+    return (newX, (r * (x1hSquared - newX) - y1 * hCubed) % FIELD, h * z1 % FIELD)
+
+def publicKey(privateKey):
+    """ The 64 byte uncompressed public key (x . y) of an int private key. """
+    if not 0 < privateKey < ORDER:
+        raise ValueError('private key out of range')
+    point = (0, 0, 0)
+    for bit in bin(privateKey)[2:]:
+        point = jacobianDouble(point)
+        if bit == '1':
+            point = jacobianAdd(point, GENERATOR)
+    x, y, z = point
+    zInverse = pow(z, FIELD - 2, FIELD)
+    zInverseSquared = zInverse * zInverse % FIELD
+    return ((x * zInverseSquared % FIELD).to_bytes(32, 'big') +
+            (y * zInverseSquared * zInverse % FIELD).to_bytes(32, 'big'))
+
+def addressOf(publicKeyBytes):
+    """ '0x' account address of a 64 byte public key. """
+    return "0x" + keccak256(publicKeyBytes)[12:].hex()
+
+def derivePrivateKey(seed,name):
+    """ A reproducible private key for name (same seed and name, same key), for test networks only. """
+    counter = 0
+    while True:
+        key = int.from_bytes(keccak256((str(seed) + "/" + str(name) + "/" + str(counter)).encode('utf-8')), 'big')
+        if 0 < key < ORDER:
+            return key
+        counter += 1
+
+##############################################################################
+# AES-128 (encryption only, enough for CTR mode)
+##############################################################################
+
+def makeSbox():
+    sbox = [0] * 256
+    p = q = 1
+    while True:
+        # p walks the multiplicative group by 3, q by its inverse
+        p = (p ^ (p << 1) ^ (0x1B if p & 0x80 else 0)) & 0xFF
+        q ^= q << 1
+        q ^= q << 2
+        q ^= q << 4
+        q &= 0xFF
+        if q & 0x80:
+            q ^= 0x09
+        rotated = q ^ ((q << 1) | (q >> 7)) ^ ((q << 2) | (q >> 6)) ^ ((q << 3) | (q >> 5)) ^ ((q << 4) | (q >> 4))
+        sbox[p] = (rotated ^ 0x63) & 0xFF
+        if p == 1:
+            break
+    sbox[0] = 0x63
+    return sbox
+
+SBOX = makeSbox()
+
+def xtime(value):
+    return ((value << 1) ^ 0x1B) & 0xFF if value & 0x80 else value << 1
+
+def expandKey(key):
+    """ The 11 round keys (16 bytes each) of a 16 byte key. """
+    words = [list(key[index:index + 4]) for index in range(0, 16, 4)]
+    roundConstant = 1
+    while len(words) < 44:
+        word = list(words[-1])
+        if len(words) % 4 == 0:
+            word = [SBOX[word[1]] ^ roundConstant, SBOX[word[2]], SBOX[word[3]], SBOX[word[0]]]
+            roundConstant = xtime(roundConstant)
+        words.append([a ^ b for a, b in zip(words[-4], word)])
+    return [sum(words[index:index + 4], []) for index in range(0, 44, 4)]
+
+def pureAesEncryptBlock(roundKeys,block):
+    state = [a ^ b for a, b in zip(block, roundKeys[0])]
+    for round in range(1, 11):
+        state = [SBOX[value] for value in state]
+        # shift rows, the state is column major: byte (row, column) at 4 * column + row
+        state = [state[(index + 4 * (index % 4)) % 16] for index in range(16)]
+        if round != 10:
+            mixed = []
+            for column in range(0, 16, 4):
+                a0, a1, a2, a3 = state[column:column + 4]
+                total = a0 ^ a1 ^ a2 ^ a3
+                mixed += [a0 ^ total ^ xtime(a0 ^ a1), a1 ^ total ^ xtime(a1 ^ a2),
+                          a2 ^ total ^ xtime(a2 ^ a3), a3 ^ total ^ xtime(a3 ^ a0)]
+            state = mixed
+        state = [a ^ b for a, b in zip(state, roundKeys[round])]
+    return bytes(state)
+
+def pureAes128Ctr(key,iv,data):
+    roundKeys = expandKey(key)
+    counter = int.from_bytes(iv, 'big')
+    stream = bytearray()
+    while len(stream) < len(data):
+        stream += pureAesEncryptBlock(roundKeys, counter.to_bytes(16, 'big'))
+        counter = (counter + 1) % (1 << 128)
+    return bytes(a ^ b for a, b in zip(data, stream))
+
+try:
+    from Crypto.Cipher import AES
+    from Crypto.Util import Counter
+
+    def aes128Ctr(key,iv,data):
+        """ AES-128-CTR of data (encryption and decryption are the same). """
+        return AES.new(key, AES.MODE_CTR, counter=Counter.new(128, initial_value=int.from_bytes(iv, 'big'))).encrypt(data)
+except ImportError:
+    aes128Ctr = pureAes128Ctr
+
+##############################################################################
+# Keystore files
+##############################################################################
+
+# geth's default scrypt parameters, and the ones of 'geth --lightkdf' (quick to create and unlock)
+STANDARD_SCRYPT = {'kdf': 'scrypt', 'n': 262144, 'r': 8, 'p': 1}
+LIGHT_SCRYPT = {'kdf': 'scrypt', 'n': 4096, 'r': 8, 'p': 6}
+# PBKDF2-HMAC-SHA256 iteration counts, for pythons without hashlib.scrypt
+STANDARD_PBKDF2 = {'kdf': 'pbkdf2', 'c': 262144}
+LIGHT_PBKDF2 = {'kdf': 'pbkdf2', 'c': 8192}
+STANDARD_KDF = STANDARD_SCRYPT if hasattr(hashlib, 'scrypt') else STANDARD_PBKDF2
+LIGHT_KDF = LIGHT_SCRYPT if hasattr(hashlib, 'scrypt') else LIGHT_PBKDF2
+
+def salsa20_8(words):
+    """ The Salsa20/8 core of 16 uint32 words (unrolled, this is where pure scrypt spends its time). """
+    x0, x1, x2, x3, x4, x5, x6, x7, x8, x9, x10, x11, x12, x13, x14, x15 = words
+    for round in range(4):
+        # column round
+        t = (x0 + x12) & 0xFFFFFFFF
+        x4 ^= ((t << 7) | (t >> 25)) & 0xFFFFFFFF
+        t = (x4 + x0) & 0xFFFFFFFF
+        x8 ^= ((t << 9) | (t >> 23)) & 0xFFFFFFFF
+        t = (x8 + x4) & 0xFFFFFFFF
+        x12 ^= ((t << 13) | (t >> 19)) & 0xFFFFFFFF
+        t = (x12 + x8) & 0xFFFFFFFF
+        x0 ^= ((t << 18) | (t >> 14)) & 0xFFFFFFFF
+        t = (x5 + x1) & 0xFFFFFFFF
+        x9 ^= ((t << 7) | (t >> 25)) & 0xFFFFFFFF
+        t = (x9 + x5) & 0xFFFFFFFF
+        x13 ^= ((t << 9) | (t >> 23)) & 0xFFFFFFFF
+        t = (x13 + x9) & 0xFFFFFFFF
+        x1 ^= ((t << 13) | (t >> 19)) & 0xFFFFFFFF
+        t = (x1 + x13) & 0xFFFFFFFF
+        x5 ^= ((t << 18) | (t >> 14)) & 0xFFFFFFFF
+        t = (x10 + x6) & 0xFFFFFFFF
+        x14 ^= ((t << 7) | (t >> 25)) & 0xFFFFFFFF
+        t = (x14 + x10) & 0xFFFFFFFF
+        x2 ^= ((t << 9) | (t >> 23)) & 0xFFFFFFFF
+        t = (x2 + x14) & 0xFFFFFFFF
+        x6 ^= ((t << 13) | (t >> 19)) & 0xFFFFFFFF
+        t = (x6 + x2) & 0xFFFFFFFF
+        x10 ^= ((t << 18) | (t >> 14)) & 0xFFFFFFFF
+        t = (x15 + x11) & 0xFFFFFFFF
+        x3 ^= ((t << 7) | (t >> 25)) & 0xFFFFFFFF
+        t = (x3 + x15) & 0xFFFFFFFF
+        x7 ^= ((t << 9) | (t >> 23)) & 0xFFFFFFFF
+        t = (x7 + x3) & 0xFFFFFFFF
+        x11 ^= ((t << 13) | (t >> 19)) & 0xFFFFFFFF
+        t = (x11 + x7) & 0xFFFFFFFF
+        x15 ^= ((t << 18) | (t >> 14)) & 0xFFFFFFFF
+        # row round
+        t = (x0 + x3) & 0xFFFFFFFF
+        x1 ^= ((t << 7) | (t >> 25)) & 0xFFFFFFFF
+        t = (x1 + x0) & 0xFFFFFFFF
+        x2 ^= ((t << 9) | (t >> 23)) & 0xFFFFFFFF
+        t = (x2 + x1) & 0xFFFFFFFF
+        x3 ^= ((t << 13) | (t >> 19)) & 0xFFFFFFFF
+        t = (x3 + x2) & 0xFFFFFFFF
+        x0 ^= ((t << 18) | (t >> 14)) & 0xFFFFFFFF
+        t = (x5 + x4) & 0xFFFFFFFF
+        x6 ^= ((t << 7) | (t >> 25)) & 0xFFFFFFFF
+        t = (x6 + x5) & 0xFFFFFFFF
+        x7 ^= ((t << 9) | (t >> 23)) & 0xFFFFFFFF
+        t = (x7 + x6) & 0xFFFFFFFF
+        x4 ^= ((t << 13) | (t >> 19)) & 0xFFFFFFFF
+        t = (x4 + x7) & 0xFFFFFFFF
+        x5 ^= ((t << 18) | (t >> 14)) & 0xFFFFFFFF
+        t = (x10 + x9) & 0xFFFFFFFF
+        x11 ^= ((t << 7) | (t >> 25)) & 0xFFFFFFFF
+        t = (x11 + x10) & 0xFFFFFFFF
+        x8 ^= ((t << 9) | (t >> 23)) & 0xFFFFFFFF
+        t = (x8 + x11) & 0xFFFFFFFF
+        x9 ^= ((t << 13) | (t >> 19)) & 0xFFFFFFFF
+        t = (x9 + x8) & 0xFFFFFFFF
+        x10 ^= ((t << 18) | (t >> 14)) & 0xFFFFFFFF
+        t = (x15 + x14) & 0xFFFFFFFF
+        x12 ^= ((t << 7) | (t >> 25)) & 0xFFFFFFFF
+        t = (x12 + x15) & 0xFFFFFFFF
+        x13 ^= ((t << 9) | (t >> 23)) & 0xFFFFFFFF
+        t = (x13 + x12) & 0xFFFFFFFF
+        x14 ^= ((t << 13) | (t >> 19)) & 0xFFFFFFFF
+        t = (x14 + x13) & 0xFFFFFFFF
+        x15 ^= ((t << 18) | (t >> 14)) & 0xFFFFFFFF
+    return [(x0 + words[0]) & 0xFFFFFFFF, (x1 + words[1]) & 0xFFFFFFFF, (x2 + words[2]) & 0xFFFFFFFF,
+            (x3 + words[3]) & 0xFFFFFFFF, (x4 + words[4]) & 0xFFFFFFFF, (x5 + words[5]) & 0xFFFFFFFF,
+            (x6 + words[6]) & 0xFFFFFFFF, (x7 + words[7]) & 0xFFFFFFFF, (x8 + words[8]) & 0xFFFFFFFF,
+            (x9 + words[9]) & 0xFFFFFFFF, (x10 + words[10]) & 0xFFFFFFFF, (x11 + words[11]) & 0xFFFFFFFF,
+            (x12 + words[12]) & 0xFFFFFFFF, (x13 + words[13]) & 0xFFFFFFFF, (x14 + words[14]) & 0xFFFFFFFF,
+            (x15 + words[15]) & 0xFFFFFFFF]
+
+def blockMix(blocks):
+    """ scrypt's BlockMix of 2r blocks of 16 words, the even outputs first, then the odd ones. """
+    x = blocks[-1]
+    mixed = []
+    for block in blocks:
+        x = salsa20_8([a ^ b for a, b in zip(x, block)])
+        mixed.append(x)
+    return mixed[0::2] + mixed[1::2]
+
+def pureScrypt(password,salt,n,r,p,dklen=32):
+    """ scrypt (RFC 7914) with hashlib's PBKDF2-HMAC-SHA256 around a python ROMix. """
+    data = hashlib.pbkdf2_hmac('sha256', password, salt, 1, p * 128 * r)
+    output = bytearray()
+    for chunk in range(p):
+        words = struct.unpack('<' + str(32 * r) + 'I', data[chunk * 128 * r:(chunk + 1) * 128 * r])
+        blocks = [list(words[index:index + 16]) for index in range(0, 32 * r, 16)]
+        table = []
+        for step in range(n):
+            table.append(blocks)
+            blocks = blockMix(blocks)
+        for step in range(n):
+            other = table[blocks[-1][0] % n]
+            blocks = blockMix([[a ^ b for a, b in zip(block, otherBlock)] for block, otherBlock in zip(blocks, other)])
+        output += struct.pack('<' + str(32 * r) + 'I', *[word for block in blocks for word in block])
+    return hashlib.pbkdf2_hmac('sha256', password, bytes(output), 1, dklen)
+
+def scrypt(password,salt,n,r,p,dklen=32):
+    if hasattr(hashlib, 'scrypt'):
+        return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p, dklen=dklen,
+                              maxmem=128 * r * (n + p + 2) + 1024 * 1024)
+    return pureScrypt(password.encode('utf-8'), salt, n, r, p, dklen)
+
+def deriveKey(password,kdf,params):
+    """ The key the kdf ('scrypt' or 'pbkdf2') and kdfparams of a version 3 keystore derive from password. """
+    salt = bytes.fromhex(params['salt'])
+    if kdf == 'scrypt':
+        return scrypt(password, salt, params['n'], params['r'], params['p'], params['dklen'])
+    if kdf == 'pbkdf2' and params.get('prf') == 'hmac-sha256':
+        return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, params['c'], params['dklen'])
+    raise ValueError('unsupported keystore kdf: ' + str(kdf) + ' ' + str(params.get('prf', '')))
+
+def makeKeystore(privateKey,password,kdf=LIGHT_KDF):
+    """ Version 3 keystore (dict) of an int private key, encrypted with password. """
+    iv = os.urandom(16)
+    kdfName = kdf.get('kdf', 'scrypt')
+    params = {'dklen': 32, 'salt': os.urandom(32).hex()}
+    if kdfName == 'scrypt':
+        params.update(n=kdf['n'], r=kdf['r'], p=kdf['p'])
+    else:
+        params.update(c=kdf['c'], prf='hmac-sha256')
+    derived = deriveKey(password, kdfName, params)
+    ciphertext = aes128Ctr(derived[:16], iv, privateKey.to_bytes(32, 'big'))
+    return {'address': addressOf(publicKey(privateKey))[2:],
+            'crypto': {'cipher': 'aes-128-ctr', 'ciphertext': ciphertext.hex(), 'cipherparams': {'iv': iv.hex()},
+                       'kdf': kdfName, 'kdfparams': params, 'mac': keccak256(derived[16:32] + ciphertext).hex()},
+            'id': str(uuid.uuid4()), 'version': 3}
+
+def decryptKeystore(keystore,password):
+    """ The int private key of a version 3 keystore, ValueError for a wrong password. """
+    crypto = keystore.get('crypto') or keystore['Crypto']
+    derived = deriveKey(password, crypto['kdf'], crypto['kdfparams'])
+    ciphertext = bytes.fromhex(crypto['ciphertext'])
+    if keccak256(derived[16:32] + ciphertext).hex() != crypto['mac']:
+        raise ValueError('wrong password for keystore')
+    return int.from_bytes(aes128Ctr(derived[:16], bytes.fromhex(crypto['cipherparams']['iv']), ciphertext), 'big')
+
+def keystoreFileName(address,created=None):
+    """ geth's keystore file name, UTC--<time>--<address without 0x>. """
+    created = time.time() if created == None else created
+    stamp = time.strftime('%Y-%m-%dT%H-%M-%S', time.gmtime(created)) + ".%09dZ" % int((created % 1) * 1e9)
+    return "UTC--" + stamp + "--" + address.lower().replace("0x", "")
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    if len(sys.argv) < 2:
+        print ("usage: ./ethKeys.py <privateKeyHex>")
+        sys.exit(1)
+    key = int(sys.argv[1], 16)
+    public = publicKey(key)
+    print ("address: " + addressOf(public))
+    print ("node id: " + public.hex())
+    print (json.dumps(makeKeystore(key, "password")))
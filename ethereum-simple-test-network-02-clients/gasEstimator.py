@@ -0,0 +1,246 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Gas estimates and gas prices for the ethereum RPC "2.0" helper methods.
+#
+#    Instead of reserving a fixed "0x200000" gas for every transaction, the
+#    gas is estimated with eth_estimateGas and a safety margin is added.
+#    Estimates are memoized per (contract code hash, function selector,
+#    argument shape), so a repeated call such as SimpleStorage set(x)
+#    skips the round trip, and the estimates missing for many pending
+#    transactions are fetched in one batched request. Sent transactions are
+#    tracked, and a receipt showing one failed or used all of its gas makes
+#    the estimate it was given forgotten. The gas price is taken from the
+#    transactions of the recent blocks, only the blocks new since the last
+#    look are fetched.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import threading
+import time
+from collections import OrderedDict
+from keccak import keccak256
+
+# gas reserved when estimation is turned off (what the helpers always used before)
+DEFAULT_GAS = "0x200000"
+
+def isError(results):
+    return isinstance(results, dict) and 'error' in results
+
+def transactionData(transaction):
+    return transaction.get('data') or transaction.get('input') or "0x"
+
+def hashHex(hexString):
+    return keccak256(bytes.fromhex(hexString[2:] if hexString.startswith("0x") else hexString)).hex()
+
+
+class GasEstimator(object):
+    """ Memoized gas estimates and recent gas prices, shared by every client of a network.
+          margin          - fraction added on top of every estimate.
+          maxEntries      - most memoized estimates, least recently used are evicted first.
+          priceBlocks     - number of recent blocks the gas price is taken from.
+          pricePercentile - percentile of the gas prices paid in those blocks that is suggested.
+          priceTtl        - seconds a gas price is used before the client's head is checked again.
+        A call's argument shape is the length of its call data and whether it sends ether. Calls of the
+        same shape can still differ in cost (storing into an empty slot costs more than overwriting one),
+        so the memo keeps the highest estimate seen, and observe() forgets an estimate that ran out of gas:
+        the helpers track() what they send and observe() the receipts they get.
+    """
+
+    def __init__(self,margin=0.25,maxEntries=10000,priceBlocks=20,pricePercentile=0.6,priceTtl=2.0):
+        self.margin = margin
+        self.maxEntries = maxEntries
+        self.priceBlocks = priceBlocks
+        self.pricePercentile = pricePercentile
+        self.priceTtl = priceTtl
+        self.lock = threading.Lock()
+        # shape key -> estimated gas (int, without margin), in least to most recently used order
+        self.estimates = OrderedDict()
+        # contract address -> keccak of its code
+        self.codeHashes = {}
+        # node -> {'head': n, 'blocks': OrderedDict of number -> [gas prices], 'price': hex, 'gasLimit': n, 'checkedAt': t}
+        self.prices = {}
+        # transaction hash -> (shape key, gas sent) of the sent transactions whose receipt was not observed yet
+        self.sent = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.forgotten = 0
+
+    ##########################################################################
+    # estimates
+    ##########################################################################
+
+    def shapeKey(self,transaction):
+        """ Memo key of a transaction, None while the code of its target is not known. """
+        data = transactionData(transaction)
+        sendsValue = transaction.get('value') not in (None, "0x", "0x0", 0)
+        if not transaction.get('to'):
+            # contract creation, code and constructor arguments are hashed whole
+            return ('create', hashHex(data), sendsValue)
+        codeHash = self.codeHashes.get(transaction['to'].lower())
+        if codeHash == None:
+            return None
+        return (codeHash, data[:10], len(data), sendsValue)
+
+    def withMargin(self,gas,gasLimit=None):
+        gas = int(gas * (1.0 + self.margin))
+        return hex(min(gas, gasLimit) if gasLimit else gas)
+
+    def estimateMany(self,transactions,fetch,node=None):
+        """ Gas (hex, with margin) for each transaction dict ('from', 'to', 'data', 'value').
+              fetch - function(list of (method, params)) -> list of results, one batched request
+                      to the client (rpcBatchCommand).
+              node  - the client's (ip, port), estimates are capped at its block gas limit once known.
+            A transaction that cannot be estimated (it would fail) gets the client's error dict instead.
+        """
+        transactions = list(transactions)
+        unknownCode = sorted(set(transaction['to'].lower() for transaction in transactions
+                                 if transaction.get('to') and transaction['to'].lower() not in self.codeHashes))
+        if unknownCode:
+            for address, code in zip(unknownCode, fetch([("eth_getCode", [address, "latest"]) for address in unknownCode])):
+                # no code yet (not mined, or not a contract) is not remembered
+                if isinstance(code, str) and code not in ("0x", ""):
+                    with self.lock:
+                        self.codeHashes[address] = hashHex(code)
+        results = [None] * len(transactions)
+        missing = OrderedDict()
+        with self.lock:
+            keys = [self.shapeKey(transaction) for transaction in transactions]
+            for index, key in enumerate(keys):
+                if key != None and key in self.estimates:
+                    self.estimates.move_to_end(key)
+                    results[index] = self.estimates[key]
+                    self.hits += 1
+                else:
+                    # one estimate per shape, (no shape: one per transaction)
+                    missing.setdefault(key if key != None else ('transaction', index), []).append(index)
+                    self.misses += 1
+        if missing:
+            calls = []
+            for indexes in missing.values():
+                transaction = transactions[indexes[0]]
+                calls.append(("eth_estimateGas", [dict((field, value) for field, value in transaction.items()
+                                                       if field in ('from', 'to', 'data', 'input', 'value'))]))
+            for (key, indexes), estimate in zip(missing.items(), fetch(calls)):
+                if not isinstance(estimate, str):
+                    for index in indexes:
+                        results[index] = estimate
+                    continue
+                gas = int(estimate, 16)
+                if key[0] != 'transaction':
+                    with self.lock:
+                        gas = max(gas, self.estimates.get(key, 0))
+                        self.estimates[key] = gas
+                        self.estimates.move_to_end(key)
+                        while len(self.estimates) > self.maxEntries:
+                            self.estimates.popitem(last=False)
+                for index in indexes:
+                    results[index] = gas
+        gasLimit = self.prices.get(node, {}).get('gasLimit') if node != None else None
+        return [self.withMargin(gas, gasLimit) if isinstance(gas, int) else gas for gas in results]
+
+    def track(self,transactionHash,transaction):
+        """ Remember the shape and gas of a sent transaction (dict with 'gas'), for observe(). """
+        if not isinstance(transactionHash, str) or not transaction.get('gas'):
+            return
+        with self.lock:
+            key = self.shapeKey(transaction)
+            if key == None:
+                return
+            self.sent[transactionHash] = (key, int(transaction['gas'], 16))
+            while len(self.sent) > self.maxEntries:
+                self.sent.popitem(last=False)
+
+    def tracked(self,transactionHash):
+        with self.lock:
+            return transactionHash in self.sent
+
+    def observe(self,receipt):
+        """ Forget the estimate a tracked transaction was sent with when its receipt shows it failed or
+            used all of its gas (it ran out), the next transaction of that shape is estimated again.
+        """
+        if not isinstance(receipt, dict) or 'gasUsed' not in receipt:
+            return
+        with self.lock:
+            entry = self.sent.pop(receipt.get('transactionHash'), None)
+            if entry == None:
+                return
+            key, gas = entry
+            if receipt.get('status') == "0x0" or int(receipt['gasUsed'], 16) >= gas:
+                if self.estimates.pop(key, None) != None:
+                    self.forgotten += 1
+
+    ##########################################################################
+    # gas price
+    ##########################################################################
+
+    def gasPrice(self,node,fetch):
+        """ Suggested gas price (hex) on node: the pricePercentile of the gas prices paid in the last
+            priceBlocks blocks, or the client's eth_gasPrice when they hold no transactions.
+        """
+        with self.lock:
+            state = self.prices.setdefault(node, {'head': None, 'blocks': OrderedDict(), 'price': None,
+                                                  'gasLimit': None, 'checkedAt': 0.0})
+            if state['price'] != None and time.time() - state['checkedAt'] < self.priceTtl:
+                return state['price']
+        head = fetch([("eth_blockNumber", [])])[0]
+        if not isinstance(head, str):
+            return state['price'] or head
+        head = int(head, 16)
+        if head == state['head'] and state['price'] != None:
+            state['checkedAt'] = time.time()
+            return state['price']
+        first = max(0, head - self.priceBlocks + 1)
+        if state['head'] != None and state['head'] <= head:
+            first = max(first, state['head'] + 1)
+        numbers = list(range(first, head + 1))
+        blocks = fetch([("eth_getBlockByNumber", [hex(number), True]) for number in numbers]) if numbers else []
+        with self.lock:
+            for number, block in zip(numbers, blocks):
+                if isinstance(block, dict):
+                    state['blocks'][number] = [int(transaction['gasPrice'], 16) for transaction in block.get('transactions', [])
+                                               if isinstance(transaction, dict) and transaction.get('gasPrice')]
+                    state['gasLimit'] = int(block['gasLimit'], 16) if block.get('gasLimit') else state['gasLimit']
+            for number in list(state['blocks']):
+                if number < head - self.priceBlocks + 1 or number > head:
+                    del state['blocks'][number]
+            paid = sorted(price for prices in state['blocks'].values() for price in prices)
+        if paid:
+            price = hex(paid[min(len(paid) - 1, int(self.pricePercentile * len(paid)))])
+        else:
+            price = fetch([("eth_gasPrice", [])])[0]
+            if not isinstance(price, str):
+                return state['price'] or price
+        with self.lock:
+            state.update(head=head, price=price, checkedAt=time.time())
+        return price
+
+    def stats(self):
+        with self.lock:
+            return {'estimates': len(self.estimates), 'codeHashes': len(self.codeHashes), 'hits': self.hits,
+                    'misses': self.misses, 'tracked': len(self.sent), 'forgotten': self.forgotten, 'prices': dict((":".join(node), state['price']) for node, state in self.prices.items())}
+
+
+##############################################################################
+# Shared estimator used by the helper methods, None when estimation is turned off.
+##############################################################################
+
+defaultEstimatorLock = threading.Lock()
+defaultEstimator = GasEstimator()
+
+def getDefaultEstimator():
+    """ Get the estimator shared by the helper methods, None if estimation is turned off. """
+    return defaultEstimator
+
+def configureDefaultEstimator(enabled=True,margin=0.25,maxEntries=10000,priceBlocks=20,pricePercentile=0.6,priceTtl=2.0):
+    """ Replace the shared estimator with one using the given settings (or turn it off, the helpers
+        then reserve DEFAULT_GAS again).
+    """
+    global defaultEstimator
+    with defaultEstimatorLock:
+        defaultEstimator = GasEstimator(margin, maxEntries, priceBlocks, pricePercentile, priceTtl) if enabled else None
+    return defaultEstimator
@@ -0,0 +1,441 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Follow the output.log of many geth clients at once and turn it into
+# structured events and timing metrics.
+#
+#    Files are read incrementally (only the bytes appended since the last
+#    read), woken by inotify on linux and by polling their size elsewhere.
+#    Rotated and truncated logs are followed. Block import, sealing and
+#    mining lines, p2p peers being added and dropped, and transaction pool
+#    messages become events; from them the propagation delay of every block
+#    to every client (import time minus the time it was sealed, or first
+#    seen) and the import time per block are measured.
+#
+#    Geth 1.7 logs timestamps to the second only. Lines that are read while
+#    following a log (rather than from its backlog) are timed when they
+#    arrive instead, which is as precise as the tailer's wake ups.
+#
+#    ./gethLogTailer.py --network network-02-clients.json
+#    ./gethLogTailer.py --log miner=/workspace/ethereum/test_network_001_1/miners/00001/output.log --events
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import re
+import select
+import struct
+import sys
+import time
+from rpcMetrics import LatencyHistogram
+
+##############################################################################
+# Parsing
+##############################################################################
+
+# INFO [11-10|04:32:20] Imported new chain segment               blocks=1 txs=0 ... (newer geth adds .mmm to the time)
+LINE_PATTERN = re.compile(r'^(?P<level>[A-Z]+)\s*\[(?P<month>\d\d)-(?P<day>\d\d)\|(?P<clock>\d\d:\d\d:\d\d)(?P<fraction>\.\d+)?\]\s*(?P<rest>.*)$')
+FIELD_PATTERN = re.compile(r'([A-Za-z_][\w.]*)=("(?:[^"\\]|\\.)*"|\S*)')
+DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(ns|µs|us|ms|s|m|h)')
+DURATION_UNITS = {'ns': 1e-9, 'µs': 1e-6, 'us': 1e-6, 'ms': 1e-3, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+# (event type, start of the log message), first match wins
+EVENT_MESSAGES = [
+    ('blockImported', "Imported new chain segment"),
+    ('blockInserted', "Inserted new block"),
+    ('blockSealed', "Successfully sealed new block"),
+    ('blockMined', "mined potential block"),
+    ('miningWork', "Commit new mining work"),
+    ('peerAdded', "Adding p2p peer"),
+    ('peerRemoved', "Removing p2p peer"),
+    ('peerConnected', "Ethereum peer connected"),
+    ('txSubmitted', "Submitted transaction"),
+    ('txSubmitted', "Submitted contract creation"),
+    ('txPooled', "Pooled new"),
+    ('txPromoted', "Promoting queued transaction"),
+    ('txDiscarded', "Discarding"),
+    ('txDropped', "Removed old"),
+]
+
+def parseDuration(text):
+    """ Go duration ('2.345ms', '1m2.5s', '123.4µs') -> seconds, None if it is not one. """
+    parts = DURATION_PATTERN.findall(text or '')
+    if not parts:
+        return None
+    return sum(float(value) * DURATION_UNITS[unit] for value, unit in parts)
+
+def parseLogTime(match,now=None):
+    """ Seconds since the epoch of a log line's [MM-DD|HH:MM:SS] stamp (local time, the year is not logged). """
+    now = time.time() if now == None else now
+    year = time.localtime(now).tm_year
+    stamp = time.mktime(time.strptime(str(year) + "-" + match.group('month') + "-" + match.group('day') + " " + match.group('clock'),
+                                      '%Y-%m-%d %H:%M:%S'))
+    if stamp > now + 86400:
+        # logged last year, read after new year
+        stamp = time.mktime(time.strptime(str(year - 1) + "-" + match.group('month') + "-" + match.group('day') + " "
+                                          + match.group('clock'), '%Y-%m-%d %H:%M:%S'))
+    return stamp + (float(match.group('fraction')) if match.group('fraction') else 0.0)
+
+def parseLine(line):
+    """ A geth log line -> {'level', 'logTime', 'precise', 'message', 'fields'}, None for other lines. """
+    match = LINE_PATTERN.match(line)
+    if match == None:
+        return None
+    rest = match.group('rest')
+    first = FIELD_PATTERN.search(rest)
+    message = (rest[:first.start()] if first else rest).strip()
+    fields = {}
+    if first:
+        for key, value in FIELD_PATTERN.findall(rest[first.start():]):
+            fields[key] = value[1:-1] if value.startswith('"') else value
+    return {'level': match.group('level'), 'logTime': parseLogTime(match), 'precise': match.group('fraction') != None,
+            'message': message, 'fields': fields}
+
+def eventType(message):
+    for kind, start in EVENT_MESSAGES:
+        if start in message[:len(start) + 4]:
+            return kind
+    return None
+
+def hashKey(blockHash):
+    """ Terminal logs abbreviate hashes to 'a4b2c3…f3e1d2', full hashes are cut down to match. """
+    text = (blockHash or '').replace('0x', '')
+    if '…' in text:
+        head, tail = text.split('…', 1)
+        return head[:6] + tail[-6:]
+    return text[:6] + text[-6:]
+
+def toInt(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def makeEvent(node,line,seenAt=None,live=False):
+    """ The structured event of a log line of node, None for lines that are not one.
+        'time' is the log's own time when it has sub-second precision, else the arrival
+        time of live lines, else the (whole second) log time.
+    """
+    entry = parseLine(line)
+    if entry == None:
+        return None
+    kind = eventType(entry['message'])
+    if kind == None:
+        return None
+    fields = entry['fields']
+    if entry['precise'] or not live or seenAt == None:
+        eventTime = entry['logTime']
+    else:
+        eventTime = seenAt
+    event = {'node': node, 'type': kind, 'time': eventTime, 'logTime': entry['logTime'], 'level': entry['level'],
+             'message': entry['message'], 'fields': fields}
+    if 'number' in fields:
+        event['number'] = toInt(fields['number'])
+    if 'hash' in fields and kind.startswith('block'):
+        event['hash'] = hashKey(fields['hash'])
+    if 'elapsed' in fields:
+        event['elapsed'] = parseDuration(fields['elapsed'])
+    if 'peers' in fields:
+        event['peers'] = toInt(fields['peers'])
+    return event
+
+
+##############################################################################
+# Tailing
+##############################################################################
+
+class FollowedFile(object):
+    """ Incremental reader of one log file, survives rotation and truncation. """
+
+    def __init__(self,name,path,fromStart=False):
+        self.name = name
+        self.path = path
+        self.handle = None
+        self.inode = None
+        self.remainder = b''
+        # start at the end of an existing file unless the backlog is wanted
+        self.skipExisting = not fromStart
+
+    def open(self):
+        try:
+            self.handle = open(self.path, 'rb')
+        except FileNotFoundError:
+            # everything in a file created later is new
+            self.skipExisting = False
+            return False
+        self.inode = os.fstat(self.handle.fileno()).st_ino
+        if self.skipExisting:
+            self.handle.seek(0, os.SEEK_END)
+        self.skipExisting = False
+        return True
+
+    def readLines(self):
+        """ Complete lines appended since the last call. """
+        if self.handle == None and not self.open():
+            return []
+        data = self.handle.read()
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            current = None
+        if current != None and current.st_ino != self.inode:
+            # rotated: the rest of the old file was just read, continue with the new one from its start
+            self.handle.close()
+            self.handle = None
+            if self.open():
+                data += self.handle.read()
+        elif current != None and current.st_size < self.handle.tell():
+            # truncated
+            self.handle.seek(0)
+            data += self.handle.read()
+        if not data:
+            return []
+        lines = (self.remainder + data).split(b'\n')
+        self.remainder = lines.pop()
+        return [line.decode('utf-8', 'replace') for line in lines]
+
+    def close(self):
+        if self.handle != None:
+            self.handle.close()
+            self.handle = None
+
+
+class Inotify(object):
+    """ The directories of the followed files watched with linux's inotify (through ctypes). """
+
+    MASK = 0x00000002 | 0x00000008 | 0x00000080 | 0x00000100   # IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    def __init__(self,directories):
+        library = ctypes.util.find_library('c')
+        self.libc = ctypes.CDLL(library, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.directories = {}
+        for directory in directories:
+            watch = self.libc.inotify_add_watch(self.fd, directory.encode('utf-8'), self.MASK)
+            if watch < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), 'inotify_add_watch failed for ' + directory)
+            self.directories[watch] = directory
+
+    def wait(self,timeout):
+        """ Directories with changes, empty after timeout seconds without any. """
+        readable, writable, failed = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        data = os.read(self.fd, 65536)
+        changed = set()
+        position = 0
+        while position + 16 <= len(data):
+            watch, mask, cookie, length = struct.unpack_from('iIII', data, position)
+            changed.add(self.directories.get(watch))
+            position += 16 + length
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class LogTailer(object):
+    """ Follows many log files at once.
+          logs         - dict of node name -> log file path (files may not exist yet).
+          fromStart    - read what the files already hold first (those lines are not 'live').
+          pollInterval - seconds between size checks without inotify, and the longest wait with it.
+    """
+
+    def __init__(self,logs,fromStart=False,pollInterval=0.25,useInotify=True):
+        self.files = [FollowedFile(name, os.path.abspath(path), fromStart) for name, path in sorted(logs.items())]
+        self.pollInterval = pollInterval
+        self.inotify = None
+        directories = set(os.path.dirname(followed.path) for followed in self.files)
+        if useInotify and sys.platform.startswith('linux') and all(os.path.isdir(directory) for directory in directories):
+            try:
+                self.inotify = Inotify(directories)
+            except (OSError, AttributeError):
+                self.inotify = None
+
+    def lines(self,stopped=None,follow=True):
+        """ Generator of (node name, line, seenAt, live) until stopped (a threading.Event) is set,
+            or until the files are read to their end when follow is False.
+        """
+        # the backlog (or nothing when starting at the end) first
+        for followed in self.files:
+            seenAt = time.time()
+            for line in followed.readLines():
+                yield (followed.name, line, seenAt, False)
+        while follow and (stopped == None or not stopped.is_set()):
+            if self.inotify != None:
+                changed = self.inotify.wait(max(self.pollInterval, 1.0))
+                candidates = [followed for followed in self.files if os.path.dirname(followed.path) in changed]
+            else:
+                time.sleep(self.pollInterval)
+                candidates = self.files
+            seenAt = time.time()
+            for followed in candidates:
+                for line in followed.readLines():
+                    yield (followed.name, line, seenAt, True)
+
+    def events(self,stopped=None,follow=True):
+        """ Generator of the events (see makeEvent) of every followed log. """
+        for name, line, seenAt, live in self.lines(stopped, follow):
+            event = makeEvent(name, line, seenAt, live)
+            if event != None:
+                yield event
+
+    def close(self):
+        for followed in self.files:
+            followed.close()
+        if self.inotify != None:
+            self.inotify.close()
+
+
+##############################################################################
+# Telemetry
+##############################################################################
+
+class LogTelemetry(object):
+    """ Metrics of the events of many clients' logs.
+          keepBlocks - most recent block numbers kept for propagation delays.
+    """
+
+    def __init__(self,keepBlocks=1000):
+        self.keepBlocks = keepBlocks
+        # (number, hash key) -> {'sealed': (node, time), 'imports': {node: time}}
+        self.blocks = {}
+        self.highest = 0
+        self.importTimes = {}
+        self.insertLogged = set()
+        self.peers = {}
+        self.counts = {}
+
+    def add(self,event):
+        node = event['node']
+        kind = event['type']
+        counts = self.counts.setdefault(node, {})
+        counts[kind] = counts.get(kind, 0) + 1
+        if kind in ('peerAdded', 'peerRemoved') and event.get('peers') != None:
+            self.peers[node] = event['peers']
+        if kind == 'blockSealed' and event.get('number') != None:
+            self.block(event)['sealed'] = (node, event['time'])
+        elif kind in ('blockImported', 'blockInserted') and event.get('number') != None:
+            imports = self.block(event)['imports']
+            imports[node] = min(imports.get(node, event['time']), event['time'])
+            self.recordImportTime(node, event)
+
+    def block(self,event):
+        key = (event['number'], event.get('hash'))
+        if event['number'] > self.highest:
+            self.highest = event['number']
+            if len(self.blocks) > self.keepBlocks:
+                for old in [old for old in self.blocks if old[0] <= self.highest - self.keepBlocks]:
+                    del self.blocks[old]
+        return self.blocks.setdefault(key, {'sealed': None, 'imports': {}})
+
+    def recordImportTime(self,node,event):
+        """ geth logs 'Inserted new block' per block at debug level, 'Imported new chain segment' per batch:
+            use the per block lines of nodes that log them.
+        """
+        if event.get('elapsed') == None:
+            return
+        if event['type'] == 'blockInserted':
+            self.insertLogged.add(node)
+            seconds = event['elapsed']
+        elif node in self.insertLogged:
+            return
+        else:
+            seconds = event['elapsed'] / max(1, toInt(event['fields'].get('blocks')) or 1)
+        self.importTimes.setdefault(node, LatencyHistogram()).record(seconds)
+
+    def propagationDelays(self):
+        """ node -> LatencyHistogram of the time from a block being sealed (or first imported by
+            any client, when its miner's log is not followed) to the node importing it.
+        """
+        delays = {}
+        for key, block in self.blocks.items():
+            if not block['imports']:
+                continue
+            if block['sealed'] != None:
+                origin, start = block['sealed']
+            else:
+                origin, start = min(block['imports'].items(), key=lambda item: item[1])
+            for node, imported in block['imports'].items():
+                if node == origin:
+                    continue
+                delays.setdefault(node, LatencyHistogram()).record(max(0.0, imported - start))
+        return delays
+
+    def snapshot(self):
+        """ Dict of every node's propagation delay and import time percentiles (ms), peers and event counts. """
+        def summary(histogram):
+            return {'count': histogram.count, 'p50ms': self.ms(histogram.percentile(0.5)),
+                    'p90ms': self.ms(histogram.percentile(0.9)), 'p99ms': self.ms(histogram.percentile(0.99)),
+                    'maxms': self.ms(histogram.max)}
+        delays = self.propagationDelays()
+        nodes = sorted(set(self.counts) | set(delays) | set(self.importTimes))
+        return {'highestBlock': self.highest,
+                'nodes': dict((node, {'propagationDelay': summary(delays[node]) if node in delays else None,
+                                      'importTime': summary(self.importTimes[node]) if node in self.importTimes else None,
+                                      'peers': self.peers.get(node), 'events': self.counts.get(node, {})})
+                              for node in nodes)}
+
+    @staticmethod
+    def ms(seconds):
+        return None if seconds == None else round(seconds * 1000.0, 3)
+
+
+def logsOfNetwork(path):
+    """ node name -> output.log of every node of a network.json (see nodeSupervisor.py). """
+    with open(path) as networkFile:
+        network = json.load(networkFile)
+    nodes = network['nodes'] if isinstance(network, dict) else network
+    return dict((node['name'], node.get('logFile') or os.path.join(node['datadir'], 'output.log')) for node in nodes)
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Follow geth logs and report block propagation and import timing.')
+    parser.add_argument('--network', help='network.json whose nodes\' output.log files are followed')
+    parser.add_argument('--log', action='append', default=[], help='<name>=<path of output.log>, repeatable')
+    parser.add_argument('--from-start', action='store_true', help='read the existing log contents first')
+    parser.add_argument('--no-follow', action='store_true', help='stop at the end of the logs (with --from-start)')
+    parser.add_argument('--events', action='store_true', help='print every event as a json line')
+    parser.add_argument('--interval', type=float, default=10.0, help='seconds between telemetry reports')
+    args = parser.parse_args()
+
+    logs = logsOfNetwork(args.network) if args.network else {}
+    for text in args.log:
+        name, _, path = text.partition('=')
+        logs[name] = path
+    if not logs:
+        parser.error('no logs, use --network or --log')
+
+    tailer = LogTailer(logs, fromStart=args.from_start)
+    telemetry = LogTelemetry()
+    reported = time.time()
+    try:
+        for event in tailer.events(follow=not args.no_follow):
+            telemetry.add(event)
+            if args.events:
+                print (json.dumps(event, ensure_ascii=False), flush=True)
+            elif time.time() - reported >= args.interval:
+                print (json.dumps(telemetry.snapshot(), indent=2), flush=True)
+                reported = time.time()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tailer.close()
+    if not args.events:
+        print (json.dumps(telemetry.snapshot(), indent=2))
@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Keccak-256, the hash ethereum uses for function selectors, storage slots
+# and addresses. (hashlib's sha3_256 is the final SHA-3 standard, which pads
+# differently and gives different hashes.)
+#
+#    Uses pycryptodome or pysha3 when one of them is installed, otherwise a
+#    pure python implementation.
+#
+#    ./keccak.py "set(uint256)"
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import sys
+
+ROUND_CONSTANTS = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+
+# rotation offsets, indexed [x][y]
+ROTATIONS = [
+    [0, 36, 3, 41, 18],
+    [1, 44, 10, 45, 2],
+    [62, 6, 43, 15, 61],
+    [28, 55, 25, 21, 56],
+    [27, 20, 39, 8, 14],
+]
+
+MASK = 0xFFFFFFFFFFFFFFFF
+RATE = 136  # bytes, for a 256 bit output
+
+
+# (source lane, destination lane, rotation) of the combined rho and pi steps
+RHO_PI = [(x + 5 * y, y + 5 * ((2 * x + 3 * y) % 5), ROTATIONS[x][y]) for x in range(5) for y in range(5)]
+
+def keccakF(state):
+    """ The keccak-f[1600] permutation on a list of 25 lanes, state[x + 5*y]. """
+    moved = [0] * 25
+    for roundConstant in ROUND_CONSTANTS:
+        # theta
+        c0 = state[0] ^ state[5] ^ state[10] ^ state[15] ^ state[20]
+        c1 = state[1] ^ state[6] ^ state[11] ^ state[16] ^ state[21]
+        c2 = state[2] ^ state[7] ^ state[12] ^ state[17] ^ state[22]
+        c3 = state[3] ^ state[8] ^ state[13] ^ state[18] ^ state[23]
+        c4 = state[4] ^ state[9] ^ state[14] ^ state[19] ^ state[24]
+        d = (c4 ^ (((c1 << 1) | (c1 >> 63)) & MASK),
+             c0 ^ (((c2 << 1) | (c2 >> 63)) & MASK),
+             c1 ^ (((c3 << 1) | (c3 >> 63)) & MASK),
+             c2 ^ (((c4 << 1) | (c4 >> 63)) & MASK),
+             c3 ^ (((c0 << 1) | (c0 >> 63)) & MASK))
+        # rho and pi
+        for source, destination, shift in RHO_PI:
+            value = state[source] ^ d[source % 5]
+            moved[destination] = ((value << shift) | (value >> (64 - shift))) & MASK if shift else value
+        # chi
+        for y in (0, 5, 10, 15, 20):
+            a0, a1, a2, a3, a4 = moved[y:y + 5]
+            state[y] = a0 ^ (~a1 & a2)
+            state[y + 1] = a1 ^ (~a2 & a3)
+            state[y + 2] = a2 ^ (~a3 & a4)
+            state[y + 3] = a3 ^ (~a4 & a0)
+            state[y + 4] = a4 ^ (~a0 & a1)
+        # iota
+        state[0] ^= roundConstant
+
+def pureKeccak256(data):
+    """ Keccak-256 of data (bytes) in pure python, returns 32 bytes. """
+    padded = bytearray(data)
+    padded.append(0x01)
+    while len(padded) % RATE != 0:
+        padded.append(0x00)
+    padded[-1] |= 0x80
+    state = [0] * 25
+    view = memoryview(padded)
+    for start in range(0, len(padded), RATE):
+        block = view[start:start + RATE]
+        for lane in range(RATE // 8):
+            state[lane] ^= int.from_bytes(block[lane * 8:lane * 8 + 8], 'little')
+        keccakF(state)
+    return b''.join(state[lane].to_bytes(8, 'little') for lane in range(4))
+
+
+try:
+    from Crypto.Hash import keccak as cryptoKeccak
+
+    def keccak256(data):
+        """ Keccak-256 of data (bytes), returns 32 bytes. """
+        return cryptoKeccak.new(digest_bits=256, data=bytes(data)).digest()
+except ImportError:
+    try:
+        import sha3
+
+        def keccak256(data):
+            """ Keccak-256 of data (bytes), returns 32 bytes. """
+            return sha3.keccak_256(bytes(data)).digest()
+    except ImportError:
+        keccak256 = pureKeccak256
+
+def keccak256Hex(data):
+    """ Keccak-256 as a '0x' hex string, str data is hashed as utf-8. """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return "0x" + keccak256(data).hex()
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    for text in sys.argv[1:]:
+        print (keccak256Hex(text) + "  " + text)
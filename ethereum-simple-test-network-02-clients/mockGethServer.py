@@ -0,0 +1,726 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Stand-in for a geth client's JSON-RPC "2.0" HTTP interface.
+#
+#    Keeps a small chain in memory (accounts, balances, nonces, blocks,
+#    receipts and SimpleStorage style contracts) so the python tools can be
+#    run and benchmarked without docker or geth. Answers the calls the
+#    helpers use, including blocks, logs, filters, txpool, admin_nodeInfo,
+#    admin_addPeer and net_peerCount, and can add latency, rpc errors and
+#    dropped connections to test clients against a misbehaving node. With
+#    --ipc-path and --ws-port it also serves IPC and WebSocket connections,
+#    with eth_subscribe (newHeads, logs, newPendingTransactions).
+#
+#    ./mockGethServer.py --port 9000 --block-time 1.0
+#    ./mockGethServer.py --port 9000 --latency 0.005 --jitter 0.01 --error-rate 0.01
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn, ThreadingTCPServer, ThreadingUnixStreamServer, BaseRequestHandler
+from rpcTransport import readJsonStream, readMessages, encodeFrame, websocketAccept, OPCODE_TEXT
+
+# SimpleStorage selectors, see testProject.py
+SET_SELECTOR = "0x60fe47b1"
+GET_SELECTOR = "0x6d4ce63c"
+
+
+def toHex32(value):
+    return "0x" + hex(value)[2:].rjust(64, '0')
+
+def fakeHash(*parts):
+    """ Stable 32 byte hash for mock objects (sha256, not keccak: only needs to be unique). """
+    return "0x" + hashlib.sha256("|".join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+class RpcError(Exception):
+    def __init__(self,message,code=-32000):
+        Exception.__init__(self, message)
+        self.code = code
+
+
+class MockChain(object):
+    """ In-memory chain state, transactions are mined every blockTime seconds (0 mines on every send). """
+
+    def __init__(self,accounts=3,balance=10**21,blockTime=1.0,chainId=15):
+        self.lock = threading.RLock()
+        self.blockTime = blockTime
+        self.chainId = chainId
+        self.accounts = ["0x" + fakeHash('account', index)[-40:] for index in range(accounts)]
+        self.balances = dict((account, balance) for account in self.accounts)
+        self.nonces = dict((account, 0) for account in self.accounts)
+        # (account, nonce) -> transaction waiting to be mined
+        self.pool = {}
+        self.transactions = {}
+        self.receipts = {}
+        # contract address -> {'code': runtime code, 'storage': {slot: value}}
+        self.contracts = {}
+        genesis = {'number': "0x0", 'hash': fakeHash('block', 0), 'parentHash': "0x" + "0" * 64,
+                   'timestamp': hex(int(time.time())), 'transactions': [], 'gasUsed': "0x0", 'gasLimit': hex(4712388)}
+        self.blocks = [genesis]
+        self.blocksByHash = {genesis['hash']: genesis}
+        # filter id -> {'type': 'block'|'pending'|'log', 'changes': [...], 'criteria': ..., 'nextBlock': n}
+        self.filters = {}
+        self.nextFilterId = 1
+        self.mining = True
+        # function(kind, value) called with ('block', block) and ('pendingTransaction', hash), for subscriptions
+        self.listeners = []
+
+    ##########################################################################
+    # state
+    ##########################################################################
+
+    def head(self):
+        return self.blocks[-1]
+
+    def storageOf(self,address):
+        contract = self.contracts.get(address.lower())
+        return contract['storage'] if contract != None else {}
+
+    def pendingNonce(self,account):
+        nonce = self.nonces.get(account, 0)
+        while (account, nonce) in self.pool:
+            nonce += 1
+        return nonce
+
+    ##########################################################################
+    # transactions
+    ##########################################################################
+
+    def sendTransaction(self,transaction):
+        with self.lock:
+            sender = transaction.get('from', '').lower()
+            if sender not in self.nonces:
+                raise RpcError("unknown account")
+            nonce = int(transaction['nonce'], 16) if 'nonce' in transaction else self.pendingNonce(sender)
+            if nonce < self.nonces[sender]:
+                raise RpcError("nonce too low")
+            if (sender, nonce) in self.pool:
+                existing = self.pool[(sender, nonce)]
+                if int(transaction.get('gasPrice', '0x0'), 16) <= int(existing['gasPrice'], 16):
+                    raise RpcError("replacement transaction underpriced")
+            entry = {'from': sender, 'to': transaction.get('to'), 'input': transaction.get('data', '0x'),
+                     'value': transaction.get('value', '0x0'), 'gas': transaction.get('gas', '0x15f90'),
+                     'gasPrice': transaction.get('gasPrice', '0x4a817c800'), 'nonce': hex(nonce),
+                     'blockHash': None, 'blockNumber': None, 'transactionIndex': None}
+            entry['hash'] = fakeHash('tx', sender, nonce, entry['input'], entry['gasPrice'], time.time())
+            self.pool[(sender, nonce)] = entry
+            self.transactions[entry['hash']] = entry
+            for installed in self.filters.values():
+                if installed['type'] == 'pending':
+                    installed['changes'].append(entry['hash'])
+            for listener in list(self.listeners):
+                listener('pendingTransaction', entry['hash'])
+            if self.blockTime == 0:
+                self.mine()
+            return entry['hash']
+
+    def execute(self,transaction):
+        """ Apply a mined transaction, returns (contractAddress, gasUsed). """
+        value = int(transaction['value'], 16)
+        self.balances[transaction['from']] = self.balances.get(transaction['from'], 0) - value
+        if transaction['to'] == None:
+            address = "0x" + fakeHash('contract', transaction['from'], transaction['nonce'])[-40:]
+            self.contracts[address] = {'code': transaction['input'], 'storage': {}}
+            self.balances[address] = value
+            return address, 90000
+        target = transaction['to'].lower()
+        self.balances[target] = self.balances.get(target, 0) + value
+        data = transaction['input'] or '0x'
+        if target in self.contracts and data.startswith(SET_SELECTOR) and len(data) >= 74:
+            self.contracts[target]['storage'][0] = int(data[10:74], 16)
+            return None, 26000
+        return None, 21000
+
+    def mine(self):
+        """ Seal a block with every transaction whose nonce is next in line. """
+        with self.lock:
+            parent = self.head()
+            number = len(self.blocks)
+            blockHash = fakeHash('block', number, parent['hash'], time.time())
+            included = []
+            gasUsed = 0
+            for account in list(self.nonces):
+                while (account, self.nonces[account]) in self.pool:
+                    transaction = self.pool.pop((account, self.nonces[account]))
+                    self.nonces[account] += 1
+                    contractAddress, used = self.execute(transaction)
+                    transaction['blockHash'] = blockHash
+                    transaction['blockNumber'] = hex(number)
+                    transaction['transactionIndex'] = hex(len(included))
+                    gasUsed += used
+                    self.receipts[transaction['hash']] = {
+                        'transactionHash': transaction['hash'], 'transactionIndex': transaction['transactionIndex'],
+                        'blockHash': blockHash, 'blockNumber': hex(number), 'from': transaction['from'],
+                        'to': transaction['to'], 'contractAddress': contractAddress, 'gasUsed': hex(used),
+                        'cumulativeGasUsed': hex(gasUsed), 'logs': [], 'logsBloom': "0x" + "0" * 512,
+                        'status': "0x1"}
+                    included.append(transaction)
+            block = {'number': hex(number), 'hash': blockHash, 'parentHash': parent['hash'],
+                     'timestamp': hex(int(time.time())), 'transactions': included,
+                     'gasUsed': hex(gasUsed), 'gasLimit': hex(4712388)}
+            self.blocks.append(block)
+            self.blocksByHash[blockHash] = block
+            for installed in self.filters.values():
+                if installed['type'] == 'block':
+                    installed['changes'].append(blockHash)
+            for listener in list(self.listeners):
+                listener('block', block)
+            return number
+
+    def reorg(self,fromBlock):
+        """ Replace blocks fromBlock..head with blocks of new hashes holding the same transactions, as
+            when a competing chain wins. The orphaned blocks stay reachable by hash.
+        """
+        with self.lock:
+            for number in range(max(1, fromBlock), len(self.blocks)):
+                # copies all the way down, the orphaned block keeps its transactions as they were
+                block = dict(self.blocks[number])
+                block['parentHash'] = self.blocks[number - 1]['hash']
+                block['hash'] = fakeHash('block', number, block['parentHash'], 'reorg', time.time())
+                block['transactions'] = [dict(transaction, blockHash=block['hash']) for transaction in block['transactions']]
+                for transaction in block['transactions']:
+                    self.transactions[transaction['hash']] = transaction
+                    receipt = dict(self.receipts[transaction['hash']], blockHash=block['hash'])
+                    receipt['logs'] = [dict(log, blockHash=block['hash']) for log in receipt['logs']]
+                    self.receipts[transaction['hash']] = receipt
+                self.blocks[number] = block
+                self.blocksByHash[block['hash']] = block
+
+    def txpoolContent(self):
+        """ txpool_content: state -> account -> nonce -> transaction, executable ones are pending, the others queued. """
+        content = {'pending': {}, 'queued': {}}
+        for (account, nonce), transaction in self.pool.items():
+            state = 'pending' if nonce < self.pendingNonce(account) else 'queued'
+            content[state].setdefault(account, {})[str(nonce)] = transaction
+        return content
+
+    def txpoolStatus(self):
+        content = self.txpoolContent()
+        return dict((state, hex(sum(len(byNonce) for byNonce in content[state].values()))) for state in content)
+
+    def call(self,transaction):
+        target = (transaction.get('to') or '').lower()
+        data = transaction.get('data', '0x') or '0x'
+        if target in self.contracts and data.startswith(GET_SELECTOR):
+            return toHex32(self.contracts[target]['storage'].get(0, 0))
+        return "0x"
+
+    ##########################################################################
+    # blocks, logs and filters
+    ##########################################################################
+
+    def blockView(self,block,fullTransactions):
+        """ A block as eth_getBlockBy* returns it, None for unknown blocks. """
+        if block == None:
+            return None
+        view = dict(block)
+        view['transactions'] = [dict(transaction) if fullTransactions else transaction['hash'] for transaction in block['transactions']]
+        return view
+
+    def blockByNumber(self,number):
+        return self.blocks[number] if 0 <= number < len(self.blocks) else None
+
+    def logs(self,criteria,fromNumber,toNumber):
+        """ Logs of the receipts of blocks fromNumber..toNumber matching eth_getLogs style criteria. """
+        addresses = criteria.get('address')
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = None if addresses == None else set(address.lower() for address in addresses)
+        topics = criteria.get('topics') or []
+        results = []
+        for number in range(max(0, fromNumber), min(toNumber, len(self.blocks) - 1) + 1):
+            for transaction in self.blocks[number]['transactions']:
+                for log in self.receipts[transaction['hash']]['logs']:
+                    if addresses != None and log['address'].lower() not in addresses:
+                        continue
+                    if all(wanted == None or (log['topics'][position] if position < len(log['topics']) else None)
+                           in (wanted if isinstance(wanted, list) else [wanted]) for position, wanted in enumerate(topics)):
+                        results.append(log)
+        return results
+
+    def criteriaRange(self,criteria):
+        fromNumber = blockParameterNumber(self, criteria.get('fromBlock', 'latest'))
+        toNumber = blockParameterNumber(self, criteria.get('toBlock', 'latest'))
+        return fromNumber, toNumber
+
+    def newFilter(self,kind,criteria=None):
+        filterId = hex(self.nextFilterId)
+        self.nextFilterId += 1
+        self.filters[filterId] = {'type': kind, 'changes': [], 'criteria': criteria}
+        if kind == 'log':
+            self.filters[filterId]['nextBlock'] = self.criteriaRange(criteria)[0]
+        return filterId
+
+    def filterChanges(self,filterId):
+        """ What happened since the last poll of a filter: block hashes, transaction hashes or logs. """
+        installed = self.filters.get(filterId)
+        if installed == None:
+            raise RpcError("filter not found")
+        if installed['type'] != 'log':
+            changes, installed['changes'] = installed['changes'], []
+            return changes
+        fromNumber, toNumber = self.criteriaRange(installed['criteria'])
+        if 'toBlock' not in installed['criteria']:
+            toNumber = len(self.blocks) - 1
+        changes = self.logs(installed['criteria'], installed['nextBlock'], toNumber)
+        installed['nextBlock'] = max(installed['nextBlock'], len(self.blocks))
+        return changes
+
+    def filterLogs(self,filterId):
+        installed = self.filters.get(filterId)
+        if installed == None or installed['type'] != 'log':
+            raise RpcError("filter not found")
+        return self.logs(installed['criteria'], *self.criteriaRange(installed['criteria']))
+
+
+##############################################################################
+# JSON-RPC method table
+##############################################################################
+
+def blockParameterNumber(chain,blockParameter):
+    if blockParameter in ('latest', 'pending', None):
+        return len(chain.blocks) - 1
+    if blockParameter == 'earliest':
+        return 0
+    return int(blockParameter, 16)
+
+def makeMethods(chain):
+    """ method name -> function(params) for every supported rpc method. """
+    return {
+        'eth_blockNumber': lambda params: hex(len(chain.blocks) - 1),
+        'eth_accounts': lambda params: list(chain.accounts),
+        'eth_coinbase': lambda params: chain.accounts[0],
+        'eth_gasPrice': lambda params: "0x4a817c800",
+        'eth_getBalance': lambda params: hex(chain.balances.get(params[0].lower(), 0)),
+        'eth_getTransactionCount': lambda params: hex(chain.pendingNonce(params[0].lower()) if params[1] == 'pending'
+                                                      else chain.nonces.get(params[0].lower(), 0)),
+        'eth_sendTransaction': lambda params: chain.sendTransaction(params[0]),
+        'eth_getTransactionByHash': lambda params: chain.transactions.get(params[0]),
+        'eth_getTransactionReceipt': lambda params: chain.receipts.get(params[0]),
+        'eth_call': lambda params: chain.call(params[0]),
+        'eth_estimateGas': lambda params: hex(90000 if not params[0].get('to') else 26000),
+        'eth_getStorageAt': lambda params: toHex32(chain.storageOf(params[0]).get(int(params[1], 16), 0)),
+        'eth_getCode': lambda params: chain.contracts.get(params[0].lower(), {}).get('code', "0x"),
+        'eth_getBlockByNumber': lambda params: chain.blockView(chain.blockByNumber(blockParameterNumber(chain, params[0])),
+                                                               len(params) > 1 and params[1]),
+        'eth_getBlockByHash': lambda params: chain.blockView(chain.blocksByHash.get(params[0]), len(params) > 1 and params[1]),
+        'eth_getLogs': lambda params: chain.logs(params[0], *chain.criteriaRange(params[0])),
+        'eth_newFilter': lambda params: chain.newFilter('log', params[0]),
+        'eth_newBlockFilter': lambda params: chain.newFilter('block'),
+        'eth_newPendingTransactionFilter': lambda params: chain.newFilter('pending'),
+        'eth_getFilterChanges': lambda params: chain.filterChanges(params[0]),
+        'eth_getFilterLogs': lambda params: chain.filterLogs(params[0]),
+        'eth_uninstallFilter': lambda params: chain.filters.pop(params[0], None) != None,
+        'txpool_content': lambda params: chain.txpoolContent(),
+        'txpool_status': lambda params: chain.txpoolStatus(),
+        'eth_syncing': lambda params: False,
+        'eth_mining': lambda params: chain.mining,
+        'miner_start': lambda params: setattr(chain, 'mining', True) or None,
+        'miner_stop': lambda params: setattr(chain, 'mining', False) or True,
+        'personal_unlockAccount': lambda params: params[0].lower() in chain.nonces,
+        'net_version': lambda params: str(chain.chainId),
+        'net_listening': lambda params: True,
+        'web3_clientVersion': lambda params: "MockGeth/v1.7.2-mock/python",
+    }
+
+
+class MockGethRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # headers and body go out in separate writes, without this each response waits on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self,format,*args):
+        pass
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections.add(self.connection)
+
+    def finish(self):
+        self.server.connections.discard(self.connection)
+        BaseHTTPRequestHandler.finish(self)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        try:
+            request = json.loads(body.decode('utf-8'))
+            calls = request if isinstance(request, list) else [request]
+            if self.server.injectFaults(calls):
+                # dropped: the client sees the connection close without an answer
+                self.close_connection = True
+                return
+            if isinstance(request, list):
+                response = self.server.shuffled([self.server.handleCall(call) for call in request])
+            else:
+                response = self.server.handleCall(request)
+        except ValueError:
+            response = {'jsonrpc': "2.0", 'id': None, 'error': {'code': -32700, 'message': "parse error"}}
+        data = json.dumps(response).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockSubscriptions(object):
+    """ One IPC or WebSocket connection: answers its calls, including eth_subscribe and eth_unsubscribe,
+        and sends the notifications of its subscriptions through send(text).
+    """
+
+    def __init__(self,server,send):
+        self.server = server
+        self.send = send
+        self.lock = threading.Lock()
+        # subscription id -> (kind, criteria)
+        self.subscriptions = {}
+        self.closed = False
+        server.chain.listeners.append(self.notify)
+
+    def handle(self,request):
+        calls = request if isinstance(request, list) else [request]
+        if self.server.injectFaults(calls):
+            # dropped: the client sees the connection close without an answer
+            raise OSError("dropped")
+        responses = [self.handleCall(call) for call in calls]
+        self.send(json.dumps(self.server.shuffled(responses) if isinstance(request, list) else responses[0]))
+
+    def handleCall(self,call):
+        method = call.get('method')
+        params = call.get('params') or []
+        if method not in ('eth_subscribe', 'eth_unsubscribe'):
+            return self.server.handleCall(call)
+        response = {'jsonrpc': "2.0", 'id': call.get('id')}
+        with self.lock:
+            if method == 'eth_unsubscribe':
+                response['result'] = self.subscriptions.pop(params[0] if params else None, None) != None
+            elif params and params[0] in ('newHeads', 'logs', 'newPendingTransactions'):
+                subscriptionId = fakeHash('subscription', id(self), time.time(), len(self.subscriptions))[:34]
+                self.subscriptions[subscriptionId] = (params[0], params[1] if len(params) > 1 else {})
+                response['result'] = subscriptionId
+            else:
+                response['error'] = {'code': -32601, 'message': "no \"" + str(params[0] if params else None) + "\" subscription in eth namespace"}
+        return response
+
+    def notify(self,kind,value):
+        with self.lock:
+            subscriptions = list(self.subscriptions.items())
+        for subscriptionId, (subscriptionKind, criteria) in subscriptions:
+            if kind == 'block' and subscriptionKind == 'newHeads':
+                results = [dict((field, fieldValue) for field, fieldValue in value.items() if field != 'transactions')]
+            elif kind == 'block' and subscriptionKind == 'logs':
+                number = int(value['number'], 16)
+                results = self.server.chain.logs(criteria, number, number)
+            elif kind == 'pendingTransaction' and subscriptionKind == 'newPendingTransactions':
+                results = [value]
+            else:
+                continue
+            for result in results:
+                try:
+                    self.send(json.dumps({'jsonrpc': "2.0", 'method': "eth_subscription",
+                                          'params': {'subscription': subscriptionId, 'result': result}}))
+                except OSError:
+                    self.close()
+                    return
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            try:
+                self.server.chain.listeners.remove(self.notify)
+            except ValueError:
+                pass
+
+
+class MockIpcHandler(BaseRequestHandler):
+    """ geth style IPC: json messages back to back on a unix socket. """
+
+    def handle(self):
+        writeLock = threading.Lock()
+        def send(text):
+            with writeLock:
+                self.request.sendall(text.encode('utf-8'))
+        self.server.mock.connections.add(self.request)
+        session = MockSubscriptions(self.server.mock, send)
+        try:
+            for request in readJsonStream(self.request):
+                session.handle(request)
+        except OSError:
+            pass
+        finally:
+            session.close()
+            self.server.mock.connections.discard(self.request)
+
+
+class MockWebSocketHandler(BaseRequestHandler):
+    """ geth style WebSocket rpc: one json message per text frame. """
+
+    def handle(self):
+        reader = self.request.makefile('rb')
+        headers = {}
+        reader.readline()
+        while True:
+            line = reader.readline().decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if 'sec-websocket-key' not in headers:
+            self.request.sendall(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            return
+        self.request.sendall(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                              "Sec-WebSocket-Accept: " + websocketAccept(headers['sec-websocket-key']) + "\r\n\r\n").encode('ascii'))
+        writeLock = threading.Lock()
+        def sendFrame(opcode, payload):
+            with writeLock:
+                self.request.sendall(encodeFrame(opcode, payload, mask=False))
+        self.server.mock.connections.add(self.request)
+        session = MockSubscriptions(self.server.mock, lambda text: sendFrame(OPCODE_TEXT, text.encode('utf-8')))
+        try:
+            for text in readMessages(reader, sendFrame):
+                try:
+                    session.handle(json.loads(text))
+                except ValueError:
+                    session.send(json.dumps({'jsonrpc': "2.0", 'id': None, 'error': {'code': -32700, 'message': "parse error"}}))
+        except OSError:
+            pass
+        finally:
+            session.close()
+            self.server.mock.connections.discard(self.request)
+
+
+class MockGethServer(ThreadingMixIn, HTTPServer):
+    """ Threaded HTTP server answering JSON-RPC calls from a MockChain.
+          port          - 0 picks a free port, see address().
+          p2pPort       - port in the enode of admin_nodeInfo (default: port - 1000, as start-geth.sh has it).
+          latency       - seconds added to every request, plus up to jitter seconds at random.
+          methodLatency - dict of method -> extra seconds for requests calling it.
+          errorRate     - fraction of calls answered with an rpc error (code -32000, "injected error").
+          dropRate      - fraction of requests whose connection is closed without an answer.
+          shuffleBatches - answer the calls of a batch in random order, as JSON-RPC allows.
+          mine          - False for servers sharing the chain of another server, which mines it.
+          ipcPath       - also serve IPC connections on this unix socket path.
+          wsPort        - also serve WebSocket connections on this port (0 picks a free one, see wsAddress()).
+        Servers in one process that add each other with admin_addPeer see each other as peers,
+        both ways, as geth clients do.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+    # node id -> server, of the servers running in this process
+    running = {}
+
+    def __init__(self,ip='127.0.0.1',port=0,chain=None,blockTime=1.0,p2pPort=None,latency=0.0,jitter=0.0,methodLatency=None,
+                 errorRate=0.0,dropRate=0.0,seed=None,mine=True,ipcPath=None,wsPort=None,shuffleBatches=False):
+        HTTPServer.__init__(self, (ip, int(port)), MockGethRequestHandler)
+        self.chain = chain or MockChain(blockTime=blockTime)
+        self.mine = mine
+        self.p2pPort = p2pPort if p2pPort != None else max(1, self.server_address[1] - 1000)
+        self.nodeId = (fakeHash('node', ip, self.server_address[1], time.time()) + fakeHash('node', id(self)))[2:].replace("0x", "")
+        # node id -> enode of the peers
+        self.peers = {}
+        self.methods = makeMethods(self.chain)
+        self.methods.update({
+            'admin_nodeInfo': lambda params: self.nodeInfo(),
+            'admin_addPeer': lambda params: self.addPeer(params[0]),
+            'admin_removePeer': lambda params: self.removePeer(params[0]),
+            'admin_peers': lambda params: [{'id': nodeId, 'enode': enode} for nodeId, enode in sorted(self.peers.items())],
+            'net_peerCount': lambda params: hex(len(self.peers)),
+        })
+        self.random = random.Random(seed)
+        self.inject(latency, jitter, methodLatency, errorRate, dropRate, shuffleBatches)
+        self.connections = set()
+        self.stopped = threading.Event()
+        self.threads = []
+        self.ipcPath = ipcPath
+        self.ipcServer = None
+        self.wsServer = None
+        if ipcPath != None:
+            if os.path.exists(ipcPath):
+                os.remove(ipcPath)
+            self.ipcServer = ThreadingUnixStreamServer(ipcPath, MockIpcHandler)
+        if wsPort != None:
+            self.wsServer = ThreadingTCPServer((ip, int(wsPort)), MockWebSocketHandler)
+        for server in (self.ipcServer, self.wsServer):
+            if server != None:
+                server.daemon_threads = True
+                server.mock = self
+
+    def address(self):
+        """ (ip, port) to pass to the helper methods. """
+        return self.server_address[0], str(self.server_address[1])
+
+    def wsAddress(self):
+        """ ws://<ip>:<port> of the WebSocket endpoint, None without one. """
+        return None if self.wsServer == None else "ws://" + self.wsServer.server_address[0] + ":" + str(self.wsServer.server_address[1])
+
+    ##########################################################################
+    # fault injection
+    ##########################################################################
+
+    def inject(self,latency=0.0,jitter=0.0,methodLatency=None,errorRate=0.0,dropRate=0.0,shuffleBatches=False):
+        """ Change the injected latency and faults (see the class), also while running. """
+        self.latency = latency
+        self.jitter = jitter
+        self.methodLatency = dict(methodLatency or {})
+        self.errorRate = errorRate
+        self.dropRate = dropRate
+        self.shuffleBatches = shuffleBatches
+
+    def shuffled(self,responses):
+        """ The responses of a batch, in random order when shuffleBatches is set. """
+        if self.shuffleBatches:
+            responses = list(responses)
+            self.random.shuffle(responses)
+        return responses
+
+    def injectFaults(self,calls):
+        """ Sleep the injected latency of a request. Returns True if it is to be dropped. """
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if self.methodLatency:
+            delay += max(self.methodLatency.get(call.get('method'), 0.0) for call in calls)
+        if delay > 0:
+            time.sleep(delay)
+        return self.dropRate > 0 and self.random.random() < self.dropRate
+
+    ##########################################################################
+    # calls
+    ##########################################################################
+
+    def handleCall(self,call):
+        response = {'jsonrpc': "2.0", 'id': call.get('id')}
+        method = self.methods.get(call.get('method'))
+        if method == None:
+            response['error'] = {'code': -32601, 'message': "The method " + str(call.get('method')) + " does not exist/is not available"}
+            return response
+        if self.errorRate > 0 and self.random.random() < self.errorRate:
+            response['error'] = {'code': -32000, 'message': "injected error"}
+            return response
+        try:
+            with self.chain.lock:
+                response['result'] = method(call.get('params') or [])
+        except RpcError as e:
+            response['error'] = {'code': e.code, 'message': str(e)}
+        except (IndexError, KeyError, TypeError, ValueError, AttributeError) as e:
+            response['error'] = {'code': -32602, 'message': "invalid argument: " + str(e)}
+        return response
+
+    def enode(self):
+        return "enode://" + self.nodeId + "@" + self.server_address[0] + ":" + str(self.p2pPort)
+
+    def nodeInfo(self):
+        head = self.chain.head()
+        return {'id': self.nodeId, 'name': "MockGeth/v1.7.2-mock/python", 'enode': self.enode(),
+                'ip': self.server_address[0], 'listenAddr': "[::]:" + str(self.p2pPort),
+                'ports': {'discovery': self.p2pPort, 'listener': self.p2pPort},
+                'protocols': {'eth': {'network': self.chain.chainId, 'difficulty': len(self.chain.blocks),
+                                      'genesis': self.chain.blocks[0]['hash'], 'head': head['hash']}}}
+
+    def addPeer(self,enode):
+        if not enode.startswith("enode://") or "@" not in enode:
+            raise RpcError("invalid enode: " + enode)
+        nodeId = enode[len("enode://"):].split("@")[0]
+        if nodeId != self.nodeId:
+            self.peers[nodeId] = enode
+            other = MockGethServer.running.get(nodeId)
+            if other != None:
+                other.peers[self.nodeId] = self.enode()
+        return True
+
+    def removePeer(self,enode):
+        nodeId = enode[len("enode://"):].split("@")[0]
+        self.peers.pop(nodeId, None)
+        other = MockGethServer.running.get(nodeId)
+        if other != None:
+            other.peers.pop(self.nodeId, None)
+        return True
+
+    ##########################################################################
+    # running
+    ##########################################################################
+
+    def mineLoop(self):
+        while not self.stopped.wait(self.chain.blockTime):
+            if self.chain.mining:
+                self.chain.mine()
+
+    def start(self):
+        """ Serve (and mine) from background threads. """
+        MockGethServer.running[self.nodeId] = self
+        self.threads = [threading.Thread(target=self.serve_forever, name='mockGethServer')]
+        for server in (self.ipcServer, self.wsServer):
+            if server != None:
+                self.threads.append(threading.Thread(target=server.serve_forever, name='mockGethServer'))
+        if self.mine and self.chain.blockTime > 0:
+            self.threads.append(threading.Thread(target=self.mineLoop, name='mockGethMiner'))
+        for thread in self.threads:
+            thread.daemon = True
+            thread.start()
+        return self
+
+    def stop(self):
+        """ Stop serving and close the open keep-alive connections, as a stopped client would. """
+        MockGethServer.running.pop(self.nodeId, None)
+        for nodeId in list(self.peers):
+            other = MockGethServer.running.get(nodeId)
+            if other != None:
+                other.peers.pop(self.nodeId, None)
+        self.stopped.set()
+        self.shutdown()
+        self.server_close()
+        for server in (self.ipcServer, self.wsServer):
+            if server != None:
+                server.shutdown()
+                server.server_close()
+        if self.ipcServer != None and os.path.exists(self.ipcPath):
+            os.remove(self.ipcPath)
+        for connection in list(self.connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Mock geth JSON-RPC server.')
+    parser.add_argument('--ip', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--p2p-port', type=int, default=None, help='port of the enode (default: port - 1000)')
+    parser.add_argument('--block-time', type=float, default=1.0, help='seconds per block, 0 mines on every transaction')
+    parser.add_argument('--accounts', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='up to this many more seconds at random')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of calls answered with an rpc error')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='fraction of requests dropped without an answer')
+    parser.add_argument('--shuffle-batches', action='store_true', help='answer the calls of a batch in random order')
+    parser.add_argument('--ipc-path', default=None, help='also serve IPC on this unix socket path')
+    parser.add_argument('--ws-port', type=int, default=None, help='also serve WebSocket connections on this port')
+    args = parser.parse_args()
+
+    server = MockGethServer(args.ip, args.port, chain=MockChain(accounts=args.accounts, blockTime=args.block_time),
+                            p2pPort=args.p2p_port, latency=args.latency, jitter=args.jitter, errorRate=args.error_rate,
+                            dropRate=args.drop_rate, ipcPath=args.ipc_path, wsPort=args.ws_port,
+                            shuffleBatches=args.shuffle_batches)
+    print ("Mock geth JSON-RPC server listening on http://" + ":".join(server.address()))
+    server.start()
+    try:
+        server.stopped.wait()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,290 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Generate the data directories of a private network of N geth clients.
+#
+#    From a genesis template this writes, for every node, a keystore with
+#    one pre-funded account, a node key and a static-nodes.json with the
+#    enodes of its peers (the topologies of networkTopology.py), plus the
+#    genesis.json, a network.json node list (loadable with
+#    networkTopology.loadNodes) and a start-network.sh launching them all
+#    under nodeSupervisor.py.
+#
+#    Keys are derived from a seed and created in parallel processes. Every
+#    generated artifact (keystores, the initialized genesis chaindata) is
+#    cached under its content hash, so running again with the same inputs
+#    only copies files. Without geth on the PATH the chaindata is left for
+#    start-network.sh to initialize.
+#
+#    ./networkGenerator.py /workspace/ethereum/test_network --count 20 --miners 1
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from ethKeys import LIGHT_KDF, STANDARD_KDF, derivePrivateKey, keystoreFileName, makeKeystore, publicKey
+from networkTopology import TOPOLOGIES, nodesFromCount, topologyEdges
+
+DEFAULT_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'networkGenerator')
+
+# geth 1.7's genesis format, the chain id matches --networkid
+GENESIS_TEMPLATE = {
+    'config': {'chainId': 15, 'homesteadBlock': 0, 'eip155Block': 0, 'eip158Block': 0},
+    'nonce': "0x0000000000000042",
+    'difficulty': "0x400",
+    'gasLimit': "0x47b760",
+    'extraData': "0x",
+    'coinbase': "0x0000000000000000000000000000000000000000",
+    'timestamp': "0x00",
+    'parentHash': "0x" + "0" * 64,
+    'mixhash': "0x" + "0" * 64,
+    'alloc': {},
+}
+
+def contentHash(*parts):
+    """ sha256 of the json of parts, the key artifacts are cached under. """
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+def nodeDirectory(nodes,index):
+    """ Data directory of a node, relative to the network directory: miners/<n> or prosumer/<n> as in
+        start-geth.sh, numbered from 00001 within each role.
+    """
+    node = nodes[index]
+    number = sum(1 for other in nodes[:index + 1] if other['miner'] == node['miner'])
+    return ("miners" if node['miner'] else "prosumer") + "/" + "%05d" % number
+
+
+##############################################################################
+# Keys, created in parallel processes and cached
+##############################################################################
+
+def generateKey(seed,name,password,kdf):
+    """ Account keystore and node key of one node (run in a worker process). """
+    accountKey = derivePrivateKey(seed, name + "/account")
+    nodeKey = derivePrivateKey(seed, name + "/node")
+    keystore = makeKeystore(accountKey, password, kdf)
+    return {'address': "0x" + keystore['address'], 'keystore': keystore,
+            'keystoreName': keystoreFileName(keystore['address']),
+            'nodeKey': "%064x" % nodeKey, 'nodeId': publicKey(nodeKey).hex()}
+
+def generateKeys(seed,names,password,kdf,cacheDir,workers=None):
+    """ name -> key artifacts for every name, from the cache or made in parallel. """
+    keys = {}
+    missing = []
+    for name in names:
+        path = os.path.join(cacheDir, 'keys', contentHash('key', seed, name, password, kdf) + ".json")
+        if os.path.exists(path):
+            with open(path) as keyFile:
+                keys[name] = json.load(keyFile)
+        else:
+            missing.append((name, path))
+    if missing:
+        os.makedirs(os.path.join(cacheDir, 'keys'), exist_ok=True)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [(name, path, executor.submit(generateKey, seed, name, password, kdf)) for name, path in missing]
+            for name, path, future in futures:
+                keys[name] = future.result()
+                writeJson(path, keys[name])
+    return keys
+
+def writeJson(path,data):
+    """ Write json atomically, a cache file is either whole or missing. """
+    temporaryPath = path + '.tmp' + str(os.getpid())
+    with open(temporaryPath, 'w') as jsonFile:
+        json.dump(data, jsonFile, indent=2, sort_keys=True)
+    os.replace(temporaryPath, path)
+
+
+##############################################################################
+# Genesis
+##############################################################################
+
+def makeGenesis(template,accounts,balance,networkId):
+    """ template with every account funded with balance wei and the chain id set to networkId. """
+    genesis = copy.deepcopy(template)
+    genesis.setdefault('config', {})['chainId'] = int(networkId)
+    genesis.setdefault('alloc', {})
+    for account in accounts:
+        genesis['alloc'][account[2:]] = {'balance': str(balance)}
+    return genesis
+
+def initializedChaindata(genesis,cacheDir,geth='geth'):
+    """ Directory holding the 'geth' directory of a datadir initialized with genesis, made once per
+        genesis (every node starts from the same state). None when geth is not installed.
+    """
+    path = os.path.join(cacheDir, 'chaindata', contentHash('genesis', genesis))
+    if os.path.isdir(os.path.join(path, 'geth', 'chaindata')):
+        return path
+    if shutil.which(geth) == None:
+        return None
+    building = path + '.tmp' + str(os.getpid())
+    shutil.rmtree(building, ignore_errors=True)
+    os.makedirs(building)
+    genesisPath = os.path.join(building, 'genesis.json')
+    writeJson(genesisPath, genesis)
+    subprocess.check_call([geth, '--datadir', building, 'init', genesisPath], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # keep only the chain, node keys and keystores are per node
+    for name in ('nodekey', 'LOCK', 'transactions.rlp'):
+        if os.path.exists(os.path.join(building, 'geth', name)):
+            os.remove(os.path.join(building, 'geth', name))
+    shutil.rmtree(os.path.join(building, 'keystore'), ignore_errors=True)
+    os.replace(building, path)
+    return path
+
+
+##############################################################################
+# Network
+##############################################################################
+
+def gethCommand(node,network):
+    """ The geth command line of a node, as in start-geth.sh. """
+    command = ['geth', '--password', network['passwordFile'], '--datadir', node['datadir'],
+               '--networkid', str(network['networkId']), '--port', node['p2pPort'], '--unlock', '0',
+               '--verbosity', str(network['verbosity']), '--rpc', '--rpcaddr', node['ip'], '--rpcport', node['rpcPort'],
+               '--rpcapi', network['rpcApi'], '--netrestrict', network['netrestrict'], '--nodiscover']
+    if node.get('wsPort'):
+        # WebSocket endpoint, for eth_subscribe (see rpcTransport.py), geth's IPC socket is always on
+        command += ['--ws', '--wsaddr', node['ip'], '--wsport', str(node['wsPort']), '--wsapi', network['rpcApi'],
+                    '--wsorigins', '*']
+    if node['miner']:
+        command += ['--mine', '--minerthreads=1', '--etherbase=' + node['account']]
+    return command
+
+def startScript(network,outputDir):
+    """ start-network.sh: initialize any node without a chain, then run every node under nodeSupervisor.py. """
+    lines = ["#!/bin/bash", "", "# generated by networkGenerator.py", ""]
+    for node in network['nodes']:
+        datadir = node['datadir']
+        lines.append("[ -d " + datadir + "/geth/chaindata ] || geth --datadir " + datadir + " init " + network['genesisFile']
+                     + " > /dev/null 2>&1")
+    supervisor = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nodeSupervisor.py')
+    lines += ["", "nohup " + supervisor + " run " + os.path.join(outputDir, 'network.json') + " > "
+              + os.path.join(outputDir, 'nodeSupervisor.log') + " 2>&1 &", ""]
+    return "\n".join(lines)
+
+def writeNode(node,keys,chaindata,staticNodes,genesisHash):
+    """ Lay out one node's datadir: keystore, node key, static peers and (if cached) the genesis chain.
+        A chain left over from a different genesis is removed.
+    """
+    datadir = node['datadir']
+    markerPath = os.path.join(datadir, 'geth', 'genesis.sha256')
+    if os.path.exists(markerPath):
+        with open(markerPath) as markerFile:
+            if markerFile.read() != genesisHash:
+                shutil.rmtree(os.path.join(datadir, 'geth', 'chaindata'), ignore_errors=True)
+                shutil.rmtree(os.path.join(datadir, 'geth', 'lightchaindata'), ignore_errors=True)
+    os.makedirs(os.path.join(datadir, 'keystore'), exist_ok=True)
+    os.makedirs(os.path.join(datadir, 'geth'), exist_ok=True)
+    for existing in os.listdir(os.path.join(datadir, 'keystore')):
+        os.remove(os.path.join(datadir, 'keystore', existing))
+    writeJson(os.path.join(datadir, 'keystore', keys['keystoreName']), keys['keystore'])
+    with open(os.path.join(datadir, 'geth', 'nodekey'), 'w') as nodeKeyFile:
+        nodeKeyFile.write(keys['nodeKey'])
+    # geth 1.7 reads static-nodes.json from the instance directory, <datadir>/geth
+    writeJson(os.path.join(datadir, 'geth', 'static-nodes.json'), staticNodes)
+    if chaindata != None and not os.path.isdir(os.path.join(datadir, 'geth', 'chaindata')):
+        for name in os.listdir(os.path.join(chaindata, 'geth')):
+            shutil.copytree(os.path.join(chaindata, 'geth', name), os.path.join(datadir, 'geth', name))
+    with open(markerPath, 'w') as markerFile:
+        markerFile.write(genesisHash)
+
+def generateNetwork(outputDir,count=2,miners=1,ip='127.0.0.1',rpcPortBase=9000,p2pPortBase=8001,networkId=15,
+                    topology='star',k=None,seed='test_network',password='password',balance=10**24,genesisTemplate=None,
+                    lightKdf=True,cacheDir=DEFAULT_CACHE,workers=None,verbosity=3,rpcApi='eth,web3,admin,miner,net,db,txpool'):
+    """ Generate the datadirs of count nodes (the last 'miners' of them mining) under outputDir.
+          topology        - peers written to static-nodes.json: one of networkTopology.TOPOLOGIES.
+          seed            - keys are derived from it, the same seed gives the same accounts and enodes.
+          balance         - wei pre-funded to every node's account in the genesis block.
+          genesisTemplate - genesis dict, the accounts are added to its alloc (default GENESIS_TEMPLATE).
+          lightKdf        - encrypt keystores with geth's --lightkdf scrypt parameters (fast to unlock), or
+                            few PBKDF2 iterations on pythons without hashlib.scrypt.
+        Returns the launch config that is also written to outputDir/network.json.
+    """
+    outputDir = os.path.abspath(outputDir)
+    kdf = LIGHT_KDF if lightKdf else STANDARD_KDF
+    nodes = nodesFromCount(count, ip, rpcPortBase, p2pPortBase, miners)
+    for index, node in enumerate(nodes):
+        directory = nodeDirectory(nodes, index)
+        node['name'] = directory.replace("miners/", "miner").replace("prosumer/", "prosumer")
+        node['datadir'] = os.path.join(outputDir, directory)
+    keys = generateKeys(seed, [node['name'] for node in nodes], password, kdf, cacheDir, workers)
+    for node in nodes:
+        node['account'] = keys[node['name']]['address']
+        node['enode'] = "enode://" + keys[node['name']]['nodeId'] + "@" + node['ip'] + ":" + node['p2pPort']
+
+    genesis = makeGenesis(genesisTemplate or GENESIS_TEMPLATE, [node['account'] for node in nodes], balance, networkId)
+    chaindata = initializedChaindata(genesis, cacheDir)
+    peers = dict((index, []) for index in range(count))
+    for i, j in topologyEdges(nodes, topology, k, contentHash(seed)):
+        peers[i].append(nodes[j]['enode'])
+        peers[j].append(nodes[i]['enode'])
+
+    os.makedirs(outputDir, exist_ok=True)
+    network = {'networkId': int(networkId), 'topology': topology, 'seed': seed, 'verbosity': verbosity, 'rpcApi': rpcApi,
+               'netrestrict': '127.0.0.0/16', 'genesisFile': os.path.join(outputDir, 'genesis.json'),
+               'passwordFile': os.path.join(outputDir, 'password.txt'), 'nodes': nodes}
+    writeJson(network['genesisFile'], genesis)
+    with open(network['passwordFile'], 'w') as passwordFile:
+        passwordFile.write(password + "\n")
+    genesisHash = contentHash('genesis', genesis)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda index: writeNode(nodes[index], keys[nodes[index]['name']], chaindata, peers[index], genesisHash),
+                          range(count)))
+    for node in nodes:
+        node['command'] = gethCommand(node, network)
+    writeJson(os.path.join(outputDir, 'network.json'), network)
+    scriptPath = os.path.join(outputDir, 'start-network.sh')
+    with open(scriptPath, 'w') as scriptFile:
+        scriptFile.write(startScript(network, outputDir))
+    os.chmod(scriptPath, 0o755)
+    return network
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Generate the datadirs, genesis and launch config of a private geth network.')
+    parser.add_argument('outputDir')
+    parser.add_argument('--count', type=int, default=2, help='number of nodes')
+    parser.add_argument('--miners', type=int, default=1, help='how many of the nodes mine')
+    parser.add_argument('--ip', default='127.0.0.1')
+    parser.add_argument('--rpc-port-base', type=int, default=9000)
+    parser.add_argument('--p2p-port-base', type=int, default=8001)
+    parser.add_argument('--network-id', type=int, default=15)
+    parser.add_argument('--topology', choices=TOPOLOGIES, default='star', help='static peers of every node')
+    parser.add_argument('--k', type=int, default=None, help='peers per node of the random topology')
+    parser.add_argument('--seed', default='test_network', help='keys are derived from it')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--balance', type=int, default=10**24, help='wei pre-funded per account')
+    parser.add_argument('--genesis', default=None, help='genesis template json file')
+    parser.add_argument('--standard-kdf', action='store_true', help="geth's default (slow) scrypt parameters, or many PBKDF2 iterations")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE)
+    parser.add_argument('--workers', type=int, default=None, help='processes creating keys (default: cpu count)')
+    args = parser.parse_args()
+
+    genesisTemplate = None
+    if args.genesis:
+        with open(args.genesis) as genesisFile:
+            genesisTemplate = json.load(genesisFile)
+    started = time.time()
+    network = generateNetwork(args.outputDir, args.count, args.miners, args.ip, args.rpc_port_base, args.p2p_port_base,
+                              args.network_id, args.topology, args.k, args.seed, args.password, args.balance, genesisTemplate,
+                              not args.standard_kdf, args.cache_dir, args.workers)
+    for node in network['nodes']:
+        print (node['name'] + " " + node['account'] + " rpc " + node['ip'] + ":" + node['rpcPort'] + " " + node['enode'])
+    print ("Generated " + str(len(network['nodes'])) + " nodes in " + str(round(time.time() - started, 2)) + " seconds, start with "
+           + os.path.join(os.path.abspath(args.outputDir), 'start-network.sh'))
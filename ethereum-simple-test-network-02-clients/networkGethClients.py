@@ -15,59 +15,48 @@ import pprint
 import pycurl
 import json
 import sys
-from io import BytesIO
 import time
+import threading
+import itertools
+from rpcTransport import post, TransportError
+from rpcJson import loads, ResultStreamParser
+from rpcMetrics import getDefaultMetrics, batchLabel
+from rpcCache import getDefaultCache
+from gasEstimator import getDefaultEstimator, DEFAULT_GAS
 
 def rpcCommand(method,params=[],ip='localhost',port='9012',id=1,jsonrpc="2.0",verbose=False,exceptions=False):
     """ Method to abstract away 'curl' usage to interact with RPC of geth clients.
         Will throw error if attempting to connect to a client that doesn't exist.
     """
-    # the <ip:port> to connect to
-    ipPort = str(ip) + ":" + str(port)
-    # buffer to capture output
-    buffer = BytesIO()
-    # start building curl command to process
+    # build the json rpc request
+    data2 = {"jsonrpc":str(jsonrpc),"method": str(method),"params":params,"id":str(id)}
+    data = json.dumps(data2)
+    # HTTP POST over a pooled, keep-alive, pycurl handle (or the client's IPC/WebSocket transport, see rpcTransport.py)
     try:
-        c = pycurl.Curl()
-        c.setopt(pycurl.URL, ipPort)
-        c.setopt(pycurl.HTTPHEADER, ['Accept:application/json'])
-        c.setopt(pycurl.WRITEFUNCTION, buffer.write)
-        data2 = {"jsonrpc":str(jsonrpc),"method": str(method),"params":params,"id":str(id)}
-        data = json.dumps(data2)
-        c.setopt(pycurl.POST, 1)
-        c.setopt(pycurl.POSTFIELDS, data)
-        if verbose:
-            c.setopt(pycurl.VERBOSE, 1)
-        #perform pycurl
-        c.perform()
-
-        # check response code (HTTP codes)
-        if (c.getinfo(pycurl.RESPONSE_CODE) != 200):
-            if exceptions:
-                raise Exception('rpc_communication_error', 'return_code_not_200')
-            return {'error':'rpc_comm_error','desc':'return_code_not_200','error_num':None}
-        #close pycurl object
-        c.close()
-    except pycurl.error as e:
-        c.close()
+        responseCode, body = post(ip, port, data, verbose=verbose, method=method)
+    except (pycurl.error, TransportError) as e:
         errno, message = e.args
         if exceptions:
-            raise Exception('rpc_communication_error', 'Error No: ' + errno + ", message: " + message)
+            raise Exception('rpc_communication_error', 'Error No: ' + str(errno) + ", message: " + message)
         return {'error':'rpc_comm_error','desc':message,'error_num':errno}
 
+    # check response code (HTTP codes)
+    if (responseCode != 200):
+        if exceptions:
+            raise Exception('rpc_communication_error', 'return_code_not_200')
+        return {'error':'rpc_comm_error','desc':'return_code_not_200','error_num':None}
 
-    # decode result
-    results = str(buffer.getvalue().decode('iso-8859-1'))
     if verbose:
-        print (results)
+        print (body.decode('iso-8859-1'))
 
-    # convert result to json object for parsing
-    data = json.loads(results)
+    # convert result to json object for parsing, straight from the received bytes
+    data = loads(body)
     # return appropriate result
     if 'result' in data.keys():
         return data["result"]
     else:
         if 'error' in data.keys():
+            getDefaultMetrics().recordError(ip, port, method)
             if exceptions:
                 raise Exception('rpc_communication_error', data)
             return data
@@ -77,6 +66,205 @@ def rpcCommand(method,params=[],ip='localhost',port='9012',id=1,jsonrpc="2.0",ve
             return {"error":"Unknown Error: possible method/parameter(s) were wrong and/or networking issue."}
 
 
+# unique ids for the calls inside batch requests
+batchIds = itertools.count(1)
+
+def rpcBatchCommand(calls,ip='localhost',port='9012',chunkSize=100,jsonrpc="2.0",verbose=False,exceptions=False):
+    """ Send many rpc calls to one client with a single HTTP POST per chunk (JSON-RPC batch).
+          calls     - list of (method, params) pairs.
+          chunkSize - most calls put into one HTTP POST, bigger lists are split up.
+        Returns a list of results in the same order as calls. A call that failed has the
+        same error dict in its place that rpcCommand would have returned for it.
+    """
+    calls = list(calls)
+    results = []
+    for start in range(0, len(calls), chunkSize):
+        chunk = calls[start:start + chunkSize]
+        ids = [next(batchIds) for call in chunk]
+        data = json.dumps([{"jsonrpc":str(jsonrpc),"method":str(method),"params":params,"id":callId}
+                           for callId, (method, params) in zip(ids, chunk)])
+        label = batchLabel(chunk)
+        try:
+            responseCode, body = post(ip, port, data, verbose=verbose, method=label)
+        except (pycurl.error, TransportError) as e:
+            errno, message = e.args
+            if exceptions:
+                raise Exception('rpc_communication_error', 'Error No: ' + str(errno) + ", message: " + message)
+            results.extend({'error':'rpc_comm_error','desc':message,'error_num':errno} for call in chunk)
+            continue
+        if (responseCode != 200):
+            if exceptions:
+                raise Exception('rpc_communication_error', 'return_code_not_200')
+            results.extend({'error':'rpc_comm_error','desc':'return_code_not_200','error_num':None} for call in chunk)
+            continue
+
+        responses = loads(body)
+        if verbose:
+            pprint.pprint(responses)
+        if isinstance(responses, dict):
+            # the whole batch was rejected, the client answers with one error object
+            getDefaultMetrics().recordError(ip, port, label)
+            if exceptions:
+                raise Exception('rpc_communication_error', responses)
+            results.extend(responses for call in chunk)
+            continue
+
+        # responses may arrive in any order, match them back up by id
+        byId = {}
+        for response in responses:
+            byId[response.get('id')] = response
+        for callId in ids:
+            response = byId.get(callId)
+            if response != None and 'result' in response:
+                results.append(response['result'])
+            elif response != None and 'error' in response:
+                getDefaultMetrics().recordError(ip, port, label)
+                if exceptions:
+                    raise Exception('rpc_communication_error', response)
+                results.append(response)
+            else:
+                if exceptions:
+                    raise Exception('rpc_communication_error', "Unknown Error: no response for batched call.")
+                results.append({"error":"Unknown Error: no response for batched call."})
+    return results
+
+
+def rpcStreamCommand(method,params=[],ip='localhost',port='9012',onItem=None,path=('result',),id=1,jsonrpc="2.0",exceptions=False):
+    """ rpcCommand for calls with large array results (eth_getLogs, blocks with full transactions).
+        The items of the array at path are parsed as they arrive and handed to onItem one at a
+        time, so memory use does not grow with the size of the response.
+        Returns what rpcCommand would, with the streamed array left empty.
+    """
+    data = json.dumps({"jsonrpc":str(jsonrpc),"method": str(method),"params":params,"id":str(id)})
+    parser = ResultStreamParser(onItem, path)
+    failures = []
+
+    def write(piece):
+        try:
+            parser.feed(piece)
+        except Exception as e:
+            # onItem (or the parser) failed, abort the transfer and raise it below
+            failures.append(e)
+            return 0
+
+    try:
+        responseCode, body = post(ip, port, data, method=method, writeFunction=write)
+    except (pycurl.error, TransportError) as e:
+        if failures:
+            raise failures[0]
+        errno, message = e.args
+        if exceptions:
+            raise Exception('rpc_communication_error', 'Error No: ' + str(errno) + ", message: " + message)
+        return {'error':'rpc_comm_error','desc':message,'error_num':errno}
+    if (responseCode != 200):
+        if exceptions:
+            raise Exception('rpc_communication_error', 'return_code_not_200')
+        return {'error':'rpc_comm_error','desc':'return_code_not_200','error_num':None}
+
+    data = parser.close()
+    if 'result' in data.keys():
+        return data["result"]
+    if 'error' in data.keys():
+        getDefaultMetrics().recordError(ip, port, method)
+        if exceptions:
+            raise Exception('rpc_communication_error', data)
+        return data
+    if exceptions:
+        raise Exception('rpc_communication_error', "Unknown Error: possible method/parameter(s) were wrong and/or networking issue.")
+    return {"error":"Unknown Error: possible method/parameter(s) were wrong and/or networking issue."}
+
+
+##############################################################################
+# Cached calls, used by the helper methods (see rpcCache.py).
+##############################################################################
+
+def checkHead(ip,port):
+    """ Let the shared cache follow the client's head, dropping results from orphaned blocks. """
+    cache = getDefaultCache()
+    if cache != None:
+        cache.refreshHead((str(ip), str(port)),
+                          lambda blockParameter: rpcCommand(ip=ip,port=port,method="eth_getBlockByNumber",params=[blockParameter,False]))
+
+def storeMined(cache,node,key,results):
+    cache.putMined(node, key, results)
+
+def storeForBlockParameter(blockParameter):
+    def store(cache,node,key,results):
+        if isinstance(results, str):
+            cache.putForBlockParameter(node, key, results, blockParameter)
+    return store
+
+def cachedCall(ip,port,method,params,store):
+    """ rpcCommand through the shared cache, store(cache, node, key, results) keeps fresh results. """
+    cache = getDefaultCache()
+    if cache == None:
+        return rpcCommand(ip=ip,port=port,method=method,params=params)
+    node = (str(ip), str(port))
+    key = (method,) + tuple(params)
+    found, results = cache.get(node, key)
+    if not found:
+        results = rpcCommand(ip=ip,port=port,method=method,params=params)
+        store(cache, node, key, results)
+    return results
+
+def cachedBatchCall(ip,port,method,paramsList,store):
+    """ rpcBatchCommand through the shared cache, only the calls missing from the cache are sent. """
+    cache = getDefaultCache()
+    if cache == None:
+        return rpcBatchCommand([(method, params) for params in paramsList], ip=ip, port=port)
+    node = (str(ip), str(port))
+    keys = [(method,) + tuple(params) for params in paramsList]
+    results = []
+    missing = []
+    for index, key in enumerate(keys):
+        found, value = cache.get(node, key)
+        results.append(value)
+        if not found:
+            missing.append(index)
+    fetched = rpcBatchCommand([(method, paramsList[index]) for index in missing], ip=ip, port=port)
+    for index, value in zip(missing, fetched):
+        results[index] = value
+        store(cache, node, keys[index], value)
+    return results
+
+
+##############################################################################
+# Gas estimates and prices, used by the helper methods (see gasEstimator.py).
+##############################################################################
+
+def estimateGasMany(ip,port,transactions):
+    """ Gas (hex, with a safety margin) for each transaction dict, the estimates not memoized yet are
+        fetched in one batched request. Error dict in place of a transaction that would fail.
+    """
+    estimator = getDefaultEstimator()
+    if estimator == None:
+        return [DEFAULT_GAS for transaction in transactions]
+    return estimator.estimateMany(transactions, lambda calls: rpcBatchCommand(calls, ip=ip, port=port), (str(ip), str(port)))
+
+def estimateGas(ip,port,transaction):
+    """ Gas (hex, with a safety margin) for one transaction dict, or the error dict if it would fail. """
+    return estimateGasMany(ip, port, [transaction])[0]
+
+def trackSent(transactionHash,transaction):
+    """ Tell the gas estimator about a sent transaction, so its receipt can correct a bad estimate. """
+    estimator = getDefaultEstimator()
+    if estimator != None:
+        estimator.track(transactionHash, transaction)
+
+def observeReceipt(receipt):
+    """ Hand a receipt to the gas estimator: an estimate that ran out of gas is forgotten. """
+    estimator = getDefaultEstimator()
+    if estimator != None:
+        estimator.observe(receipt)
+
+def getGasPrice(ip,port):
+    """ Gas price (hex) paid in the client's recent blocks, its eth_gasPrice if they are empty. """
+    estimator = getDefaultEstimator()
+    if estimator == None:
+        return rpcCommand(ip=ip,port=port,method="eth_gasPrice",params=[])
+    return estimator.gasPrice((str(ip), str(port)), lambda calls: rpcBatchCommand(calls, ip=ip, port=port))
+
+
 ##############################################################################
 # Helper methods to simplify blockchain interactions.
 ##############################################################################
@@ -95,6 +283,22 @@ def getAccounts(ip,port,verbose=False):
         print ("Accounts: " + result)
     return results
 
+# (ip, port) -> account list, the accounts of a client only change when one is created
+accountCache = {}
+accountCacheLock = threading.Lock()
+
+def getCachedAccounts(ip,port,refresh=False):
+    """ Get list of accounts on target geth client, only asking the client the first time. """
+    key = (str(ip), str(port))
+    with accountCacheLock:
+        accounts = accountCache.get(key)
+    if accounts == None or refresh:
+        accounts = getAccounts(ip,port)
+        if isinstance(accounts, list):
+            with accountCacheLock:
+                accountCache[key] = accounts
+    return accounts
+
 def getBalance(ip,port,account=None,blockParameter="latest", verbose=False):
     """ Get balance of an account. Defaults to first account in client.
           blockParameter defaults to "latest", valid options are:
@@ -107,10 +311,10 @@ def getBalance(ip,port,account=None,blockParameter="latest", verbose=False):
     if account == None:
         if verbose == 'True':
             print ("No account given, querying first account on cliennt.")
-        account = rpcCommand(ip=ip,port=port,method='eth_accounts')[0]
+        account = getCachedAccounts(ip,port)[0]
         if verbose == 'True':
             print ("   Account Number: " + account)
-    results = rpcCommand(ip=ip,port=port,method="eth_getBalance",params=[account,blockParameter])
+    results = cachedCall(ip, port, "eth_getBalance", [account,blockParameter], storeForBlockParameter(blockParameter))
     if verbose == 'True':
         print( "Account:" +account + ", latest balance: " + results)
     return results
@@ -129,16 +333,23 @@ def getEnodeInfo(ip,port,verbose=False):
         print ("Enode: " + results['enode'])
     return results['enode']
 
-def deployContract(ip,port,gas = "0x200000", contractBytecode="", account=None,verbose=False):
+def deployContract(ip,port,gas = None, contractBytecode="", account=None,verbose=False):
+    """ Submit contract creation, gas is estimated when not given. """
     if account == None:
-        account = getAccounts(ip,port)[0]
+        account = getCachedAccounts(ip,port)[0]
         if verbose == 'True':
             print ("No acocunt provided, first acocunt on this client will be used: " + account)
+    if gas == None:
+        gas = estimateGas(ip, port, {'from':account, 'data': contractBytecode})
+        if not isinstance(gas, str):
+            return gas
     # Could add future check to see if account balance is suffient enough.
     # balance = getBalance(ip,port,results1[0])
     # balanceNeeded = .... calculation of contract size + gas offering, etc.
     # print ( "balance is not enough, ohly has: " + balance + " needs: " + balanceNeeded)
-    results = rpcCommand(ip=ip,port=port,method="eth_sendTransaction",params=[{'from':account, 'data': contractBytecode,'gas': gas}])
+    transaction = {'from':account, 'data': contractBytecode,'gas': gas}
+    results = rpcCommand(ip=ip,port=port,method="eth_sendTransaction",params=[transaction])
+    trackSent(results, transaction)
     if verbose == 'True':
         print ("Transaction results:" + results)
     # return receipt.
@@ -147,26 +358,35 @@ def deployContract(ip,port,gas = "0x200000", contractBytecode="", account=None,v
 
 def getAddressOfTransaction(ip,port,transactionReceipt,account=None,verbose='False'):
     if account == None:
-        account = getAccounts(ip,port)[0]
+        account = getCachedAccounts(ip,port)[0]
         if verbose == 'True':
             print ("No acocunt provided, first acocunt on this client will be used: " + account)
-    results = rpcCommand("eth_getTransactionReceipt", params=[transactionReceipt], ip=ip, port=port)
+    checkHead(ip, port)
+    results = cachedCall(ip, port, "eth_getTransactionReceipt", [transactionReceipt], storeMined)
+    observeReceipt(results)
     if verbose == 'True':
         print ("TransactionReceipt:")
         pprint.pprint(results)
     return results
 
 
-def callContractMethod(ip,port,toAddress,dataString,gas="0x200000",account=None,verbose=False):
+def callContractMethod(ip,port,toAddress,dataString,gas=None,account=None,verbose=False):
+    """ Submit a contract call as a transaction, gas is estimated when not given. """
     if account == None:
-        account = getAccounts(ip,port)[0]
+        account = getCachedAccounts(ip,port)[0]
         if verbose == 'True':
             print ("No acocunt provided, first acocunt on this client will be used: " + account)
+    if gas == None:
+        gas = estimateGas(ip, port, {'from':account, 'to':toAddress, 'data': dataString})
+        if not isinstance(gas, str):
+            return gas
     # Could add future check to see if account balance is suffient enough.
     # balance = getBalance(ip,port,results1[0])
     # balanceNeeded = .... calculation of contract size + gas offering, etc.
     # print ( "balance is not enough, ohly has: " + balance + " needs: " + balanceNeeded)
-    results = rpcCommand(ip=ip,port=port,method="eth_sendTransaction",params=[{'from':account, 'to':toAddress, 'data': dataString, 'gas': gas}])
+    transaction = {'from':account, 'to':toAddress, 'data': dataString, 'gas': gas}
+    results = rpcCommand(ip=ip,port=port,method="eth_sendTransaction",params=[transaction])
+    trackSent(results, transaction)
     if verbose == 'True':
         print ("Transaction results:" + results)
     return results
@@ -188,7 +408,8 @@ def getBlockNumber(ip,port,verbose='False'):
 
 def getTransactionByHash(ip,port,hash,verbose='False'):
     """ Returns the information about a transaction requested by transaction hash. """
-    results = rpcCommand(ip=ip,port=port,method='eth_getTransactionByHash',params=[hash])
+    checkHead(ip, port)
+    results = cachedCall(ip, port, 'eth_getTransactionByHash', [hash], storeMined)
     if verbose == 'True':
         print ("Transaction by hash:")
         pprint.pprint(results)
@@ -202,6 +423,47 @@ def makeNewFilter(ip,port,fromBlock="0x1",verbose='False'):
     return newFilterID
 
 
+##############################################################################
+# Bulk helper methods, one HTTP POST per chunk of calls (JSON-RPC batch).
+##############################################################################
+
+def getBalances(ip,port,accounts,blockParameter="latest",verbose=False):
+    """ Get balances of many accounts. Returns a dict of account -> balance.
+          blockParameter takes the same options as getBalance.
+    """
+    if blockParameter not in ['earliest', 'latest', 'pending']:
+        return "blockParameter was not a valid option: 'earliest', 'latest', 'pending'."
+    accounts = list(accounts)
+    results = cachedBatchCall(ip, port, "eth_getBalance", [[account, blockParameter] for account in accounts], storeForBlockParameter(blockParameter))
+    balances = dict(zip(accounts, results))
+    if verbose == 'True':
+        print ("Balances:")
+        pprint.pprint(balances)
+    return balances
+
+def getTransactionsByHash(ip,port,hashes,verbose='False'):
+    """ Returns the information about many transactions, as a dict of hash -> transaction. """
+    hashes = list(hashes)
+    checkHead(ip, port)
+    results = cachedBatchCall(ip, port, 'eth_getTransactionByHash', [[hash] for hash in hashes], storeMined)
+    transactions = dict(zip(hashes, results))
+    if verbose == 'True':
+        print ("Transactions by hash:")
+        pprint.pprint(transactions)
+    return transactions
+
+def getTransactionReceipts(ip,port,hashes,verbose='False'):
+    """ Returns the receipts of many transactions, as a dict of hash -> receipt (None if not mined yet). """
+    hashes = list(hashes)
+    checkHead(ip, port)
+    results = cachedBatchCall(ip, port, 'eth_getTransactionReceipt', [[hash] for hash in hashes], storeMined)
+    receipts = dict(zip(hashes, results))
+    if verbose == 'True':
+        print ("TransactionReceipts:")
+        pprint.pprint(receipts)
+    return receipts
+
+
 ##############################################################################
 # Experimental methods, not guarenteed to work!!!!!!
 ##############################################################################
@@ -247,12 +509,21 @@ def getHash(ip,port):
 
 if __name__ == '__main__':
 
-    # get enode info from non-miner client
-    results = getEnodeInfo("127.0.0.1", "9000", verbose='False')
-
-    # convert enode into fully appropriate string version
-    results = results.split("@")[0] + "@127.0.0.1:8001"
+    from networkTopology import makeNode, buildNetwork
 
-    # add the peer to the miner's client statically
-    results2 = addPeer("127.0.0.1", "11000", results)
+    # the non-miner (prosumer) client and the miner client started by start-geth.sh
+    nodes = [ makeNode("127.0.0.1", "9000", "8001", miner=False, name="prosumer00001"),
+              makeNode("127.0.0.1", "11000", "10001", miner=True, name="miner00001") ]
 
+    # add every client to the miner's client statically, see networkTopology.py for other topologies.
+    # a short wait: the peers connect in the background, the report says which had not yet.
+    try:
+        results = buildNetwork(nodes, topology='star', timeout=5)
+    except Exception as e:
+        print ("could not wire the clients together: " + str(e.args[-1]))
+        sys.exit(1)
+    for name, count in results['peers'].items():
+        if count == None or count < results['expectedPeers'][name]:
+            print ("not yet connected: " + name + " has " + str(count) + " of " + str(results['expectedPeers'][name]) + " peers")
+    for a, b, error in results['failedAddPeer']:
+        print ("admin_addPeer failed: " + a + " -> " + b + ": " + str(error))
@@ -0,0 +1,215 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Wire any number of geth clients together into a private network.
+#
+#    Collects the enode of every client at once, adds the peers of the
+#    chosen topology in parallel, then waits until every client reports
+#    the expected number of peers.
+#
+#    ./networkTopology.py --topology ring --count 10
+#    ./networkTopology.py --topology star --node 127.0.0.1:9000:8001 --node 127.0.0.1:11000:10001:miner
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import argparse
+import asyncio
+import json
+import pprint
+import random
+import sys
+import time
+import asyncGethClients
+
+TOPOLOGIES = ['mesh', 'ring', 'star', 'random']
+
+
+##############################################################################
+# Node lists
+##############################################################################
+
+def makeNode(ip,rpcPort,p2pPort,miner=False,name=None):
+    """ A node is a dict of its rpc address, p2p port and whether it mines. """
+    return {'ip':str(ip), 'rpcPort':str(rpcPort), 'p2pPort':str(p2pPort), 'miner':bool(miner),
+            'name': name or (str(ip) + ":" + str(rpcPort))}
+
+def nodesFromCount(count,ip='127.0.0.1',rpcPortBase=9000,p2pPortBase=8001,miners=1):
+    """ count nodes on one host, node i uses rpc port rpcPortBase+i and p2p port p2pPortBase+i.
+        The last 'miners' nodes are marked as miners.
+    """
+    return [makeNode(ip, rpcPortBase + i, p2pPortBase + i, miner=(i >= count - miners)) for i in range(count)]
+
+def parseNode(text):
+    """ Turn '<ip>:<rpcPort>:<p2pPort>[:miner]' into a node. """
+    parts = text.split(':')
+    return makeNode(parts[0], parts[1], parts[2], miner=(len(parts) > 3 and parts[3] == 'miner'))
+
+def loadNodes(path):
+    """ Load a node list from a json file, either a list of nodes or a dict with a 'nodes' list. """
+    with open(path) as nodeFile:
+        data = json.load(nodeFile)
+    if isinstance(data, dict):
+        data = data['nodes']
+    return [makeNode(node['ip'], node['rpcPort'], node['p2pPort'], node.get('miner', False), node.get('name')) for node in data]
+
+
+##############################################################################
+# Topologies, each returns a list of (i, j) edges: node i adds node j as a peer.
+# Peer connections in geth go both ways so every pair is only added once.
+##############################################################################
+
+def meshEdges(nodes):
+    """ Every node connected to every other node (geth's default maxpeers is 25). """
+    return [(i, j) for i in range(len(nodes)) for j in range(i + 1, len(nodes))]
+
+def ringEdges(nodes):
+    """ Every node connected to the node before and after it. """
+    count = len(nodes)
+    if count < 2:
+        return []
+    if count == 2:
+        return [(0, 1)]
+    return [(i, (i + 1) % count) for i in range(count)]
+
+def starEdges(nodes):
+    """ Every node connected to every miner, and the miners to each other.
+        If no node is a miner the first node is the center of the star.
+    """
+    centers = [i for i, node in enumerate(nodes) if node['miner']] or [0]
+    edges = [(a, b) for index, a in enumerate(centers) for b in centers[index + 1:]]
+    edges += [(center, i) for center in centers for i in range(len(nodes)) if i not in centers]
+    return edges
+
+def randomRegularEdges(nodes,k,seed=None,attempts=100):
+    """ Random k-regular graph (every node has exactly k peers), by the pairing model. """
+    count = len(nodes)
+    if k >= count or (k * count) % 2 != 0:
+        raise ValueError('no ' + str(k) + '-regular graph with ' + str(count) + ' nodes, need k < N and k*N even')
+    generator = random.Random(seed)
+    for attempt in range(attempts):
+        stubs = [i for i in range(count) for copy in range(k)]
+        generator.shuffle(stubs)
+        edges = set()
+        valid = True
+        for index in range(0, len(stubs), 2):
+            a, b = sorted((stubs[index], stubs[index + 1]))
+            if a == b or (a, b) in edges:
+                valid = False
+                break
+            edges.add((a, b))
+        if valid:
+            return sorted(edges)
+    raise ValueError('could not build a random ' + str(k) + '-regular graph in ' + str(attempts) + ' attempts')
+
+def topologyEdges(nodes,topology='mesh',k=None,seed=None):
+    if topology == 'mesh':
+        return meshEdges(nodes)
+    if topology == 'ring':
+        return ringEdges(nodes)
+    if topology == 'star':
+        return starEdges(nodes)
+    if topology == 'random':
+        return randomRegularEdges(nodes, k or min(3, len(nodes) - 1), seed=seed)
+    raise ValueError('unknown topology: ' + str(topology) + ', valid options are: ' + ', '.join(TOPOLOGIES))
+
+def expectedPeerCounts(nodes,edges):
+    counts = [0] * len(nodes)
+    for a, b in edges:
+        counts[a] += 1
+        counts[b] += 1
+    return counts
+
+
+##############################################################################
+# Wiring
+##############################################################################
+
+async def collectEnodes(nodes,client=None):
+    """ Get the enode of every node at once, with the host rewritten to the node's ip:p2pPort. """
+    results = await asyncio.gather(*[asyncGethClients.getEnodeInfo(node['ip'], node['rpcPort'], client=client) for node in nodes])
+    enodes = []
+    for node, enode in zip(nodes, results):
+        if not isinstance(enode, str):
+            raise Exception('rpc_communication_error', 'no enode from ' + node['name'] + ': ' + str(enode))
+        enodes.append(enode.split("@")[0] + "@" + node['ip'] + ":" + node['p2pPort'])
+    return enodes
+
+async def waitForPeers(nodes,expected,timeout=60,interval=0.25,client=None):
+    """ Poll every node's peer count at once until each has at least its expected number of peers.
+        Returns the last peer counts seen (as ints, None for nodes that did not answer).
+    """
+    deadline = time.time() + timeout
+    while True:
+        results = await asyncio.gather(*[asyncGethClients.getPeerCount(node['ip'], node['rpcPort'], client=client) for node in nodes])
+        counts = [int(result, 16) if isinstance(result, str) else None for result in results]
+        if all(count != None and count >= want for count, want in zip(counts, expected)):
+            return counts
+        if time.time() >= deadline:
+            return counts
+        await asyncio.sleep(interval)
+
+async def wireNetwork(nodes,topology='mesh',k=None,seed=None,timeout=60,verbose='False'):
+    """ Connect nodes in the given topology and wait for the peer counts to converge.
+        Returns a report dict with the edges added, expected and actual peer counts.
+    """
+    client = asyncGethClients.AsyncRpcClient(maxInFlightPerNode=4)
+    try:
+        edges = topologyEdges(nodes, topology, k, seed)
+        enodes = await collectEnodes(nodes, client)
+        results = await asyncio.gather(*[asyncGethClients.addPeer(nodes[a]['ip'], nodes[a]['rpcPort'], enodes[b], client=client)
+                                         for a, b in edges])
+        failed = [(nodes[a]['name'], nodes[b]['name'], result) for (a, b), result in zip(edges, results) if result is not True]
+        expected = expectedPeerCounts(nodes, edges)
+        counts = await waitForPeers(nodes, expected, timeout=timeout, client=client)
+    finally:
+        client.close()
+    converged = all(count != None and count >= want for count, want in zip(counts, expected))
+    report = {'topology': topology,
+              'edges': [(nodes[a]['name'], nodes[b]['name']) for a, b in edges],
+              'failedAddPeer': failed,
+              'expectedPeers': dict((node['name'], want) for node, want in zip(nodes, expected)),
+              'peers': dict((node['name'], count) for node, count in zip(nodes, counts)),
+              'converged': converged}
+    if verbose == 'True':
+        pprint.pprint(report)
+    return report
+
+def buildNetwork(nodes,topology='mesh',k=None,seed=None,timeout=60,verbose='False'):
+    """ Blocking version of wireNetwork for synchronous scripts. """
+    return asyncGethClients.runSync(wireNetwork(nodes, topology, k, seed, timeout, verbose))
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Wire geth clients together into a private network.')
+    parser.add_argument('--topology', choices=TOPOLOGIES, default='mesh')
+    parser.add_argument('--k', type=int, default=None, help='peers per node for the random topology')
+    parser.add_argument('--seed', type=int, default=None, help='seed for the random topology')
+    parser.add_argument('--node', action='append', default=[], help='<ip>:<rpcPort>:<p2pPort>[:miner], repeatable')
+    parser.add_argument('--nodes', help='json file with a list of nodes')
+    parser.add_argument('--count', type=int, help='number of nodes on --ip using consecutive ports')
+    parser.add_argument('--ip', default='127.0.0.1')
+    parser.add_argument('--rpc-port-base', type=int, default=9000)
+    parser.add_argument('--p2p-port-base', type=int, default=8001)
+    parser.add_argument('--timeout', type=float, default=60)
+    args = parser.parse_args()
+
+    if args.nodes:
+        nodes = loadNodes(args.nodes)
+    elif args.node:
+        nodes = [parseNode(text) for text in args.node]
+    elif args.count:
+        nodes = nodesFromCount(args.count, args.ip, args.rpc_port_base, args.p2p_port_base)
+    else:
+        parser.error('give --node, --nodes or --count')
+
+    report = buildNetwork(nodes, args.topology, args.k, args.seed, args.timeout, verbose='True')
+    sys.exit(0 if report['converged'] and not report['failedAddPeer'] else 1)
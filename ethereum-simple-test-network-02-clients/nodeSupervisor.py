@@ -0,0 +1,340 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Launch and supervise the geth clients of the network (or mock clients).
+#
+#    Starts every node of a network.json (see networkGenerator.py) as a
+#    child process, assigning rpc and p2p ports to nodes that have none.
+#    Each node's output is read line by line into a rotating log file and a
+#    node is reported ready the moment it logs that its HTTP endpoint is
+#    open (confirmed with one eth_blockNumber call), nothing polls. Nodes
+#    that exit are restarted with exponential backoff. On SIGTERM/SIGINT
+#    every node is stopped at once, and killed if it does not exit in time.
+#
+#    ./nodeSupervisor.py run /workspace/network-02-clients.json
+#    ./nodeSupervisor.py mock --count 3
+#    ./nodeSupervisor.py stop
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import argparse
+import json
+import logging
+import logging.handlers
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+STATUS_FILE = '/tmp/nodeSupervisor.json'
+MOCK_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mockGethServer.py')
+
+# output lines that mean a node accepts rpc calls: geth 1.7 ("HTTP endpoint opened"),
+# newer geth ("HTTP server started") and mockGethServer.py
+READY_PATTERN = re.compile(r'HTTP endpoint opened|HTTP server started|JSON-RPC server listening on')
+
+NETWORK_DEFAULTS = {'networkId': 15, 'verbosity': 3, 'rpcApi': 'eth,web3,admin,miner,net,db,txpool',
+                    'netrestrict': '127.0.0.0/16', 'passwordFile': '/workspace/password.txt'}
+
+def answersRpc(ip,port,timeout=2.0):
+    """ True if <ip:port> answers eth_blockNumber. Plain urllib, so the supervisor needs nothing but the
+        standard library (it starts the clients before anything else runs).
+    """
+    request = urllib.request.Request("http://" + str(ip) + ":" + str(port),
+                                     data=b'{"jsonrpc":"2.0","method":"eth_blockNumber","params":[],"id":1}',
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return 'result' in json.loads(response.read().decode('utf-8'))
+    except (OSError, ValueError):
+        return False
+
+def freePort(ip='127.0.0.1'):
+    """ A port nothing listens on right now, picked by the OS. """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind((ip, 0))
+        return str(probe.getsockname()[1])
+
+def assignPorts(network):
+    """ Give nodes without rpcPort/p2pPort one: rpcPortBase/p2pPortBase + index when the network
+        has those, otherwise a free port.
+    """
+    for index, node in enumerate(network['nodes']):
+        node.setdefault('ip', '127.0.0.1')
+        for key, base in (('rpcPort', 'rpcPortBase'), ('p2pPort', 'p2pPortBase')):
+            if not node.get(key):
+                node[key] = str(network[base] + index) if base in network else freePort(node['ip'])
+            node[key] = str(node[key])
+    return network
+
+def nodeCommand(node,network):
+    """ Command line of a node: its own 'command', mockGethServer.py for kind 'mock', else geth's. """
+    if node.get('command'):
+        return list(node['command'])
+    if node.get('kind') == 'mock':
+        # -u: unbuffered, the ready line has to arrive while the server runs
+        return [sys.executable, '-u', MOCK_SERVER, '--ip', node['ip'], '--port', node['rpcPort'], '--p2p-port', node['p2pPort'],
+                '--block-time', str(node.get('blockTime', 1.0))]
+    from networkGenerator import gethCommand
+    settings = dict(NETWORK_DEFAULTS)
+    settings.update(network)
+    return gethCommand(node, settings)
+
+def loadNetwork(path):
+    with open(path) as networkFile:
+        network = json.load(networkFile)
+    if isinstance(network, list):
+        network = {'nodes': network}
+    return network
+
+def mockNetwork(count,blockTime=1.0,rpcPortBase=None,logDir='/tmp'):
+    """ A network of count mock clients. """
+    network = {'nodes': [{'name': 'mock%05d' % (index + 1), 'kind': 'mock', 'blockTime': blockTime,
+                          'logFile': os.path.join(logDir, 'mock%05d.log' % (index + 1))} for index in range(count)]}
+    if rpcPortBase != None:
+        network['rpcPortBase'] = rpcPortBase
+        network['p2pPortBase'] = rpcPortBase + count
+    return network
+
+
+class SupervisedNode(object):
+    """ One node's process, log and restart state. """
+
+    def __init__(self,node,command,logFile,maxLogBytes,logBackups):
+        self.node = node
+        self.name = node['name']
+        self.command = command
+        self.logFile = logFile
+        self.process = None
+        self.state = 'stopped'
+        self.restarts = 0
+        self.failures = 0
+        self.startedAt = None
+        self.readyAt = None
+        self.exitCode = None
+        self.ready = threading.Event()
+        self.thread = None
+        self.log = logging.getLogger('nodeSupervisor.' + self.name)
+        self.log.propagate = False
+        self.log.setLevel(logging.INFO)
+        for handler in list(self.log.handlers):
+            self.log.removeHandler(handler)
+        os.makedirs(os.path.dirname(os.path.abspath(logFile)), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(logFile, maxBytes=maxLogBytes, backupCount=logBackups)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.log.addHandler(handler)
+
+    def address(self):
+        return (self.node['ip'], self.node['rpcPort'])
+
+    def status(self):
+        return {'pid': self.process.pid if self.process != None and self.process.poll() == None else None,
+                'state': self.state, 'ip': self.node['ip'], 'rpcPort': self.node['rpcPort'],
+                'p2pPort': self.node['p2pPort'], 'restarts': self.restarts, 'exitCode': self.exitCode,
+                'startedAt': self.startedAt, 'readyAt': self.readyAt, 'logFile': self.logFile}
+
+
+class NodeSupervisor(object):
+    """ Runs the nodes of a network (dict as in network.json) as supervised child processes.
+          backoff / maxBackoff - seconds before the first restart of a node, doubled per failure up to maxBackoff.
+          stableSeconds        - a node that ran this long before exiting restarts after backoff again.
+          maxLogBytes          - size a node's log file rotates at, logBackups rotated files are kept.
+          statusFile           - json status written on every change (None for none).
+          onReady(name, (ip, port)) - called once a node is ready, again after every restart.
+    """
+
+    def __init__(self,network,backoff=1.0,maxBackoff=60.0,stableSeconds=30.0,maxLogBytes=10 * 1024 * 1024,logBackups=5,
+                 statusFile=None,onReady=None):
+        self.network = assignPorts(network)
+        self.backoff = backoff
+        self.maxBackoff = maxBackoff
+        self.stableSeconds = stableSeconds
+        self.statusFile = statusFile
+        self.onReady = onReady
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.nodes = []
+        for node in self.network['nodes']:
+            logFile = node.get('logFile') or os.path.join(node['datadir'], 'output.log')
+            self.nodes.append(SupervisedNode(node, nodeCommand(node, self.network), logFile, maxLogBytes, logBackups))
+
+    ##########################################################################
+    # running
+    ##########################################################################
+
+    def start(self):
+        """ Start every node, returns at once (see waitReady). """
+        for node in self.nodes:
+            node.thread = threading.Thread(target=self.superviseNode, args=(node,), name='supervise-' + node.name)
+            node.thread.daemon = True
+            node.thread.start()
+        self.writeStatus()
+        return self
+
+    def superviseNode(self,node):
+        """ Run node until stop(): launch, pump its output into the log, restart it when it exits. """
+        while not self.stopping.is_set():
+            self.launch(node)
+            for line in iter(node.process.stdout.readline, b''):
+                text = line.decode('utf-8', 'replace').rstrip('\n')
+                node.log.info(text)
+                if node.state == 'starting' and READY_PATTERN.search(text):
+                    threading.Thread(target=self.confirmReady, args=(node,), name='ready-' + node.name, daemon=True).start()
+            node.exitCode = node.process.wait()
+            node.ready.clear()
+            if self.stopping.is_set():
+                break
+            ranFor = time.time() - node.startedAt
+            node.failures = 0 if ranFor >= self.stableSeconds else node.failures + 1
+            delay = min(self.maxBackoff, self.backoff * (2 ** max(0, node.failures - 1)))
+            node.log.info("[nodeSupervisor] " + node.name + " exited with " + str(node.exitCode) + " after "
+                          + str(round(ranFor, 1)) + "s, restarting in " + str(delay) + "s")
+            self.setState(node, 'restarting')
+            # waiting on the event lets stop() interrupt the backoff
+            if self.stopping.wait(delay):
+                break
+            node.restarts += 1
+        self.setState(node, 'stopped')
+
+    def launch(self,node):
+        with self.lock:
+            node.process = subprocess.Popen(node.command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                            stdin=subprocess.DEVNULL, start_new_session=True)
+            node.startedAt = time.time()
+            node.readyAt = None
+            node.exitCode = None
+        node.log.info("[nodeSupervisor] started " + node.name + " pid " + str(node.process.pid) + ": " + " ".join(node.command))
+        self.setState(node, 'starting')
+
+    def confirmReady(self,node,attempts=5):
+        """ The ready line was logged, check that rpc calls get through. """
+        process = node.process
+        ip, port = node.address()
+        for attempt in range(attempts):
+            if process is not node.process or process.poll() != None or self.stopping.is_set():
+                return
+            if answersRpc(ip, port):
+                break
+            self.stopping.wait(0.1 * (attempt + 1))
+        else:
+            node.log.info("[nodeSupervisor] " + node.name + " logged its endpoint but does not answer rpc calls")
+            return
+        node.readyAt = time.time()
+        self.setState(node, 'ready')
+        node.ready.set()
+        if self.onReady != None:
+            self.onReady(node.name, node.address())
+
+    def waitReady(self,timeout=None,names=None):
+        """ Block until every node (or the named ones) is ready. Returns True, or False on timeout. """
+        deadline = None if timeout == None else time.time() + timeout
+        for node in self.nodes:
+            if names != None and node.name not in names:
+                continue
+            remaining = None if deadline == None else max(0, deadline - time.time())
+            if not node.ready.wait(remaining):
+                return False
+        return True
+
+    def stop(self,timeout=15.0):
+        """ Stop every node at once: SIGTERM to all, then SIGKILL to those still running after timeout. """
+        self.stopping.set()
+        running = [node for node in self.nodes if node.process != None and node.process.poll() == None]
+        for node in running:
+            self.setState(node, 'stopping')
+            node.process.terminate()
+        deadline = time.time() + timeout
+        for node in running:
+            try:
+                node.process.wait(max(0, deadline - time.time()))
+            except subprocess.TimeoutExpired:
+                node.process.kill()
+                node.process.wait()
+        for node in self.nodes:
+            if node.thread != None:
+                node.thread.join()
+        self.writeStatus()
+
+    ##########################################################################
+    # status
+    ##########################################################################
+
+    def setState(self,node,state):
+        node.state = state
+        self.writeStatus()
+
+    def status(self):
+        """ name -> pid, state, ports, restarts and log file of every node. """
+        return dict((node.name, node.status()) for node in self.nodes)
+
+    def writeStatus(self):
+        if self.statusFile == None:
+            return
+        with self.lock:
+            temporaryPath = self.statusFile + '.tmp'
+            with open(temporaryPath, 'w') as statusFile:
+                json.dump({'supervisorPid': os.getpid(), 'updatedAt': time.time(), 'nodes': self.status()}, statusFile, indent=2)
+            os.replace(temporaryPath, self.statusFile)
+
+    def nodeAddresses(self):
+        """ (ip, rpcPort) of every node, for the rpc helpers. """
+        return [node.address() for node in self.nodes]
+
+
+def superviseUntilSignalled(supervisor):
+    """ Run supervisor until SIGTERM or SIGINT, then stop every node. """
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda number, frame: stopped.set())
+    signal.signal(signal.SIGINT, lambda number, frame: stopped.set())
+    supervisor.start()
+    stopped.wait()
+    supervisor.stop()
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Launch and supervise geth (or mock) clients.')
+    parser.add_argument('--status-file', default=STATUS_FILE, help='json status of the nodes, rewritten on every change')
+    parser.add_argument('--backoff', type=float, default=1.0, help='seconds before the first restart, doubled per crash')
+    parser.add_argument('--max-log-bytes', type=int, default=10 * 1024 * 1024, help='rotate node logs at this size')
+    commands = parser.add_subparsers(dest='command')
+    runParser = commands.add_parser('run', help='supervise the nodes of a network.json')
+    runParser.add_argument('network')
+    mockParser = commands.add_parser('mock', help='supervise mock clients')
+    mockParser.add_argument('--count', type=int, default=2)
+    mockParser.add_argument('--block-time', type=float, default=1.0)
+    mockParser.add_argument('--rpc-port-base', type=int, default=None, help='default: free ports')
+    commands.add_parser('stop', help='stop a running supervisor and its nodes')
+    commands.add_parser('status', help='print the status file')
+    args = parser.parse_args()
+
+    if args.command in ('run', 'mock'):
+        network = loadNetwork(args.network) if args.command == 'run' else mockNetwork(args.count, args.block_time, args.rpc_port_base)
+        supervisor = NodeSupervisor(network, backoff=args.backoff, maxLogBytes=args.max_log_bytes, statusFile=args.status_file,
+                                    onReady=lambda name, address: print ("Ready: " + name + " " + ":".join(address), flush=True))
+        superviseUntilSignalled(supervisor)
+    elif args.command in ('stop', 'status'):
+        if not os.path.exists(args.status_file):
+            print ("No supervisor status at " + args.status_file)
+            sys.exit(1)
+        with open(args.status_file) as statusFile:
+            status = json.load(statusFile)
+        if args.command == 'status':
+            print (json.dumps(status, indent=2))
+        else:
+            os.kill(status['supervisorPid'], signal.SIGTERM)
+    else:
+        parser.print_help()
@@ -15,58 +15,43 @@ import pprint
 import pycurl
 import json
 import sys
-from io import BytesIO
 import time
+from rpcConnectionPool import getDefaultPool
+from rpcJson import loads
+from rpcMetrics import getDefaultMetrics
 
 
 def rpcCommand(method,params=[],ip='localhost',port='9012',id=1,jsonrpc="2.0",verbose=False,exceptions=False):
     """ Method to abstract away 'curl' usage to interact with RPC of geth clients. """
-    # the <ip:port> to connect to
-    ipPort = str(ip) + ":" + str(port)
-    # buffer to capture output
-    buffer = BytesIO()
-    # start building curl command to process
+    # build the json rpc request
+    data2 = {"jsonrpc":str(jsonrpc),"method": str(method),"params":params,"id":str(id)}
+    data = json.dumps(data2)
+    # HTTP POST over a pooled, keep-alive, pycurl handle
     try:
-        c = pycurl.Curl()
-        c.setopt(pycurl.URL, ipPort)
-        c.setopt(pycurl.HTTPHEADER, ['Accept:application/json'])
-        c.setopt(pycurl.WRITEFUNCTION, buffer.write)
-        data2 = {"jsonrpc":str(jsonrpc),"method": str(method),"params":params,"id":str(id)}
-        data = json.dumps(data2)
-        c.setopt(pycurl.POST, 1)
-        c.setopt(pycurl.POSTFIELDS, data)
-        if verbose:
-            c.setopt(pycurl.VERBOSE, 1)
-        #perform pycurl
-        c.perform()
-
-        # check response code (HTTP codes)
-        if (c.getinfo(pycurl.RESPONSE_CODE) != 200):
-            if exceptions:
-                raise Exception('rpc_communication_error', 'return_code_not_200')
-            return {'error':'rpc_comm_error','desc':'return_code_not_200','error_num':None}
-        #close pycurl object
-        c.close()
+        responseCode, body = getDefaultPool().post(ip, port, data, verbose=verbose, method=method)
     except pycurl.error as e:
-        c.close()
         errno, message = e.args
         if exceptions:
-            raise Exception('rpc_communication_error', 'Error No: ' + errno + ", message: " + message)
+            raise Exception('rpc_communication_error', 'Error No: ' + str(errno) + ", message: " + message)
         return {'error':'rpc_comm_error','desc':message,'error_num':errno}
 
+    # check response code (HTTP codes)
+    if (responseCode != 200):
+        if exceptions:
+            raise Exception('rpc_communication_error', 'return_code_not_200')
+        return {'error':'rpc_comm_error','desc':'return_code_not_200','error_num':None}
 
-    # decode result
-    results = str(buffer.getvalue().decode('iso-8859-1'))
     if verbose:
-        print (results)
+        print (body.decode('iso-8859-1'))
 
-    # convert result to json object for parsing
-    data = json.loads(results)
+    # convert result to json object for parsing, straight from the received bytes
+    data = loads(body)
     # return appropriate result
     if 'result' in data.keys():
         return data["result"]
     else:
         if 'error' in data.keys():
+            getDefaultMetrics().recordError(ip, port, method)
             if exceptions:
                 raise Exception('rpc_communication_error', data)
             return data
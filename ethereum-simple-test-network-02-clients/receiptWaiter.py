@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Wait for transactions to be mined instead of sleeping a fixed time.
+#
+#    Polls the head block number with an adaptive interval, and as soon as
+#    a new block shows up fetches the receipts of every still pending
+#    transaction in one batched request. Every receipt found is handed to
+#    the gas estimator (see gasEstimator.py).
+#
+#    ./receiptWaiter.py <ip> <port> <transactionHash> [<transactionHash> ...]
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import pprint
+import sys
+import time
+from networkGethClients import rpcCommand, rpcBatchCommand, observeReceipt
+
+
+def waitForReceipts(ip,port,transactionHashes,timeout=300,minInterval=0.05,maxInterval=1.0,onReceipt=None,verbose='False'):
+    """ Wait until every transaction in transactionHashes has been mined.
+          timeout     - seconds to wait in total before giving up.
+          minInterval - seconds between head polls right after a new block.
+          maxInterval - most seconds between head polls, the interval backs off
+                        from minInterval up to a quarter of the observed block time,
+                        but never past maxInterval.
+          onReceipt   - optional function(transactionHash, receipt) called as soon
+                        as each receipt is found.
+        Returns a dict of transactionHash -> receipt, receipt is None for the
+        transactions that were not mined before the timeout.
+    """
+    pending = set(transactionHashes)
+    receipts = dict((transactionHash, None) for transactionHash in pending)
+    deadline = time.time() + timeout
+    lastBlock = None
+    lastBlockTime = None
+    blockTime = None
+    interval = minInterval
+
+    while pending:
+        blockNumber = rpcCommand(ip=ip,port=port,method="eth_blockNumber",params=[])
+        now = time.time()
+        if isinstance(blockNumber, str) and blockNumber != lastBlock:
+            # new head, check every pending transaction in one request
+            if lastBlockTime != None:
+                observed = now - lastBlockTime
+                blockTime = observed if blockTime == None else 0.75 * blockTime + 0.25 * observed
+            lastBlock = blockNumber
+            lastBlockTime = now
+            interval = minInterval
+            hashes = list(pending)
+            results = rpcBatchCommand([("eth_getTransactionReceipt", [transactionHash]) for transactionHash in hashes], ip=ip, port=port)
+            for transactionHash, receipt in zip(hashes, results):
+                if isinstance(receipt, dict) and 'blockNumber' in receipt:
+                    pending.discard(transactionHash)
+                    receipts[transactionHash] = receipt
+                    observeReceipt(receipt)
+                    if verbose == 'True':
+                        print ("Transaction " + transactionHash + " mined in block " + receipt['blockNumber'])
+                    if onReceipt != None:
+                        onReceipt(transactionHash, receipt)
+            if not pending:
+                break
+        else:
+            # no new block yet, back off
+            ceiling = maxInterval if blockTime == None else min(maxInterval, max(minInterval, blockTime / 4.0))
+            interval = min(interval * 2, ceiling)
+
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            if verbose == 'True':
+                print ("Timed out waiting for " + str(len(pending)) + " transaction(s).")
+            break
+        time.sleep(min(interval, remaining))
+    return receipts
+
+def waitForReceipt(ip,port,transactionHash,timeout=300,verbose='False'):
+    """ Wait until one transaction has been mined, returns its receipt (None on timeout). """
+    return waitForReceipts(ip, port, [transactionHash], timeout=timeout, verbose=verbose)[transactionHash]
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    # Must give <this-script> <ip> <port> <transactionHash> [<transactionHash> ...]
+    receipts = waitForReceipts(sys.argv[1], sys.argv[2], sys.argv[3:], verbose='True')
+    pprint.pprint(receipts)
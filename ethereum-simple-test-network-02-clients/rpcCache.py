@@ -0,0 +1,215 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Cache for the results of the ethereum RPC "2.0" helper methods.
+#
+#    Mined transactions and receipts never change (unless their block is
+#    orphaned), so they are kept in a size bounded LRU cache. Results for
+#    "latest"/"pending" only live for a short time. The head of every
+#    client is followed, and when its parent hash stops matching what was
+#    seen before, every entry from the orphaned blocks is dropped.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class RpcCache(object):
+    """ Per client cache of rpc results.
+          maxEntries        - most immutable entries kept, least recently used are evicted first.
+          latestTtl         - seconds a result for "latest" is kept.
+          pendingTtl        - seconds a result for "pending" (or a pending transaction) is kept.
+          headCheckInterval - most seconds between head (reorg) checks of a client.
+          headHistory       - number of recent canonical block hashes kept per client, also the
+                              deepest reorg that is looked for.
+    """
+
+    def __init__(self,maxEntries=10000,latestTtl=1.0,pendingTtl=0.25,headCheckInterval=1.0,headHistory=256):
+        self.maxEntries = maxEntries
+        self.latestTtl = latestTtl
+        self.pendingTtl = pendingTtl
+        self.headCheckInterval = headCheckInterval
+        self.headHistory = headHistory
+        self.lock = threading.RLock()
+        # (node, key) -> (value, blockNumber), in least to most recently used order
+        self.immutable = OrderedDict()
+        # (node, key) -> (value, expiresAt)
+        self.volatile = {}
+        # node -> OrderedDict of blockNumber -> blockHash for the recent canonical chain
+        self.heads = {}
+        # node -> time of the last head check
+        self.headChecks = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    ##########################################################################
+    # lookups / stores
+    ##########################################################################
+
+    def get(self,node,key):
+        """ Returns (found, value). """
+        entryKey = (node, key)
+        with self.lock:
+            entry = self.immutable.get(entryKey)
+            if entry != None:
+                self.immutable.move_to_end(entryKey)
+                self.hits += 1
+                return True, entry[0]
+            entry = self.volatile.get(entryKey)
+            if entry != None:
+                if entry[1] > time.time():
+                    self.hits += 1
+                    return True, entry[0]
+                del self.volatile[entryKey]
+            self.misses += 1
+            return False, None
+
+    def putImmutable(self,node,key,value,blockNumber,blockHash=None):
+        """ Keep a result that only changes if block blockNumber (blockHash) is orphaned. """
+        entryKey = (node, key)
+        with self.lock:
+            if blockHash != None:
+                # remembered so a later reorg of this block is noticed
+                heads = self.heads.setdefault(node, OrderedDict())
+                if blockNumber not in heads:
+                    heads[blockNumber] = blockHash
+            self.immutable[entryKey] = (value, blockNumber)
+            self.immutable.move_to_end(entryKey)
+            while len(self.immutable) > self.maxEntries:
+                self.immutable.popitem(last=False)
+
+    def putVolatile(self,node,key,value,ttl):
+        with self.lock:
+            if len(self.volatile) >= self.maxEntries:
+                now = time.time()
+                for entryKey in [entryKey for entryKey, entry in self.volatile.items() if entry[1] <= now]:
+                    del self.volatile[entryKey]
+                if len(self.volatile) >= self.maxEntries:
+                    self.volatile.clear()
+            self.volatile[(node, key)] = (value, time.time() + ttl)
+
+    def putForBlockParameter(self,node,key,value,blockParameter):
+        """ Store a result queried at blockParameter with the right lifetime. """
+        if blockParameter == 'earliest':
+            self.putImmutable(node, key, value, 0)
+        elif blockParameter == 'pending':
+            self.putVolatile(node, key, value, self.pendingTtl)
+        else:
+            self.putVolatile(node, key, value, self.latestTtl)
+
+    def putMined(self,node,key,value):
+        """ Store a transaction or receipt, kept for good once it is in a block. """
+        if isinstance(value, dict) and value.get('blockHash') and value.get('blockNumber'):
+            self.putImmutable(node, key, value, int(value['blockNumber'], 16), value['blockHash'])
+        elif isinstance(value, dict) and 'error' not in value:
+            self.putVolatile(node, key, value, self.pendingTtl)
+
+    ##########################################################################
+    # reorg handling
+    ##########################################################################
+
+    def invalidate(self,node,fromBlock):
+        """ Drop every entry of node from block fromBlock onwards, and all of its short lived entries. """
+        with self.lock:
+            for entryKey in [entryKey for entryKey, entry in self.immutable.items() if entryKey[0] == node and entry[1] >= fromBlock]:
+                del self.immutable[entryKey]
+            for entryKey in [entryKey for entryKey in self.volatile if entryKey[0] == node]:
+                del self.volatile[entryKey]
+            heads = self.heads.get(node)
+            if heads != None:
+                for number in [number for number in heads if number >= fromBlock]:
+                    del heads[number]
+            self.invalidations += 1
+
+    def refreshHead(self,node,fetchBlock,force=False):
+        """ Follow the head of node, dropping entries from orphaned blocks.
+              fetchBlock - function(blockParameter) returning the block dict for 'latest' or a hex number.
+            Checks at most once every headCheckInterval seconds unless force is given.
+            Returns the first orphaned block number, or None if there was no reorg.
+        """
+        now = time.time()
+        with self.lock:
+            if not force and now - self.headChecks.get(node, 0) < self.headCheckInterval:
+                return None
+            self.headChecks[node] = now
+            known = dict(self.heads.get(node, {}))
+
+        head = fetchBlock('latest')
+        if not isinstance(head, dict) or 'hash' not in head:
+            return None
+        number = int(head['number'], 16)
+        canonical = {number: head['hash']}
+        forkPoint = None
+        if known.get(number, head['hash']) != head['hash']:
+            forkPoint = number
+        if any(knownNumber > number for knownNumber in known):
+            # the chain got shorter, everything above the new head is orphaned
+            forkPoint = min(forkPoint if forkPoint != None else number + 1, number + 1)
+
+        # check the remembered hashes below the head, newest first, and stop at the first one that is
+        # still canonical. Only remembered blocks are looked at: the hash of the block just below one
+        # already fetched is its parentHash, other ones are fetched once each. So an unchanged chain
+        # costs at most one extra call however far the head moved, and only a mismatch walks further.
+        block = head
+        for knownNumber in sorted((knownNumber for knownNumber in known if knownNumber < number), reverse=True)[:self.headHistory]:
+            if int(block['number'], 16) != knownNumber + 1:
+                block = fetchBlock(hex(knownNumber + 1))
+                if not isinstance(block, dict) or 'hash' not in block:
+                    break
+                canonical[knownNumber + 1] = block['hash']
+            if block['parentHash'] == known[knownNumber]:
+                break
+            # orphaned, the next remembered block down might be too
+            forkPoint = knownNumber
+            block = fetchBlock(hex(knownNumber))
+            if not isinstance(block, dict) or 'hash' not in block:
+                break
+            canonical[knownNumber] = block['hash']
+
+        if forkPoint != None:
+            self.invalidate(node, forkPoint)
+        with self.lock:
+            heads = self.heads.setdefault(node, OrderedDict())
+            for blockNumber in sorted(canonical):
+                heads[blockNumber] = canonical[blockNumber]
+            for oldNumber in sorted(heads)[:-self.headHistory]:
+                del heads[oldNumber]
+        return forkPoint
+
+    def clear(self):
+        with self.lock:
+            self.immutable.clear()
+            self.volatile.clear()
+            self.heads.clear()
+            self.headChecks.clear()
+
+    def stats(self):
+        with self.lock:
+            return {'immutableEntries': len(self.immutable), 'volatileEntries': len(self.volatile),
+                    'hits': self.hits, 'misses': self.misses, 'invalidations': self.invalidations}
+
+
+##############################################################################
+# Shared cache used by the helper methods, None when caching is turned off.
+##############################################################################
+
+defaultCacheLock = threading.Lock()
+defaultCache = RpcCache()
+
+def getDefaultCache():
+    """ Get the cache shared by the helper methods, None if caching is turned off. """
+    return defaultCache
+
+def configureDefaultCache(enabled=True,maxEntries=10000,latestTtl=1.0,pendingTtl=0.25,headCheckInterval=1.0):
+    """ Replace the shared cache with one using the given settings (or turn it off). """
+    global defaultCache
+    with defaultCacheLock:
+        defaultCache = RpcCache(maxEntries, latestTtl, pendingTtl, headCheckInterval) if enabled else None
+    return defaultCache
@@ -0,0 +1,188 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Pool of persistent (keep-alive) pycurl handles for geth RPC "2.0" calls.
+#
+#    Handles are kept per <ip:port> and reused between calls, so only the
+#    first call to a client pays for the TCP handshake. Safe to share
+#    between threads. Every post is recorded in rpcMetrics (latency, bytes,
+#    whether the connection was reused).
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import pycurl
+import threading
+import time
+from rpcMetrics import getDefaultMetrics
+
+
+class RpcConnectionPool(object):
+    """ Thread safe pool of pycurl handles keyed by (ip, port).
+          maxHandlesPerNode - most handles (connections) open to one client at once,
+                              callers block until a handle is free once reached.
+          idleTimeout       - seconds an unused handle is kept before it is closed.
+          connectTimeout    - seconds allowed to connect to a client.
+          requestTimeout    - seconds allowed for a whole request (0 for no limit).
+    """
+
+    def __init__(self,maxHandlesPerNode=8,idleTimeout=30.0,connectTimeout=5,requestTimeout=60):
+        self.maxHandlesPerNode = maxHandlesPerNode
+        self.idleTimeout = idleTimeout
+        self.connectTimeout = connectTimeout
+        self.requestTimeout = requestTimeout
+        self.condition = threading.Condition(threading.Lock())
+        # (ip,port) -> list of [handle, lastUsedTime], most recently used last
+        self.idleHandles = {}
+        # (ip,port) -> number of handles currently created (idle + in use)
+        self.openCounts = {}
+        self.closed = False
+
+    def newHandle(self):
+        """ Create a pycurl handle with the options shared by every call. """
+        c = pycurl.Curl()
+        c.setopt(pycurl.HTTPHEADER, ['Accept:application/json', 'Content-Type:application/json'])
+        c.setopt(pycurl.POST, 1)
+        c.setopt(pycurl.NOSIGNAL, 1)
+        c.setopt(pycurl.TCP_KEEPALIVE, 1)
+        c.setopt(pycurl.CONNECTTIMEOUT, self.connectTimeout)
+        c.setopt(pycurl.TIMEOUT, self.requestTimeout)
+        return c
+
+    def evictIdle(self,now=None):
+        """ Close every idle handle that has not been used within idleTimeout. """
+        if now == None:
+            now = time.time()
+        expired = []
+        with self.condition:
+            for key, handles in self.idleHandles.items():
+                keep = [entry for entry in handles if now - entry[1] < self.idleTimeout]
+                if len(keep) != len(handles):
+                    expired.extend(entry[0] for entry in handles if now - entry[1] >= self.idleTimeout)
+                    self.openCounts[key] -= len(handles) - len(keep)
+                    handles[:] = keep
+            if expired:
+                self.condition.notify_all()
+        for handle in expired:
+            handle.close()
+        return len(expired)
+
+    def acquire(self,ip,port,timeout=None):
+        """ Get a handle connected (or connectable) to <ip:port>. Must be given back via release(). """
+        key = (str(ip), str(port))
+        self.evictIdle()
+        deadline = None if timeout == None else time.time() + timeout
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise Exception('rpc_communication_error', 'connection pool is closed')
+                handles = self.idleHandles.get(key)
+                if handles:
+                    return handles.pop()[0]
+                if self.openCounts.get(key, 0) < self.maxHandlesPerNode:
+                    self.openCounts[key] = self.openCounts.get(key, 0) + 1
+                    break
+                remaining = None if deadline == None else deadline - time.time()
+                if remaining != None and remaining <= 0:
+                    raise Exception('rpc_communication_error', 'no free connection to ' + key[0] + ':' + key[1])
+                self.condition.wait(remaining)
+        try:
+            return self.newHandle()
+        except:
+            self.forget(key)
+            raise
+
+    def release(self,ip,port,handle,reusable=True):
+        """ Give a handle back to the pool. Handles that failed mid request are closed instead. """
+        key = (str(ip), str(port))
+        if not reusable or self.closed:
+            handle.close()
+            self.forget(key)
+            return
+        with self.condition:
+            self.idleHandles.setdefault(key, []).append([handle, time.time()])
+            self.condition.notify()
+
+    def forget(self,key):
+        with self.condition:
+            self.openCounts[key] = max(0, self.openCounts.get(key, 0) - 1)
+            self.condition.notify()
+
+    def post(self,ip,port,data,verbose=False,method='unknown',writeFunction=None):
+        """ HTTP POST data to <ip:port> over a pooled handle, method names the call for the metrics.
+            Returns (responseCode, responseBytes), responseBytes being a bytearray the response was
+            received into (no copies). With writeFunction the response is instead handed to it piece
+            by piece as it arrives and responseBytes is None, returning a number from it aborts.
+            Raises pycurl.error on communication failures.
+        """
+        body = None
+        received = [0]
+        if writeFunction == None:
+            body = bytearray()
+            write = body.extend
+        else:
+            def write(piece):
+                received[0] += len(piece)
+                return writeFunction(piece)
+        handle = self.acquire(ip, port)
+        reusable = False
+        responseCode = None
+        reused = None
+        started = time.perf_counter()
+        try:
+            handle.setopt(pycurl.URL, str(ip) + ":" + str(port))
+            handle.setopt(pycurl.WRITEFUNCTION, write)
+            handle.setopt(pycurl.POSTFIELDS, data)
+            handle.setopt(pycurl.VERBOSE, 1 if verbose else 0)
+            handle.perform()
+            responseCode = handle.getinfo(pycurl.RESPONSE_CODE)
+            reused = handle.getinfo(pycurl.NUM_CONNECTS) == 0
+            reusable = True
+        finally:
+            getDefaultMetrics().record(ip, port, method, time.perf_counter() - started, len(data),
+                                       len(body) if body != None else received[0], reused, responseCode != 200)
+            self.release(ip, port, handle, reusable)
+        return responseCode, body
+
+    def close(self):
+        """ Close every idle handle, handles in use are closed when released. """
+        with self.condition:
+            self.closed = True
+            handles = [entry[0] for entries in self.idleHandles.values() for entry in entries]
+            self.idleHandles = {}
+            self.openCounts = {}
+            self.condition.notify_all()
+        for handle in handles:
+            handle.close()
+
+
+##############################################################################
+# Shared pool used by rpcCommand.
+##############################################################################
+
+defaultPoolLock = threading.Lock()
+defaultPool = None
+
+def getDefaultPool():
+    """ Get the pool shared by every rpcCommand call in this process. """
+    global defaultPool
+    with defaultPoolLock:
+        if defaultPool == None:
+            defaultPool = RpcConnectionPool()
+        return defaultPool
+
+def configureDefaultPool(maxHandlesPerNode=8,idleTimeout=30.0,connectTimeout=5,requestTimeout=60):
+    """ Replace the shared pool with one using the given settings. """
+    global defaultPool
+    with defaultPoolLock:
+        oldPool = defaultPool
+        defaultPool = RpcConnectionPool(maxHandlesPerNode=maxHandlesPerNode,
+                                        idleTimeout=idleTimeout,
+                                        connectTimeout=connectTimeout,
+                                        requestTimeout=requestTimeout)
+    if oldPool != None:
+        oldPool.close()
+    return defaultPool
@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# JSON decoding for rpc responses, straight from the received bytes.
+#
+#    loads() parses bytes/bytearray without first copying them into a str,
+#    using orjson, ujson or rapidjson when one is installed and the stdlib
+#    json module otherwise.
+#
+#    ResultStreamParser is fed the response as it arrives and hands out the
+#    items of one array in it (e.g. the "result" of eth_getLogs, or the
+#    "transactions" of a full block) as soon as they are complete, so only
+#    the last received piece of the response is ever held in memory, no
+#    matter how large the response is.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import json
+import re
+
+try:
+    import orjson
+
+    BACKEND = 'orjson'
+    def loads(data):
+        """ Parse a JSON document from bytes, bytearray, memoryview or str. """
+        return orjson.loads(data)
+except ImportError:
+    try:
+        import ujson
+
+        BACKEND = 'ujson'
+        def loads(data):
+            """ Parse a JSON document from bytes, bytearray, memoryview or str. """
+            return ujson.loads(bytes(data) if isinstance(data, memoryview) else data)
+    except ImportError:
+        try:
+            import rapidjson
+
+            BACKEND = 'rapidjson'
+            def loads(data):
+                """ Parse a JSON document from bytes, bytearray, memoryview or str. """
+                return rapidjson.loads(bytes(data) if isinstance(data, memoryview) else data)
+        except ImportError:
+            BACKEND = 'json'
+            def loads(data):
+                """ Parse a JSON document from bytes, bytearray, memoryview or str. """
+                # json.loads only takes bytes from python 3.6 on, it decodes them the same way itself
+                return json.loads(data if isinstance(data, str) else bytes(data).decode('utf-8'))
+
+
+# a string, a structural character or a run of anything else (numbers, literals, whitespace)
+ENVELOPE_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[][{},:]|[^][{},:"]+')
+# everything up to the next bracket or comma (or bracket, inside of a nested value) outside of strings
+ITEM_TOP = re.compile(rb'(?:[^"\[\]{},]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+ITEM_NESTED = re.compile(rb'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+
+
+class ResultStreamParser(object):
+    """ Incremental parser of one JSON-RPC response, streaming the items of the array at path.
+          onItem - called with every (decoded) item of the array, in order.
+          path   - keys leading from the top level object to the array, ('result',) for calls
+                   returning an array, ('result', 'transactions') for a block with full transactions.
+        feed() the response bytes in any number of pieces, then close() returns the rest of the
+        response (jsonrpc, id, result or error) with the streamed array left empty.
+    """
+
+    def __init__(self,onItem,path=('result',)):
+        self.onItem = onItem
+        self.path = [b'"' + key.encode('utf-8') + b'"' for key in path]
+        # received bytes not consumed yet: at most the item being received (or an unfinished string)
+        self.buffer = bytearray()
+        self.position = 0
+        # everything but the streamed items, small
+        self.envelope = bytearray()
+        # one [container, key] per open object/array outside the streamed items
+        self.stack = []
+        self.lastString = None
+        self.streaming = False
+        self.itemStart = 0
+        self.itemDepth = 0
+        self.count = 0
+
+    def feed(self,chunk):
+        self.buffer += chunk
+        while True:
+            if self.streaming:
+                if not self.feedItems():
+                    break
+            elif not self.feedEnvelope():
+                break
+        # drop what has been consumed, keeping only the unfinished item
+        consumed = self.itemStart if self.streaming else self.position
+        del self.buffer[:consumed]
+        self.position -= consumed
+        self.itemStart -= consumed
+
+    def feedEnvelope(self):
+        """ Copy tokens into the envelope until the streamed array starts. False when out of data. """
+        buffer = self.buffer
+        while True:
+            match = ENVELOPE_TOKEN.match(buffer, self.position)
+            if match == None:
+                # out of data, or in the middle of a string
+                return False
+            token = match.group()
+            self.position = match.end()
+            self.envelope += token
+            if token[0] == 0x22:
+                self.lastString = token
+            elif token == b':':
+                if self.stack:
+                    self.stack[-1][1] = self.lastString
+            elif token == b',':
+                if self.stack:
+                    self.stack[-1][1] = None
+            elif token == b'{':
+                self.stack.append([b'{', None])
+            elif token == b'[':
+                keys = [key for container, key in self.stack]
+                objects = all(container == b'{' for container, key in self.stack)
+                self.stack.append([b'[', None])
+                if objects and keys == self.path:
+                    self.streaming = True
+                    self.itemDepth = 0
+                    self.itemStart = self.position
+                    return True
+            elif token == b'}' or token == b']':
+                if self.stack:
+                    self.stack.pop()
+
+    def feedItems(self):
+        """ Hand out every complete item of the streamed array. False when out of data. """
+        buffer = self.buffer
+        end = len(buffer)
+        # the complete items found in this piece are parsed together, "item,item,..." is buffer[batchStart:batchEnd]
+        batchStart = self.itemStart
+        batchEnd = None
+        while True:
+            scanner = ITEM_NESTED if self.itemDepth else ITEM_TOP
+            stop = scanner.match(buffer, self.position).end()
+            if stop >= end or buffer[stop] == 0x22:
+                # out of data, or in the middle of a string: rescan from here once more arrives
+                self.position = stop
+                self.emitItems(batchStart, batchEnd)
+                return False
+            character = buffer[stop]
+            self.position = stop + 1
+            if character == 0x7b or character == 0x5b:
+                self.itemDepth += 1
+            elif self.itemDepth > 0:
+                self.itemDepth -= 1
+            elif character == 0x2c:
+                # ',' between items
+                batchEnd = stop
+                self.itemStart = self.position
+            else:
+                # ']' at the end of the array
+                if buffer[self.itemStart:stop].strip():
+                    batchEnd = stop
+                self.emitItems(batchStart, batchEnd)
+                self.streaming = False
+                self.stack.pop()
+                self.envelope += b']'
+                return True
+
+    def emitItems(self,start,end):
+        if end == None:
+            return
+        items = loads(b'[' + self.buffer[start:end] + b']')
+        self.count += len(items)
+        for item in items:
+            self.onItem(item)
+
+    def close(self):
+        """ Parse what is left of the response (everything but the streamed items). """
+        return loads(self.envelope)
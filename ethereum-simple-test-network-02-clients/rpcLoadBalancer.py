@@ -0,0 +1,287 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# rpc client spreading calls over several geth clients, with failover.
+#
+#    Reads go to the endpoint with the fewest calls outstanding or the best
+#    latency EWMA (weighted by its outstanding calls). Writes (transactions,
+#    admin/miner/personal calls) are pinned to one endpoint, since accounts
+#    and their nonces live on a single client. A background health check
+#    polls every endpoint's block number; endpoints that do not answer, or
+#    whose head is more than maxLag blocks behind the median of the pool,
+#    are taken out of rotation until they recover. A read that fails to
+#    reach its endpoint is retried on the next best one.
+#
+#    ./rpcLoadBalancer.py 127.0.0.1:9000 127.0.0.1:11000
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from networkGethClients import rpcCommand, rpcBatchCommand
+
+# methods that change state or depend on a client's own accounts, always sent to the write endpoint
+WRITE_METHODS = set(["eth_sendTransaction", "eth_sendRawTransaction", "eth_sign", "eth_signTransaction",
+                     "eth_newFilter", "eth_newBlockFilter", "eth_newPendingTransactionFilter",
+                     "eth_getFilterChanges", "eth_getFilterLogs", "eth_uninstallFilter", "eth_accounts",
+                     "eth_coinbase"])
+WRITE_PREFIXES = ("personal_", "admin_", "miner_", "debug_", "txpool_")
+
+def isWrite(method):
+    return method in WRITE_METHODS or method.startswith(WRITE_PREFIXES)
+
+def isCommunicationError(results):
+    """ True for rpcCommand's error dicts for calls that never reached the client (not rpc errors). """
+    return isinstance(results, dict) and results.get('error') == 'rpc_comm_error'
+
+
+class Endpoint(object):
+    """ One geth client of the pool and what is known about its health. """
+
+    def __init__(self,ip,port):
+        self.ip = str(ip)
+        self.port = str(port)
+        self.outstanding = 0
+        # seconds, None until the first call finished
+        self.latencyEwma = None
+        self.healthy = True
+        self.lagging = False
+        self.blockNumber = None
+        self.failures = 0
+        self.lastError = None
+        self.calls = 0
+
+    def name(self):
+        return self.ip + ":" + self.port
+
+    def available(self):
+        return self.healthy and not self.lagging
+
+    def status(self):
+        return {'healthy': self.healthy, 'lagging': self.lagging, 'blockNumber': self.blockNumber,
+                'outstanding': self.outstanding, 'calls': self.calls, 'failures': self.failures,
+                'latencyEwmams': None if self.latencyEwma == None else round(self.latencyEwma * 1000.0, 3),
+                'lastError': self.lastError}
+
+
+class LoadBalancedClient(object):
+    """ rpc calls over a pool of geth clients.
+          endpoints      - list of (ip, port).
+          strategy       - 'least-outstanding' or 'ewma' for picking the endpoint of a read.
+          writeEndpoint  - (ip, port) writes are pinned to, default the first endpoint.
+          healthInterval - seconds between background health checks, 0 for none (an endpoint a
+                           call failed on then stays out of rotation).
+          maxLag         - blocks an endpoint may be behind the median head before it is ejected.
+          ewmaAlpha      - weight of the newest latency sample in the EWMA.
+          retries        - other endpoints a failed read is retried on (default all of them).
+    """
+
+    def __init__(self,endpoints,strategy='least-outstanding',writeEndpoint=None,healthInterval=2.0,maxLag=3,
+                 ewmaAlpha=0.3,retries=None):
+        if strategy not in ('least-outstanding', 'ewma'):
+            raise ValueError('unknown strategy: ' + str(strategy))
+        self.endpoints = [Endpoint(ip, port) for ip, port in endpoints]
+        if not self.endpoints:
+            raise ValueError('no endpoints')
+        self.strategy = strategy
+        self.maxLag = maxLag
+        self.ewmaAlpha = ewmaAlpha
+        self.retries = len(self.endpoints) - 1 if retries == None else retries
+        self.lock = threading.Lock()
+        self.writeEndpoint = self.endpoints[0]
+        if writeEndpoint != None:
+            self.writeEndpoint = self.endpointFor(writeEndpoint)
+        self.nextTieBreak = 0
+        self.stopped = threading.Event()
+        self.healthInterval = healthInterval
+        self.healthExecutor = ThreadPoolExecutor(max_workers=len(self.endpoints))
+        self.healthThread = None
+        if healthInterval:
+            self.checkHealth()
+            self.healthThread = threading.Thread(target=self.healthLoop, name='rpcLoadBalancerHealth')
+            self.healthThread.daemon = True
+            self.healthThread.start()
+
+    def endpointFor(self,node):
+        for endpoint in self.endpoints:
+            if (endpoint.ip, endpoint.port) == (str(node[0]), str(node[1])):
+                return endpoint
+        raise ValueError('not an endpoint of the pool: ' + str(node))
+
+    def pinWrites(self,node):
+        """ Send writes to (ip, port) from now on. """
+        self.writeEndpoint = self.endpointFor(node)
+
+    ##########################################################################
+    # endpoint selection
+    ##########################################################################
+
+    def score(self,endpoint):
+        if self.strategy == 'ewma':
+            # unmeasured endpoints score best so they get measured
+            return (endpoint.latencyEwma or 0.0) * (endpoint.outstanding + 1)
+        return endpoint.outstanding
+
+    def pickRead(self,exclude=()):
+        """ The best available endpoint for a read (any endpoint if none is available). """
+        with self.lock:
+            candidates = [endpoint for endpoint in self.endpoints if endpoint.available() and endpoint not in exclude]
+            if not candidates:
+                candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+            if not candidates:
+                return None
+            best = min(self.score(endpoint) for endpoint in candidates)
+            ties = [endpoint for endpoint in candidates if self.score(endpoint) == best]
+            # rotate through equally good endpoints instead of always using the first
+            self.nextTieBreak += 1
+            endpoint = ties[self.nextTieBreak % len(ties)]
+            endpoint.outstanding += 1
+            return endpoint
+
+    def begin(self,endpoint):
+        with self.lock:
+            endpoint.outstanding += 1
+
+    def finish(self,endpoint,seconds,results):
+        with self.lock:
+            endpoint.outstanding -= 1
+            endpoint.calls += 1
+            if isCommunicationError(results):
+                endpoint.failures += 1
+                endpoint.healthy = False
+                endpoint.lastError = results.get('desc')
+                return
+            if endpoint.latencyEwma == None:
+                endpoint.latencyEwma = seconds
+            else:
+                endpoint.latencyEwma += self.ewmaAlpha * (seconds - endpoint.latencyEwma)
+
+    ##########################################################################
+    # calls
+    ##########################################################################
+
+    def send(self,endpoint,function,**kwargs):
+        started = time.perf_counter()
+        results = {'error': 'rpc_comm_error', 'desc': 'exception'}
+        try:
+            results = function(ip=endpoint.ip, port=endpoint.port, **kwargs)
+        finally:
+            self.finish(endpoint, time.perf_counter() - started, results)
+        return results
+
+    def route(self,write,function,**kwargs):
+        """ Run function(ip=..., port=..., **kwargs) on the write endpoint, or on the best read
+            endpoint with failover to the next best ones while calls fail to get through.
+        """
+        if write:
+            self.begin(self.writeEndpoint)
+            return self.send(self.writeEndpoint, function, **kwargs)
+        tried = []
+        results = None
+        while True:
+            endpoint = self.pickRead(exclude=tried)
+            if endpoint == None:
+                return results
+            results = self.send(endpoint, function, **kwargs)
+            tried.append(endpoint)
+            if not isCommunicationError(results) or len(tried) > self.retries:
+                return results
+
+    def rpcCommand(self,method,params=[],exceptions=False):
+        """ networkGethClients.rpcCommand on the pool, same return values. """
+        results = self.route(isWrite(method), rpcCommand, method=method, params=params)
+        if exceptions and isinstance(results, dict) and 'error' in results:
+            raise Exception('rpc_communication_error', results)
+        return results
+
+    def rpcBatchCommand(self,calls,chunkSize=100,exceptions=False):
+        """ networkGethClients.rpcBatchCommand on the pool: one endpoint answers the whole batch,
+            the write endpoint if any call in it is a write.
+        """
+        calls = list(calls)
+        write = any(isWrite(method) for method, params in calls)
+        results = self.route(write, self.batchOnce, calls=calls, chunkSize=chunkSize)
+        if isCommunicationError(results):
+            # no endpoint could be reached
+            results = [results for call in calls]
+        if exceptions:
+            for result in results:
+                if isinstance(result, dict) and 'error' in result:
+                    raise Exception('rpc_communication_error', result)
+        return results
+
+    def batchOnce(self,ip,port,calls,chunkSize):
+        results = rpcBatchCommand(calls, ip=ip, port=port, chunkSize=chunkSize)
+        # a single error dict makes route() fail over when the whole batch did not get through
+        if results and all(isCommunicationError(result) for result in results):
+            return results[0]
+        return results
+
+    def call(self,helper,*args,**kwargs):
+        """ Run a networkGethClients helper taking (ip, port, ...) as a read, e.g.
+            client.call(getBalance, account). Pass write=True for helpers that send transactions.
+        """
+        write = kwargs.pop('write', False)
+        return self.route(write, lambda ip, port: helper(ip, port, *args, **kwargs))
+
+    ##########################################################################
+    # health
+    ##########################################################################
+
+    def probe(self,endpoint):
+        results = rpcCommand(ip=endpoint.ip,port=endpoint.port,method="eth_blockNumber",params=[])
+        return None if isinstance(results, dict) else int(results, 16)
+
+    def checkHealth(self):
+        """ Poll every endpoint's head block at once, then mark unreachable and lagging ones. """
+        heights = list(self.healthExecutor.map(self.probe, self.endpoints))
+        answered = sorted(height for height in heights if height != None)
+        median = answered[len(answered) // 2] if answered else None
+        with self.lock:
+            for endpoint, height in zip(self.endpoints, heights):
+                endpoint.healthy = height != None
+                if height == None:
+                    endpoint.lastError = 'health check failed'
+                    continue
+                endpoint.blockNumber = height
+                endpoint.lagging = median - height > self.maxLag
+        return median
+
+    def healthLoop(self):
+        while not self.stopped.wait(self.healthInterval):
+            try:
+                self.checkHealth()
+            except Exception:
+                pass
+
+    def status(self):
+        """ "ip:port" -> health, head, outstanding calls and latency of every endpoint. """
+        with self.lock:
+            return dict((endpoint.name(), endpoint.status()) for endpoint in self.endpoints)
+
+    def close(self):
+        self.stopped.set()
+        if self.healthThread != None:
+            self.healthThread.join()
+        self.healthExecutor.shutdown(wait=True)
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    nodes = [tuple(text.rsplit(':', 1)) for text in sys.argv[1:]] or [('127.0.0.1', '9000'), ('127.0.0.1', '11000')]
+    client = LoadBalancedClient(nodes)
+    for index in range(20):
+        client.rpcCommand("eth_blockNumber")
+    for name, status in sorted(client.status().items()):
+        print (name + " " + str(status))
+    client.close()
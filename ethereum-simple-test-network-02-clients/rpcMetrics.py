@@ -0,0 +1,328 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Per (client, method) metrics for the rpc calls made by this process.
+#
+#    Counts calls and errors, bytes sent and received, how often a pooled
+#    connection was reused, and keeps an HDR style (log-linear buckets,
+#    ~3% precision) latency histogram per (client, method). Recording a
+#    call is a few dict lookups under a lock, so it is always on.
+#
+#    Export as a dict (snapshot()), as Prometheus text (prometheusText(),
+#    serveMetrics(port)) or as periodic json lines (MetricsReporter).
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+# 2**SUB_BUCKET_BITS buckets per power of two of microseconds
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+# "le" bounds (seconds) of the Prometheus histograms
+PROMETHEUS_BOUNDS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+
+
+class LatencyHistogram(object):
+    """ Log-linear histogram of latencies (recorded in seconds, bucketed in microseconds).
+        Values below 2**SUB_BUCKET_BITS us get their own bucket, above that every power
+        of two is split into 2**(SUB_BUCKET_BITS-1) buckets. Not thread safe on its own.
+    """
+
+    def __init__(self):
+        # bucket index -> count
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def bucketIndex(micros):
+        shift = micros.bit_length() - SUB_BUCKET_BITS
+        if shift <= 0:
+            return micros
+        return shift * SUB_BUCKET_COUNT + (micros >> shift)
+
+    @staticmethod
+    def bucketUpperBound(index):
+        """ Largest latency (seconds) that falls into a bucket. """
+        shift, subBucket = divmod(index, SUB_BUCKET_COUNT)
+        if shift == 0:
+            return subBucket / 1e6
+        return (((subBucket + 1) << shift) - 1) / 1e6
+
+    def record(self,seconds):
+        index = self.bucketIndex(int(seconds * 1e6))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self,other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self,fraction):
+        """ Latency (seconds) at or below which fraction of the recorded calls were. """
+        if self.count == 0:
+            return None
+        rank = max(1, int(round(fraction * self.count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self.bucketUpperBound(index), self.max)
+        return self.max
+
+    def cumulativeCounts(self,bounds):
+        """ Number of calls at or below each bound (seconds), for Prometheus "le" buckets. """
+        ordered = sorted((self.bucketUpperBound(index), count) for index, count in self.counts.items())
+        results = []
+        seen = 0
+        position = 0
+        for bound in bounds:
+            while position < len(ordered) and ordered[position][0] <= bound:
+                seen += ordered[position][1]
+                position += 1
+            results.append(seen)
+        return results
+
+
+class MethodStats(object):
+    """ Everything recorded for one (client, method). """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.bytesOut = 0
+        self.bytesIn = 0
+        self.newConnections = 0
+        self.reusedConnections = 0
+        self.latency = LatencyHistogram()
+
+    def copy(self):
+        stats = MethodStats()
+        stats.__dict__.update(self.__dict__)
+        stats.latency = LatencyHistogram()
+        stats.latency.merge(self.latency)
+        return stats
+
+
+class RpcMetrics(object):
+    """ Thread safe registry of MethodStats keyed by ("ip:port", method).
+          enabled - when False record()/recordError() return straight away.
+    """
+
+    def __init__(self,enabled=True):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.started = time.time()
+
+    def statsFor(self,node,method):
+        key = (node, method)
+        stats = self.stats.get(key)
+        if stats == None:
+            stats = self.stats[key] = MethodStats()
+        return stats
+
+    def record(self,ip,port,method,seconds,bytesOut=0,bytesIn=0,reused=None,error=False):
+        """ Record one HTTP round trip. reused - True/False if known whether the connection was reused. """
+        if not self.enabled:
+            return
+        with self.lock:
+            stats = self.statsFor(str(ip) + ":" + str(port), method)
+            stats.calls += 1
+            if error:
+                stats.errors += 1
+            stats.bytesOut += bytesOut
+            stats.bytesIn += bytesIn
+            if reused == True:
+                stats.reusedConnections += 1
+            elif reused == False:
+                stats.newConnections += 1
+            stats.latency.record(seconds)
+
+    def recordError(self,ip,port,method,count=1):
+        """ Count rpc level errors (an "error" in the json response of a call that got through). """
+        if not self.enabled:
+            return
+        with self.lock:
+            self.statsFor(str(ip) + ":" + str(port), method).errors += count
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+            self.started = time.time()
+
+    ##########################################################################
+    # exports
+    ##########################################################################
+
+    def snapshot(self):
+        """ Dict of "ip:port" -> method -> counters and latency percentiles (ms), plus per client totals. """
+        with self.lock:
+            copies = [(key, stats.copy()) for key, stats in self.stats.items()]
+        toMs = lambda value: None if value == None else round(value * 1000.0, 3)
+        nodes = {}
+        for (node, method), stats in copies:
+            latency = stats.latency
+            connections = stats.newConnections + stats.reusedConnections
+            totals = nodes.setdefault(node, {'methods': {}, 'calls': 0, 'errors': 0, 'bytesOut': 0, 'bytesIn': 0})
+            totals['methods'][method] = {
+                'calls': stats.calls, 'errors': stats.errors, 'bytesOut': stats.bytesOut, 'bytesIn': stats.bytesIn,
+                'connectionReuseRate': round(stats.reusedConnections / float(connections), 4) if connections else None,
+                'meanms': toMs(latency.total / latency.count if latency.count else None),
+                'p50ms': toMs(latency.percentile(0.50)), 'p90ms': toMs(latency.percentile(0.90)),
+                'p99ms': toMs(latency.percentile(0.99)), 'p999ms': toMs(latency.percentile(0.999)),
+                'maxms': toMs(latency.max if latency.count else None)}
+            for counter in ('calls', 'errors', 'bytesOut', 'bytesIn'):
+                totals[counter] += getattr(stats, counter)
+        return {'time': time.time(), 'since': self.started, 'nodes': nodes}
+
+    def prometheusText(self):
+        """ The metrics in the Prometheus text exposition format. """
+        with self.lock:
+            items = sorted((key, stats.calls, stats.errors, stats.bytesOut, stats.bytesIn, stats.newConnections,
+                            stats.reusedConnections, stats.latency.cumulativeCounts(PROMETHEUS_BOUNDS),
+                            stats.latency.count, stats.latency.total) for key, stats in self.stats.items())
+        counters = [('geth_rpc_calls_total', 'HTTP round trips per client and method.', 1),
+                    ('geth_rpc_errors_total', 'Failed calls (communication or rpc errors).', 2),
+                    ('geth_rpc_bytes_out_total', 'Request bytes sent.', 3),
+                    ('geth_rpc_bytes_in_total', 'Response bytes received.', 4),
+                    ('geth_rpc_new_connections_total', 'Calls that had to open a new connection.', 5),
+                    ('geth_rpc_reused_connections_total', 'Calls sent over a reused keep-alive connection.', 6)]
+        label = lambda node, method: 'node="' + node + '",method="' + method.replace('"', '\\"') + '"'
+        lines = []
+        for name, help, column in counters:
+            lines.append('# HELP ' + name + ' ' + help)
+            lines.append('# TYPE ' + name + ' counter')
+            for item in items:
+                lines.append(name + '{' + label(*item[0]) + '} ' + str(item[column]))
+        lines.append('# HELP geth_rpc_latency_seconds Round trip latency per client and method.')
+        lines.append('# TYPE geth_rpc_latency_seconds histogram')
+        for item in items:
+            labels = label(*item[0])
+            for bound, count in zip(PROMETHEUS_BOUNDS, item[7]):
+                lines.append('geth_rpc_latency_seconds_bucket{' + labels + ',le="' + repr(bound) + '"} ' + str(count))
+            lines.append('geth_rpc_latency_seconds_bucket{' + labels + ',le="+Inf"} ' + str(item[8]))
+            lines.append('geth_rpc_latency_seconds_sum{' + labels + '} ' + repr(item[9]))
+            lines.append('geth_rpc_latency_seconds_count{' + labels + '} ' + str(item[8]))
+        return "\n".join(lines) + "\n"
+
+
+##############################################################################
+# Prometheus endpoint and json lines reporter
+##############################################################################
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+
+    def log_message(self,format,*args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?')[0] == '/metrics':
+            data = self.server.metrics.prometheusText().encode('utf-8')
+            contentType = 'text/plain; version=0.0.4'
+        elif self.path.split('?')[0] == '/metrics.json':
+            data = json.dumps(self.server.metrics.snapshot(), sort_keys=True).encode('utf-8')
+            contentType = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', contentType)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MetricsServer(ThreadingMixIn, HTTPServer):
+    """ Serves /metrics (Prometheus text) and /metrics.json (snapshot()) from a background thread. """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self,metrics,ip='0.0.0.0',port=9100):
+        HTTPServer.__init__(self, (ip, int(port)), MetricsRequestHandler)
+        self.metrics = metrics
+        self.thread = threading.Thread(target=self.serve_forever, name='rpcMetricsServer')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class MetricsReporter(object):
+    """ Appends a snapshot() json line to a file (or stream) every interval seconds, until stop(). """
+
+    def __init__(self,metrics,output=sys.stdout,interval=10.0):
+        self.metrics = metrics
+        self.output = output
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.reportLoop, name='rpcMetricsReporter')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def report(self):
+        line = json.dumps(self.metrics.snapshot(), sort_keys=True) + "\n"
+        if isinstance(self.output, str):
+            with open(self.output, 'a') as outputFile:
+                outputFile.write(line)
+        else:
+            self.output.write(line)
+            self.output.flush()
+
+    def reportLoop(self):
+        while not self.stopped.wait(self.interval):
+            self.report()
+
+    def stop(self):
+        """ Stop reporting, writing one last line. """
+        self.stopped.set()
+        self.thread.join()
+        self.report()
+
+
+##############################################################################
+# Shared metrics recorded by rpcCommand.
+##############################################################################
+
+defaultMetrics = RpcMetrics()
+
+def batchLabel(calls):
+    """ Method name batches are recorded under in the metrics: batch(<method>) or batch(mixed). """
+    methods = set(str(method) for method, params in calls)
+    return "batch(" + (methods.pop() if len(methods) == 1 else "mixed") + ")"
+
+def getDefaultMetrics():
+    """ Get the metrics every rpcCommand call in this process records into. """
+    return defaultMetrics
+
+def configureDefaultMetrics(enabled=True):
+    """ Turn recording on or off (it starts on). """
+    defaultMetrics.enabled = enabled
+    return defaultMetrics
+
+def serveMetrics(port=9100,ip='0.0.0.0',metrics=None):
+    """ Serve the shared metrics on http://<ip>:<port>/metrics, returns the MetricsServer. """
+    return MetricsServer(metrics or defaultMetrics, ip, port)
+
+def reportMetrics(output=sys.stdout,interval=10.0,metrics=None):
+    """ Write the shared metrics as json lines every interval seconds, returns the MetricsReporter. """
+    return MetricsReporter(metrics or defaultMetrics, output, interval)
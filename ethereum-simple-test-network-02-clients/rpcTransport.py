@@ -0,0 +1,737 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Pluggable transports under rpcCommand: HTTP, WebSocket and IPC.
+#
+#    HTTP is the default, POSTs over the shared pycurl pool. A client can
+#    instead be reached over its IPC socket (<datadir>/geth.ipc, local to
+#    the datadir, no HTTP on top) or a WebSocket (geth --ws). Both keep one
+#    connection open with any number of calls in flight on it, and support
+#    eth_subscribe: new heads, logs and pending transactions are pushed
+#    to a callback or an (async) iterator instead of being polled for.
+#
+#    Only the python standard library is used, the WebSocket client is a
+#    small RFC 6455 implementation (text frames, ping/pong, close).
+#
+#    ./rpcTransport.py ipc:/workspace/ethereum/test_network_001_1/miners/00001/geth.ipc newHeads
+#    ./rpcTransport.py ws://127.0.0.1:9001 newPendingTransactions
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import os
+import queue
+import re
+import socket
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from rpcConnectionPool import getDefaultPool
+from rpcJson import loads
+from rpcMetrics import getDefaultMetrics
+
+
+class TransportError(Exception):
+    """ Communication failure, args are (errno, message) like those of pycurl.error. """
+
+    def __init__(self,errno,message):
+        Exception.__init__(self, errno, message)
+
+
+##############################################################################
+# HTTP
+##############################################################################
+
+class HttpTransport(object):
+    """ HTTP POSTs over the shared keep-alive pycurl pool (rpcConnectionPool.py), no subscriptions. """
+
+    persistent = False
+
+    def post(self,ip,port,data,verbose=False,method='unknown',writeFunction=None):
+        return getDefaultPool().post(ip, port, data, verbose=verbose, method=method, writeFunction=writeFunction)
+
+    def close(self):
+        pass
+
+
+##############################################################################
+# Persistent connections (IPC and WebSocket)
+##############################################################################
+
+CLOSED = object()
+
+class Subscription(object):
+    """ The notifications of one eth_subscribe. They are handed to callback(result) when one is given,
+        otherwise queued (at most maxQueued, the oldest are dropped first) for iteration:
+            for head in subscription: ...
+            async for head in subscription: ...
+        Iteration ends when the subscription is unsubscribed or its connection is lost.
+    """
+
+    def __init__(self,transport,subscriptionId,kind,callback=None,maxQueued=10000):
+        self.transport = transport
+        self.id = subscriptionId
+        self.kind = kind
+        self.callback = callback
+        self.queue = queue.Queue(maxQueued)
+        self.closed = False
+        self.received = 0
+        self.dropped = 0
+
+    def deliver(self,result):
+        self.received += 1
+        if self.callback != None:
+            self.callback(result)
+            return
+        while True:
+            try:
+                self.queue.put_nowait(result)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self,timeout=None):
+        """ Next notification, None on timeout or once closed. """
+        try:
+            result = self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if result is CLOSED:
+            self.queue.put(CLOSED)
+            return None
+        return result
+
+    def __iter__(self):
+        while True:
+            result = self.queue.get()
+            if result is CLOSED:
+                self.queue.put(CLOSED)
+                return
+            yield result
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        # a class instead of an async generator, those need python 3.6
+        result = await asyncio.get_event_loop().run_in_executor(None, self.queue.get)
+        if result is CLOSED:
+            self.queue.put(CLOSED)
+            raise StopAsyncIteration
+        return result
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.queue.put(CLOSED)
+
+    def unsubscribe(self):
+        """ eth_unsubscribe, then end the iteration. """
+        try:
+            if not self.closed:
+                self.transport.call("eth_unsubscribe", [self.id])
+        finally:
+            self.transport.subscriptions.pop(self.id, None)
+            self.close()
+
+
+class PersistentTransport(object):
+    """ One open connection to a client. Calls get ids of their own on the connection, so any number
+        of them can be in flight at once, a reader thread matches responses back to their callers and
+        hands subscription notifications to their Subscription. A lost connection fails the calls in
+        flight and ends the subscriptions, the next call connects again.
+          timeout - seconds a call waits for its response.
+    """
+
+    persistent = True
+
+    def __init__(self,timeout=60.0):
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.writeLock = threading.Lock()
+        self.ids = itertools.count(1)
+        # connection id -> Future of the response (a batch registers every id of the batch)
+        self.waiting = {}
+        # subscription id -> Subscription
+        self.subscriptions = {}
+        # notifications that arrived before eth_subscribe's response was handled
+        self.early = {}
+        self.connection = None
+        self.reader = None
+
+    # connection specific: open(), sendText(text), messages() yielding (message bytes, ids) as
+    # JsonStreamScanner.feed returns them, shutdown()
+
+    def connect(self):
+        with self.lock:
+            if self.connection == None:
+                try:
+                    self.connection = self.open()
+                except OSError as e:
+                    raise TransportError(e.errno or 7, "could not connect to " + self.name() + ": " + str(e))
+                self.reader = threading.Thread(target=self.readLoop, args=(self.connection,), name='rpcTransportReader')
+                self.reader.daemon = True
+                self.reader.start()
+        return self
+
+    def readLoop(self,connection):
+        error = "connection to " + self.name() + " closed"
+        try:
+            for message, ids in self.messages(connection):
+                self.dispatch(message, ids)
+        except (OSError, ValueError) as e:
+            error = "connection to " + self.name() + " lost: " + str(e)
+        self.disconnected(connection, error)
+
+    def dispatch(self,message,ids):
+        """ Hand a response (the raw bytes, with the positions of its ids) to the call waiting for it,
+            only messages without an id, subscription notifications, are parsed here.
+        """
+        if not ids:
+            message = loads(message)
+            if not isinstance(message, dict) or message.get('method') != 'eth_subscription':
+                return
+            params = message.get('params') or {}
+            with self.lock:
+                subscription = self.subscriptions.get(params.get('subscription'))
+                if subscription == None:
+                    # bounded, notifications of a subscription that was just unsubscribed never get claimed
+                    early = self.early.setdefault(params.get('subscription'), []) if len(self.early) < 16 else []
+                    if len(early) < 1000:
+                        early.append(params.get('result'))
+                    return
+            subscription.deliver(params.get('result'))
+            return
+        with self.lock:
+            futures = [self.waiting.pop(connectionId, None) for connectionId, start, end in ids]
+        for future in futures:
+            if future != None and not future.done():
+                future.set_result((message, ids))
+                break
+
+    def disconnected(self,connection,error):
+        with self.lock:
+            if self.connection is not connection:
+                return
+            self.connection = None
+            waiting = list(self.waiting.values())
+            self.waiting = {}
+            subscriptions = list(self.subscriptions.values())
+            self.subscriptions = {}
+            self.early = {}
+        try:
+            self.shutdown(connection)
+        except OSError:
+            pass
+        for future in waiting:
+            if not future.done():
+                future.set_exception(TransportError(56, error))
+        for subscription in subscriptions:
+            subscription.close()
+
+    def request(self,payload):
+        """ Send a call dict, or a batch list of them, and wait for the response, returned as the bytes
+            received. Each call is sent as a copy with a connection unique id, the caller's ids are put
+            back in the response bytes in their place, without parsing or re-serializing it.
+        """
+        calls = payload if isinstance(payload, list) else [payload]
+        future = Future()
+        originalIds = {}
+        sent = []
+        # the reader can lose the connection right after connect(), then connect once more
+        for attempt in range(2):
+            self.connect()
+            with self.lock:
+                connection = self.connection
+                if connection != None:
+                    for call in calls:
+                        connectionId = next(self.ids)
+                        originalIds[connectionId] = call.get('id')
+                        sent.append(dict(call, id=connectionId))
+                        self.waiting[connectionId] = future
+                    break
+        if connection == None:
+            raise TransportError(56, "connection to " + self.name() + " lost while connecting")
+        try:
+            with self.writeLock:
+                self.sendText(connection, json.dumps(sent if isinstance(payload, list) else sent[0]))
+            message, ids = future.result(self.timeout)
+        except FutureTimeoutError:
+            # before OSError, from python 3.11 on this is the builtin TimeoutError
+            self.forget(originalIds)
+            raise TransportError(28, "no response from " + self.name() + " within " + str(self.timeout) + " seconds")
+        except OSError as e:
+            self.forget(originalIds)
+            self.disconnected(connection, "sending to " + self.name() + " failed: " + str(e))
+            raise TransportError(55, "sending to " + self.name() + " failed: " + str(e))
+        view = memoryview(message)
+        pieces = []
+        previous = 0
+        for connectionId, start, end in ids:
+            if connectionId in originalIds:
+                pieces.append(view[previous:start])
+                pieces.append(json.dumps(originalIds[connectionId]).encode('utf-8'))
+                previous = end
+        pieces.append(view[previous:])
+        return b"".join(pieces)
+
+    def forget(self,connectionIds):
+        """ Stop waiting for the responses of calls that failed. """
+        with self.lock:
+            for connectionId in connectionIds:
+                self.waiting.pop(connectionId, None)
+
+    def post(self,ip,port,data,verbose=False,method='unknown',writeFunction=None):
+        """ Same contract as RpcConnectionPool.post: (200, response bytes), TransportError on failure.
+            The response arrives as one message, writeFunction (see RpcConnectionPool.post) gets it whole.
+        """
+        started = time.perf_counter()
+        body = b""
+        try:
+            if verbose:
+                print (self.name() + " <- " + str(data))
+            body = self.request(loads(data))
+            if verbose:
+                print (self.name() + " -> " + body.decode('utf-8'))
+        finally:
+            getDefaultMetrics().record(ip, port, method, time.perf_counter() - started, len(data), len(body), True, not body)
+        if writeFunction != None:
+            if writeFunction(body) != None:
+                raise TransportError(23, "response rejected by the write function")
+            return 200, None
+        return 200, body
+
+    def call(self,method,params=[]):
+        """ One rpc call, returns its result, raises Exception('rpc_communication_error', error) on an error. """
+        response = loads(self.request({"jsonrpc": "2.0", "method": method, "params": params, "id": 1}))
+        if 'error' in response:
+            raise Exception('rpc_communication_error', response['error'])
+        return response.get('result')
+
+    def subscribe(self,kind,*params,callback=None,maxQueued=10000):
+        """ eth_subscribe to kind ('newHeads', 'logs' with a filter dict, 'newPendingTransactions' or
+            'syncing'), returns the Subscription.
+        """
+        subscriptionId = self.call("eth_subscribe", [kind] + list(params))
+        subscription = Subscription(self, subscriptionId, kind, callback, maxQueued)
+        with self.lock:
+            self.subscriptions[subscriptionId] = subscription
+            early = self.early.pop(subscriptionId, [])
+        for result in early:
+            subscription.deliver(result)
+        return subscription
+
+    def close(self):
+        with self.lock:
+            connection = self.connection
+        if connection != None:
+            self.disconnected(connection, "connection to " + self.name() + " closed")
+
+
+# the next bracket or whole string outside of strings (a lone quote: a string not complete yet),
+# the next quote or escape inside of one
+JSON_STRUCTURE = re.compile(rb'[][{}]|"[^"\\]*(?:\\.[^"\\]*)*"|"')
+JSON_STRING_END = re.compile(rb'["\\]')
+# everything up to the next bracket (or string not complete yet), whole strings included
+JSON_SKIP = re.compile(rb'(?:[^][{}"]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+# the value of an "id" key
+JSON_ID_VALUE = re.compile(rb'\s*:\s*(-?[0-9]+|null|"[^"\\]*")')
+
+class JsonStreamScanner(object):
+    """ Finds where each json message (object or batch array) of a byte stream ends. Only the bytes
+        that arrived since the last feed are looked at, the nesting depth and whether the scan is
+        inside a string are kept in between, so a message is scanned once however many reads it
+        takes to arrive. The top level "id" of a response, or of each response of a batch, is
+        located on the way, so it can be read and replaced without parsing the message.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.position = 0
+        self.depth = 0
+        self.inString = False
+        self.stringStart = 0
+        # depth of the keys of a response: 1, or 2 in a batch
+        self.idDepth = 1
+        # buffer positions after each "id" key of the message being scanned
+        self.idKeys = []
+
+    def feed(self,data):
+        """ Add received bytes, returns (message bytes, ids) of every message they completed, ids
+            being (id, start, end) of each id value in the message.
+        """
+        buffer = self.buffer
+        buffer += data
+        end = len(buffer)
+        position = self.position
+        messageStart = 0
+        messages = []
+        while position < end:
+            if self.inString:
+                match = JSON_STRING_END.search(buffer, position)
+                if match == None:
+                    position = end
+                    break
+                position = match.end()
+                if buffer[match.start()] == 0x5C:
+                    # skip the escaped character, which may not have arrived yet
+                    position += 1
+                    continue
+                self.inString = False
+                if self.depth == self.idDepth and buffer[self.stringStart:position] == b'"id"':
+                    self.idKeys.append(position)
+                continue
+            if self.depth > self.idDepth:
+                # inside of a value only the brackets matter, the strings in between are skipped in one go
+                start = JSON_SKIP.match(buffer, position).end()
+                if start == end:
+                    position = end
+                    break
+                position = start + 1
+            else:
+                match = JSON_STRUCTURE.search(buffer, position)
+                if match == None:
+                    position = end
+                    break
+                start = match.start()
+                position = match.end()
+            character = buffer[start]
+            if character == 0x22:
+                if position - start == 1:
+                    self.inString = True
+                    self.stringStart = start
+                elif position - start == 4 and self.depth == self.idDepth and buffer[start:position] == b'"id"':
+                    self.idKeys.append(position)
+            elif character == 0x7B or character == 0x5B:
+                if self.depth == 0:
+                    messageStart = start
+                    self.idDepth = 2 if character == 0x5B else 1
+                self.depth += 1
+            elif self.depth > 0:
+                self.depth -= 1
+                if self.depth == 0:
+                    messages.append(self.message(messageStart, position))
+        # keep only the message still arriving
+        drop = messageStart if self.depth > 0 else min(position, end)
+        del buffer[:drop]
+        self.position = position - drop
+        self.stringStart -= drop
+        self.idKeys = [keyEnd - drop for keyEnd in self.idKeys]
+        return messages
+
+    def message(self,start,end):
+        ids = []
+        for keyEnd in self.idKeys:
+            match = JSON_ID_VALUE.match(self.buffer, keyEnd, end)
+            if match != None:
+                value = match.group(1)
+                if value == b"null":
+                    value = None
+                elif value.startswith(b'"'):
+                    value = value[1:-1].decode('utf-8')
+                else:
+                    value = int(value)
+                ids.append((value, match.start(1) - start, match.end(1) - start))
+        self.idKeys = []
+        return bytes(self.buffer[start:end]), ids
+
+def readRawJsonStream(connection):
+    """ Yield (message bytes, ids) of every json message of a socket carrying them back to back
+        (geth's IPC framing), see JsonStreamScanner.
+    """
+    scanner = JsonStreamScanner()
+    while True:
+        data = connection.recv(65536)
+        if not data:
+            return
+        for message in scanner.feed(data):
+            yield message
+
+def readJsonStream(connection):
+    """ Yield every json message of a socket carrying them back to back, parsed. """
+    for message, ids in readRawJsonStream(connection):
+        yield loads(message)
+
+
+class IpcTransport(PersistentTransport):
+    """ geth's IPC socket: a unix socket carrying a stream of json messages, <datadir>/geth.ipc. """
+
+    def __init__(self,path,timeout=60.0):
+        PersistentTransport.__init__(self, timeout)
+        self.path = path
+
+    def name(self):
+        return "ipc:" + self.path
+
+    def open(self):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(self.path)
+        return connection
+
+    def sendText(self,connection,text):
+        connection.sendall(text.encode('utf-8'))
+
+    def messages(self,connection):
+        return readRawJsonStream(connection)
+
+    def shutdown(self,connection):
+        connection.close()
+
+
+##############################################################################
+# WebSocket (RFC 6455) framing, shared with mockGethServer.py
+##############################################################################
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+def websocketAccept(key):
+    """ Sec-WebSocket-Accept answering a Sec-WebSocket-Key. """
+    return base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode('ascii')).digest()).decode('ascii')
+
+def encodeFrame(opcode,payload,mask):
+    """ One final frame, clients mask what they send (mask=True), servers do not. """
+    header = bytearray([0x80 | opcode])
+    length = len(payload)
+    maskBit = 0x80 if mask else 0
+    if length < 126:
+        header.append(maskBit | length)
+    elif length < 65536:
+        header.append(maskBit | 126)
+        header += struct.pack('!H', length)
+    else:
+        header.append(maskBit | 127)
+        header += struct.pack('!Q', length)
+    if not mask:
+        return bytes(header) + payload
+    key = os.urandom(4)
+    return bytes(header) + key + maskBytes(payload, key)
+
+def maskBytes(payload,key):
+    if not payload:
+        return b""
+    # xor with the 4 byte key repeated, as one big integer instead of byte by byte
+    repeated = (key * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(len(payload), 'big')
+
+def readExactly(reader,count):
+    data = reader.read(count)
+    if len(data) < count:
+        raise EOFError()
+    return data
+
+def readFrame(reader):
+    """ (fin, opcode, payload) of the next frame from a buffered binary reader, EOFError when it ends. """
+    first, second = readExactly(reader, 2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack('!H', readExactly(reader, 2))[0]
+    elif length == 127:
+        length = struct.unpack('!Q', readExactly(reader, 8))[0]
+    key = readExactly(reader, 4) if second & 0x80 else None
+    payload = readExactly(reader, length) if length else b""
+    if key != None:
+        payload = maskBytes(payload, key)
+    return bool(first & 0x80), first & 0x0F, payload
+
+def readMessages(reader,sendFrame,decode=True):
+    """ Yield the text of every data message (its bytes with decode=False), joining fragments. Pings
+        are answered with sendFrame(OPCODE_PONG, payload), a close frame ends the messages.
+    """
+    fragments = []
+    while True:
+        try:
+            fin, opcode, payload = readFrame(reader)
+        except EOFError:
+            return
+        if opcode == OPCODE_PING:
+            sendFrame(OPCODE_PONG, payload)
+        elif opcode == OPCODE_CLOSE:
+            try:
+                sendFrame(OPCODE_CLOSE, payload[:2])
+            except OSError:
+                pass
+            return
+        elif opcode in (OPCODE_TEXT, OPCODE_BINARY, OPCODE_CONTINUATION):
+            fragments.append(payload)
+            if fin:
+                message = b"".join(fragments)
+                yield message.decode('utf-8') if decode else message
+                fragments = []
+
+
+class WebSocketConnection(object):
+    """ A connected socket and the buffered reader of its frames. """
+
+    def __init__(self,sock,reader):
+        self.sock = sock
+        self.reader = reader
+
+
+class WebSocketTransport(PersistentTransport):
+    """ geth's WebSocket rpc (geth --ws --wsport <port> --wsapi ... --wsorigins '*'), url ws://<ip>:<port>. """
+
+    def __init__(self,url,timeout=60.0,origin="http://localhost"):
+        PersistentTransport.__init__(self, timeout)
+        self.url = url
+        self.origin = origin
+        hostPort, _, path = url[len("ws://"):].partition('/')
+        host, _, port = hostPort.partition(':')
+        self.address = (host, int(port or 80))
+        self.path = "/" + path
+
+    def name(self):
+        return self.url
+
+    def open(self):
+        connection = socket.create_connection(self.address, timeout=self.timeout)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        connection.sendall(("GET " + self.path + " HTTP/1.1\r\nHost: " + "%s:%d" % self.address + "\r\n"
+                            "Upgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: " + key + "\r\n"
+                            "Sec-WebSocket-Version: 13\r\nOrigin: " + self.origin + "\r\n\r\n").encode('ascii'))
+        reader = connection.makefile('rb')
+        status = reader.readline().decode('latin-1')
+        headers = {}
+        while True:
+            line = reader.readline().decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if " 101 " not in status or headers.get('sec-websocket-accept') != websocketAccept(key):
+            connection.close()
+            raise OSError(71, "websocket handshake refused: " + status.strip())
+        connection.settimeout(None)
+        return WebSocketConnection(connection, reader)
+
+    def sendFrame(self,connection,opcode,payload):
+        connection.sock.sendall(encodeFrame(opcode, payload, mask=True))
+
+    def sendText(self,connection,text):
+        self.sendFrame(connection, OPCODE_TEXT, text.encode('utf-8'))
+
+    def messages(self,connection):
+        def reply(opcode, payload):
+            with self.writeLock:
+                self.sendFrame(connection, opcode, payload)
+        scanner = JsonStreamScanner()
+        for data in readMessages(connection.reader, reply, decode=False):
+            for message in scanner.feed(data):
+                yield message
+
+    def shutdown(self,connection):
+        try:
+            with self.writeLock:
+                self.sendFrame(connection, OPCODE_CLOSE, struct.pack('!H', 1000))
+        except OSError:
+            pass
+        connection.reader.close()
+        connection.sock.close()
+
+
+##############################################################################
+# Transport of each client, used by rpcCommand (HTTP unless set otherwise).
+##############################################################################
+
+transportsLock = threading.Lock()
+# (ip, port) -> transport
+transports = {}
+httpTransport = HttpTransport()
+
+def setTransport(ip,port,transport):
+    """ Send the rpc calls for <ip:port> over transport (None: back to HTTP). """
+    key = (str(ip), str(port))
+    with transportsLock:
+        previous = transports.pop(key, None)
+        if transport != None:
+            transports[key] = transport
+    if previous != None and previous is not transport:
+        previous.close()
+    return transport
+
+def getTransport(ip,port):
+    with transportsLock:
+        return transports.get((str(ip), str(port)), httpTransport)
+
+def post(ip,port,data,verbose=False,method='unknown',writeFunction=None):
+    """ rpcCommand's POST: over the client's transport, returns (responseCode, responseBytes). With
+        writeFunction the response is handed to it instead (see RpcConnectionPool.post).
+    """
+    return getTransport(ip, port).post(ip, port, data, verbose=verbose, method=method, writeFunction=writeFunction)
+
+def useIpc(ip,port,path):
+    """ Reach <ip:port> through an IPC socket (a path, or a datadir holding geth.ipc). """
+    if os.path.isdir(path):
+        path = os.path.join(path, 'geth.ipc')
+    return setTransport(ip, port, IpcTransport(path).connect())
+
+def useWebSocket(ip,port,wsPort,wsIp=None):
+    """ Reach <ip:port> through its WebSocket endpoint on wsPort. """
+    return setTransport(ip, port, WebSocketTransport("ws://" + str(wsIp or ip) + ":" + str(wsPort)).connect())
+
+def useIpcForNetwork(path):
+    """ Switch every node of a network.json whose geth.ipc exists to IPC, returns the (ip, port) switched. """
+    with open(path) as networkFile:
+        network = json.load(networkFile)
+    switched = []
+    for node in network['nodes'] if isinstance(network, dict) else network:
+        ipcPath = node.get('ipcPath') or os.path.join(node.get('datadir', ''), 'geth.ipc')
+        if node.get('rpcPort') and os.path.exists(ipcPath):
+            useIpc(node.get('ip', '127.0.0.1'), node['rpcPort'], ipcPath)
+            switched.append((node.get('ip', '127.0.0.1'), str(node['rpcPort'])))
+    return switched
+
+def subscribe(ip,port,kind,*params,callback=None,maxQueued=10000):
+    """ eth_subscribe on <ip:port>, which needs an IPC or WebSocket transport (see useIpc/useWebSocket). """
+    transport = getTransport(ip, port)
+    if not transport.persistent:
+        raise TransportError(1, "subscriptions need an IPC or WebSocket transport for " + str(ip) + ":" + str(port))
+    return transport.subscribe(kind, *params, callback=callback, maxQueued=maxQueued)
+
+def makeTransport(address):
+    """ Transport for 'ipc:<path>', '<path>.ipc' or 'ws://<ip>:<port>'. """
+    if address.startswith("ws://"):
+        return WebSocketTransport(address)
+    return IpcTransport(address[len("ipc:"):] if address.startswith("ipc:") else address)
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    if len(sys.argv) < 2:
+        print ("usage: ./rpcTransport.py <ipc:path|ws://ip:port> [newHeads|newPendingTransactions|logs [filterJson]]")
+        sys.exit(1)
+    transport = makeTransport(sys.argv[1]).connect()
+    kind = sys.argv[2] if len(sys.argv) > 2 else 'newHeads'
+    params = [json.loads(sys.argv[3])] if len(sys.argv) > 3 else ([{}] if kind == 'logs' else [])
+    print ("head: " + str(transport.call("eth_blockNumber")))
+    subscription = transport.subscribe(kind, *params)
+    try:
+        for result in subscription:
+            print (json.dumps(result), flush=True)
+    except KeyboardInterrupt:
+        subscription.unsubscribe()
+    transport.close()
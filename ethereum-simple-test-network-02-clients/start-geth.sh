@@ -1,5 +1,7 @@
 #!/bin/bash
 
-dtach -n `mktemp -u /tmp/prosumer00001XXXXX.dtach` bash -c 'exec -a prosumer00001 geth --password /workspace/password.txt --datadir /workspace/ethereum/test_network_001_1/prosumer/00001 --networkid 15 --port 8001 --unlock 0  --verbosity 5 --rpc --rpcaddr 127.0.0.1 --rpcport  9000 --rpcapi eth,web3,admin,miner,net,db  --netrestrict 127.0.0.0/16 --nodiscover  > /workspace/ethereum/test_network_001_1/prosumer/00001/output.log 2>&1 '
+# The clients of network-02-clients.json run under nodeSupervisor.py: it restarts crashed clients,
+# rotates each client's output.log and keeps their pids and readiness in /tmp/nodeSupervisor.json.
+# Stop everything with: /workspace/nodeSupervisor.py stop
 
-dtach -n `mktemp -u /tmp/miner00001XXXXX.dtach` bash -c 'exec -a miner00001 geth --password /workspace/password.txt --datadir /workspace/ethereum/test_network_001_1/miners/00001 --networkid 15 --port 10001 --unlock 0  --verbosity 5 --rpc --rpcaddr 127.0.0.1 --rpcport  11000 --rpcapi eth,web3,admin,miner,net,db  --netrestrict 127.0.0.0/16 --nodiscover  --mine --minerthreads=1 --etherbase=0x0000000000000000000000000000000000000000 > /workspace/ethereum/test_network_001_1/miners/00001/output.log 2>&1 '
+nohup /workspace/nodeSupervisor.py run /workspace/network-02-clients.json > /workspace/ethereum/nodeSupervisor.log 2>&1 &
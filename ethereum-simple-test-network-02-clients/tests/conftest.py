@@ -0,0 +1,13 @@
+##############################################################################
+#
+# The scripts are flat modules next to this directory, make them importable.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,32 @@
+##############################################################################
+#
+# Known answer tests of abiCodec.py.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+from abiCodec import AbiContract, functionSelector, encodeArguments, decodeArguments
+
+
+def test_functionSelectors():
+    assert functionSelector("set(uint256)").hex() == "60fe47b1"
+    assert functionSelector("get()").hex() == "6d4ce63c"
+    assert functionSelector("transfer(address,uint256)").hex() == "a9059cbb"
+
+def test_encodeSimpleStorage():
+    contract = AbiContract([{'name': 'set', 'type': 'function', 'inputs': [{'name': 'x', 'type': 'uint'}], 'outputs': []},
+                            {'name': 'get', 'type': 'function', 'inputs': [], 'outputs': [{'name': '', 'type': 'uint'}],
+                             'constant': True}])
+    assert contract.function('set').encode(5) == "0x60fe47b1" + "%064x" % 5
+    assert contract.function('get').encode() == "0x6d4ce63c"
+    assert contract.function('get').decodeOutput("0x" + "%064x" % 42) == 42
+
+def test_encodeDynamicArguments():
+    # the sam(bytes,bool,uint256[]) example of the solidity ABI specification
+    encoded = encodeArguments(['bytes', 'bool', 'uint256[]'], [b"dave", True, [1, 2, 3]])
+    words = ["%064x" % 0x60, "%064x" % 1, "%064x" % 0xa0, "%064x" % 4, "6461766500000000000000000000000000000000000000000000000000000000",
+             "%064x" % 3, "%064x" % 1, "%064x" % 2, "%064x" % 3]
+    assert encoded == "0x" + "".join(words)
+    assert decodeArguments(['bytes', 'bool', 'uint256[]'], encoded) == [b"dave", True, [1, 2, 3]]
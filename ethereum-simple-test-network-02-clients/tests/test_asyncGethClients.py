@@ -0,0 +1,65 @@
+##############################################################################
+#
+# asyncGethClients.py: fanning calls out to mock servers from synchronous
+# code, on the main thread and on worker threads.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import asyncGethClients
+from asyncGethClients import runFanOut, runSync, probeNode, getBalance, AsyncRpcClient
+from mockGethServer import MockGethServer
+
+
+@pytest.fixture
+def servers():
+    servers = [MockGethServer('127.0.0.1', 0, blockTime=3600).start() for index in range(3)]
+    servers[0].chain.mine()
+    yield servers
+    for server in servers:
+        server.stop()
+
+def test_runFanOut(servers):
+    nodes = [server.address() for server in servers]
+    results = runFanOut(nodes, probeNode)
+    assert [result['blockNumber'] for result in results] == ["0x1", "0x0", "0x0"]
+    assert all(result['peerCount'] == "0x0" for result in results)
+
+def test_runFanOutFromWorkerThreads(servers):
+    nodes = [server.address() for server in servers]
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(lambda attempt: runFanOut(nodes, getBalance), range(8)))
+    assert all(result == results[0] for result in results)
+    assert all(isinstance(balance, str) and balance.startswith("0x") for balance in results[0])
+
+def test_loopFoundWithoutRunningLoopLookup(servers,monkeypatch):
+    # python 3.5.2's get_event_loop() returns the loop set for the thread, never the running one
+    policy = asyncio.get_event_loop_policy()
+    monkeypatch.setattr(asyncio, 'get_event_loop', lambda: policy.get_event_loop())
+    nodes = [server.address() for server in servers]
+    with ThreadPoolExecutor(1) as executor:
+        results = executor.submit(runFanOut, nodes, probeNode).result()
+    assert results[0]['blockNumber'] == "0x1"
+
+def test_runSyncRestoresCurrentLoop(servers):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        ip, port = servers[0].address()
+        async def blockNumber():
+            client = AsyncRpcClient()
+            try:
+                return (await client.rpcCommand("eth_blockNumber", ip=ip, port=port))
+            finally:
+                client.close()
+        assert runSync(blockNumber()) == "0x1"
+        assert asyncGethClients.currentEventLoop() is loop
+        assert loop.run_until_complete(asyncio.sleep(0, result=5)) == 5
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
@@ -0,0 +1,77 @@
+##############################################################################
+#
+# Known answer tests of ethKeys.py: address derivation, AES, scrypt and the
+# keystores of the Web3 Secret Storage definition.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import hashlib
+import pytest
+from ethKeys import (publicKey, addressOf, expandKey, pureAesEncryptBlock, pureAes128Ctr, aes128Ctr, pureScrypt,
+                     makeKeystore, decryptKeystore, LIGHT_PBKDF2, LIGHT_SCRYPT, LIGHT_KDF)
+
+# the test vectors of the Web3 Secret Storage definition, password "testpassword"
+PRIVATE_KEY = 0x7a28b5ba57c53603b0b07b56bba752f7784bf506fa95edc395f5cf6c7514fe9d
+PBKDF2_KEYSTORE = {'crypto': {'cipher': 'aes-128-ctr', 'cipherparams': {'iv': "6087dab2f9fdbbfaddc31a909735c1e6"},
+                              'ciphertext': "5318b4d5bcd28de64ee5559e671353e16f075ecae9f99c7a79a38af5f869aa46",
+                              'kdf': 'pbkdf2', 'kdfparams': {'c': 262144, 'dklen': 32, 'prf': 'hmac-sha256',
+                                                             'salt': "ae3cd4e7013836a3df6bd7241b12db061dbe2c6785853cce422d148a624ce0bd"},
+                              'mac': "517ead924a9d0dc3124507e3393d175ce3ff7c1e96529c6c555ce9e51205e9b2"},
+                   'id': "3198bc9c-6672-5ab3-d995-4942343ae5b6", 'version': 3}
+
+
+
+def test_addressOfPrivateKeyOne():
+    public = publicKey(1)
+    # the generator point of secp256k1
+    assert public[:32].hex() == "79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798"
+    assert public[32:].hex() == "483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8"
+    assert addressOf(public) == "0x7e5f4552091a69125d5dfcb7b8c2659029395bdf"
+
+def test_aesBlock():
+    # FIPS-197 appendix C.1
+    key = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+    block = bytes.fromhex("00112233445566778899aabbccddeeff")
+    assert pureAesEncryptBlock(expandKey(key), block).hex() == "69c4e0d86a7b0430d8cdb78070b4c55a"
+
+def test_aesCtr():
+    # NIST SP 800-38A F.5.1, first two blocks
+    key = bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c")
+    iv = bytes.fromhex("f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff")
+    plaintext = bytes.fromhex("6bc1bee22e409f96e93d7e117393172aae2d8a571e03ac9c9eb76fac45af8e51")
+    ciphertext = "874d6191b620e3261bef6864990db6ce9806f66b7970fdff8617187bb9fffdff"
+    assert pureAes128Ctr(key, iv, plaintext).hex() == ciphertext
+    assert aes128Ctr(key, iv, plaintext).hex() == ciphertext
+    assert pureAes128Ctr(key, iv, bytes.fromhex(ciphertext)) == plaintext
+
+def test_pureScrypt():
+    # RFC 7914 section 12, first vector
+    expected = ("77d6576238657b203b19ca42c18a0497f16b4844e3074ae8dfdffa3fede21442"
+                "fcd0069ded0948f8326a753a0fc81f17e8d3e0fb2e0d3628cf35e20c38d18906")
+    assert pureScrypt(b"", b"", 16, 1, 1, 64).hex() == expected
+
+def test_decryptPbkdf2Keystore():
+    assert decryptKeystore(PBKDF2_KEYSTORE, "testpassword") == PRIVATE_KEY
+    with pytest.raises(ValueError):
+        decryptKeystore(PBKDF2_KEYSTORE, "wrong")
+
+def test_unsupportedKdf():
+    keystore = {'crypto': dict(PBKDF2_KEYSTORE['crypto'], kdfparams=dict(PBKDF2_KEYSTORE['crypto']['kdfparams'], prf='hmac-sha512'))}
+    with pytest.raises(ValueError):
+        decryptKeystore(keystore, "testpassword")
+
+@pytest.mark.parametrize('kdf', [LIGHT_PBKDF2, LIGHT_SCRYPT])
+def test_keystoreRoundTrip(kdf):
+    if kdf['kdf'] == 'scrypt' and not hasattr(hashlib, 'scrypt'):
+        pytest.skip("the pure python scrypt takes half a minute")
+    keystore = makeKeystore(PRIVATE_KEY, "password", kdf)
+    assert keystore['crypto']['kdf'] == kdf['kdf']
+    assert keystore['address'] == "008aeeda4d805471df9b2a5b0f38a0c3bcba786b"
+    assert decryptKeystore(keystore, "password") == PRIVATE_KEY
+
+def test_defaultKdfIsQuick():
+    # keys are created with a kdf hashlib implements in C: scrypt when it has it, PBKDF2 otherwise
+    assert LIGHT_KDF['kdf'] == ('scrypt' if hasattr(hashlib, 'scrypt') else 'pbkdf2')
@@ -0,0 +1,125 @@
+##############################################################################
+#
+# gasEstimator.py against mockGethServer.py: the memo key of a call, hits,
+#    forgetting an estimate that ran out of gas, and recent gas prices.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import pytest
+from mockGethServer import MockChain, MockGethServer, SET_SELECTOR
+from gasEstimator import GasEstimator
+from networkGethClients import rpcBatchCommand
+
+CODE = "0x6060604052"
+
+
+@pytest.fixture
+def server():
+    chain = MockChain(blockTime=3600)
+    account = chain.accounts[0]
+    creation = chain.sendTransaction({'from': account, 'data': CODE})
+    chain.mine()
+    server = MockGethServer(chain=chain, mine=False).start()
+    server.contract = chain.receipts[creation]['contractAddress']
+    yield server
+    server.stop()
+
+def fetcher(server,calls):
+    """ rpcBatchCommand to the server, every call sent is appended to calls. """
+    ip, port = server.address()
+    def fetch(batch):
+        calls.extend(batch)
+        return rpcBatchCommand(batch, ip=ip, port=port)
+    return fetch
+
+def setCall(server,number,**fields):
+    return dict({'from': server.chain.accounts[0], 'to': server.contract, 'data': SET_SELECTOR + "%064x" % number}, **fields)
+
+def estimates(calls):
+    return [params for method, params in calls if method == "eth_estimateGas"]
+
+
+def test_shapeKey(server):
+    estimator = GasEstimator()
+    transaction = setCall(server, 1)
+    # the code of the target is not known yet
+    assert estimator.shapeKey(transaction) == None
+    estimator.estimateMany([transaction], fetcher(server, []))
+    codeHash, selector, length, sendsValue = estimator.shapeKey(transaction)
+    assert (selector, length, sendsValue) == (SET_SELECTOR, 74, False)
+    assert estimator.shapeKey(setCall(server, 2)) == estimator.shapeKey(transaction)
+    assert estimator.shapeKey(setCall(server, 1, value="0x1")) != estimator.shapeKey(transaction)
+    assert estimator.shapeKey(setCall(server, 1, data=transaction['data'] + "00" * 32)) != estimator.shapeKey(transaction)
+    assert estimator.shapeKey({'data': CODE})[0] == 'create'
+
+def test_sameShapeIsEstimatedOnce(server):
+    estimator = GasEstimator(margin=0.25)
+    calls = []
+    results = estimator.estimateMany([setCall(server, value) for value in range(5)], fetcher(server, calls))
+    assert results == [hex(32500)] * 5
+    assert len(estimates(calls)) == 1
+    # memoized: no round trip at all the next time
+    calls[:] = []
+    assert estimator.estimateMany([setCall(server, 6)], fetcher(server, calls)) == [hex(32500)]
+    assert calls == []
+    assert (estimator.stats()['hits'], estimator.stats()['estimates']) == (1, 1)
+
+def test_memoKeepsTheHighestEstimate():
+    estimator = GasEstimator(margin=0.0)
+    estimator.codeHashes["0xc0"] = "code"
+    transaction = {'to': "0xc0", 'data': SET_SELECTOR + "00" * 32}
+    key = estimator.shapeKey(transaction)
+
+    def fetch(calls):
+        # an estimate of the same shape, made at the same time, landed first
+        estimator.estimates[key] = 40000
+        return [hex(21000)]
+    # the lower estimate neither replaces it nor is handed out
+    assert estimator.estimateMany([transaction], fetch) == [hex(40000)]
+    assert estimator.estimates[key] == 40000
+
+def test_ranOutOfGasIsForgotten(server):
+    # a negative margin sends less gas than the call uses
+    estimator = GasEstimator(margin=-0.5)
+    calls = []
+    transaction = setCall(server, 1)
+    transaction['gas'] = estimator.estimateMany([transaction], fetcher(server, calls))[0]
+    assert transaction['gas'] == hex(13000)
+    transactionHash = server.chain.sendTransaction(transaction)
+    estimator.track(transactionHash, transaction)
+    assert estimator.tracked(transactionHash)
+    server.chain.mine()
+    estimator.observe(server.chain.receipts[transactionHash])
+    assert not estimator.tracked(transactionHash)
+    assert estimator.stats()['forgotten'] == 1 and estimator.stats()['estimates'] == 0
+    estimator.estimateMany([setCall(server, 2)], fetcher(server, calls))
+    assert len(estimates(calls)) == 2
+
+def test_enoughGasIsKept(server):
+    estimator = GasEstimator(margin=0.25)
+    transaction = setCall(server, 1)
+    transaction['gas'] = estimator.estimateMany([transaction], fetcher(server, []))[0]
+    transactionHash = server.chain.sendTransaction(transaction)
+    estimator.track(transactionHash, transaction)
+    server.chain.mine()
+    estimator.observe(server.chain.receipts[transactionHash])
+    assert estimator.stats()['forgotten'] == 0 and estimator.stats()['estimates'] == 1
+
+def test_gasPriceFromRecentBlocks(server):
+    estimator = GasEstimator(priceBlocks=20, pricePercentile=0.5, priceTtl=0)
+    account = server.chain.accounts[1]
+    for gwei in range(1, 11):
+        server.chain.sendTransaction({'from': account, 'to': account, 'gasPrice': hex(gwei * 10 ** 9)})
+        server.chain.mine()
+    calls = []
+    node = server.address()
+    assert estimator.gasPrice(node, fetcher(server, calls)) == hex(6 * 10 ** 9)
+    server.chain.sendTransaction({'from': account, 'to': account, 'gasPrice': hex(20 * 10 ** 9)})
+    server.chain.mine()
+    calls[:] = []
+    assert estimator.gasPrice(node, fetcher(server, calls)) == hex(7 * 10 ** 9)
+    # only the new block is fetched
+    assert [method for method, params in calls] == ["eth_blockNumber", "eth_getBlockByNumber"]
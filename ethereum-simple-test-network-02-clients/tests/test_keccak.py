@@ -0,0 +1,24 @@
+##############################################################################
+#
+# Known answer tests of keccak.py.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+from keccak import keccak256, keccak256Hex, pureKeccak256
+
+
+def test_keccakEmpty():
+    expected = "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470"
+    assert keccak256(b"").hex() == expected
+    assert pureKeccak256(b"").hex() == expected
+
+def test_keccakAbc():
+    assert keccak256Hex("abc") == "0x4e03657aea45a94fc7d47ba826c8d667c0d1e6e33a64a036ec44f58fa12d6c45"
+
+def test_keccakAcrossBlocks():
+    # longer than one 136 byte rate block, the pure version has to agree with the installed one
+    data = bytes(range(256)) * 3
+    assert pureKeccak256(data) == keccak256(data)
@@ -0,0 +1,52 @@
+##############################################################################
+#
+# mockGethServer.py: the chain the other tests run against.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+from mockGethServer import MockChain, MockGethServer
+from networkGethClients import rpcCommand
+
+
+def makeChain(blocks):
+    chain = MockChain(blockTime=3600)
+    account = chain.accounts[0]
+    hashes = []
+    for number in range(blocks):
+        hashes.append(chain.sendTransaction({'from': account, 'to': account, 'value': "0x1"}))
+        chain.mine()
+    return chain, hashes
+
+def test_reorgKeepsOrphanedBlocksIntact():
+    chain, hashes = makeChain(5)
+    orphaned = [chain.blockByNumber(number) for number in range(6)]
+    chain.reorg(3)
+    for number in range(6):
+        block = chain.blockByNumber(number)
+        assert (block['hash'] == orphaned[number]['hash']) == (number < 3)
+        if number > 0:
+            assert block['parentHash'] == chain.blockByNumber(number - 1)['hash']
+        for transaction in block['transactions']:
+            assert transaction['blockHash'] == block['hash']
+            assert chain.transactions[transaction['hash']]['blockHash'] == block['hash']
+            assert chain.receipts[transaction['hash']]['blockHash'] == block['hash']
+    for block in orphaned[3:]:
+        # still reachable by hash, its transactions still point at it
+        assert chain.blocksByHash[block['hash']] is block
+        assert [transaction['blockHash'] for transaction in block['transactions']] == [block['hash']]
+
+def test_rpcAgainstServer():
+    server = MockGethServer('127.0.0.1', 0, blockTime=0)
+    server.start()
+    try:
+        ip, port = server.address()
+        account = rpcCommand("eth_accounts", ip=ip, port=port)[0]
+        transactionHash = rpcCommand("eth_sendTransaction", [{'from': account, 'to': account, 'value': "0x1"}], ip=ip, port=port)
+        receipt = rpcCommand("eth_getTransactionReceipt", [transactionHash], ip=ip, port=port)
+        assert receipt['blockNumber'] == rpcCommand("eth_blockNumber", ip=ip, port=port) == "0x1"
+        assert rpcCommand("eth_getBlockByHash", [receipt['blockHash'], False], ip=ip, port=port)['transactions'] == [transactionHash]
+    finally:
+        server.stop()
@@ -0,0 +1,61 @@
+##############################################################################
+#
+# networkGethClients.py: batched calls against mockGethServer.py, answered
+#    out of order and split into chunks.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import pytest
+from mockGethServer import MockChain, MockGethServer
+from networkGethClients import rpcBatchCommand, getBalances
+from rpcMetrics import getDefaultMetrics
+
+
+@pytest.fixture
+def server():
+    chain = MockChain(accounts=12, blockTime=3600)
+    # a different balance for every account, so a result matched up with the wrong call shows
+    for index, account in enumerate(chain.accounts):
+        chain.balances[account] = 1000 + index
+    server = MockGethServer(chain=chain, mine=False, seed=1, shuffleBatches=True).start()
+    getDefaultMetrics().reset()
+    yield server
+    server.stop()
+    getDefaultMetrics().reset()
+
+def balanceCalls(chain):
+    return [("eth_getBalance", [account, "latest"]) for account in chain.accounts]
+
+
+def test_shuffledAnswersAreMatchedById(server):
+    ip, port = server.address()
+    results = rpcBatchCommand(balanceCalls(server.chain), ip=ip, port=port)
+    assert [int(result, 16) for result in results] == [1000 + index for index in range(12)]
+
+def test_chunksKeepTheOrderOfTheCalls(server):
+    ip, port = server.address()
+    results = rpcBatchCommand(balanceCalls(server.chain), ip=ip, port=port, chunkSize=5)
+    assert [int(result, 16) for result in results] == [1000 + index for index in range(12)]
+    # 12 calls in chunks of 5 are 3 POSTs
+    methods = getDefaultMetrics().snapshot()['nodes'][ip + ":" + port]['methods']
+    assert methods['batch(eth_getBalance)']['calls'] == 3
+
+def test_failedCallKeepsItsPlace(server):
+    ip, port = server.address()
+    calls = [("eth_blockNumber", []), ("eth_noSuchMethod", []), ("net_version", [])] * 3
+    results = rpcBatchCommand(calls, ip=ip, port=port, chunkSize=4)
+    for (method, params), result in zip(calls, results):
+        if method == "eth_noSuchMethod":
+            assert result['error']['code'] == -32601
+        else:
+            assert isinstance(result, str)
+    assert results[2] == str(server.chain.chainId)
+
+def test_bulkHelpers(server):
+    ip, port = server.address()
+    balances = getBalances(ip, port, server.chain.accounts)
+    assert dict((account, int(balance, 16)) for account, balance in balances.items()) == \
+        dict((account, 1000 + index) for index, account in enumerate(server.chain.accounts))
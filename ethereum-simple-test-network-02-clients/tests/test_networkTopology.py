@@ -0,0 +1,81 @@
+##############################################################################
+#
+# networkTopology.py: the edges of each topology, and wiring mock servers
+#    (mockGethServer.py) together with buildNetwork.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import pytest
+from mockGethServer import MockGethServer
+from networkTopology import (makeNode, nodesFromCount, meshEdges, ringEdges, starEdges, randomRegularEdges,
+                             topologyEdges, expectedPeerCounts, buildNetwork)
+
+
+def checkSimple(edges,count):
+    """ No node peers with itself and every pair is added once. """
+    pairs = [tuple(sorted(edge)) for edge in edges]
+    assert all(a != b and 0 <= a < count and 0 <= b < count for a, b in pairs)
+    assert len(set(pairs)) == len(pairs)
+
+
+def test_mesh():
+    nodes = nodesFromCount(6)
+    edges = meshEdges(nodes)
+    checkSimple(edges, 6)
+    assert len(edges) == 15
+    assert expectedPeerCounts(nodes, edges) == [5] * 6
+
+def test_ring():
+    assert ringEdges(nodesFromCount(1)) == []
+    assert ringEdges(nodesFromCount(2)) == [(0, 1)]
+    nodes = nodesFromCount(7)
+    edges = ringEdges(nodes)
+    checkSimple(edges, 7)
+    assert expectedPeerCounts(nodes, edges) == [2] * 7
+
+def test_star():
+    # the last two of nodesFromCount's nodes are the miners
+    nodes = nodesFromCount(6, miners=2)
+    edges = starEdges(nodes)
+    checkSimple(edges, 6)
+    assert (4, 5) in edges
+    assert expectedPeerCounts(nodes, edges) == [2, 2, 2, 2, 5, 5]
+    # without a miner the first node is the center
+    nodes = nodesFromCount(4, miners=0)
+    assert expectedPeerCounts(nodes, starEdges(nodes)) == [3, 1, 1, 1]
+
+def test_randomRegular():
+    nodes = nodesFromCount(10)
+    edges = randomRegularEdges(nodes, 3, seed=7)
+    checkSimple(edges, 10)
+    assert expectedPeerCounts(nodes, edges) == [3] * 10
+    assert randomRegularEdges(nodes, 3, seed=7) == edges
+    with pytest.raises(ValueError):
+        randomRegularEdges(nodesFromCount(5), 3)
+    with pytest.raises(ValueError):
+        randomRegularEdges(nodesFromCount(3), 3)
+
+def test_topologyEdges():
+    nodes = nodesFromCount(4)
+    assert topologyEdges(nodes, 'ring') == ringEdges(nodes)
+    # k defaults to 3, or N - 1 for fewer nodes
+    assert expectedPeerCounts(nodes, topologyEdges(nodes, 'random', seed=1)) == [3] * 4
+    with pytest.raises(ValueError):
+        topologyEdges(nodes, 'tree')
+
+def test_buildNetwork():
+    servers = [MockGethServer(mine=False).start() for index in range(5)]
+    try:
+        nodes = [makeNode(server.address()[0], server.address()[1], server.p2pPort, miner=(index == 4))
+                 for index, server in enumerate(servers)]
+        report = buildNetwork(nodes, 'ring', timeout=10)
+        assert report['converged'] and report['failedAddPeer'] == []
+        assert list(report['peers'].values()) == [2] * 5
+        # peers go both ways: the last node added the first, and was added by the one before it
+        assert sorted(servers[4].peers) == sorted([servers[0].nodeId, servers[3].nodeId])
+    finally:
+        for server in servers:
+            server.stop()
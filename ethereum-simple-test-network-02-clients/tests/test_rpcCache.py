@@ -0,0 +1,95 @@
+##############################################################################
+#
+# rpcCache.py: results from blocks orphaned by a reorg are dropped.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+from rpcCache import RpcCache, configureDefaultCache
+from mockGethServer import MockChain, MockGethServer
+from networkGethClients import rpcCommand, getAddressOfTransaction
+
+NODE = ('127.0.0.1', '9000')
+
+
+def makeChain(blocks):
+    chain = MockChain(blockTime=3600)
+    account = chain.accounts[0]
+    hashes = []
+    for number in range(blocks):
+        hashes.append(chain.sendTransaction({'from': account, 'to': account, 'value': "0x1"}))
+        chain.mine()
+    return chain, hashes
+
+def fetcher(chain,calls):
+    def fetchBlock(blockParameter):
+        calls.append(blockParameter)
+        if blockParameter == 'latest':
+            return chain.blockView(chain.head(), False)
+        return chain.blockView(chain.blockByNumber(int(blockParameter, 16)), False)
+    return fetchBlock
+
+def cacheReceipts(cache,chain,hashes):
+    for transactionHash in hashes:
+        # a copy, the mock updates its own receipts in place on a reorg
+        cache.putMined(NODE, ('eth_getTransactionReceipt', transactionHash), dict(chain.receipts[transactionHash]))
+
+def cached(cache,transactionHash):
+    return cache.get(NODE, ('eth_getTransactionReceipt', transactionHash))[0]
+
+
+def test_unchangedChainKeepsEntries():
+    chain, hashes = makeChain(10)
+    cache = RpcCache()
+    cacheReceipts(cache, chain, hashes)
+    calls = []
+    assert cache.refreshHead(NODE, fetcher(chain, calls), force=True) == None
+    chain.mine()
+    assert cache.refreshHead(NODE, fetcher(chain, calls), force=True) == None
+    assert all(cached(cache, transactionHash) for transactionHash in hashes)
+    # the head, and one block to link it to the remembered ones
+    assert len(calls) <= 4
+
+def test_reorgDropsOrphanedEntries():
+    chain, hashes = makeChain(10)
+    cache = RpcCache()
+    cacheReceipts(cache, chain, hashes)
+    cache.refreshHead(NODE, fetcher(chain, []), force=True)
+    # the transaction of block n is hashes[n - 1]
+    chain.reorg(6)
+    assert cache.refreshHead(NODE, fetcher(chain, []), force=True) == 6
+    assert [cached(cache, transactionHash) for transactionHash in hashes] == [True] * 5 + [False] * 5
+    assert cache.invalidations == 1
+
+def test_headCheckInterval():
+    chain, hashes = makeChain(3)
+    cache = RpcCache(headCheckInterval=60)
+    calls = []
+    cache.refreshHead(NODE, fetcher(chain, calls))
+    chain.reorg(1)
+    assert cache.refreshHead(NODE, fetcher(chain, calls)) == None
+    assert len(calls) == 1
+
+def test_helpersRefetchAfterReorg():
+    cache = configureDefaultCache(headCheckInterval=0)
+    server = MockGethServer('127.0.0.1', 0, blockTime=0)
+    server.start()
+    try:
+        ip, port = server.address()
+        account = server.chain.accounts[0]
+        hashes = [rpcCommand("eth_sendTransaction", [{'from': account, 'to': account, 'value': "0x1"}], ip=ip, port=port)
+                  for number in range(3)]
+        receipts = [getAddressOfTransaction(ip, port, transactionHash) for transactionHash in hashes]
+        hits = cache.hits
+        assert [getAddressOfTransaction(ip, port, transactionHash) for transactionHash in hashes] == receipts
+        assert cache.hits == hits + 3
+        server.chain.reorg(2)
+        again = [getAddressOfTransaction(ip, port, transactionHash) for transactionHash in hashes]
+        assert again[0] == receipts[0]
+        assert [receipt['blockHash'] for receipt in again[1:]] == [server.chain.blockByNumber(number)['hash'] for number in (2, 3)]
+        assert again[1]['blockHash'] != receipts[1]['blockHash']
+    finally:
+        server.stop()
+        configureDefaultCache()
@@ -0,0 +1,98 @@
+##############################################################################
+#
+# rpcConnectionPool.py: the most handles per client, reuse and idle eviction,
+#    against mockGethServer.py.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import json
+import threading
+import time
+import pytest
+from mockGethServer import MockGethServer
+from rpcConnectionPool import RpcConnectionPool
+from rpcMetrics import getDefaultMetrics
+
+BLOCK_NUMBER = json.dumps({"jsonrpc": "2.0", "method": "eth_blockNumber", "params": [], "id": 1})
+
+
+@pytest.fixture
+def server():
+    server = MockGethServer(mine=False).start()
+    getDefaultMetrics().reset()
+    yield server
+    server.stop()
+    getDefaultMetrics().reset()
+
+
+def test_mostHandlesPerNode():
+    pool = RpcConnectionPool(maxHandlesPerNode=2)
+    first = pool.acquire('127.0.0.1', 9000)
+    second = pool.acquire('127.0.0.1', 9000)
+    assert first is not second
+    with pytest.raises(Exception) as raised:
+        pool.acquire('127.0.0.1', 9000, timeout=0.05)
+    assert 'no free connection' in str(raised.value)
+    # the limit is per client
+    other = pool.acquire('127.0.0.1', 9001, timeout=0.05)
+    pool.release('127.0.0.1', 9000, first)
+    assert pool.acquire('127.0.0.1', 9000, timeout=0.05) is first
+    for port, handle in ((9000, first), (9000, second), (9001, other)):
+        pool.release('127.0.0.1', port, handle)
+    pool.close()
+
+def test_waitingCallerGetsReleasedHandle():
+    pool = RpcConnectionPool(maxHandlesPerNode=1)
+    handle = pool.acquire('127.0.0.1', 9000)
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire('127.0.0.1', 9000, timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    assert acquired == []
+    pool.release('127.0.0.1', 9000, handle)
+    waiter.join(5)
+    assert acquired == [handle]
+    pool.close()
+
+def test_failedHandleFreesItsPlace():
+    pool = RpcConnectionPool(maxHandlesPerNode=1)
+    handle = pool.acquire('127.0.0.1', 9000)
+    pool.release('127.0.0.1', 9000, handle, reusable=False)
+    assert pool.openCounts[('127.0.0.1', '9000')] == 0
+    assert pool.acquire('127.0.0.1', 9000, timeout=0.05) is not handle
+    pool.close()
+
+def test_idleHandlesAreEvicted():
+    pool = RpcConnectionPool(maxHandlesPerNode=4, idleTimeout=10.0)
+    handles = [pool.acquire('127.0.0.1', 9000) for index in range(3)]
+    for handle in handles:
+        pool.release('127.0.0.1', 9000, handle)
+    assert pool.evictIdle(time.time() + 5) == 0
+    assert pool.evictIdle(time.time() + 11) == 3
+    assert pool.openCounts[('127.0.0.1', '9000')] == 0
+    assert pool.idleHandles[('127.0.0.1', '9000')] == []
+    pool.close()
+
+def test_postReusesConnection(server):
+    ip, port = server.address()
+    pool = RpcConnectionPool(maxHandlesPerNode=2)
+    for call in range(5):
+        responseCode, body = pool.post(ip, port, BLOCK_NUMBER, method='eth_blockNumber')
+        assert responseCode == 200 and json.loads(body.decode('utf-8'))['result'] == "0x0"
+    stats = getDefaultMetrics().statsFor(ip + ":" + port, 'eth_blockNumber')
+    assert (stats.newConnections, stats.reusedConnections) == (1, 4)
+    assert pool.openCounts[(ip, port)] == 1
+    pool.close()
+
+def test_failedPostIsNotReused(server):
+    ip, port = server.address()
+    pool = RpcConnectionPool(maxHandlesPerNode=1, connectTimeout=1)
+    server.stop()
+    with pytest.raises(Exception):
+        pool.post(ip, port, BLOCK_NUMBER, method='eth_blockNumber')
+    assert pool.openCounts[(ip, port)] == 0
+    assert pool.idleHandles.get((ip, port)) in (None, [])
+    pool.close()
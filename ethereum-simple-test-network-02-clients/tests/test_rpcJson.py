@@ -0,0 +1,76 @@
+##############################################################################
+#
+# rpcJson.py: loads() and the ResultStreamParser, alone and fed by
+# rpcStreamCommand from mockGethServer.py.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import json
+import pytest
+from rpcJson import loads, ResultStreamParser
+from mockGethServer import MockGethServer
+from networkGethClients import rpcCommand, rpcStreamCommand
+
+RESPONSE = {"jsonrpc": "2.0", "id": 1, "result": [
+    {"address": "0x" + "ab" * 20, "topics": ["0x" + "cd" * 32], "data": "0x", "logIndex": "0x0"},
+    {"address": "0x" + "ef" * 20, "topics": [], "data": "0x]}\"[{", "note": "escaped \" quote \\ and é"},
+    [1, [2, {"nested": []}]]]}
+
+
+def pieces(data,size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+def test_loads():
+    data = json.dumps(RESPONSE).encode('utf-8')
+    for value in (data, bytearray(data), memoryview(data), data.decode('utf-8')):
+        assert loads(value) == RESPONSE
+
+@pytest.mark.parametrize('size', [1, 3, 7, 64, 100000])
+def test_resultStreamParser(size):
+    items = []
+    parser = ResultStreamParser(items.append)
+    for piece in pieces(json.dumps(RESPONSE).encode('utf-8'), size):
+        parser.feed(piece)
+    assert items == RESPONSE['result']
+    assert parser.close() == {"jsonrpc": "2.0", "id": 1, "result": []}
+
+def test_resultStreamParserNestedPath():
+    block = {"jsonrpc": "2.0", "id": 1, "result": {"number": "0x1", "transactions": [{"hash": "0x1"}, {"hash": "0x2"}], "uncles": []}}
+    items = []
+    parser = ResultStreamParser(items.append, ('result', 'transactions'))
+    for piece in pieces(json.dumps(block).encode('utf-8'), 5):
+        parser.feed(piece)
+    assert items == block['result']['transactions']
+    assert parser.close()['result'] == {"number": "0x1", "transactions": [], "uncles": []}
+
+def test_resultStreamParserError():
+    parser = ResultStreamParser(lambda item: None)
+    parser.feed(b'{"jsonrpc":"2.0","id":1,"error":{"code":-32000,"message":"boom"}}')
+    assert parser.close()['error']['message'] == "boom"
+
+def test_rpcStreamCommand():
+    # mined by hand, so several transactions end up in one block
+    server = MockGethServer('127.0.0.1', 0, blockTime=3600)
+    server.start()
+    try:
+        ip, port = server.address()
+        account = server.chain.accounts[0]
+        for value in range(5):
+            server.chain.sendTransaction({'from': account, 'to': account, 'value': hex(value)})
+        server.chain.mine()
+        block = rpcCommand("eth_getBlockByNumber", ["0x1", True], ip=ip, port=port)
+        assert len(block['transactions']) == 5
+        transactions = []
+        streamed = rpcStreamCommand("eth_getBlockByNumber", ["0x1", True], ip=ip, port=port, onItem=transactions.append,
+                                    path=('result', 'transactions'))
+        assert transactions == block['transactions']
+        assert streamed['hash'] == block['hash'] and streamed['transactions'] == []
+        def failing(item):
+            raise ValueError('stop')
+        with pytest.raises(ValueError):
+            rpcStreamCommand("eth_getBlockByNumber", ["0x1", True], ip=ip, port=port, onItem=failing, path=('result', 'transactions'))
+    finally:
+        server.stop()
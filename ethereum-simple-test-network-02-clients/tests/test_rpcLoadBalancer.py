@@ -0,0 +1,107 @@
+##############################################################################
+#
+# rpcLoadBalancer.py against mockGethServer.py: failover from a stopped or
+#    dropping client, and taking a client that lags behind out of rotation.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import pytest
+from mockGethServer import MockGethServer
+from rpcLoadBalancer import LoadBalancedClient
+
+
+@pytest.fixture
+def servers():
+    # every server has its own chain, only mined when a test calls chain.mine()
+    servers = [MockGethServer(mine=False).start() for index in range(3)]
+    yield servers
+    for server in servers:
+        server.stop()
+
+def makeClient(servers,**options):
+    # the health checks are run by the tests
+    return LoadBalancedClient([server.address() for server in servers], healthInterval=0, **options)
+
+def mine(server,blocks):
+    for block in range(blocks):
+        server.chain.mine()
+
+def callsPerEndpoint(client):
+    return [endpoint.calls for endpoint in client.endpoints]
+
+
+def test_readsAreSpread(servers):
+    client = makeClient(servers)
+    for call in range(30):
+        assert client.rpcCommand("eth_blockNumber") == "0x0"
+    assert callsPerEndpoint(client) == [10, 10, 10]
+    client.close()
+
+def test_failoverFromStoppedClient(servers):
+    client = makeClient(servers)
+    servers[1].stop()
+    for call in range(30):
+        assert client.rpcCommand("eth_blockNumber") == "0x0"
+    stopped = client.endpoints[1]
+    assert stopped.failures == 1 and not stopped.healthy
+    # out of rotation after the first failure
+    assert stopped.calls == 1
+    client.checkHealth()
+    assert client.status()[stopped.name()]['healthy'] == False
+    client.close()
+
+def test_failoverFromDroppedRequests(servers):
+    client = makeClient(servers)
+    servers[0].inject(dropRate=1.0)
+    # equally good endpoints take turns, so each of them gets one of the batches
+    for batch in range(3):
+        results = client.rpcBatchCommand([("eth_blockNumber", []), ("net_version", [])] * 5)
+        assert results[:2] == ["0x0", str(servers[0].chain.chainId)]
+    dropping = client.endpoints[0]
+    assert (dropping.calls, dropping.failures, dropping.healthy) == (1, 1, False)
+    # the client is back once a health check gets an answer from it
+    servers[0].inject()
+    client.checkHealth()
+    assert client.endpoints[0].healthy
+    client.close()
+
+def test_rpcErrorsAreNotFailedOver(servers):
+    client = makeClient(servers, strategy='ewma')
+    for server in servers:
+        server.inject(errorRate=1.0)
+    results = client.rpcCommand("eth_blockNumber")
+    assert results['error']['message'] == "injected error"
+    # the client answered, it is not taken out of rotation
+    assert sum(callsPerEndpoint(client)) == 1
+    assert all(endpoint.healthy for endpoint in client.endpoints)
+    client.close()
+
+def test_laggingClientIsEjected(servers):
+    client = makeClient(servers, maxLag=3)
+    mine(servers[0], 10)
+    mine(servers[1], 10)
+    mine(servers[2], 6)
+    assert client.checkHealth() == 10
+    assert [endpoint.lagging for endpoint in client.endpoints] == [False, False, True]
+    for call in range(20):
+        assert client.rpcCommand("eth_blockNumber") == hex(10)
+    assert callsPerEndpoint(client)[2] == 0
+    # within maxLag of the median again
+    mine(servers[2], 1)
+    client.checkHealth()
+    assert client.endpoints[2].available()
+    client.close()
+
+def test_writesArePinned(servers):
+    client = makeClient(servers, writeEndpoint=servers[2].address())
+    account = servers[2].chain.accounts[0]
+    for call in range(3):
+        transactionHash = client.rpcCommand("eth_sendTransaction", [{'from': account, 'to': account, 'value': "0x1"}])
+        assert transactionHash in servers[2].chain.transactions
+    assert callsPerEndpoint(client) == [0, 0, 3]
+    client.pinWrites(servers[0].address())
+    assert client.rpcCommand("eth_accounts") == servers[0].chain.accounts
+    client.close()
@@ -0,0 +1,75 @@
+##############################################################################
+#
+# rpcMetrics.py: latency histogram buckets and percentiles.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+from rpcMetrics import LatencyHistogram, RpcMetrics, SUB_BUCKET_COUNT, getDefaultMetrics
+from mockGethServer import MockGethServer
+from networkGethClients import rpcCommand, rpcBatchCommand
+
+
+def test_bucketBounds():
+    # every latency falls into a bucket whose upper bound is at or above it, and within 1/16th of it
+    for micros in list(range(0, 200)) + [1000, 4095, 4096, 123456, 10 ** 7]:
+        upper = LatencyHistogram.bucketUpperBound(LatencyHistogram.bucketIndex(micros))
+        assert micros / 1e6 <= upper <= max(micros * (1 + 2.0 / SUB_BUCKET_COUNT), micros + 1) / 1e6
+
+def test_smallLatenciesAreExact():
+    for micros in range(SUB_BUCKET_COUNT):
+        assert LatencyHistogram.bucketUpperBound(LatencyHistogram.bucketIndex(micros)) == micros / 1e6
+
+def test_percentiles():
+    histogram = LatencyHistogram()
+    for millis in range(1, 101):
+        histogram.record(millis / 1000.0)
+    assert abs(histogram.percentile(0.5) - 0.050) < 0.050 / 16
+    assert abs(histogram.percentile(0.99) - 0.099) < 0.099 / 16
+    assert histogram.percentile(1.0) == histogram.max == 0.1
+    # a call counts towards a bound once its whole bucket is at or below it, 10ms is in the 10-10.24ms one
+    assert histogram.cumulativeCounts([0.0005, 0.01, 0.011, 1.0]) == [0, 9, 10, 100]
+
+def test_merge():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    first.record(0.001)
+    second.record(0.002)
+    second.record(0.002)
+    first.merge(second)
+    assert first.count == 3 and first.max == 0.002
+
+def test_recordPerMethod():
+    metrics = RpcMetrics()
+    metrics.record('127.0.0.1', '9000', 'eth_blockNumber', 0.001, 10, 20, True, False)
+    metrics.record('127.0.0.1', '9000', 'eth_blockNumber', 0.003, 10, 20, False, True)
+    stats = metrics.statsFor("127.0.0.1:9000", 'eth_blockNumber')
+    assert (stats.calls, stats.errors, stats.bytesIn) == (2, 1, 40)
+    assert (stats.reusedConnections, stats.newConnections) == (1, 1)
+    assert stats.latency.count == 2 and stats.latency.max == 0.003
+
+def test_helpersRecordCalls():
+    server = MockGethServer('127.0.0.1', 0, methodLatency={'eth_getBalance': 0.02})
+    server.start()
+    metrics = getDefaultMetrics()
+    metrics.reset()
+    try:
+        ip, port = server.address()
+        for call in range(5):
+            rpcCommand("eth_blockNumber", ip=ip, port=port)
+        account = rpcCommand("eth_accounts", ip=ip, port=port)[0]
+        rpcCommand("eth_getBalance", [account, "latest"], ip=ip, port=port)
+        rpcCommand("eth_noSuchMethod", ip=ip, port=port)
+        rpcBatchCommand([("eth_blockNumber", []), ("net_version", [])], ip=ip, port=port)
+        methods = metrics.snapshot()['nodes'][ip + ":" + port]['methods']
+        assert methods['eth_blockNumber']['calls'] == 5 and methods['eth_blockNumber']['errors'] == 0
+        # after the first call the keep-alive connection is reused
+        assert methods['eth_blockNumber']['connectionReuseRate'] >= 0.8
+        assert methods['eth_getBalance']['p50ms'] >= 20
+        assert methods['eth_noSuchMethod']['errors'] == 1
+        assert sum(stats['calls'] for method, stats in methods.items() if method.startswith('batch')) == 1
+        assert 'geth_rpc_latency_seconds_bucket{' in metrics.prometheusText()
+    finally:
+        server.stop()
+        metrics.reset()
@@ -0,0 +1,139 @@
+##############################################################################
+#
+# rpcTransport.py: the JsonStreamScanner framing of IPC streams, and the
+# IPC and WebSocket transports against mockGethServer.py.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import pytest
+from rpcTransport import (JsonStreamScanner, readJsonStream, IpcTransport, WebSocketTransport, TransportError,
+                          useIpc, useWebSocket, setTransport, subscribe)
+from mockGethServer import MockGethServer
+from networkGethClients import rpcCommand, rpcBatchCommand, rpcStreamCommand
+
+RESPONSE = {"jsonrpc": "2.0", "id": 1, "result": [
+    {"address": "0x" + "ab" * 20, "data": "0x]}\"[{", "note": "escaped \" quote \\ and é", "id": 5}, [1, [2, {"id": []}]]]}
+
+
+def pieces(data,size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+@pytest.mark.parametrize('size', [1, 2, 5, 64, 100000])
+def test_jsonStreamScanner(size):
+    batch = [{"jsonrpc": "2.0", "id": 7, "result": {"id": 99}}, {"result": "id", "id": "seven"}]
+    notification = {"jsonrpc": "2.0", "method": "eth_subscription", "params": {"subscription": "0x1", "result": {"id": 3}}}
+    messages = [RESPONSE, batch, notification]
+    stream = b"\n".join(json.dumps(message).encode('utf-8') for message in messages) + b" \r\n"
+    scanner = JsonStreamScanner()
+    found = []
+    for piece in pieces(stream, size):
+        found += scanner.feed(piece)
+    assert [json.loads(message.decode('utf-8')) for message, ids in found] == messages
+    # only the top level ids (of each response of a batch), at the right place in the bytes
+    assert [[value for value, start, end in ids] for message, ids in found] == [[1], [7, "seven"], []]
+    for message, ids in found:
+        for value, start, end in ids:
+            assert message[start:end] == json.dumps(value).encode('utf-8')
+    assert len(scanner.buffer) == 0
+
+def test_readJsonStream():
+    left, right = socket.socketpair()
+    with left, right:
+        left.sendall(json.dumps(RESPONSE).encode('utf-8') + b'{"id":2}')
+        left.shutdown(socket.SHUT_WR)
+        assert list(readJsonStream(right)) == [RESPONSE, {"id": 2}]
+
+
+@pytest.fixture
+def mock():
+    ipcPath = os.path.join(tempfile.mkdtemp(), 'geth.ipc')
+    # mined by hand, so several transactions end up in one block
+    server = MockGethServer('127.0.0.1', 0, blockTime=3600, ipcPath=ipcPath, wsPort=0)
+    server.start()
+    account = server.chain.accounts[0]
+    for value in range(5):
+        server.chain.sendTransaction({'from': account, 'to': account, 'value': hex(value)})
+    server.chain.mine()
+    yield server, ipcPath
+    setTransport(*server.address(), transport=None)
+    server.stop()
+
+def switch(server,ipcPath,kind):
+    ip, port = server.address()
+    if kind == 'ipc':
+        return useIpc(ip, port, ipcPath)
+    return useWebSocket(ip, port, server.wsServer.server_address[1])
+
+@pytest.mark.parametrize('kind', ['ipc', 'ws'])
+def test_helpersOverTransport(mock,kind):
+    server, ipcPath = mock
+    ip, port = server.address()
+    switch(server, ipcPath, kind)
+    assert rpcCommand("eth_blockNumber", ip=ip, port=port) == "0x1"
+    assert rpcBatchCommand([("eth_blockNumber", []), ("net_version", []), ("eth_noSuchMethod", [])], ip=ip, port=port)[:2] == ["0x1", "15"]
+    block = rpcCommand("eth_getBlockByNumber", ["0x1", True], ip=ip, port=port)
+    transactions = []
+    streamed = rpcStreamCommand("eth_getBlockByNumber", ["0x1", True], ip=ip, port=port, onItem=transactions.append,
+                                path=('result', 'transactions'))
+    assert len(transactions) == 5 and transactions == block['transactions']
+    assert streamed['transactions'] == []
+
+@pytest.mark.parametrize('kind', ['ipc', 'ws'])
+def test_requestKeepsCallerIds(mock,kind):
+    server, ipcPath = mock
+    transport = switch(server, ipcPath, kind)
+    call = {"jsonrpc": "2.0", "method": "eth_blockNumber", "params": [], "id": "mine"}
+    batch = [dict(call, id=1), dict(call, id=1)]
+    assert json.loads(transport.request(call).decode('utf-8'))['id'] == "mine"
+    assert [response['id'] for response in json.loads(transport.request(batch).decode('utf-8'))] == [1, 1]
+    # the caller's dicts are not changed
+    assert call['id'] == "mine" and [item['id'] for item in batch] == [1, 1]
+    assert transport.waiting == {}
+
+def test_lostConnection(mock):
+    server, ipcPath = mock
+    transport = IpcTransport(ipcPath, timeout=5).connect()
+    assert transport.call("eth_blockNumber") == "0x1"
+    # as if the reader lost the connection right after connect() returned
+    transport.close()
+    transport.connect = lambda: transport
+    with pytest.raises(TransportError):
+        transport.call("eth_blockNumber")
+    assert transport.waiting == {}
+    del transport.connect
+    assert transport.call("eth_blockNumber") == "0x1"
+    transport.close()
+
+def test_timeout(mock):
+    server, ipcPath = mock
+    transport = IpcTransport(ipcPath, timeout=0.2).connect()
+    server.methodLatency['eth_blockNumber'] = 1.0
+    with pytest.raises(TransportError) as raised:
+        transport.call("eth_blockNumber")
+    assert raised.value.args[0] == 28
+    assert transport.waiting == {}
+    transport.close()
+
+@pytest.mark.parametrize('kind', ['ipc', 'ws'])
+def test_subscriptions(mock,kind):
+    server, ipcPath = mock
+    ip, port = server.address()
+    switch(server, ipcPath, kind)
+    heads = subscribe(ip, port, 'newHeads')
+    server.chain.mine()
+    assert heads.get(timeout=5)['number'] == "0x2"
+    async def nextHead():
+        async for head in heads:
+            return head['number']
+    server.chain.mine()
+    assert asyncio.new_event_loop().run_until_complete(nextHead()) == "0x3"
+    heads.unsubscribe()
+    assert heads.get(timeout=1) == None
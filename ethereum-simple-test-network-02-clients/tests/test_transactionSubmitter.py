@@ -0,0 +1,128 @@
+##############################################################################
+#
+# transactionSubmitter.py against mockGethServer.py: local nonces, gaps
+#    left by failed sends and stuck transactions resent with a higher gas price.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import time
+import pytest
+from mockGethServer import MockChain, MockGethServer
+from rpcCache import configureDefaultCache
+from transactionSubmitter import TransactionSubmitter
+
+TRANSFER = {'value': "0x1", 'gas': "0x5208", 'gasPrice': "0x3b9aca00"}
+
+
+@pytest.fixture
+def server():
+    # blocks are only mined when a test calls chain.mine()
+    configureDefaultCache(enabled=False)
+    server = MockGethServer(chain=MockChain(blockTime=3600), mine=False).start()
+    yield server
+    server.stop()
+    configureDefaultCache()
+
+def makeSubmitter(server,**options):
+    # the monitor is left idle, the tests run its checks themselves
+    return TransactionSubmitter([server.address()], accounts={server.address(): server.chain.accounts[:1]},
+                                checkInterval=3600, **options)
+
+def waitForSends(submitter,timeout=5.0):
+    deadline = time.time() + timeout
+    while any(submitted.sending for sender in submitter.senders for submitted in list(sender.inFlight.values())):
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+def transfer(server):
+    return dict(TRANSFER, to=server.chain.accounts[1])
+
+def poolNonces(chain):
+    return sorted(nonce for account, nonce in chain.pool)
+
+
+def test_noncesAreHandedOutInOrder(server):
+    submitter = makeSubmitter(server)
+    sent = []
+    futures = [submitter.submit(transfer(server), onSent=sent.append) for index in range(5)]
+    waitForSends(submitter)
+    assert poolNonces(server.chain) == [0, 1, 2, 3, 4]
+    # sent, but not mined yet
+    assert not any(future.done() for future in futures)
+    server.chain.mine()
+    submitter.checkPending()
+    assert sorted(future.result(0) for future in futures) == sorted(sent)
+    assert submitter.pendingCount() == 0
+    submitter.close()
+
+def test_stuckTransactionGivesTheMinedHash(server):
+    submitter = makeSubmitter(server, stuckAfter=0.0)
+    sent = []
+    future = submitter.submit(transfer(server), onSent=sent.append)
+    waitForSends(submitter)
+    submitter.checkPending()
+    waitForSends(submitter)
+    replacement = server.chain.pool[(server.chain.accounts[0], 0)]
+    assert replacement['hash'] != sent[0]
+    assert int(replacement['gasPrice'], 16) > int(TRANSFER['gasPrice'], 16)
+    server.chain.mine()
+    submitter.checkPending()
+    assert future.result(0) == replacement['hash']
+    submitter.close()
+
+def test_acceptedTransactionIsNotFilled(server):
+    submitter = makeSubmitter(server, stuckAfter=0.0, maxAttempts=1)
+    future = submitter.submit(transfer(server))
+    waitForSends(submitter)
+    transactionHash = server.chain.pool[(server.chain.accounts[0], 0)]['hash']
+    for check in range(3):
+        submitter.checkPending()
+        waitForSends(submitter)
+    # out of attempts, but the client holds it, so it is left to be mined
+    assert server.chain.pool[(server.chain.accounts[0], 0)]['hash'] == transactionHash
+    server.chain.mine()
+    submitter.checkPending()
+    assert future.result(0) == transactionHash
+    submitter.close()
+
+def test_failedSendIsFilled(server):
+    submitter = makeSubmitter(server, maxAttempts=1)
+    account = server.chain.accounts[0]
+    first = submitter.submit(transfer(server))
+    waitForSends(submitter)
+    server.inject(errorRate=1.0)
+    failed = submitter.submit(transfer(server))
+    waitForSends(submitter)
+    server.inject()
+    last = submitter.submit(transfer(server))
+    waitForSends(submitter)
+    # nonce 1 is a gap, holding up nonce 2
+    assert poolNonces(server.chain) == [0, 2]
+    submitter.checkPending()
+    waitForSends(submitter)
+    assert 'injected error' in str(failed.exception(0))
+    filler = server.chain.pool[(account, 1)]
+    assert (filler['to'], filler['value']) == (account, "0x0")
+    server.chain.mine()
+    submitter.checkPending()
+    assert first.result(0) != None and last.result(0) != None
+    assert server.chain.nonces[account] == 3
+    assert submitter.pendingCount() == 0
+    submitter.close()
+
+def test_nonceMinedWithAnotherTransactionFails(server):
+    submitter = makeSubmitter(server)
+    account = server.chain.accounts[0]
+    future = submitter.submit(transfer(server))
+    waitForSends(submitter)
+    # replaced by a send from outside of the submitter
+    server.chain.sendTransaction({'from': account, 'to': account, 'nonce': "0x0", 'gasPrice': "0x77359400"})
+    server.chain.mine()
+    submitter.checkPending()
+    with pytest.raises(Exception) as raised:
+        future.result(0)
+    assert 'another transaction' in str(raised.value)
+    submitter.close()
@@ -0,0 +1,370 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# High throughput transaction submission with local nonce management.
+#
+#    Every (client, account) pair is a sender. Nonces are handed out
+#    locally, so many eth_sendTransaction calls can be in flight at once
+#    across every account and client instead of waiting on the client to
+#    pick each nonce. A monitor notices nonce gaps (a send that failed) and
+#    stuck transactions, and resubmits them. A transaction's Future gives
+#    the hash that was mined, which a resend with a higher gas price changes.
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from networkGethClients import rpcCommand, rpcBatchCommand, getCachedAccounts, estimateGasMany, getGasPrice, trackSent, observeReceipt
+from gasEstimator import getDefaultEstimator
+
+
+class Sender(object):
+    """ One account on one client, with the next nonce to hand out and its unconfirmed transactions. """
+
+    def __init__(self,ip,port,account):
+        self.ip = str(ip)
+        self.port = str(port)
+        self.account = account
+        self.lock = threading.Lock()
+        self.nextNonce = None
+        # nonce -> SubmittedTransaction, not yet seen as mined
+        self.inFlight = {}
+
+    def name(self):
+        return self.ip + ":" + self.port + "/" + self.account
+
+
+class SubmittedTransaction(object):
+    """ A transaction handed to the submitter, its nonce, the hashes of its accepted sends and how
+        often it was (re)sent.
+    """
+
+    def __init__(self,sender,nonce,transaction,future,onSent=None):
+        self.sender = sender
+        self.nonce = nonce
+        self.transaction = transaction
+        self.future = future
+        self.onSent = onSent
+        # every send the client accepted, a resend with a higher gas price has a new hash
+        self.hashes = []
+        self.accepted = False
+        self.sending = False
+        self.sentAt = None
+        self.attempts = 0
+        self.error = None
+
+    def queue(self,executor,send):
+        self.sending = True
+        self.sentAt = None
+        executor.submit(send, self)
+
+
+class TransactionSubmitter(object):
+    """ Submit transactions from every account of every client concurrently.
+          nodes         - list of (ip, port) clients, their (unlocked) accounts are used as senders.
+          accounts      - optional dict of (ip, port) -> list of accounts to use instead of all of them.
+          workers       - eth_sendTransaction calls in flight at once.
+          gas           - gas for transactions that do not give one, None estimates it (see gasEstimator.py).
+          stuckAfter    - seconds after which an unmined transaction blocking its account is resent
+                          with a higher gas price.
+          gasPriceBump  - factor the gas price is raised by when a stuck transaction is resent.
+          maxAttempts   - most sends of one transaction; one the client never accepted is then given up
+                          and its nonce filled, one it accepted is left to be mined.
+          checkInterval - seconds between checks for mined, stuck and missing transactions.
+    """
+
+    def __init__(self,nodes,accounts=None,workers=16,gas=None,stuckAfter=30.0,gasPriceBump=1.125,
+                 maxAttempts=5,checkInterval=1.0):
+        self.gas = gas
+        self.stuckAfter = stuckAfter
+        self.gasPriceBump = gasPriceBump
+        self.maxAttempts = maxAttempts
+        self.checkInterval = checkInterval
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.senders = []
+        for ip, port in nodes:
+            nodeAccounts = (accounts or {}).get((str(ip), str(port))) or getCachedAccounts(ip, port)
+            if not isinstance(nodeAccounts, list):
+                raise Exception('rpc_communication_error', nodeAccounts)
+            self.senders.extend(Sender(ip, port, account) for account in nodeAccounts)
+        if not self.senders:
+            raise Exception('no accounts to send transactions from')
+        self.nextSender = itertools.cycle(self.senders)
+        self.nextSenderLock = threading.Lock()
+        self.stopped = threading.Event()
+        self.monitor = threading.Thread(target=self.monitorLoop, name='transactionSubmitterMonitor')
+        self.monitor.daemon = True
+        self.monitor.start()
+
+    ##########################################################################
+    # submission
+    ##########################################################################
+
+    def pickSender(self,account=None,node=None):
+        if account == None and node == None:
+            with self.nextSenderLock:
+                return next(self.nextSender)
+        for sender in self.senders:
+            if (account == None or sender.account == account) and (node == None or (sender.ip, sender.port) == (str(node[0]), str(node[1]))):
+                return sender
+        raise Exception('no sender for account ' + str(account) + ' on ' + str(node))
+
+    def gasPrice(self,sender):
+        """ The gas price paid in the client's recent blocks. """
+        price = getGasPrice(sender.ip, sender.port)
+        if not isinstance(price, str):
+            raise Exception('rpc_communication_error', price)
+        return price
+
+    def estimateGas(self,transactions,senders):
+        """ Fill in the gas of the transactions that give none, estimated on the client and from the
+            account of the Sender each is sent by, in one batched estimate per client. Returns the
+            estimation error of each transaction that would fail (None for the others).
+        """
+        errors = [None] * len(transactions)
+        if self.gas != None:
+            for transaction in transactions:
+                transaction.setdefault('gas', self.gas)
+            return errors
+        byNode = {}
+        for index, (transaction, sender) in enumerate(zip(transactions, senders)):
+            if not transaction.get('gas'):
+                byNode.setdefault((sender.ip, sender.port), []).append(index)
+        for (ip, port), missing in byNode.items():
+            estimates = estimateGasMany(ip, port, [dict(transactions[index], **{'from': senders[index].account})
+                                                   for index in missing])
+            for index, gas in zip(missing, estimates):
+                if isinstance(gas, str):
+                    transactions[index]['gas'] = gas
+                else:
+                    errors[index] = gas
+        return errors
+
+    def syncNonce(self,sender):
+        """ (Re)load the sender's next nonce from its client's pending state. The call is made before
+            sender.lock is taken (the caller must not hold it), so other submits are not held up by it.
+        """
+        count = rpcCommand(ip=sender.ip,port=sender.port,method="eth_getTransactionCount",params=[sender.account,"pending"],exceptions=True)
+        with sender.lock:
+            sender.nextNonce = max(int(count, 16), sender.nextNonce or 0)
+
+    def lookupHash(self,sender,nonce):
+        """ Hash of the transaction the client holds for the sender's nonce (in its pool or pending
+            block), None if it has none.
+        """
+        content, block = rpcBatchCommand([("txpool_content", []), ("eth_getBlockByNumber", ["pending", True])],
+                                         ip=sender.ip, port=sender.port)
+        if isinstance(content, dict) and 'error' not in content:
+            for state in ('pending', 'queued'):
+                for account, byNonce in (content.get(state) or {}).items():
+                    if account.lower() == sender.account.lower() and str(nonce) in byNonce:
+                        return byNonce[str(nonce)]['hash']
+        if isinstance(block, dict) and 'error' not in block:
+            for transaction in block.get('transactions', []):
+                if (isinstance(transaction, dict) and (transaction.get('from') or '').lower() == sender.account.lower()
+                        and int(transaction['nonce'], 16) == nonce):
+                    return transaction['hash']
+        return None
+
+    def submit(self,transaction,account=None,node=None,onSent=None):
+        """ Queue a transaction dict ('to', 'data', 'value', 'gas', ...; 'from' and 'nonce' are filled in).
+            Returns a Future giving the hash of the transaction once it is mined. That is the hash of
+            the send that got mined, a stuck transaction resent with a higher gas price has a new one.
+            It fails if the transaction was given up, or its nonce was mined with another transaction.
+              onSent - optional callable, given the hash when the client first accepts the transaction.
+        """
+        sender = self.pickSender(account or transaction.get('from'), node)
+        future = Future()
+        transaction = dict(transaction)
+        error = self.estimateGas([transaction], [sender])[0]
+        if error != None:
+            # it would fail, no nonce is used up
+            future.set_exception(Exception('gas_estimation_error', error))
+            return future
+        # the round trips happen outside of sender.lock, only handing out the nonce is serialized
+        if sender.nextNonce == None:
+            self.syncNonce(sender)
+        if not transaction.get('gasPrice'):
+            transaction['gasPrice'] = self.gasPrice(sender)
+        transaction['from'] = sender.account
+        with sender.lock:
+            submitted = SubmittedTransaction(sender, sender.nextNonce, transaction, future, onSent)
+            sender.nextNonce += 1
+            sender.inFlight[submitted.nonce] = submitted
+        submitted.queue(self.executor, self.send)
+        return future
+
+    def submitMany(self,transactions):
+        """ Queue many transactions, spread over every sender. Returns a list of Futures. """
+        transactions = [dict(transaction) for transaction in transactions]
+        senders = [self.pickSender(transaction.get('from')) for transaction in transactions]
+        # the estimates missing for the batch are fetched at once (per client), submit() then has them
+        self.estimateGas(transactions, senders)
+        return [self.submit(transaction, sender.account, (sender.ip, sender.port)) for transaction, sender in zip(transactions, senders)]
+
+    def send(self,submitted):
+        try:
+            self.sendOnce(submitted)
+        finally:
+            submitted.sending = False
+
+    def sendOnce(self,submitted):
+        sender = submitted.sender
+        transaction = dict(submitted.transaction)
+        transaction['nonce'] = hex(submitted.nonce)
+        submitted.attempts += 1
+        submitted.sentAt = time.time()
+        results = rpcCommand(ip=sender.ip,port=sender.port,method="eth_sendTransaction",params=[transaction])
+        if isinstance(results, str):
+            self.accepted(submitted, results, transaction)
+            return
+        message = str(results.get('error', results)) if isinstance(results, dict) else str(results)
+        if 'known transaction' in message or 'already known' in message:
+            # an earlier attempt got through (its answer was lost), the client has its hash
+            self.accepted(submitted, self.lookupHash(sender, submitted.nonce), transaction)
+            return
+        if 'nonce too low' in message and not submitted.accepted:
+            # the nonce was used outside of this submitter, move the transaction to a fresh one
+            self.syncNonce(sender)
+            with sender.lock:
+                sender.inFlight.pop(submitted.nonce, None)
+                submitted.nonce = sender.nextNonce
+                sender.nextNonce += 1
+                sender.inFlight[submitted.nonce] = submitted
+            self.sendOnce(submitted)
+            return
+        # a gap (or a resend of an accepted transaction the client turned down), the monitor resends it
+        submitted.error = results
+
+    def accepted(self,submitted,transactionHash,transaction):
+        """ Note a send the client accepted, its hash is None if it could not be found out. """
+        submitted.error = None
+        if transactionHash != None and transactionHash not in submitted.hashes:
+            submitted.hashes.append(transactionHash)
+            trackSent(transactionHash, transaction)
+        first = not submitted.accepted
+        submitted.accepted = True
+        if first and submitted.onSent != None and transactionHash != None:
+            submitted.onSent(transactionHash)
+
+    ##########################################################################
+    # monitoring
+    ##########################################################################
+
+    def minedNonces(self):
+        """ Number of mined transactions of every sender, one batched request per client. """
+        byNode = {}
+        for sender in self.senders:
+            byNode.setdefault((sender.ip, sender.port), []).append(sender)
+        counts = {}
+        for (ip, port), senders in byNode.items():
+            results = rpcBatchCommand([("eth_getTransactionCount", [sender.account, "latest"]) for sender in senders], ip=ip, port=port)
+            for sender, result in zip(senders, results):
+                if isinstance(result, str):
+                    counts[sender] = int(result, 16)
+        return counts
+
+    def resolveMined(self,mined):
+        """ Settle the Futures of transactions whose nonce was mined, with the hash of the send that has
+            a receipt, and hand the receipts of those sent with an estimated gas to the gas estimator.
+            One batched receipt request per client. Returns the ones settled, a transaction whose
+            receipts could not be fetched is left for the next check.
+        """
+        estimator = getDefaultEstimator()
+        byNode = {}
+        for submitted in mined:
+            byNode.setdefault((submitted.sender.ip, submitted.sender.port), []).append(submitted)
+        settled = []
+        for (ip, port), transactions in byNode.items():
+            calls = [("eth_getTransactionReceipt", [transactionHash]) for submitted in transactions for transactionHash in submitted.hashes]
+            receipts = iter(rpcBatchCommand(calls, ip=ip, port=port) if calls else [])
+            for submitted in transactions:
+                results = [next(receipts) for transactionHash in submitted.hashes]
+                if any(isinstance(result, dict) and 'error' in result for result in results):
+                    continue
+                receipt = next((result for result in results if isinstance(result, dict)), None)
+                settled.append(submitted)
+                if receipt == None:
+                    reason = 'its nonce was mined, but the hash of its send was never learned' if submitted.accepted and not submitted.hashes \
+                        else 'its nonce was mined with another transaction'
+                    submitted.future.set_exception(Exception('rpc_communication_error', reason))
+                    continue
+                if estimator != None and estimator.tracked(receipt['transactionHash']):
+                    observeReceipt(receipt)
+                submitted.future.set_result(receipt['transactionHash'])
+        return settled
+
+    def checkPending(self):
+        """ Settle mined transactions, resend gaps (failed sends) and stuck transactions. """
+        now = time.time()
+        for sender, minedCount in self.minedNonces().items():
+            resend = []
+            with sender.lock:
+                # one still being sent may get a new hash, it is settled on a later check
+                mined = [submitted for nonce, submitted in sender.inFlight.items() if nonce < minedCount and not submitted.sending]
+                for nonce, submitted in sender.inFlight.items():
+                    if submitted.sending or nonce < minedCount:
+                        continue
+                    if submitted.error != None and not submitted.accepted:
+                        resend.append(submitted)
+                    elif nonce == minedCount and now - submitted.sentAt > self.stuckAfter:
+                        # the oldest unmined transaction of the account holds up all of the others
+                        resend.append(submitted)
+            for submitted in self.resolveMined(mined):
+                with sender.lock:
+                    if sender.inFlight.get(submitted.nonce) is submitted:
+                        del sender.inFlight[submitted.nonce]
+            for submitted in resend:
+                if submitted.attempts < self.maxAttempts:
+                    if submitted.accepted:
+                        # replacing a transaction the client holds takes a higher gas price
+                        gasPrice = int(submitted.transaction['gasPrice'], 16)
+                        submitted.transaction['gasPrice'] = hex(int(gasPrice * self.gasPriceBump) + 1)
+                    submitted.queue(self.executor, self.send)
+                elif not submitted.accepted:
+                    self.fillGap(submitted)
+                # the nonce of one the client accepted is never filled, it may still be mined
+
+    def fillGap(self,submitted):
+        """ Give up on a transaction no client accepted, sending an empty transfer with its nonce so later
+            ones can be mined.
+        """
+        submitted.future.set_exception(Exception('rpc_communication_error', submitted.error))
+        sender = submitted.sender
+        gasPrice = int(submitted.transaction['gasPrice'], 16)
+        transaction = {'from': sender.account, 'to': sender.account, 'value': '0x0',
+                       'gas': '0x5208', 'gasPrice': hex(int(gasPrice * self.gasPriceBump) + 1)}
+        filler = SubmittedTransaction(sender, submitted.nonce, transaction, Future())
+        with sender.lock:
+            sender.inFlight[filler.nonce] = filler
+        filler.queue(self.executor, self.send)
+
+    def monitorLoop(self):
+        while not self.stopped.wait(self.checkInterval):
+            try:
+                self.checkPending()
+            except Exception:
+                # a client being briefly unreachable is retried on the next check
+                pass
+
+    def pendingCount(self):
+        return sum(len(sender.inFlight) for sender in self.senders)
+
+    def waitUntilMined(self,timeout=None,interval=0.5):
+        """ Wait until every submitted transaction has been mined. Returns True if they all were. """
+        deadline = None if timeout == None else time.time() + timeout
+        while self.pendingCount() > 0:
+            if deadline != None and time.time() >= deadline:
+                return False
+            time.sleep(interval)
+        return True
+
+    def close(self):
+        self.stopped.set()
+        self.executor.shutdown(wait=True)
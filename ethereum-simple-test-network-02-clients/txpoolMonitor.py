@@ -0,0 +1,273 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Transaction pool monitor for the geth test network.
+#
+#    Samples txpool_status and txpool_content of every client at once, at
+#    a fixed interval, and keeps a bounded ring buffer of samples per
+#    client. From them come the backlog depth (pending + queued), the
+#    queued nonces of each account, and how long transactions stay in
+#    the pool. A transaction that leaves a pool is looked up once: mined
+#    (it has a receipt) or dropped. Transactions in a pool for longer than
+#    stuckAfter seconds are flagged, with the reason when it can be told
+#    (a queued transaction waiting behind a missing nonce).
+#
+#    Needs the txpool rpc api (--rpcapi ...,txpool, see network-02-clients.json).
+#
+#    ./txpoolMonitor.py --network /workspace/network-02-clients.json --interval 1 --report-interval 10
+#    ./txpoolMonitor.py --node 127.0.0.1:9000 --transaction <transactionHash>
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from networkGethClients import rpcBatchCommand
+from rpcMetrics import LatencyHistogram
+
+def isError(results):
+    return not isinstance(results, dict) or 'error' in results
+
+def toInt(value):
+    if isinstance(value, int):
+        return value
+    return int(value, 16) if isinstance(value, str) and value.startswith("0x") else int(value)
+
+
+class TxpoolMonitor(object):
+    """ Samples the transaction pools of many clients.
+          nodes       - list of (ip, port).
+          interval    - seconds between samples.
+          maxSamples  - samples kept per client, the oldest are dropped first.
+          stuckAfter  - seconds in a pool after which a transaction is flagged as stuck.
+          maxDeparted - most transactions that left a pool remembered, for transactionState().
+    """
+
+    def __init__(self,nodes,interval=1.0,maxSamples=600,stuckAfter=60.0,maxDeparted=100000):
+        self.nodes = [(str(ip), str(port)) for ip, port in nodes]
+        self.interval = interval
+        self.stuckAfter = stuckAfter
+        self.maxDeparted = maxDeparted
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, len(self.nodes)))
+        self.samples = dict((node, deque(maxlen=maxSamples)) for node in self.nodes)
+        # node -> transaction hash -> (state, account, nonce), as of the last sample
+        self.inPool = dict((node, {}) for node in self.nodes)
+        # node -> transaction hash -> time first seen in the pool
+        self.firstSeen = dict((node, {}) for node in self.nodes)
+        # (node, transaction hash) -> {'left': time, 'seconds': time in pool, 'fate': 'mined' or 'dropped'}
+        self.departed = OrderedDict()
+        self.timeInPool = dict((node, LatencyHistogram()) for node in self.nodes)
+        self.fates = dict((node, {'mined': 0, 'dropped': 0}) for node in self.nodes)
+        self.errors = dict((node, 0) for node in self.nodes)
+        self.stopped = threading.Event()
+        self.thread = None
+
+    ##########################################################################
+    # sampling
+    ##########################################################################
+
+    def fetch(self,node):
+        return rpcBatchCommand([("txpool_status", []), ("txpool_content", [])], ip=node[0], port=node[1])
+
+    def sample(self):
+        """ Sample every client once (at the same time), returns node -> the new sample. """
+        results = list(self.executor.map(self.fetch, self.nodes))
+        now = time.time()
+        samples = {}
+        for node, (status, content) in zip(self.nodes, results):
+            if isError(status) or isError(content):
+                with self.lock:
+                    self.errors[node] += 1
+                continue
+            samples[node] = self.record(node, now, status, content)
+        return samples
+
+    def record(self,node,now,status,content):
+        transactions = {}
+        queuedNonces = {}
+        for state in ('pending', 'queued'):
+            for account, byNonce in (content.get(state) or {}).items():
+                account = account.lower()
+                for nonce, transaction in byNonce.items():
+                    transactions[transaction['hash']] = (state, account, int(nonce))
+                    if state == 'queued':
+                        queuedNonces.setdefault(account, []).append(int(nonce))
+        with self.lock:
+            firstSeen = self.firstSeen[node]
+            left = [transactionHash for transactionHash in self.inPool[node] if transactionHash not in transactions]
+            for transactionHash in transactions:
+                firstSeen.setdefault(transactionHash, now)
+            for transactionHash in left:
+                seconds = now - firstSeen.pop(transactionHash, now)
+                self.timeInPool[node].record(seconds)
+                self.departed[(node, transactionHash)] = {'left': now, 'seconds': seconds, 'fate': None}
+            while len(self.departed) > self.maxDeparted:
+                self.departed.popitem(last=False)
+            self.inPool[node] = transactions
+            ages = [now - firstSeen[transactionHash] for transactionHash in transactions]
+            sample = {'time': now, 'pending': toInt(status.get('pending', 0)), 'queued': toInt(status.get('queued', 0)),
+                      'accounts': len(set(account for state, account, nonce in transactions.values())),
+                      'queuedNonces': dict((account, sorted(nonces)) for account, nonces in queuedNonces.items()),
+                      'stuck': sum(1 for age in ages if age > self.stuckAfter),
+                      'oldestSeconds': round(max(ages), 3) if ages else 0.0}
+            sample['backlog'] = sample['pending'] + sample['queued']
+            self.samples[node].append(sample)
+        if left:
+            self.classify(node, left)
+        return sample
+
+    def classify(self,node,transactionHashes):
+        """ Record whether transactions that left node's pool were mined or dropped. """
+        receipts = rpcBatchCommand([("eth_getTransactionReceipt", [transactionHash]) for transactionHash in transactionHashes],
+                                   ip=node[0], port=node[1])
+        with self.lock:
+            for transactionHash, receipt in zip(transactionHashes, receipts):
+                if isinstance(receipt, dict) and 'error' in receipt:
+                    continue
+                fate = 'mined' if isinstance(receipt, dict) and receipt.get('blockNumber') else 'dropped'
+                self.fates[node][fate] += 1
+                entry = self.departed.get((node, transactionHash))
+                if entry != None:
+                    entry['fate'] = fate
+
+    def loop(self):
+        while not self.stopped.is_set():
+            started = time.time()
+            self.sample()
+            self.stopped.wait(max(0.0, self.interval - (time.time() - started)))
+
+    def start(self):
+        """ Sample every interval seconds from a background thread. """
+        self.thread = threading.Thread(target=self.loop, name='txpoolMonitor')
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread != None:
+            self.thread.join()
+        self.executor.shutdown()
+
+    ##########################################################################
+    # queries
+    ##########################################################################
+
+    def transactionState(self,transactionHash):
+        """ Where a transaction is, per client: 'pending' or 'queued' (with its seconds in the pool),
+            'mined' or 'dropped' once it left the pool, 'unseen' if it was never in that client's pool.
+        """
+        states = {}
+        with self.lock:
+            for node in self.nodes:
+                name = ":".join(node)
+                entry = self.inPool[node].get(transactionHash)
+                departed = self.departed.get((node, transactionHash))
+                if entry != None:
+                    states[name] = {'state': entry[0], 'account': entry[1], 'nonce': entry[2],
+                                    'seconds': round(time.time() - self.firstSeen[node][transactionHash], 3)}
+                elif departed != None:
+                    states[name] = {'state': departed['fate'] or 'left', 'seconds': round(departed['seconds'], 3)}
+                else:
+                    states[name] = {'state': 'unseen'}
+        return states
+
+    def stuckTransactions(self,node=None):
+        """ Transactions in a pool for more than stuckAfter seconds, oldest first. A queued transaction
+            gets the nonce it waits for when its account has pending ones (the next nonce after them).
+        """
+        now = time.time()
+        stuck = []
+        with self.lock:
+            for current in [node] if node != None else self.nodes:
+                pool = self.inPool[current]
+                nextNonce = {}
+                for state, account, nonce in pool.values():
+                    if state == 'pending':
+                        nextNonce[account] = max(nextNonce.get(account, 0), nonce + 1)
+                for transactionHash, (state, account, nonce) in pool.items():
+                    age = now - self.firstSeen[current][transactionHash]
+                    if age <= self.stuckAfter:
+                        continue
+                    entry = {'node': ":".join(current), 'hash': transactionHash, 'state': state, 'account': account,
+                             'nonce': nonce, 'seconds': round(age, 3)}
+                    if state == 'queued' and account in nextNonce:
+                        entry['waitingForNonce'] = nextNonce[account]
+                    stuck.append(entry)
+        return sorted(stuck, key=lambda entry: -entry['seconds'])
+
+    def snapshot(self,maxStuck=50):
+        """ Dict of every client's backlog (latest, max and mean over the kept samples), accounts with
+            queued nonces, time in pool percentiles (ms), mined/dropped counts and stuck transactions.
+        """
+        nodes = {}
+        with self.lock:
+            for node in self.nodes:
+                samples = list(self.samples[node])
+                latest = samples[-1] if samples else {}
+                backlogs = [sample['backlog'] for sample in samples]
+                histogram = self.timeInPool[node]
+                nodes[":".join(node)] = {
+                    'samples': len(samples), 'errors': self.errors[node],
+                    'pending': latest.get('pending'), 'queued': latest.get('queued'), 'backlog': latest.get('backlog'),
+                    'backlogMax': max(backlogs) if backlogs else None,
+                    'backlogMean': round(sum(backlogs) / float(len(backlogs)), 2) if backlogs else None,
+                    'queuedNonces': latest.get('queuedNonces', {}), 'stuck': latest.get('stuck', 0),
+                    'oldestSeconds': latest.get('oldestSeconds'),
+                    'timeInPool': {'count': histogram.count, 'p50ms': self.ms(histogram.percentile(0.5)),
+                                   'p90ms': self.ms(histogram.percentile(0.9)), 'p99ms': self.ms(histogram.percentile(0.99)),
+                                   'maxms': self.ms(histogram.max)},
+                    'mined': self.fates[node]['mined'], 'dropped': self.fates[node]['dropped']}
+        return {'nodes': nodes, 'stuck': self.stuckTransactions()[:maxStuck]}
+
+    @staticmethod
+    def ms(seconds):
+        return None if seconds == None else round(seconds * 1000.0, 3)
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Monitor the transaction pools of the geth test network.')
+    parser.add_argument('--network', help='network.json (or node list) of the clients to monitor')
+    parser.add_argument('--node', action='append', default=[], help='<ip>:<rpcPort>, repeatable (default 127.0.0.1:9000)')
+    parser.add_argument('--interval', type=float, default=1.0, help='seconds between samples')
+    parser.add_argument('--samples', type=int, default=600, help='samples kept per client')
+    parser.add_argument('--stuck-after', type=float, default=60.0, help='seconds in a pool before a transaction is stuck')
+    parser.add_argument('--report-interval', type=float, default=10.0, help='seconds between printed reports')
+    parser.add_argument('--duration', type=float, default=None, help='stop after this many seconds')
+    parser.add_argument('--transaction', default=None, help='print where this transaction is after one sample')
+    args = parser.parse_args()
+
+    if args.network:
+        from networkTopology import loadNodes
+        nodes = [(node['ip'], node['rpcPort']) for node in loadNodes(args.network)]
+    else:
+        nodes = [tuple(text.rsplit(':', 1)) for text in args.node] or [('127.0.0.1', '9000')]
+
+    monitor = TxpoolMonitor(nodes, interval=args.interval, maxSamples=args.samples, stuckAfter=args.stuck_after)
+    if args.transaction:
+        monitor.sample()
+        print (json.dumps(monitor.transactionState(args.transaction), indent=2))
+        monitor.stop()
+    else:
+        monitor.start()
+        deadline = None if args.duration == None else time.time() + args.duration
+        try:
+            while deadline == None or time.time() < deadline:
+                time.sleep(args.report_interval if deadline == None else max(0.0, min(args.report_interval, deadline - time.time())))
+                print (json.dumps(monitor.snapshot(), indent=2), flush=True)
+        except KeyboardInterrupt:
+            pass
+        monitor.stop()
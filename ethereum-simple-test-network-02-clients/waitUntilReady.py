@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+
+##############################################################################
+#
+# Wait until the geth clients of the network are ready to use.
+#
+#    Probes every client at once over one persistent connection each and
+#    exits as soon as all of the conditions hold:
+#
+#       --min-block N     every client's block number is > N (default 0, mining has started)
+#       --min-peers K     every client has >= K peers
+#       --max-spread D    all clients are within D blocks of each other
+#
+#    ./waitUntilReady.py --node 127.0.0.1:9000 --node 127.0.0.1:11000 --min-peers 1
+#
+# @Author   Michael A. Walker
+# @Date     2026-10-17
+#
+##############################################################################
+
+import argparse
+import asyncio
+import sys
+import time
+import asyncGethClients
+
+
+def probeCalls(minPeers):
+    calls = [("eth_blockNumber", [])]
+    if minPeers != None:
+        calls.append(("net_peerCount", []))
+    return calls
+
+def toInt(result):
+    return int(result, 16) if isinstance(result, str) else None
+
+def checkConditions(status,minBlock=0,minPeers=None,maxSpread=None):
+    """ True when every client in status (name -> {'blockNumber','peerCount'}) satisfies the conditions. """
+    blocks = [entry['blockNumber'] for entry in status.values()]
+    if any(block == None or block <= minBlock for block in blocks):
+        return False
+    if minPeers != None and any(entry['peerCount'] == None or entry['peerCount'] < minPeers for entry in status.values()):
+        return False
+    if maxSpread != None and max(blocks) - min(blocks) > maxSpread:
+        return False
+    return True
+
+async def waitForNodes(nodes,minBlock=0,minPeers=None,maxSpread=None,timeout=None,interval=0.2,onProbe=None):
+    """ Probe (ip, port) nodes concurrently every interval seconds until the conditions hold.
+        Returns (ready, status), status is a dict of 'ip:port' -> {'blockNumber','peerCount'} as ints.
+    """
+    # one in-flight call per client keeps it to one persistent connection each
+    client = asyncGethClients.AsyncRpcClient(maxInFlightPerNode=1, timeout=max(interval, 2.0))
+    calls = probeCalls(minPeers)
+    deadline = None if timeout == None else time.time() + timeout
+    try:
+        while True:
+            started = time.time()
+            results = await asyncio.gather(*[client.rpcBatchCommand(calls, ip=ip, port=port) for ip, port in nodes])
+            status = {}
+            for (ip, port), result in zip(nodes, results):
+                status[ip + ":" + port] = {'blockNumber': toInt(result[0]),
+                                           'peerCount': toInt(result[1]) if len(result) > 1 else None}
+            if onProbe != None:
+                onProbe(status)
+            if checkConditions(status, minBlock, minPeers, maxSpread):
+                return True, status
+            if deadline != None and time.time() >= deadline:
+                return False, status
+            await asyncio.sleep(max(0, interval - (time.time() - started)))
+    finally:
+        client.close()
+
+def waitUntilReady(nodes,minBlock=0,minPeers=None,maxSpread=None,timeout=None,interval=0.2,onProbe=None):
+    """ Blocking version of waitForNodes for synchronous scripts. """
+    return asyncGethClients.runSync(waitForNodes(nodes, minBlock, minPeers, maxSpread, timeout, interval, onProbe))
+
+
+##############################################################################
+# 'main' entrypoint of script
+##############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Wait until the geth clients are ready to use.')
+    parser.add_argument('--node', action='append', default=[], help='<ip>:<rpcPort> to watch, repeatable (default 127.0.0.1:9000)')
+    parser.add_argument('--min-block', type=int, default=0, help='wait for block number > N on every client')
+    parser.add_argument('--min-peers', type=int, default=None, help='wait for >= K peers on every client')
+    parser.add_argument('--max-spread', type=int, default=None, help='wait for all clients to be within D blocks')
+    parser.add_argument('--timeout', type=float, default=None, help='give up (exit 1) after this many seconds')
+    parser.add_argument('--interval', type=float, default=0.2, help='seconds between probes')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    nodes = [asyncGethClients.parseNode(text) for text in args.node] or [('127.0.0.1', '9000')]
+
+    def printStatus(status):
+        print ("  " + ", ".join(name + " block=" + str(entry['blockNumber']) + " peers=" + str(entry['peerCount'])
+                                for name, entry in sorted(status.items())))
+
+    ready, status = waitUntilReady(nodes, args.min_block, args.min_peers, args.max_spread, args.timeout,
+                                   args.interval, printStatus if args.verbose else None)
+    sys.exit(0 if ready else 1)
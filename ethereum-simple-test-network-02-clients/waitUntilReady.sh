@@ -13,12 +13,8 @@ echo ""
 echo "  Waiting for Network Miner to start mining."
 echo ""
 
-results=$(./pycurlGetBlockNumber.py 127.0.0.1 9000 | grep "Current block number is:" | awk {'print $5'})
-
-while [ "$results" = "0x0" ]; do
-   sleep 2
-   results=$(./pycurlGetBlockNumber.py 127.0.0.1 9000 | grep "Current block number is:" | awk {'print $5'})
-done
+# probes in-process until block number > 0, see ./waitUntilReady.py --help for more conditions.
+./waitUntilReady.py --node 127.0.0.1:9000 "$@" || exit 1
 
 echo "  Mining has started. Network is ready to use."
 echo ""